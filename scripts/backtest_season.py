@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Season Backtest Runner
+
+Replay a season of stored activities and wellness data through the reasoning
+policy and compare threshold settings side by side.
+
+Examples:
+    python scripts/backtest_season.py --start 2025-01-01 \\
+        --grid readiness_low=60,65,70,75 --grid tsb_positive=10,15,20
+    python scripts/backtest_season.py --llm-stub --workers 4
+"""
+
+import sys
+import argparse
+import itertools
+from datetime import date
+from pathlib import Path
+
+# Add project paths
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from lanterne_rouge.backtest import build_daily_metrics, load_activities, load_wellness, run_backtest
+from lanterne_rouge.batch_decisions import THRESHOLD_PATHS
+
+
+def parse_grid(entries):
+    """Turn ``name=v1,v2`` options into named decision_rules overrides."""
+    grid = {}
+    for entry in entries or []:
+        name, _, values = entry.partition("=")
+        if name not in THRESHOLD_PATHS:
+            raise SystemExit(f"❌ Unknown threshold '{name}'. Choose from: {', '.join(THRESHOLD_PATHS)}")
+        grid[name] = [float(v) for v in values.split(",") if v.strip()]
+    if not grid:
+        return {}  # only the default policy
+
+    parameter_sets = {}
+    for combo in itertools.product(*grid.values()):
+        overrides = {}
+        for name, value in zip(grid, combo):
+            group, key = THRESHOLD_PATHS[name]
+            overrides.setdefault(group, {})[key] = value
+        label = " ".join(f"{name}={value:g}" for name, value in zip(grid, combo))
+        parameter_sets[label] = overrides
+    return parameter_sets
+
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Backtest reasoning policies over a stored season")
+    parser.add_argument('--activities', default=str(project_root / "tests" / "i296483_activities.csv"),
+                        help='Strava or intervals.icu activities CSV export')
+    parser.add_argument('--wellness', default=str(project_root / "tests" / "athlete_i296483_wellness.csv"),
+                        help='intervals.icu wellness CSV export')
+    parser.add_argument('--history', action='store_true',
+                        help='Read activities and wellness imported by scripts/import_history.py')
+    parser.add_argument('--oura', action='store_true',
+                        help='Use readiness synced from Oura into the local store instead of the wellness export')
+    parser.add_argument('--start', type=date.fromisoformat, help='First day to replay (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, help='Last day to replay (YYYY-MM-DD)')
+    parser.add_argument('--ftp', type=float, help='FTP for power-based TSS when the export has none')
+    parser.add_argument('--grid', action='append',
+                        help='Threshold values to sweep, e.g. readiness_low=60,70 (repeatable)')
+    parser.add_argument('--workers', type=int, help='Process pool size (0 = run in-process)')
+    parser.add_argument('--llm-stub', action='store_true',
+                        help='Run the LLM decision path against the local stub backend')
+    parser.add_argument('--stub-latency', type=float, default=0.0,
+                        help='Seconds of simulated LLM latency per decision')
+    parser.add_argument('--csv', type=Path, help='Write per-day decisions for every policy to this CSV')
+
+    args = parser.parse_args()
+
+    if args.history:
+        from lanterne_rouge.history_import import HistoryStore
+
+        store = HistoryStore()
+        activities = load_activities(store.activities_frame(), ftp=args.ftp)
+        wellness = load_wellness(store.wellness_frame())
+    else:
+        activities = load_activities(args.activities, ftp=args.ftp)
+        wellness = load_wellness(args.wellness) if args.wellness else None
+    if args.oura:
+        from lanterne_rouge.readiness_store import ReadinessStore
+
+        wellness = ReadinessStore().frame(contributors=False)[["readiness_score"]].astype(float)
+    metrics = build_daily_metrics(activities, wellness, start=args.start, end=args.end)
+    print(f"🔍 Rebuilt {len(metrics)} days of metrics from {len(activities)} activities")
+
+    report = run_backtest(
+        metrics,
+        parameter_sets=parse_grid(args.grid),
+        workers=args.workers,
+        use_llm_stub=args.llm_stub,
+        stub_options={"latency": args.stub_latency},
+    )
+    print(report.format())
+
+    if args.csv:
+        import pandas as pd
+
+        frames = [result.decisions.assign(policy=result.name) for result in report.results]
+        pd.concat(frames).to_csv(args.csv)
+        print(f"✅ Decisions written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
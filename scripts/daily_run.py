@@ -1,6 +1,6 @@
+import csv
 import sys
 import os
-import subprocess
 from dotenv import load_dotenv
 from pathlib import Path
 from datetime import date
@@ -12,17 +12,23 @@ sys.path.insert(0, os.path.join(project_root, 'src'))
 
 from scripts.notify import send_email, send_sms
 from lanterne_rouge.strava_api import refresh_strava_token
-from lanterne_rouge.monitor import get_oura_readiness, get_ctl_atl_tsb, get_recent_workout_analysis, get_performance_trends
+from lanterne_rouge.morning_metrics import gather_morning_metrics
 from lanterne_rouge.tour_coach import TourCoach
-from lanterne_rouge.mission_config import bootstrap
+from lanterne_rouge.workflow import Workflow, WorkflowContext
 
 load_dotenv()
 
 
-def run_daily_logic():
-    """Execute the new agent-based Tour Coach logic for the day."""
+def run_daily_logic(context=None):
+    """
+    Execute the new agent-based Tour Coach logic for the day.
+
+    Args:
+        context: Shared ``WorkflowContext``; a fresh one is used when omitted.
+    """
+    context = context or WorkflowContext(Path("missions/tdf_sim_2025.toml"))
     # Load mission configuration
-    mission_cfg = bootstrap(Path("missions/tdf_sim_2025.toml"))
+    mission_cfg = context.mission_cfg
 
     # Determine reasoning mode from environment
     use_llm_reasoning = os.getenv("USE_LLM_REASONING", "true").lower() == "true"
@@ -31,33 +37,24 @@ def run_daily_logic():
     # Initialize the Tour Coach orchestrator with configurable reasoning
     coach = TourCoach(mission_cfg, use_llm_reasoning=use_llm_reasoning, llm_model=llm_model)
 
-    # Get current metrics (similar to run_tour_coach function)
-    readiness, *_ = get_oura_readiness()
-    ctl, atl, tsb = get_ctl_atl_tsb()
-    
-    # Get recent workout analysis from core monitor system
-    recent_workout_analysis = get_recent_workout_analysis()
-    performance_trends = get_performance_trends(recent_workout_analysis)
+    # Fetch Oura, Strava and the workout analysis concurrently
+    gathered = gather_morning_metrics()
+    print(gathered.format())
+    readiness = gathered.readiness_score
+    ctl, atl, tsb = gathered.ctl, gathered.atl, gathered.tsb
+    recent_workout_analysis = gathered.recent_workout_analysis
+    performance_trends = gathered.performance_trends
+    zone_adherence = gathered.zone_adherence
 
     # Create metrics dictionary for the recommendation generator
     # Note: readiness_score is now a scalar integer, not a dictionary
-    metrics = {
-        "readiness_score": readiness,
-        "ctl": ctl,
-        "atl": atl,
-        "tsb": tsb
-    }
+    metrics = gathered.as_metrics()
 
     # Check if TDF simulation is active and use appropriate coaching logic
     current_date = date.today()
     if coach._is_tdf_active(current_date):
         # Load TDF context data
-        from lanterne_rouge.tdf_tracker import TDFTracker
-        tracker = TDFTracker()
-        
-        # Get recent workout analysis from core monitor system
-        recent_workout_analysis = get_recent_workout_analysis()
-        performance_trends = get_performance_trends(recent_workout_analysis)
+        tracker = context.tracker
         
         # Check for rest days
         rest_days = []
@@ -76,6 +73,7 @@ def run_daily_logic():
             "stage_completed_today": tracker.is_stage_completed_today(current_date),
             "recent_workout_analysis": recent_workout_analysis,
             "performance_trends": performance_trends,
+            "zone_adherence": zone_adherence,
             "is_rest_day": is_rest_day,
             "rest_day_number": rest_day_number,
             "days_into_tdf": days_into_tdf,
@@ -91,7 +89,8 @@ def run_daily_logic():
         enhanced_metrics = {
             **metrics,
             "recent_workout_analysis": recent_workout_analysis,
-            "performance_trends": performance_trends
+            "performance_trends": performance_trends,
+            "zone_adherence": zone_adherence
         }
         summary = coach.generate_daily_recommendation(enhanced_metrics)
 
@@ -107,22 +106,33 @@ def run_daily_logic():
 
     return summary, log
 
-if __name__ == "__main__":
-    summary, log = run_daily_logic()  # summary: str, log: dict
 
-    # Refresh token and make it available to the updater
+def _coach_step(context):
+    return run_daily_logic(context)
+
+
+def _refresh_token_step(context):
+    # Refresh token and make it available to the secret updater
     _, refresh_token = refresh_strava_token()
     os.environ["STRAVA_REFRESH_TOKEN"] = refresh_token
+    return refresh_token
+
+
+def _github_secret_step(context):
+    from scripts.update_github_secret import update_github_secret
 
-    # Update GitHub secret with new token
-    subprocess.run(["python", "scripts/update_github_secret.py"], check=True, shell=False)
+    update_github_secret(context.results["strava_token"], session=context.session)
 
+
+def _tdf_docs_step(context):
     # Update TDF documentation if simulation is active
-    try:
-        subprocess.run(["python", "scripts/integrate_tdf_docs.py"], check=True, shell=False)
-    except subprocess.CalledProcessError as e:
-        print(f"⚠️  TDF documentation update failed: {e}")
+    from scripts.integrate_tdf_docs import main as update_tdf_docs
+
+    update_tdf_docs(mission_cfg=context.mission_cfg, tracker=context.tracker)
+
 
+def _notify_step(context):
+    summary, _ = context.results["coach"]
     subject = "Lanterne Rouge: Daily Training Plan"
     email_recipient = os.getenv("TO_EMAIL")
     sms_recipient = os.getenv("TO_PHONE")
@@ -131,9 +141,12 @@ if __name__ == "__main__":
     send_sms(summary, sms_recipient, use_twilio=os.getenv("USE_TWILIO", "false").lower() == "true")
     print(summary)
 
+
+def _reasoning_log_step(context):
+    summary, log = context.results["coach"]
     # Save metrics to reasoning log
     reasoning_log_path = "output/reasoning_log.csv"
-    import csv
+    os.makedirs("output", exist_ok=True)
     headers = [
         "day", "readiness_score", "activity_balance", "body_temperature", "hrv_balance",
         "previous_day_activity", "previous_night", "recovery_index", "resting_heart_rate",
@@ -149,7 +162,7 @@ if __name__ == "__main__":
             "day": log.get('date', ''),
             "readiness_score": log.get('readiness', ''),  # readiness is now a scalar value
             "activity_balance": '',  # These fields no longer come from readiness dict
-            "body_temperature": '',  # They're now tracked separately in readiness_score_log.csv
+            "body_temperature": '',  # They're now tracked separately in the oura_daily table
             "hrv_balance": '',       # which is maintained by record_readiness_contributors
             "previous_day_activity": log.get('previous_day_activity', ''),
             "previous_night": log.get('previous_night', ''),
@@ -159,3 +172,24 @@ if __name__ == "__main__":
             "explanation": summary  # Use full summary as explanation
         }
         writer.writerow(row)
+
+
+def build_morning_workflow(context=None):
+    """The whole morning run as one in-process workflow sharing config, tracker and HTTP session."""
+    workflow = Workflow("morning", context or WorkflowContext(Path("missions/tdf_sim_2025.toml")))
+    workflow.add_step("coach", _coach_step)
+    workflow.add_step("strava_token", _refresh_token_step)
+    workflow.add_step("github_secret", _github_secret_step)
+    workflow.add_step("tdf_docs", _tdf_docs_step, required=False)
+    workflow.add_step("notify", _notify_step)
+    workflow.add_step("reasoning_log", _reasoning_log_step)
+    return workflow
+
+
+if __name__ == "__main__":
+    workflow = build_morning_workflow()
+    report = workflow.run()
+    workflow.context.close()
+    print(report.format())
+    if not report.ok:
+        sys.exit(1)
@@ -9,7 +9,7 @@ and bonus tracking.
 import sys
 import os
 from pathlib import Path
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 import json
 
 # Add project paths
@@ -17,13 +17,35 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
+from lanterne_rouge.athlete import current_athlete
 from lanterne_rouge.strava_api import strava_get
 from lanterne_rouge.mission_config import bootstrap
 from lanterne_rouge.tdf_tracker import TDFTracker
 from lanterne_rouge.tour_coach import TourCoach
+from lanterne_rouge.ride_store import RideAnalysisStore
 from scripts.notify import send_email, send_sms
 
 
+def is_qualifying_ride(activity):
+    """True for a ride or virtual ride of at least the minimum stage duration (30 min)."""
+    if activity.get("sport_type") not in ["Ride", "VirtualRide"]:
+        return False
+    return activity.get("moving_time", 0) / 60 >= 30  # Minimum stage duration
+
+
+def activity_date(activity):
+    """The local date an activity started on, or None if it has no usable start date."""
+    try:
+        return datetime.fromisoformat(activity["start_date_local"].replace("Z", "")).date()
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def is_recent_activity(activity, today):
+    """True for an activity from today, or yesterday (the athlete's clock may be behind)."""
+    return activity_date(activity) in (today, today - timedelta(days=1))
+
+
 def get_todays_cycling_activity():
     """Get today's cycling activity from Strava."""
     print("🔍 Checking for today's cycling activity...")
@@ -33,7 +55,6 @@ def get_todays_cycling_activity():
         print("❌ No activities found")
         return None
 
-    from datetime import timedelta
     today = date.today()
     yesterday = today - timedelta(days=1)
     
@@ -44,23 +65,14 @@ def get_todays_cycling_activity():
     yesterdays_activity = None
     
     for activity in activities:
-        try:
-            # Parse activity date (this is in athlete's local time)
-            activity_date = datetime.fromisoformat(
-                activity["start_date_local"].replace("Z", "")
-            ).date()
-
-            if (activity.get("sport_type") in ["Ride", "VirtualRide"]):
-                # Check minimum duration (from mission config)
-                duration_minutes = activity.get("moving_time", 0) / 60
-                if duration_minutes >= 30:  # Minimum stage duration
-                    if activity_date == today:
-                        todays_activity = activity
-                    elif activity_date == yesterday:
-                        yesterdays_activity = activity
-
-        except (ValueError, KeyError):
+        # start_date_local is in the athlete's local time
+        started = activity_date(activity)
+        if started is None or not is_qualifying_ride(activity):
             continue
+        if started == today:
+            todays_activity = activity
+        elif started == yesterday:
+            yesterdays_activity = activity
 
     # Prefer today's activity, fall back to yesterday's only if no today activity
     if todays_activity:
@@ -77,7 +89,7 @@ def get_todays_cycling_activity():
 
 def analyze_activity_with_llm(activity, stage_info, mission_cfg):
     """Use LLM to analyze activity and determine ride mode with intelligent reasoning."""
-    from lanterne_rouge.ai_clients import call_llm
+    from lanterne_rouge.ai_clients import call_llm, llm_available
     from lanterne_rouge.validation import validate_llm_json_response, validate_ride_mode, validate_confidence_score, validate_activity_data, calculate_power_metrics
     
     # Validate and prepare activity data
@@ -88,10 +100,32 @@ def analyze_activity_with_llm(activity, stage_info, mission_cfg):
     
     # Calculate power-based metrics using athlete's FTP
     ftp = getattr(mission_cfg.athlete, 'ftp', 200)  # Default to 200W if not set
-    power_metrics = calculate_power_metrics(activity_data, ftp)
+    streams = None
+    try:
+        from lanterne_rouge.streams.cache import StreamCache
+        streams = StreamCache().fetch(activity_data['id']) if activity_data.get('id') else None
+    except Exception as e:
+        print(f"⚠️ Could not load activity streams, using summary power: {e}")
+    power_metrics = calculate_power_metrics(activity_data, ftp, streams=streams)
     
     # Merge power metrics into activity data
     activity_data.update(power_metrics)
+
+    # Peak efforts from the power-duration curve, merged into the season bests
+    peak_line = ""
+    if streams and streams.get('watts') is not None:
+        from lanterne_rouge.streams.mmp import SeasonBestIndex, describe_peaks, mmp_curve
+        curve = mmp_curve(streams['watts'], streams.get('time'))
+        activity_data['peak_powers'] = curve.peaks()
+        peak_line = f"\n• Peak Power: {describe_peaks(activity_data['peak_powers'], ftp)}"
+        try:
+            season = int(str(activity.get('start_date_local') or datetime.now().year)[:4])
+            improved = SeasonBestIndex().ingest(activity_data['id'], curve, season)
+            activity_data['season_best_durations'] = improved
+            if improved:
+                print(f"📊 New season bests at {len(improved)} durations (longest {max(improved)}s)")
+        except Exception as e:
+            print(f"⚠️ Could not update season power bests: {e}")
     
     # Get detection thresholds and points info from mission config
     tdf_config = getattr(mission_cfg, 'tdf_simulation', {})
@@ -104,7 +138,7 @@ def analyze_activity_with_llm(activity, stage_info, mission_cfg):
     
     # Check if LLM is available and enabled
     use_llm = (os.getenv("USE_LLM_REASONING", "true").lower() == "true" and 
-               os.getenv("OPENAI_API_KEY"))
+               llm_available())
     
     if use_llm:
         try:
@@ -164,7 +198,7 @@ YOUR POWER DATA:
 • Power: {activity_data['normalized_power']}W (vs {ftp}W FTP)
 • Intensity Factor: {activity_data['intensity_factor']:.3f}
 • Training Load: {activity_data['tss']:.1f} TSS
-• Effort Zone: {activity_data['effort_level']}
+• Effort Zone: {activity_data['effort_level']}{peak_line}
 
 RIDE DETAILS:
 • Distance: {activity_data['distance_km']:.1f}km
@@ -180,7 +214,7 @@ YOUR POWER DATA:
 • Power: {activity_data['normalized_power']}W (vs {ftp}W FTP)
 • Intensity Factor: {activity_data['intensity_factor']:.3f}
 • Training Load: {activity_data['tss']:.1f} TSS
-• Effort Zone: {activity_data['effort_level']}
+• Effort Zone: {activity_data['effort_level']}{peak_line}
 
 RIDE DETAILS:
 • Distance: {activity_data['distance_km']:.1f}km
@@ -299,11 +333,11 @@ def calculate_stage_points(stage_type, ride_mode, mission_cfg):
 
 def generate_llm_stage_evaluation(stage_info, ride_mode, points_earned, total_points, bonuses, rationale, activity_data, mission_cfg):
     """Generate LLM-powered post-stage performance evaluation and strategic advice."""
-    from lanterne_rouge.ai_clients import call_llm
+    from lanterne_rouge.ai_clients import call_llm, llm_available
     
     # Check if LLM is available
     use_llm = (os.getenv("USE_LLM_REASONING", "true").lower() == "true" and 
-               os.getenv("OPENAI_API_KEY"))
+               llm_available())
     
     if not use_llm:
         # Fallback to simple summary
@@ -403,9 +437,8 @@ Generate the completion summary following the exact format specified in the syst
         
         # Also save a copy for backward compatibility in output directory
         try:
-            output_dir = os.path.join(project_root, 'output')
-            os.makedirs(output_dir, exist_ok=True)
-            analysis_file = os.path.join(output_dir, f'stage{stage_number}_analysis.txt')
+            analysis_file = current_athlete().output_path(f'stage{stage_number}_analysis.txt')
+            analysis_file.parent.mkdir(parents=True, exist_ok=True)
             with open(analysis_file, 'w') as f:
                 f.write(response)
         except Exception as e:
@@ -458,7 +491,7 @@ def save_completion_summary(stage_number: int, summary: str) -> str:
     """Save completion summary to a markdown file in the new documentation structure"""
     try:
         # Create completion summary directory if it doesn't exist
-        summary_dir = Path("docs_src/tdf-simulation/stages/completion-summary")
+        summary_dir = current_athlete().summaries_dir
         summary_dir.mkdir(parents=True, exist_ok=True)
         
         # Create filename
@@ -476,8 +509,27 @@ def save_completion_summary(stage_number: int, summary: str) -> str:
         print(f"⚠️ Error saving completion summary: {e}")
         return ""
 
-def main():
-    """Main evening check workflow."""
+def main(mission_cfg=None, tracker=None, update_docs=True, activity=None):
+    """
+    Main evening check workflow.
+
+    Args:
+        mission_cfg: Mission config already loaded by the caller.
+        tracker: TDF tracker already loaded by the caller; it is updated in place.
+        update_docs: Update the TDF documentation after a stage completion
+            (the evening pipeline runs that as its own task).
+        activity: The Strava activity to score (e.g. pushed by the webhook);
+            when omitted, today's activities are polled.
+
+    Returns:
+        The stage number recorded, or None if no stage was completed.
+
+    Raises:
+        Exception: Only when ``activity`` is given. A pushed activity that
+            couldn't be scored is an error, so the webhook retries it; a
+            polling run just reports the failure and tries again tonight.
+    """
+    pushed = activity is not None
     print("🏆 LLM-Powered TDF Evening Check")
     print("=" * 45)
     
@@ -493,7 +545,8 @@ def main():
     
     try:
         # Load mission configuration
-        mission_cfg = bootstrap("missions/tdf_sim_2025.toml")
+        if mission_cfg is None:
+            mission_cfg = bootstrap("missions/tdf_sim_2025.toml")
         
         # Create TourCoach to check if TDF is active
         coach = TourCoach(mission_cfg)
@@ -515,7 +568,8 @@ def main():
         print("📅 Today: TDF stage analysis")
         
         # Initialize TDF tracker
-        tracker = TDFTracker()
+        if tracker is None:
+            tracker = TDFTracker()
         
         # Check if stage already completed today
         if tracker.is_stage_completed_today(today):
@@ -524,7 +578,15 @@ def main():
             return
         
         # Get today's cycling activity
-        activity = get_todays_cycling_activity()
+        if activity is None:
+            activity = get_todays_cycling_activity()
+        elif not is_qualifying_ride(activity):
+            print("❌ Activity is not a qualifying ride (cycling, >30 min)")
+            return
+        elif not is_recent_activity(activity, today):
+            # An old ride uploaded today doesn't complete today's stage
+            print("❌ Activity wasn't ridden today or yesterday")
+            return
         if not activity:
             print("❌ No qualifying activity found")
             print("   Complete a cycling workout (>30 min) and upload to Strava")
@@ -566,10 +628,32 @@ def main():
         
         if "error" in result:
             print("❌ Error processing stage completion")
+            if pushed:
+                raise RuntimeError(f"Could not record stage {stage_number}: {result['error']}")
             return
         
         bonuses_earned = result.get('bonuses_earned', [])
         new_total = result.get('new_total', points_earned)
+
+        # Structured completion record read by the morning workout analysis
+        try:
+            RideAnalysisStore().save_completion(
+                stage_number=stage_number,
+                completed_on=today.isoformat(),
+                activity_id=activity_id,
+                stage_type=stage_type,
+                ride_mode=ride_mode,
+                points_earned=points_earned,
+                total_points=new_total,
+                duration_minutes=activity_data.get('duration_minutes'),
+                tss=activity_data.get('tss'),
+                intensity_factor=activity_data.get('intensity_factor'),
+                effort_level=activity_data.get('effort_level'),
+                avg_power=activity_data.get('average_watts'),
+                weighted_power=activity_data.get('weighted_average_watts'),
+            )
+        except Exception as e:
+            print(f"⚠️ Could not store completion result: {e}")
         
         if bonuses_earned:
             print("🏆 BONUS ACHIEVEMENTS UNLOCKED:")
@@ -579,16 +663,14 @@ def main():
         print("\n✅ Stage completion summary generated")
         print("📊 Points processing complete")
         
-        # Update TDF documentation after stage completion
-        try:
-            import subprocess
-            subprocess.run(["python", "scripts/integrate_tdf_docs.py"], 
-                         check=True, shell=False, cwd=project_root)
-            print("📄 Documentation updated with stage completion")
-        except subprocess.CalledProcessError as e:
-            print(f"⚠️  Documentation update failed: {e}")
-        except Exception as e:
-            print(f"⚠️  Documentation update error: {e}")
+        # Update TDF documentation after stage completion, in this process
+        if update_docs:
+            try:
+                from scripts.integrate_tdf_docs import main as update_tdf_docs
+                update_tdf_docs(mission_cfg=mission_cfg, tracker=tracker)
+                print("📄 Documentation updated with stage completion")
+            except Exception as e:
+                print(f"⚠️  Documentation update error: {e}")
         
         # Debug mode notification (no sensitive data processing in logs)
         if os.getenv("DEBUG_TDF", "false").lower() == "true":
@@ -596,8 +678,8 @@ def main():
         
         # Send notifications
         try:
-            email_recipient = os.getenv("TO_EMAIL")
-            sms_recipient = os.getenv("TO_PHONE")
+            email_recipient = current_athlete().env("TO_EMAIL")
+            sms_recipient = current_athlete().env("TO_PHONE")
             
             if email_recipient:
                 # Generate comprehensive LLM-powered evaluation for notifications
@@ -628,9 +710,12 @@ def main():
             print("⚠️ Notification error occurred")
         
         print("\n✅ Evening check complete!")
+        return stage_number
         
     except Exception as e:
         print("❌ Error in evening check - operation failed")
+        if pushed:
+            raise
         return
 
 
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+History Importer
+
+Seed the local database with an athlete's activity and wellness history from
+offline exports, without any API calls.
+
+Examples:
+    python scripts/import_history.py --activities export/activities.csv \\
+        --tcx export/activities/ --wellness athlete_i296483_wellness.csv
+    python scripts/import_history.py --activities tests/i296483_activities.csv \\
+        --activities tests/strava_export_2025-06-26.csv
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+
+# Add project paths
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from lanterne_rouge.history_import import (
+    HistoryStore,
+    import_activities_csv,
+    import_tcx,
+    import_wellness_csv,
+)
+from lanterne_rouge.streams.cache import StreamCache
+from lanterne_rouge.streams.mmp import DEFAULT_ATHLETE
+
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Import activity and wellness exports into the local database")
+    parser.add_argument('--activities', action='append', default=[],
+                        help='Strava or intervals.icu activities CSV (repeatable)')
+    parser.add_argument('--wellness', action='append', default=[],
+                        help='intervals.icu wellness CSV (repeatable)')
+    parser.add_argument('--tcx', action='append', default=[],
+                        help='TCX file or directory of .tcx / .tcx.gz files (repeatable)')
+    parser.add_argument('--athlete', default=DEFAULT_ATHLETE, help='Athlete id to import for')
+    parser.add_argument('--db', type=Path, help='SQLite database (default: memory/lanterne.db)')
+    parser.add_argument('--stream-dir', type=Path, help='Stream cache directory for TCX streams')
+
+    args = parser.parse_args()
+    if not (args.activities or args.wellness or args.tcx):
+        parser.error("nothing to import: pass --activities, --wellness and/or --tcx")
+
+    started = time.perf_counter()
+    store = HistoryStore(args.db)
+    results = []
+    # CSVs first, so TCX files of the same export map onto their activity ids
+    for path in args.activities:
+        results.append(import_activities_csv(path, store, athlete_id=args.athlete))
+    for path in args.wellness:
+        results.append(import_wellness_csv(path, store, athlete_id=args.athlete))
+    if args.tcx:
+        results.append(import_tcx(args.tcx, store, StreamCache(args.stream_dir), athlete_id=args.athlete))
+
+    for result in results:
+        print(result.format())
+    print(f"📊 {store.count('activities', args.athlete)} activities and "
+          f"{store.count('wellness', args.athlete)} wellness days stored for '{args.athlete}' "
+          f"({time.perf_counter() - started:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,6 @@ import datetime
 import os
 from pathlib import Path
 import json
-import subprocess
 
 # Add project paths
 project_root = Path(__file__).parent.parent
@@ -22,11 +21,12 @@ sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
 
-def get_tdf_status():
-    """Get current TDF status from existing tracker."""
+def get_tdf_status(tracker=None):
+    """Get current TDF status from existing tracker (loaded if not given)."""
     try:
-        from lanterne_rouge.tdf_tracker import TDFTracker
-        tracker = TDFTracker()
+        if tracker is None:
+            from lanterne_rouge.tdf_tracker import TDFTracker
+            tracker = TDFTracker()
         points_status = tracker.get_points_status()
         
         return {
@@ -61,12 +61,29 @@ def get_briefing_stage():
     return None
 
 
-def update_stage_tabs(stage_num, status):
-    """Update stage documentation tabs based on status."""
-    stage_file = Path(f"docs_src/tdf-simulation/stages/stage{stage_num}.md")
+def stage_file_path(stage_num):
+    """The docs page of a stage."""
+    return Path(f"docs_src/tdf-simulation/stages/stage{stage_num}.md")
+
+
+def points_file_path():
+    """The TDF points file the stage pages are rendered from."""
+    return os.path.join(os.path.dirname(__file__), '..', 'output', 'tdf_points.json')
+
+
+def analysis_file_path(stage_num):
+    """The evening check's analysis of a stage."""
+    return os.path.join(os.path.dirname(__file__), '..', 'output', f'stage{stage_num}_analysis.txt')
+
+
+def update_stage_tabs(stage_num, status, mission_cfg=None):
+    """Update stage documentation tabs based on status; returns True if the file was rewritten."""
+    from lanterne_rouge.doc_cache import write_if_changed
+
+    stage_file = stage_file_path(stage_num)
     
     if not stage_file.exists():
-        return
+        return False
     
     print(f"📄 Updating Stage {stage_num} tabs for status: {status}")
     
@@ -83,7 +100,7 @@ def update_stage_tabs(stage_num, status):
             break
     
     if report_idx is None:
-        return
+        return False
     
     # Keep content before Stage Report
     new_lines = lines[:report_idx + 1]
@@ -93,19 +110,18 @@ def update_stage_tabs(stage_num, status):
     if status == 'completed':
         # Show all tabs: Completed (with fresh data), Recommended, Planned
         new_lines.extend(get_completed_tab_with_data(content, stage_num))
-        new_lines.extend(get_recommended_tab_content(stage_num))
+        new_lines.extend(get_recommended_tab_content(stage_num, mission_cfg))
         new_lines.extend(get_existing_tab_content(content, 'Planned'))
     elif status == 'current':
         # Show Recommended (with current briefing), Planned (no Completed until stage is done)
-        new_lines.extend(get_recommended_tab_content(stage_num))
+        new_lines.extend(get_recommended_tab_content(stage_num, mission_cfg))
         new_lines.extend(get_existing_tab_content(content, 'Planned'))
     else:  # future
         # Show only Planned
         new_lines.extend(get_existing_tab_content(content, 'Planned'))
     
-    # Write updated content
-    with open(stage_file, 'w') as f:
-        f.write('\n'.join(new_lines))
+    # Write updated content (unless it is byte-identical)
+    return write_if_changed(stage_file, '\n'.join(new_lines))
 
 
 def get_existing_tab_content(content, tab_name):
@@ -135,7 +151,7 @@ def get_completed_tab_with_data(content, stage_num):
     
     # Try to get fresh data from TDF points
     try:
-        tdf_points_path = os.path.join(os.path.dirname(__file__), '..', 'output', 'tdf_points.json')
+        tdf_points_path = points_file_path()
         if os.path.exists(tdf_points_path):
             with open(tdf_points_path) as f:
                 tdf_data = json.load(f)
@@ -201,8 +217,7 @@ def get_latest_evening_analysis(stage_num):
     """Get the latest LLM analysis from evening check for this stage."""
     try:
         # Look for recent analysis in output directory
-        output_dir = os.path.join(os.path.dirname(__file__), '..', 'output')
-        analysis_file = os.path.join(output_dir, f'stage{stage_num}_analysis.txt')
+        analysis_file = analysis_file_path(stage_num)
         
         if os.path.exists(analysis_file):
             with open(analysis_file) as f:
@@ -213,7 +228,7 @@ def get_latest_evening_analysis(stage_num):
     return None
 
 
-def get_recommended_tab_content(stage_num):
+def get_recommended_tab_content(stage_num, mission_cfg=None):
     """Generate Recommended tab with fresh morning briefing data."""
     tab_lines = []
     tab_lines.append('=== "Recommended"')
@@ -231,7 +246,8 @@ def get_recommended_tab_content(stage_num):
                 # Get mission config to determine correct stage type
                 from lanterne_rouge.mission_config import bootstrap
                 try:
-                    mission_cfg = bootstrap("missions/tdf_sim_2025.toml")
+                    if mission_cfg is None:
+                        mission_cfg = bootstrap("missions/tdf_sim_2025.toml")
                     tdf_config = getattr(mission_cfg, 'tdf_simulation', {})
                     stage_types = tdf_config.get('stages', {})
                     correct_stage_type = stage_types.get(stage_num, 'flat')
@@ -299,9 +315,53 @@ def get_recommended_tab_content(stage_num):
     return tab_lines
 
 
-def update_all_stages():
-    """Update all stage files based on current TDF status."""
-    tdf_status = get_tdf_status()
+def stage_inputs(stage_num, status, points, briefing, mission_cfg=None):
+    """
+    Everything a stage page is rendered from, for change detection.
+
+    Only what ``update_stage_tabs`` reads for this status counts: the
+    briefing when it is for this stage, and the stage's tracker entries and
+    evening analysis once it is completed. A new briefing or a completed
+    stage therefore re-renders just the stages it concerns.
+    """
+    from lanterne_rouge.doc_cache import content_hash
+    from lanterne_rouge.pipeline import file_fingerprint
+
+    inputs = {"status": status}
+    if status in ('completed', 'current'):
+        if briefing and f"Stage {stage_num} TDF Morning Briefing" in briefing:
+            inputs["briefing"] = content_hash(briefing)
+            inputs["stage_types"] = (getattr(mission_cfg, 'tdf_simulation', None) or {}).get('stages')
+        else:
+            inputs["briefing"] = briefing is not None
+    if status == 'completed':
+        inputs["tracker"] = [points.get(f"stage{stage_num}")] + [
+            stage for stage in points.get("stages", {}).values() if stage.get("stage_number") == stage_num
+        ]
+        inputs["analysis"] = file_fingerprint(analysis_file_path(stage_num))
+    return inputs
+
+
+def update_all_stages(tracker=None, mission_cfg=None, render_cache=None):
+    """
+    Update the stage files whose status or inputs changed.
+
+    Args:
+        tracker: TDF tracker already loaded by the caller.
+        mission_cfg: Mission config already loaded by the caller.
+        render_cache: Records what each page was rendered from (default:
+            the ``tdf-docs`` records in the memory database). Clear them with
+            ``PipelineCache().clear("tdf-docs")`` to force a full re-render.
+
+    Returns:
+        The numbers of the stages that were rewritten.
+    """
+    from lanterne_rouge.doc_cache import RenderCache
+
+    if render_cache is None:
+        render_cache = RenderCache("tdf-docs")
+
+    tdf_status = get_tdf_status(tracker)
     briefing_stage = get_briefing_stage() if has_new_briefing() else None
     
     completed_stages = tdf_status["completed_stages"]
@@ -309,8 +369,17 @@ def update_all_stages():
     print(f"🏆 TDF Status: {completed_stages} stages completed")
     if briefing_stage:
         print(f"📋 Current briefing for Stage {briefing_stage}")
+
+    # Inputs shared by all stages, read once
+    points = {}
+    if os.path.exists(points_file_path()):
+        with open(points_file_path()) as f:
+            points = json.load(f)
+    briefing_file = Path("output/morning_tdf_briefing.txt")
+    briefing = briefing_file.read_text().strip() if briefing_file.exists() else None
     
     # Update stages 1-21 based on status
+    rewritten = []
     for stage_num in range(1, 22):
         if stage_num <= completed_stages:
             status = 'completed'
@@ -320,24 +389,26 @@ def update_all_stages():
             status = 'future'  # Next stage without briefing
         else:
             status = 'future'
-        
-        update_stage_tabs(stage_num, status)
+
+        stage_file = stage_file_path(stage_num)
+        inputs = stage_inputs(stage_num, status, points, briefing, mission_cfg)
+        if render_cache.is_fresh(stage_file, inputs):
+            continue
+        if update_stage_tabs(stage_num, status, mission_cfg):
+            rewritten.append(stage_num)
+        render_cache.record(stage_file, inputs)
     
-    print("✅ Stage documentation updated")
+    print(f"✅ Stage documentation updated: {len(rewritten)} of 21 stages rewritten"
+          + (f" ({', '.join(map(str, rewritten))})" if rewritten else ""))
+    return rewritten
 
 
 def update_stage_data_if_completed():
     """Run stage data population if new stages were completed."""
     try:
-        # Check if there are new completions by running the populate script
-        result = subprocess.run(
-            ["python", "scripts/populate_stage_data.py"],
-            capture_output=True,
-            text=True,
-            cwd=project_root
-        )
-        
-        if result.returncode == 0 and "Updated Stage" in result.stdout:
+        # Populate in-process; the script reports how many stage files changed
+        from scripts import populate_stage_data
+        if populate_stage_data.main() > 0:
             print("📊 Stage completion data updated")
             return True
     except Exception as e:
@@ -458,11 +529,12 @@ def update_simulation_status():
         new_lines = lines[:start_idx] + new_status + lines[end_idx:]
         new_content = '\n'.join(new_lines)
         
-        # Write back to file
-        with open(index_file, 'w') as f:
-            f.write(new_content)
-        
-        print(f"✅ Updated simulation status: {total_points} points, {stages_completed} stages")
+        # Write back to file (unless nothing changed)
+        from lanterne_rouge.doc_cache import write_if_changed
+        if write_if_changed(index_file, new_content):
+            print(f"✅ Updated simulation status: {total_points} points, {stages_completed} stages")
+        else:
+            print("✅ Simulation status unchanged")
         return True
         
     except Exception as e:
@@ -550,11 +622,12 @@ def update_mkdocs_navigation():
         new_lines = lines[:indoor_rider_start] + new_indoor_rider_lines + lines[indoor_rider_end:]
         new_content = '\n'.join(new_lines)
         
-        # Write back to file
-        with open(mkdocs_file, 'w') as f:
-            f.write(new_content)
-        
-        print(f"✅ Updated mkdocs navigation with {len(stages_with_narratives)} narrative stages")
+        # Write back to file (unless nothing changed)
+        from lanterne_rouge.doc_cache import write_if_changed
+        if write_if_changed(mkdocs_file, new_content):
+            print(f"✅ Updated mkdocs navigation with {len(stages_with_narratives)} narrative stages")
+        else:
+            print("✅ mkdocs navigation unchanged")
         return True
         
     except Exception as e:
@@ -562,8 +635,15 @@ def update_mkdocs_navigation():
         return False
 
 
-def main():
-    """Main integration function - should be called after daily_run.py."""
+def main(mission_cfg=None, tracker=None):
+    """
+    Main integration function - should be called after daily_run.py.
+
+    Args:
+        mission_cfg: Mission config already loaded by the caller (e.g. a
+            workflow context); bootstrapped from the TDF mission when omitted.
+        tracker: TDF tracker already loaded by the caller.
+    """
     print("🚴 TDF Documentation Update Integration")
     print("=" * 45)
     
@@ -572,7 +652,8 @@ def main():
     from lanterne_rouge.mission_config import bootstrap
     
     try:
-        mission_cfg = bootstrap("missions/tdf_sim_2025.toml")
+        if mission_cfg is None:
+            mission_cfg = bootstrap("missions/tdf_sim_2025.toml")
         start_date = mission_cfg.start_date
         goal_date = mission_cfg.goal_date
         today = date.today()
@@ -585,7 +666,7 @@ def main():
             stage_data_updated = update_stage_data_if_completed()
             
             # Update all stage tabs based on current status
-            update_all_stages()
+            update_all_stages(tracker, mission_cfg)
             
             # If morning briefing exists, ensure it's reflected in documentation
             if has_new_briefing():
@@ -9,15 +9,25 @@ Manages stage tab visibility based on completion status:
 """
 
 import json
+import sys
 from pathlib import Path
 from datetime import datetime, date
 
+# Add project paths for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from lanterne_rouge.doc_cache import RenderCache, write_if_changed
+
 
 class StageManager:
     
-    def __init__(self):
+    def __init__(self, render_cache=None):
         self.tdf_data = self.load_tdf_data()
         self.current_stage = self.determine_current_stage()
+        # Pages are only re-rendered when their status or tabs changed
+        self.render_cache = render_cache if render_cache is not None else RenderCache("stage-tabs")
         
     def load_tdf_data(self):
         """Load TDF points data to determine completion status."""
@@ -84,12 +94,12 @@ class StageManager:
         return False
     
     def update_stage_tabs(self, stage_num):
-        """Update a stage file to show only appropriate tabs."""
+        """Update a stage file to show only appropriate tabs; returns True if it was rewritten."""
         stage_file = Path(f"docs_src/tdf-simulation/stages/stage{stage_num}.md")
         
         if not stage_file.exists():
             print(f"⚠️  Stage {stage_num} file not found")
-            return
+            return False
         
         with open(stage_file, 'r') as f:
             content = f.read()
@@ -111,7 +121,7 @@ class StageManager:
         
         if report_start is None:
             print(f"⚠️  Could not find Stage Report section in Stage {stage_num}")
-            return
+            return False
         
         # Keep everything before Stage Report
         new_content = lines[:report_start + 1] + ['']
@@ -120,11 +130,12 @@ class StageManager:
         tab_content = self.get_tab_content(stage_num, required_tabs)
         new_content.extend(tab_content)
         
-        # Write updated content
-        with open(stage_file, 'w') as f:
-            f.write('\n'.join(new_content))
+        # Write updated content (unless it is byte-identical)
+        if not write_if_changed(stage_file, '\n'.join(new_content)):
+            return False
         
         print(f"✅ Updated Stage {stage_num} tabs")
+        return True
     
     def get_tab_content(self, stage_num, required_tabs):
         """Generate tab content based on requirements."""
@@ -298,10 +309,18 @@ class StageManager:
         print(f"Completed stages: {self.tdf_data.get('stages_completed', 0)}")
         print()
         
+        rewritten = []
         for stage_num in range(1, 22):  # TDF has 21 stages
-            self.update_stage_tabs(stage_num)
+            stage_file = Path(f"docs_src/tdf-simulation/stages/stage{stage_num}.md")
+            inputs = {"status": self.get_stage_status(stage_num), "tabs": self.get_required_tabs(stage_num)}
+            if self.render_cache.is_fresh(stage_file, inputs):
+                continue
+            if self.update_stage_tabs(stage_num):
+                rewritten.append(stage_num)
+            self.render_cache.record(stage_file, inputs)
         
-        print("\n✅ All stages updated!")
+        print(f"\n✅ All stages up to date ({len(rewritten)} rewritten)")
+        return rewritten
 
 
 def main():
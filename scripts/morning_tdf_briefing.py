@@ -16,6 +16,7 @@ sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
 # Import our modules
+from lanterne_rouge.athlete import current_athlete
 from lanterne_rouge.monitor import get_oura_readiness, get_ctl_atl_tsb
 from lanterne_rouge.mission_config import bootstrap
 from lanterne_rouge.tour_coach import TourCoach
@@ -29,22 +30,32 @@ def load_points_status():
     return tracker.get_points_status()
 
 
-def generate_briefing():
-    """Generate the morning TDF briefing using LLM-powered TourCoach."""
+def generate_briefing(metrics=None, mission_cfg=None, points_status=None):
+    """
+    Generate the morning TDF briefing using LLM-powered TourCoach.
+
+    Args:
+        metrics: Readiness and CTL/ATL/TSB already fetched by the caller
+            (e.g. the pipeline's metrics task); fetched here when omitted.
+        mission_cfg: Mission config already loaded by the caller.
+        points_status: TDF points status already loaded by the caller.
+    """
     try:
-        # Get current metrics
-        readiness, *_ = get_oura_readiness()
-        ctl, atl, tsb = get_ctl_atl_tsb()
-
-        metrics = {
-            "readiness_score": readiness,
-            "ctl": ctl,
-            "atl": atl,
-            "tsb": tsb
-        }
+        if metrics is None:
+            # Get current metrics
+            readiness, *_ = get_oura_readiness()
+            ctl, atl, tsb = get_ctl_atl_tsb()
+
+            metrics = {
+                "readiness_score": readiness,
+                "ctl": ctl,
+                "atl": atl,
+                "tsb": tsb
+            }
 
         # Load mission configuration
-        mission_cfg = bootstrap("missions/tdf_sim_2025.toml")
+        if mission_cfg is None:
+            mission_cfg = bootstrap("missions/tdf_sim_2025.toml")
 
         # Create LLM-powered TourCoach
         use_llm = os.getenv("USE_LLM_REASONING", "true").lower() == "true"
@@ -58,7 +69,8 @@ def generate_briefing():
             return f"TDF simulation not active today ({today}). TDF period: July 5-27, 2025"
         
         # Load points status
-        points_status = load_points_status()
+        if points_status is None:
+            points_status = load_points_status()
         
         # Check for rest days from mission config
         today = date.today()
@@ -101,23 +113,30 @@ def main():
     print()
     
     briefing = generate_briefing()
-    
-    # Save to file
-    os.makedirs("output", exist_ok=True)
-    with open("output/morning_tdf_briefing.txt", "w", encoding="utf-8") as f:
+    save_briefing(briefing)
+    send_briefing_notifications(briefing)
+
+
+def save_briefing(briefing):
+    """Write the briefing to the active athlete's output/morning_tdf_briefing.txt."""
+    briefing_file = current_athlete().output_path("morning_tdf_briefing.txt")
+    os.makedirs(briefing_file.parent, exist_ok=True)
+    with open(briefing_file, "w", encoding="utf-8") as f:
         f.write(briefing)
     
-    print("✅ Briefing generated: output/morning_tdf_briefing.txt")
+    print(f"✅ Briefing generated: {briefing_file}")
     
     # Only print briefing in debug mode to avoid logging sensitive data
     if os.getenv("DEBUG_TDF", "false").lower() == "true":
         print("\n" + briefing)
     else:
         print("📝 Morning briefing ready (use DEBUG_TDF=true to view content)")
-    
-    # Send notifications if configured
-    email_recipient = os.getenv("TO_EMAIL")
-    sms_recipient = os.getenv("TO_PHONE")
+
+
+def send_briefing_notifications(briefing):
+    """Email the briefing and text its key lines, when recipients are configured."""
+    email_recipient = current_athlete().env("TO_EMAIL")
+    sms_recipient = current_athlete().env("TO_PHONE")
     
     if email_recipient:
         subject = f"� TDF Morning Briefing - Stage Ready!"
@@ -5,9 +5,17 @@ Script to populate stage documentation with actual data from TDF simulation logs
 
 import json
 import re
+import sys
 from pathlib import Path
 from datetime import datetime
 
+# Add project paths for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from lanterne_rouge.doc_cache import write_if_changed
+
 
 def load_tdf_points():
     """Load the TDF points data from the output file."""
@@ -43,12 +51,12 @@ def format_date(date_str):
 
 
 def update_stage_file(stage_num, stage_data, total_points_at_stage):
-    """Update a stage markdown file with actual data."""
+    """Update a stage markdown file with actual data; returns True if it was rewritten."""
     stage_file = Path(f"docs_src/tdf-simulation/stages/stage{stage_num}.md")
     
     if not stage_file.exists():
         print(f"Warning: {stage_file} not found")
-        return
+        return False
     
     # Read the current file
     with open(stage_file, 'r') as f:
@@ -139,29 +147,32 @@ def update_stage_file(stage_num, stage_data, total_points_at_stage):
     if re.search(pattern, content, re.DOTALL):
         content = re.sub(pattern, replacement_completed, content, flags=re.DOTALL)
         
-        # Write the updated content back
-        with open(stage_file, 'w') as f:
-            f.write(content)
+        # Write the updated content back (unless nothing changed)
+        if not write_if_changed(stage_file, content):
+            return False
         
         print(f"✅ Updated Stage {stage_num} with actual data")
+        return True
     else:
         print(f"⚠️  Could not find completed section pattern in Stage {stage_num}")
         # Debug: show what we're looking for
         print(f"   Looking for pattern starting with: {stage_emoji} **Stage Type:**")
+        return False
 
 
 def main():
-    """Main function to populate all stage files."""
+    """Populate all stage files; returns the number of files rewritten."""
     print("🚴 Populating TDF stage files with actual data from logs...")
     
     # Load the points data
     tdf_data = load_tdf_points()
     if tdf_data is None:
         print("❌ Failed to load TDF points data")
-        return
+        return 0
     
     # Track cumulative points
     running_total = 0
+    updated = 0
     
     # Process stages in order
     stages_by_date = sorted(tdf_data['stages'].items())
@@ -171,11 +182,12 @@ def main():
         running_total += stage_data['points_earned']
         
         print(f"Processing Stage {stage_num}...")
-        update_stage_file(stage_num, stage_data, running_total)
+        updated += update_stage_file(stage_num, stage_data, running_total)
     
     print(f"\n🎉 Completed updating {len(stages_by_date)} stage files!")
     print(f"📊 Total points in simulation: {tdf_data['total_points']}")
     print(f"🏁 Stages completed: {tdf_data['stages_completed']}/21")
+    return updated
 
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Run the morning or evening pipeline for every athlete of a club.
+
+Each athlete in the roster (see config/athletes.example.toml) runs with
+their own credentials, mission, database and output directory, so a whole
+club is served from one deployment. Athletes are processed concurrently on a
+bounded worker pool; one athlete's failure doesn't stop the others.
+
+The docs site (docs_src/) belongs to the single-athlete setup, so club runs
+skip the docs task.
+
+Usage:
+    python scripts/run_club.py morning
+    python scripts/run_club.py evening --roster config/athletes.toml --workers 8
+    python scripts/run_club.py evening --athlete alice
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add project paths for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from dotenv import load_dotenv
+
+from lanterne_rouge.athlete import load_roster, run_athletes
+from lanterne_rouge.pipeline import PipelineCache
+from lanterne_rouge.workflow import WorkflowContext
+from scripts.run_pipeline import build_pipeline
+
+DEFAULT_ROSTER = Path("config/athletes.toml")
+
+# Per-athlete tasks (what they depend on runs too)
+CLUB_TASKS = {
+    "morning": ("briefing", "notify"),
+    "evening": ("check", "fiction"),
+}
+
+
+def run_for_athlete(name, athlete, use_cache=True):
+    """Run one pipeline for one athlete (who is active while it runs)."""
+    pipeline = build_pipeline(name, cache=PipelineCache() if use_cache else None, scope=athlete.athlete_id)
+    context = WorkflowContext(athlete=athlete)
+    try:
+        report = pipeline.run(context, targets=CLUB_TASKS[name])
+    finally:
+        context.close()
+    print(f"[{athlete.athlete_id}] {report.format()}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a Lanterne Rouge pipeline for every athlete of a club")
+    parser.add_argument("pipeline", choices=tuple(CLUB_TASKS), help="Pipeline to run")
+    parser.add_argument("--roster", default=str(DEFAULT_ROSTER), help="Club roster TOML")
+    parser.add_argument("--athlete", action="append", metavar="ID", help="Only these athletes (repeatable)")
+    parser.add_argument("--workers", type=int, default=4, help="Athletes processed at the same time")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor store cached outputs")
+    args = parser.parse_args()
+
+    load_dotenv()
+    athletes = load_roster(args.roster)
+    if args.athlete:
+        unknown = set(args.athlete) - {athlete.athlete_id for athlete in athletes}
+        if unknown:
+            parser.error(f"not in {args.roster}: {', '.join(sorted(unknown))}")
+        athletes = [athlete for athlete in athletes if athlete.athlete_id in args.athlete]
+    os.makedirs("output", exist_ok=True)
+
+    print(f"🚴 Running {args.pipeline} for {len(athletes)} athletes ({args.workers} at a time)")
+    results = run_athletes(athletes, lambda athlete: run_for_athlete(args.pipeline, athlete, not args.no_cache),
+                           max_workers=args.workers)
+    failed = [result.athlete_id for result in results if not result.ok]
+    print(f"🏁 {len(results) - len(failed)}/{len(results)} athletes ok" +
+          (f"; failed: {', '.join(failed)}" if failed else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,17 +16,23 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
+from lanterne_rouge.athlete import current_athlete
 from lanterne_rouge.fiction_mode.pipeline import FictionModeOrchestrator, FictionModeConfig
 from lanterne_rouge.fiction_mode.delivery import DeliveryOptions
 
+NARRATIVES_URL = ("https://github.com/alponsirenas/lanterne-rouge/blob/main/"
+                  "docs_src/tdf-simulation/tdf-2025-hallucinations")
+
 
 def run_fiction_mode(activity_id: Optional[int] = None,
                     stage_number: Optional[int] = None,
                     style: str = 'krabbe',
                     format: str = 'markdown',
                     user_feedback: Optional[str] = None,
-                    preview_only: bool = False):
-    """Run Fiction Mode pipeline"""
+                    preview_only: bool = False,
+                    stream: bool = False,
+                    force: bool = False):
+    """Run Fiction Mode pipeline (``force`` replaces an existing narrative for the stage)"""
     
     # Handle auto-latest mode
     if activity_id is None and stage_number is None:
@@ -80,12 +86,12 @@ def run_fiction_mode(activity_id: Optional[int] = None,
             return 1
     
     # Check if narrative already exists (for manual runs)
-    if stage_number:
+    if stage_number and not force:
         sys.path.insert(0, str(project_root))
         from scripts.utils.fiction_mode_utils import narrative_already_exists
         if narrative_already_exists(stage_number):
             print(f"⚠️  Narrative already exists for stage {stage_number}")
-            print("   Use --force to overwrite (not implemented yet)")
+            print("   Use --force to overwrite")
             return 0
     
     # Configure Fiction Mode
@@ -94,7 +100,8 @@ def run_fiction_mode(activity_id: Optional[int] = None,
         delivery_format=format,
         include_metadata=True,
         save_to_archive=True,
-        auto_detect_stage=True
+        auto_detect_stage=True,
+        stream_output=stream
     )
     
     # Initialize orchestrator
@@ -157,6 +164,29 @@ def run_fiction_mode(activity_id: Optional[int] = None,
     return 0
 
 
+def send_fiction_notification(stage_number: int) -> bool:
+    """Email the athlete that the stage's narrative is ready; False without a recipient or narrative."""
+    from scripts.notify import send_email
+
+    athlete = current_athlete()
+    recipient = athlete.env("TO_EMAIL")
+    stage_file = athlete.narratives_dir / f"stage{stage_number}.md"
+    if not recipient:
+        return False
+    if not stage_file.exists():
+        print(f"⚠️  No narrative file found for Stage {stage_number}")
+        return False
+
+    narrative = stage_file.read_text(encoding="utf-8")
+    subject = f"🎭 Your TDF Stage {stage_number} Fiction Mode Narrative is Ready!"
+    body = f"Your cycling narrative for Stage {stage_number} has been generated!\n\n{narrative[:500]}..."
+    if athlete.is_default:
+        body += f"\n\nView the full narrative at: {NARRATIVES_URL}/stage{stage_number}.md"
+    send_email(subject, body, recipient)
+    print(f"📧 Fiction mode notification sent for Stage {stage_number}!")
+    return True
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate Fiction Mode cycling narratives")
     
@@ -178,6 +208,10 @@ def main():
                        help='Preview analysis without generating narrative')
     parser.add_argument('--list-styles', action='store_true',
                        help='List available narrative styles')
+    parser.add_argument('--stream', action='store_true',
+                       help='Stream the narrative to the console and archive as it is written')
+    parser.add_argument('--force', action='store_true',
+                       help='Replace the stage\'s existing narrative (e.g. to re-write it in another style)')
     
     args = parser.parse_args()
     
@@ -205,7 +239,8 @@ def main():
             style=args.style,
             format=args.format,
             user_feedback=args.feedback,
-            preview_only=args.preview
+            preview_only=args.preview,
+            stream=args.stream
         )
     
     return run_fiction_mode(
@@ -214,7 +249,9 @@ def main():
         style=args.style,
         format=args.format,
         user_feedback=args.feedback,
-        preview_only=args.preview
+        preview_only=args.preview,
+        stream=args.stream,
+        force=args.force
     )
 
 
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Run the morning or evening TDF job as one cached pipeline.
+
+Replaces the script chain in the GitHub Actions workflows
+(morning_tdf_briefing.py then integrate_tdf_docs.py; evening_tdf_check.py then
+integrate_tdf_docs.py and run_fiction_mode.py). Each task declares what it
+consumes, independent tasks run concurrently, and task outputs are cached in
+memory/lanterne.db by input hash, so a re-run skips everything whose inputs
+didn't change. The activity pipeline is the evening job for one known
+activity (pushed by the Strava webhook, see serve.py --webhook): it fetches
+exactly that activity instead of polling the recent ones.
+
+Usage:
+    python scripts/run_pipeline.py morning
+    python scripts/run_pipeline.py evening
+    python scripts/run_pipeline.py activity --activity-id 12345678901
+    python scripts/run_pipeline.py morning --only briefing
+    python scripts/run_pipeline.py morning --force
+    python scripts/run_pipeline.py morning --list
+    python scripts/run_pipeline.py --clear-cache
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+from functools import partial
+from pathlib import Path
+
+# Add project paths for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from dotenv import load_dotenv
+
+from lanterne_rouge.pipeline import Pipeline, PipelineCache, Task, file_fingerprint
+from lanterne_rouge.workflow import WorkflowContext
+
+MISSION_PATH = Path("missions/tdf_sim_2025.toml")
+
+
+def _today(context):
+    return date.today().isoformat()
+
+
+def _points_file(context):
+    return file_fingerprint(context.tracker.data_file)
+
+
+# --- morning ---------------------------------------------------------------
+
+def fetch_metrics(context):
+    """Readiness and CTL/ATL/TSB, fetched concurrently (never cached: sources may update)."""
+    from lanterne_rouge.morning_metrics import gather_morning_metrics
+
+    gathered = gather_morning_metrics(sources=("oura", "strava"))
+    print(gathered.format())
+    return gathered.as_metrics()
+
+
+def load_points(context):
+    """Current TDF points status, read once for the briefing and the docs."""
+    return context.tracker.get_points_status()
+
+
+def write_briefing(context, metrics, points):
+    """Decide the ride mode and write the morning briefing."""
+    from scripts.morning_tdf_briefing import generate_briefing, save_briefing
+
+    briefing = generate_briefing(metrics, context.mission_cfg, points)
+    if briefing.startswith("Error generating TDF briefing"):
+        raise RuntimeError(briefing)  # not cached, so a re-run tries again
+    save_briefing(briefing)
+    return briefing
+
+
+def notify_briefing(context, briefing):
+    """Send the briefing; cached, so an unchanged briefing isn't sent twice."""
+    from scripts.morning_tdf_briefing import send_briefing_notifications
+
+    send_briefing_notifications(briefing)
+    return True
+
+
+def update_docs(context, **upstream):
+    """Refresh the stage tabs, status section and navigation."""
+    from scripts.integrate_tdf_docs import main as update_tdf_docs
+
+    update_tdf_docs(mission_cfg=context.mission_cfg, tracker=context.tracker)
+    return True
+
+
+# --- evening ---------------------------------------------------------------
+
+def check_stage_completion(context):
+    """Detect and score today's stage; returns the points status afterwards."""
+    from scripts.evening_tdf_check import main as evening_check
+
+    evening_check(mission_cfg=context.mission_cfg, tracker=context.tracker, update_docs=False)
+    return context.tracker.get_points_status()
+
+
+def _new_narrative(stage, write):
+    """Run ``write`` and report whether it added the stage's narrative."""
+    from scripts.utils.fiction_mode_utils import narrative_already_exists
+
+    existed = bool(stage) and narrative_already_exists(stage)
+    exit_code = write()
+    if exit_code:
+        raise RuntimeError(f"Fiction Mode exited with {exit_code}")
+    return {"stage": stage, "new": bool(stage) and not existed and narrative_already_exists(stage)}
+
+
+def generate_fiction(context, check):
+    """Write the Fiction Mode narrative for the latest completed stage, if it is missing."""
+    from scripts.run_fiction_mode import run_fiction_mode
+
+    return _new_narrative(check["stages_completed"], run_fiction_mode)
+
+
+def notify_fiction(context, fiction):
+    """Email that a new narrative is ready; cached, so it is sent once."""
+    from scripts.run_fiction_mode import send_fiction_notification
+
+    if not fiction or not fiction["new"]:
+        return False
+    return send_fiction_notification(fiction["stage"])
+
+
+# --- activity (webhook) ----------------------------------------------------
+
+def fetch_activity(context, activity_id, owner_id=None):
+    """
+    Fetch exactly the pushed activity (one API call, no polling).
+
+    Strava doesn't sign webhook events, so anyone could announce any public
+    activity: it is only returned if it belongs to the athlete whose token
+    fetched it (and who the event named as its owner); otherwise None.
+    """
+    from lanterne_rouge.strava_api import get_athlete_id, strava_get
+
+    activity = strava_get(f"activities/{activity_id}")
+    if not activity:
+        raise RuntimeError(f"Could not fetch Strava activity {activity_id}")
+    athlete_id = (activity.get("athlete") or {}).get("id")
+    if athlete_id is None or athlete_id != get_athlete_id() or (owner_id is not None and athlete_id != owner_id):
+        print(f"❌ Activity {activity_id} doesn't belong to this athlete; ignored")
+        return None
+    return activity
+
+
+def check_activity(context, activity):
+    """Score the activity as today's stage; returns the stage number (None if not a stage)."""
+    from scripts.evening_tdf_check import main as evening_check
+
+    if activity is None:
+        return None
+    return evening_check(mission_cfg=context.mission_cfg, tracker=context.tracker,
+                         update_docs=False, activity=activity)
+
+
+def generate_activity_fiction(context, check, activity_id):
+    """Write the Fiction Mode narrative for the stage the activity completed."""
+    from scripts.run_fiction_mode import run_fiction_mode
+
+    if check is None:
+        return None
+    return _new_narrative(check, partial(run_fiction_mode, activity_id=activity_id, stage_number=check))
+
+
+def build_pipeline(name, cache=None, scope=None, activity_id=None, owner_id=None):
+    """
+    The named pipeline's task graph.
+
+    Args:
+        name: ``"morning"``, ``"evening"`` or ``"activity"``.
+        cache: PipelineCache for task outputs (None disables caching).
+        scope: Prefix for the cache entries, e.g. a mission id, so several
+            athletes served by one daemon don't share cached outputs.
+        activity_id: The Strava activity the ``"activity"`` pipeline processes.
+        owner_id: The athlete the webhook event named as the activity's owner.
+    """
+    if name == "morning":
+        tasks = [
+            Task("metrics", fetch_metrics, cache=False),
+            Task("points", load_points, inputs=_points_file),
+            Task("briefing", write_briefing, deps=("metrics", "points"), inputs=_today),
+            Task("notify", notify_briefing, deps=("briefing",)),
+            Task("docs", update_docs, deps=("briefing", "points"), inputs=_today, required=False),
+        ]
+    elif name == "evening":
+        tasks = [
+            Task("check", check_stage_completion, cache=False),
+            Task("docs", update_docs, deps=("check",), inputs=_today, required=False),
+            Task("fiction", generate_fiction, deps=("check",), required=False),
+            Task("notify_fiction", notify_fiction, deps=("fiction",), required=False),
+        ]
+    elif name == "activity":
+        if activity_id is None:
+            raise ValueError("The activity pipeline needs an activity_id")
+        tasks = [
+            Task("fetch", partial(fetch_activity, activity_id=activity_id, owner_id=owner_id), cache=False),
+            Task("check", check_activity, deps=("fetch",), cache=False),
+            Task("docs", update_docs, deps=("check",), inputs=_today, required=False),
+            Task("fiction", partial(generate_activity_fiction, activity_id=activity_id), deps=("check",),
+                 inputs=lambda context: activity_id, required=False),
+            Task("notify_fiction", notify_fiction, deps=("fiction",), required=False),
+        ]
+    else:
+        raise ValueError(f"Unknown pipeline: {name}")
+    return Pipeline(f"{scope}:{name}" if scope else name, tasks, cache=cache)
+
+
+PIPELINES = ("morning", "evening", "activity")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a Lanterne Rouge pipeline")
+    parser.add_argument("pipeline", nargs="?", choices=PIPELINES, help="Pipeline to run")
+    parser.add_argument("--activity-id", type=int, help="Strava activity for the activity pipeline")
+    parser.add_argument("--only", action="append", metavar="TASK",
+                        help="Run only this task and what it depends on (repeatable)")
+    parser.add_argument("--force", action="store_true", help="Ignore cached outputs")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor store cached outputs")
+    parser.add_argument("--list", action="store_true", help="List the pipeline's tasks and exit")
+    parser.add_argument("--clear-cache", action="store_true", help="Forget cached outputs and exit")
+    args = parser.parse_args()
+
+    if args.clear_cache:
+        removed = PipelineCache().clear(args.pipeline)
+        print(f"🧹 Cleared {removed} cached task outputs")
+        return 0
+    if not args.pipeline:
+        parser.error("a pipeline is required")
+    if args.pipeline == "activity" and args.activity_id is None:
+        parser.error("the activity pipeline requires --activity-id")
+
+    if args.list:
+        for task in build_pipeline(args.pipeline, activity_id=args.activity_id).tasks.values():
+            deps = f" ← {', '.join(task.deps)}" if task.deps else ""
+            flags = "" if task.cache else " (not cached)"
+            print(f"{task.name}{deps}{flags}")
+        return 0
+
+    load_dotenv()
+    os.makedirs("output", exist_ok=True)
+    pipeline = build_pipeline(args.pipeline, cache=None if args.no_cache else PipelineCache(),
+                              activity_id=args.activity_id)
+    context = WorkflowContext(MISSION_PATH)
+    try:
+        report = pipeline.run(context, targets=args.only, force=args.force)
+    finally:
+        context.close()
+    print(report.format())
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Run Lanterne Rouge as a long-lived daemon.
+
+Schedules the morning and evening pipelines (see run_pipeline.py) for one
+mission, or for every athlete of a club roster (see run_club.py), on the
+athlete's local clock, keeps mission config, tracker, HTTP session and LLM
+client warm between runs, and serves a health endpoint. Each roster athlete
+runs with their own credentials, database and output directory.
+
+With --webhook the daemon also receives Strava's activity events on /webhook
+and runs the activity pipeline for each new activity as soon as it is
+uploaded; the evening polling then shrinks to one late safety run. A
+webhook server is public, so POST /jobs/... then needs LANTERNE_JOBS_TOKEN
+(sent as a bearer token).
+
+Usage:
+    python scripts/serve.py
+    python scripts/serve.py --mission missions/tdf_sim_2025.toml --port 8080
+    python scripts/serve.py --roster config/athletes.toml --workers 4
+    python scripts/serve.py --morning 06:00 --evening 15:00,18:00,21:00,23:00
+    curl http://127.0.0.1:8080/health
+    curl -X POST http://127.0.0.1:8080/jobs/tdf-sim-2025:evening/run
+    LANTERNE_JOBS_TOKEN=secret python scripts/serve.py --webhook --host 0.0.0.0
+    curl -X POST -H "Authorization: Bearer secret" http://127.0.0.1:8080/jobs/tdf-sim-2025:evening/run
+    python scripts/strava_webhook.py post 12345678901
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project paths for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from dotenv import load_dotenv
+
+from lanterne_rouge.athlete import load_roster
+from lanterne_rouge.daemon import ScheduledJob, parse_times, serve
+from lanterne_rouge.pipeline import PipelineCache
+from lanterne_rouge.strava_webhook import ActivityProcessor, StravaWebhook
+from lanterne_rouge.workflow import WorkflowContext
+from scripts.run_club import CLUB_TASKS
+from scripts.run_pipeline import build_pipeline
+
+# Local times mirroring the GitHub Actions schedules (6AM; 3, 6, 9 and 11PM)
+DEFAULT_MORNING = "06:00"
+DEFAULT_EVENING = "15:00,18:00,21:00,23:00"
+# With the webhook, the evening poll only catches events that never arrived
+WEBHOOK_EVENING = "23:00"
+
+# One pipeline at a time per athlete: scheduled jobs and webhook runs share their tracker
+_athlete_locks = {}
+
+
+def _athlete_lock(scope):
+    return _athlete_locks.setdefault(scope, threading.Lock())
+
+
+def _scope(context):
+    """The athlete's id for roster athletes, else the mission id (names jobs and cache entries)."""
+    athlete = context.athlete
+    return context.mission_cfg.id if athlete is None or athlete.is_default else athlete.athlete_id
+
+
+def _targets(context, name):
+    """Tasks to run: everything, except that club athletes skip the single-athlete docs site."""
+    athlete = context.athlete
+    if athlete is None or athlete.is_default:
+        return None
+    return CLUB_TASKS["evening" if name == "activity" else name]
+
+
+def _pipeline_job(name, context, cache):
+    """A job that runs one pipeline with the athlete's long-lived context."""
+    scope = _scope(context)
+
+    def run():
+        with _athlete_lock(scope):
+            report = build_pipeline(name, cache=cache, scope=scope).run(context, targets=_targets(context, name))
+        print(report.format())
+        return report
+    return run
+
+
+def _warm(context):
+    """Load what every run needs up front, so the first job doesn't pay for it."""
+    from lanterne_rouge import ai_clients, tour_coach  # noqa: F401  (import cost only)
+
+    context.mission_cfg
+    context.tracker
+    ai_clients.get_llm_backend()
+
+
+def build_contexts(mission_path=None, roster=None):
+    """
+    The long-lived context of every athlete served.
+
+    Several athletes need a roster: each ``AthleteContext`` keeps their
+    points, briefings, tokens and database apart. Contexts for several
+    missions of the single-athlete layout would share all of those.
+    """
+    if roster is not None:
+        return [WorkflowContext(athlete=athlete) for athlete in load_roster(roster)]
+    return [WorkflowContext(Path(mission_path))]
+
+
+def build_jobs(contexts, morning_times, evening_times):
+    """One morning and one evening job per athlete."""
+    cache = PipelineCache()
+    jobs = []
+    for context in contexts:
+        _warm(context)
+        timezone = context.mission_cfg.athlete.timezone
+        scope = _scope(context)
+        for name, times in (("morning", morning_times), ("evening", evening_times)):
+            jobs.append(ScheduledJob(f"{scope}:{name}", _pipeline_job(name, context, cache), times, timezone))
+    return jobs
+
+
+def build_webhook(contexts, cache=None):
+    """
+    A Strava webhook that runs the activity pipeline for the athlete who uploaded.
+
+    Events are routed by ``[athlete] strava_id``; a single mission without
+    one receives every event.
+    """
+    by_owner = {ctx.mission_cfg.athlete.strava_id: ctx for ctx in contexts
+                if ctx.mission_cfg.athlete.strava_id is not None}
+    default = contexts[0] if len(contexts) == 1 else None
+    cache = cache if cache is not None else PipelineCache()
+
+    def handle(event):
+        context = by_owner.get(event.owner_id, default)
+        if context is None:
+            raise LookupError(f"No mission for Strava athlete {event.owner_id}")
+        scope = _scope(context)
+        with _athlete_lock(scope):
+            pipeline = build_pipeline("activity", cache=cache, scope=scope,
+                                      activity_id=event.activity_id, owner_id=event.owner_id)
+            report = pipeline.run(context, targets=_targets(context, "activity"))
+        print(report.format())
+        return report
+
+    owner_ids = list(by_owner) if default is None else None
+    return StravaWebhook(ActivityProcessor(handle), owner_ids=owner_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Lanterne Rouge daemon")
+    parser.add_argument("--mission", action="append", metavar="TOML",
+                        help="Mission config to serve (default: missions/tdf_sim_2025.toml)")
+    parser.add_argument("--roster", metavar="TOML",
+                        help="Serve every athlete of a club roster instead (e.g. config/athletes.toml)")
+    parser.add_argument("--morning", default=DEFAULT_MORNING, help="Local morning run times, comma separated")
+    parser.add_argument("--evening", help=f"Local evening run times, comma separated (default: {DEFAULT_EVENING}, "
+                                          f"or {WEBHOOK_EVENING} with --webhook)")
+    parser.add_argument("--host", default=os.getenv("LANTERNE_HOST", "127.0.0.1"), help="Health endpoint host")
+    parser.add_argument("--port", type=int, default=int(os.getenv("LANTERNE_PORT", "8080")),
+                        help="Health endpoint port")
+    parser.add_argument("--workers", type=int, default=2, help="Jobs that may run at the same time")
+    parser.add_argument("--webhook", action="store_true",
+                        help="Receive Strava activity events on /webhook (needs STRAVA_WEBHOOK_VERIFY_TOKEN)")
+    args = parser.parse_args()
+    if args.mission and (len(args.mission) > 1 or args.roster):
+        # Missions of the single-athlete layout share its points, briefings, tokens and database
+        parser.error("serve several athletes with --roster, not several --mission")
+    evening = args.evening or (WEBHOOK_EVENING if args.webhook else DEFAULT_EVENING)
+
+    # The pipelines read and write output/ and docs_src/ relative to the repository
+    os.chdir(project_root)
+    load_dotenv()
+    os.makedirs("output", exist_ok=True)
+
+    contexts = build_contexts((args.mission or ["missions/tdf_sim_2025.toml"])[0], args.roster)
+    jobs = build_jobs(contexts, parse_times(args.morning.split(",")), parse_times(evening.split(",")))
+    webhook = build_webhook(contexts) if args.webhook else None
+    if webhook is not None and not webhook.verify_token:
+        print("⚠️  STRAVA_WEBHOOK_VERIFY_TOKEN is not set: Strava can't validate the subscription")
+
+    # The jobs use date.today(): follow the athletes' clock when they share one
+    zones = {job.timezone for job in jobs}
+    if len(zones) == 1 and hasattr(time, "tzset"):
+        os.environ["TZ"] = zones.pop()
+        time.tzset()
+    elif len(zones) > 1:
+        print(f"⚠️  Athletes in several timezones ({', '.join(sorted(zones))}); dates follow the server clock")
+
+    def close_contexts():
+        for context in contexts:
+            context.close()
+
+    serve(jobs, host=args.host, port=args.port, max_workers=args.workers, on_stop=close_contexts,
+          webhook=webhook, jobs_token=os.getenv("LANTERNE_JOBS_TOKEN"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Manage the Strava webhook subscription and send test events.
+
+The receiver itself runs in the daemon (python scripts/serve.py --webhook).
+Strava allows one subscription per application; its callback URL must be
+reachable from the internet and answer the validation handshake with the
+same STRAVA_WEBHOOK_VERIFY_TOKEN the daemon uses.
+
+Usage:
+    python scripts/strava_webhook.py post 12345678901
+    python scripts/strava_webhook.py post 12345678901 --url http://127.0.0.1:8080/webhook --owner 1234567
+    python scripts/strava_webhook.py subscribe https://example.org/webhook
+    python scripts/strava_webhook.py list
+    python scripts/strava_webhook.py unsubscribe 123456
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add project paths for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from dotenv import load_dotenv
+
+from lanterne_rouge.strava_webhook import post_test_event
+
+SUBSCRIPTIONS_URL = "https://www.strava.com/api/v3/push_subscriptions"
+
+
+def _client_credentials():
+    client_id, client_secret = os.getenv("STRAVA_CLIENT_ID"), os.getenv("STRAVA_CLIENT_SECRET")
+    if not client_id or not client_secret:
+        raise RuntimeError("STRAVA_CLIENT_ID and STRAVA_CLIENT_SECRET must be set")
+    return {"client_id": client_id, "client_secret": client_secret}
+
+
+def subscribe(callback_url):
+    """Create the application's subscription; Strava validates the callback before replying."""
+    import requests
+
+    verify_token = os.getenv("STRAVA_WEBHOOK_VERIFY_TOKEN")
+    if not verify_token:
+        raise RuntimeError("STRAVA_WEBHOOK_VERIFY_TOKEN must be set")
+    response = requests.post(SUBSCRIPTIONS_URL, timeout=30, data={
+        **_client_credentials(), "callback_url": callback_url, "verify_token": verify_token})
+    response.raise_for_status()
+    return response.json()
+
+
+def list_subscriptions():
+    """The application's current subscriptions."""
+    import requests
+
+    response = requests.get(SUBSCRIPTIONS_URL, params=_client_credentials(), timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def unsubscribe(subscription_id):
+    """Delete a subscription."""
+    import requests
+
+    response = requests.delete(f"{SUBSCRIPTIONS_URL}/{subscription_id}", params=_client_credentials(),
+                               timeout=10)
+    response.raise_for_status()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Strava webhook tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    post = commands.add_parser("post", help="Send a Strava-format event to a local receiver")
+    post.add_argument("activity_id", type=int, help="Strava activity id")
+    post.add_argument("--url", default=f"http://127.0.0.1:{os.getenv('LANTERNE_PORT', '8080')}/webhook",
+                      help="Receiver URL")
+    post.add_argument("--owner", type=int, default=int(os.getenv("STRAVA_ATHLETE_ID", "0") or 0),
+                      help="Strava athlete id of the owner (default: STRAVA_ATHLETE_ID)")
+    post.add_argument("--aspect", default="create", choices=("create", "update", "delete"),
+                      help="Event aspect type")
+
+    sub = commands.add_parser("subscribe", help="Subscribe the application to Strava events")
+    sub.add_argument("callback_url", help="Public URL of the daemon's /webhook")
+    commands.add_parser("list", help="List the application's subscriptions")
+    unsub = commands.add_parser("unsubscribe", help="Delete a subscription")
+    unsub.add_argument("subscription_id", type=int)
+
+    load_dotenv()
+    args = parser.parse_args()
+    try:
+        if args.command == "post":
+            reply = post_test_event(args.url, args.activity_id, args.owner, aspect_type=args.aspect)
+            print(f"📨 {json.dumps(reply)}")
+        elif args.command == "subscribe":
+            print(f"✅ Subscribed: {json.dumps(subscribe(args.callback_url))}")
+        elif args.command == "list":
+            print(json.dumps(list_subscriptions(), indent=2))
+        else:
+            unsubscribe(args.subscription_id)
+            print(f"🗑️  Deleted subscription {args.subscription_id}")
+    except Exception as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,6 @@ This script helps identify discrepancies between our implementation and referenc
 
 import sys
 import os
-import json
 import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -145,31 +144,19 @@ def run_manual_calculation(activities_source="strava", csv_path=None, target_dat
     return ctl, atl, tsb
 
 def check_memory_db():
-    """Check the recent observations in the memory database."""
+    """Check the recent daily CTL/ATL/TSB values in the memory database."""
     print("=== CHECKING MEMORY DATABASE ===")
     try:
-        import sqlite3
-        from pathlib import Path
+        from lanterne_rouge.daily_metrics import DailyMetricsStore
 
-        db_path = Path(__file__).resolve().parents[1] / "memory" / "lanterne.db"
-        if not db_path.exists():
-            print(f"Memory database not found at {db_path}")
+        recent = DailyMetricsStore().frame(columns=["tss", "ctl", "atl", "tsb"]).dropna(how="all").tail(5)
+        if recent.empty:
+            print("No daily metrics recorded yet (run scripts/utils/manage_memory_db.py backfill-metrics)")
             return
 
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-
-        # Get recent observations
-        cursor = conn.execute(
-            "SELECT timestamp, type, data FROM memory WHERE type='observation' ORDER BY timestamp DESC LIMIT 5"
-        )
-
-        print("Recent observations in memory database:")
-        for row in cursor:
-            data = json.loads(row["data"])
-            print(f"{row['timestamp']}: CTL={data.get('ctl')}, ATL={data.get('atl')}, TSB={data.get('tsb')}")
-
-        conn.close()
+        print("Recent daily metrics in memory database:")
+        for day, row in recent.iloc[::-1].iterrows():
+            print(f"{day:%Y-%m-%d}: TSS={row['tss']}, CTL={row['ctl']}, ATL={row['atl']}, TSB={row['tsb']}")
 
     except Exception as e:
         print(f"Error checking memory database: {e}")
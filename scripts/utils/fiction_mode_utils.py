@@ -4,12 +4,13 @@ Fiction Mode Utilities - Helper functions for narrative management
 """
 
 import json
-from pathlib import Path
 from typing import Optional
 
+from lanterne_rouge.athlete import current_athlete
+
 def get_latest_completed_stage() -> Optional[dict]:
-    """Get the most recently completed stage from TDF points data"""
-    points_file = Path("output/tdf_points.json")
+    """Get the most recently completed stage from the active athlete's TDF points data"""
+    points_file = current_athlete().tdf_points_file
     
     if not points_file.exists():
         return None
@@ -46,12 +47,12 @@ def get_latest_completed_stage() -> Optional[dict]:
 
 def narrative_already_exists(stage_number: int) -> bool:
     """Check if a narrative already exists for the given stage number"""
-    narrative_file = Path(f"docs_src/tdf-simulation/tdf-2025-hallucinations/stage{stage_number}.md")
+    narrative_file = current_athlete().narratives_dir / f"stage{stage_number}.md"
     return narrative_file.exists()
 
 def list_existing_narratives() -> list:
     """List all existing narrative files"""
-    fiction_dir = Path("docs_src/tdf-simulation/tdf-2025-hallucinations")
+    fiction_dir = current_athlete().narratives_dir
     if not fiction_dir.exists():
         return []
     
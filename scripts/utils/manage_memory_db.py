@@ -135,6 +135,21 @@ def update_latest_observation(ctl=None, atl=None, tsb=None):
     finally:
         conn.close()
 
+def backfill_metrics():
+    """Migrate observations, decisions and CSV logs into the daily metrics table."""
+    from lanterne_rouge.daily_metrics import DailyMetricsStore, backfill_daily_metrics
+
+    store = DailyMetricsStore()
+    rows = backfill_daily_metrics(store)
+    print(f"✅ Merged {rows} legacy entries into daily metrics ({len(store.frame())} days)")
+
+def export_metrics(path, start=None, end=None):
+    """Export a range of daily metrics to Parquet or Arrow."""
+    from lanterne_rouge.daily_metrics import DailyMetricsStore
+
+    written = DailyMetricsStore().export(path, start, end)
+    print(f"✅ Daily metrics exported to {written}")
+
 def main():
     """Parse command line arguments and run the appropriate function."""
     import argparse
@@ -158,6 +173,13 @@ def main():
     update_parser.add_argument("--atl", type=float, help="New ATL value")
     update_parser.add_argument("--tsb", type=float, help="New TSB value")
 
+    # Daily metrics table
+    subparsers.add_parser("backfill-metrics", help="Migrate legacy logs into the daily metrics table")
+    export_parser = subparsers.add_parser("export-metrics", help="Export daily metrics to .parquet/.arrow")
+    export_parser.add_argument("path", help="Output file (.parquet, .arrow or .feather)")
+    export_parser.add_argument("--start", help="First day (YYYY-MM-DD)")
+    export_parser.add_argument("--end", help="Last day (YYYY-MM-DD)")
+
     args = parser.parse_args()
 
     if args.command == "show":
@@ -166,6 +188,10 @@ def main():
         reset_database(args.force)
     elif args.command == "update":
         update_latest_observation(args.ctl, args.atl, args.tsb)
+    elif args.command == "backfill-metrics":
+        backfill_metrics()
+    elif args.command == "export-metrics":
+        export_metrics(args.path, args.start, args.end)
     else:
         # Default to showing everything
         show_db_contents()
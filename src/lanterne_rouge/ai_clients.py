@@ -3,10 +3,15 @@ Communication Agent and AI client interfaces for Lanterne Rouge.
 
 This module provides utilities for interacting with AI models like OpenAI,
 generating empathetic summaries, and handling structured output.
+
+All chat completions go through a pluggable ``LLMBackend``. The default backend
+talks to the OpenAI API; set ``LLM_BACKEND=stub`` (or call ``set_llm_backend``)
+to use the local stand-in from ``llm_stub`` for offline runs and load tests.
 """
 import os
 import json
-from typing import Dict, Any
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional
 from datetime import date
 
 import openai
@@ -176,6 +181,163 @@ def parse_llm_list(raw_response: str) -> list[str]:
     return [line for line in lines if line]
 
 
+class LLMBackend:
+    """Interface for chat completion backends used by ``call_llm``.
+
+    Backends raise on transport or API errors; ``call_llm`` and
+    ``call_llm_stream`` turn those into their usual fallback text.
+    """
+
+    name = "base"
+
+    def is_configured(self) -> bool:
+        """Return True if the backend can serve requests (e.g. has credentials)."""
+        return True
+
+    def complete(
+        self,
+        messages: list[dict],
+        model: str,
+        *,
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        force_json: bool = False,
+    ) -> Optional[str]:
+        """Return the assistant's reply for ``messages``."""
+        raise NotImplementedError
+
+    def stream(
+        self,
+        messages: list[dict],
+        model: str,
+        *,
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+    ) -> Iterator[str]:
+        """Yield the reply in fragments. Defaults to a single fragment."""
+        content = self.complete(messages, model, temperature=temperature, max_tokens=max_tokens)
+        if content:
+            yield content
+
+
+class OpenAIBackend(LLMBackend):
+    """Backend for the OpenAI chat completions API.
+
+    Any OpenAI-compatible server (including ``python -m lanterne_rouge.llm_stub``)
+    can be used by pointing ``base_url`` or ``OPENAI_BASE_URL`` at it.
+    """
+
+    name = "openai"
+
+    def __init__(self, api_key: str | None = None, base_url: str | None = None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self._cached_client = None
+        self._cached_key = None
+
+    def _client(self):
+        """The OpenAI client, reused across calls so its connection pool stays warm."""
+        api_key = self.api_key or os.getenv("OPENAI_API_KEY")
+        base_url = self.base_url or os.getenv("OPENAI_BASE_URL")
+        # The client class is part of the key, so a patched or reloaded openai isn't bypassed
+        key = (openai.OpenAI, api_key, base_url)
+        if self._cached_client is None or self._cached_key != key:
+            if base_url:
+                self._cached_client = openai.OpenAI(api_key=api_key, base_url=base_url)
+            else:
+                self._cached_client = openai.OpenAI(api_key=api_key)
+            self._cached_key = key
+        return self._cached_client
+
+    def is_configured(self) -> bool:
+        return bool(self.api_key or os.getenv("OPENAI_API_KEY"))
+
+    def complete(self, messages, model, *, temperature=0.7, max_tokens=512, force_json=False):
+        # Set up request parameters
+        response_kwargs = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+        # Only add response_format for models that explicitly support it
+        if force_json and _model_supports_json(model):
+            response_kwargs["response_format"] = {"type": "json_object"}
+
+        response = self._client().chat.completions.create(**response_kwargs)
+        return response.choices[0].message.content
+
+    def stream(self, messages, model, *, temperature=0.7, max_tokens=512):
+        stream = self._client().chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+
+_backend: Optional[LLMBackend] = None
+
+
+def _backend_from_env() -> LLMBackend:
+    """Build the backend selected by the ``LLM_BACKEND`` environment variable."""
+    choice = os.getenv("LLM_BACKEND", "openai").strip().lower()
+    if choice == "stub":
+        from .llm_stub import StubLLMBackend
+        return StubLLMBackend.from_env()
+    if choice != "openai":
+        print(f"⚠️ Unknown LLM_BACKEND '{choice}', using OpenAI")
+    return OpenAIBackend()
+
+
+def get_llm_backend() -> LLMBackend:
+    """Return the active LLM backend, resolving it from the environment on first use."""
+    global _backend
+    if _backend is None:
+        _backend = _backend_from_env()
+    return _backend
+
+
+def set_llm_backend(backend: Optional[LLMBackend]) -> Optional[LLMBackend]:
+    """
+    Replace the active LLM backend.
+
+    Args:
+        backend: Backend to use for all subsequent calls, or None to re-resolve
+            from ``LLM_BACKEND`` on the next call.
+
+    Returns:
+        The previously active backend (None if it had not been resolved yet).
+    """
+    global _backend
+    previous = _backend
+    _backend = backend
+    return previous
+
+
+@contextmanager
+def use_llm_backend(backend: LLMBackend):
+    """Temporarily route all LLM calls through ``backend``."""
+    previous = set_llm_backend(backend)
+    try:
+        yield backend
+    finally:
+        set_llm_backend(previous)
+
+
+def llm_available() -> bool:
+    """Return True if the active backend is able to serve requests."""
+    return get_llm_backend().is_configured()
+
+
 def call_llm(
     messages: list[dict],
     model: str | None = None,
@@ -185,7 +347,7 @@ def call_llm(
     force_json: bool = False,  # Changed default to False for better compatibility
 ) -> str:
     """
-    Send a chat completion request to the OpenAI API.
+    Send a chat completion request to the active LLM backend.
 
     Args:
         messages: A list of message dicts, each with 'role' ('system', 'user', 'assistant') and 'content'.
@@ -204,25 +366,14 @@ def call_llm(
         # Default to a model that can handle JSON
         model = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
 
-    # Set up request parameters
-    response_kwargs = {
-        "model": model,
-        "messages": messages,
-        "temperature": temperature,
-        "max_tokens": max_tokens,
-    }
-
-    # Only add response_format for models that explicitly support it
-    if force_json and _model_supports_json(model):
-        response_kwargs["response_format"] = {"type": "json_object"}
-
     try:
-        # Use the new OpenAI client API
-        client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = client.chat.completions.create(**response_kwargs)
-
-        # Get the content from the response
-        content = response.choices[0].message.content
+        content = get_llm_backend().complete(
+            messages,
+            model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            force_json=force_json,
+        )
 
         # Handle empty responses
         if content is None or content.strip() == "":
@@ -235,6 +386,83 @@ def call_llm(
         return "- Error: Could not get a response from the LLM."
 
 
+def call_llm_stream(
+    messages: list[dict],
+    model: str | None = None,
+    *,
+    temperature: float = 0.7,
+    max_tokens: int = 512,
+) -> Iterator[str]:
+    """
+    Stream a chat completion from the active LLM backend, yielding text as it arrives.
+
+    This is the streaming counterpart of ``call_llm`` for long free-text
+    completions (narratives, edits) where callers want to show or persist
+    output before the full response is available.
+
+    Args:
+        messages: A list of message dicts, each with 'role' and 'content'.
+        model: The OpenAI model to use. Defaults to the value of the
+            ``OPENAI_MODEL`` environment variable.
+        temperature: Sampling temperature (default 0.7).
+        max_tokens: Maximum number of tokens in the response (default 512).
+
+    Yields:
+        Non-empty content fragments in the order they are received. If the
+        request fails before any content arrives, a single error line matching
+        ``call_llm``'s fallback text is yielded instead.
+    """
+    if model is None:
+        model = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+
+    received_any = False
+    try:
+        stream = get_llm_backend().stream(
+            messages,
+            model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+        for delta in stream:
+            if delta:
+                received_any = True
+                yield delta
+
+        if not received_any:
+            yield "- No valid response received from the model."
+
+    except Exception as e:
+        print(f"❌ OpenAI streaming request failed: {e}")
+        if not received_any:
+            yield "- Error: Could not get a response from the LLM."
+
+
+def collect_stream(chunks: Iterable[str], on_chunk: Callable[[str], None] | None = None) -> str:
+    """
+    Drain a stream of text fragments into a single string.
+
+    Args:
+        chunks: Iterable of text fragments, e.g. from ``call_llm_stream``.
+        on_chunk: Optional callback invoked with every fragment as it arrives,
+            used to echo to the console or append to a file progressively.
+
+    Returns:
+        The concatenated text.
+    """
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        if on_chunk is not None:
+            on_chunk(chunk)
+    return "".join(parts)
+
+
+def print_chunk(chunk: str) -> None:
+    """Echo a streamed fragment to the console without buffering."""
+    print(chunk, end="", flush=True)
+
+
 class CommunicationAgent:
     """Generates natural language summaries of training recommendations."""
 
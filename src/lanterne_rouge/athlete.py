@@ -0,0 +1,273 @@
+"""
+Athlete context: who a run is for, and where their data lives.
+
+Everything used to assume one athlete: one set of Strava tokens, one
+``memory/lanterne.db``, one ``output/tdf_points.json``. An ``AthleteContext``
+bundles an athlete's credentials, mission, database and output paths so one
+deployment can serve a whole club. ``TourCoach``, ``TDFTracker`` and
+``FictionModeOrchestrator`` take one explicitly; code further down the call
+chain (Strava requests, the memory bus, the SQLite stores) follows the
+*active* athlete, set with ``use_athlete`` and carried by a ``ContextVar`` so
+concurrent runs for different athletes never see each other's state.
+Without an active athlete the single-athlete layout is used, unchanged.
+
+``run_athletes`` processes many athletes concurrently on a bounded pool.
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import os
+import threading
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from .strava_api import StravaClient
+
+DEFAULT_ATHLETE = "default"
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Strava credential names; a club member's are read with their env_prefix
+STRAVA_ENV = ("STRAVA_CLIENT_ID", "STRAVA_CLIENT_SECRET", "STRAVA_ACCESS_TOKEN", "STRAVA_REFRESH_TOKEN")
+
+
+@dataclass
+class AthleteContext:
+    """
+    One athlete's identity, credentials and storage locations.
+
+    Attributes:
+        athlete_id: Stable id, also used to scope cached pipeline outputs.
+        mission_path: The athlete's mission TOML.
+        data_dir: Directory holding the athlete's database, outputs, rider
+            profile, narratives and stage summaries. None keeps the
+            single-athlete layout (``memory/lanterne.db``, ``output/``,
+            ``config/rider_profile.json`` and the docs site).
+        env_prefix: Prefix of the athlete's credential environment variables,
+            e.g. ``"ALICE_"`` reads ``ALICE_STRAVA_REFRESH_TOKEN`` and
+            ``ALICE_OURA_TOKEN``. The Strava client id and secret fall back to
+            the unprefixed ones (a club shares one Strava application).
+    """
+    athlete_id: str = DEFAULT_ATHLETE
+    mission_path: Path = Path("missions/tdf_sim_2025.toml")
+    data_dir: Optional[Path] = None
+    env_prefix: str = ""
+    _client: Optional["StravaClient"] = field(default=None, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.mission_path = Path(self.mission_path)
+        if self.data_dir is not None:
+            self.data_dir = Path(self.data_dir)
+
+    @property
+    def is_default(self) -> bool:
+        """True when using the single-athlete layout and credentials."""
+        return self.data_dir is None and not self.env_prefix
+
+    @property
+    def db_file(self) -> Path:
+        """The athlete's SQLite database (memory, stores, caches)."""
+        if self.data_dir is None:
+            from .memory_bus import DB_FILE
+            return DB_FILE
+        return self.data_dir / "lanterne.db"
+
+    @property
+    def output_dir(self) -> Path:
+        """Directory for the athlete's generated files."""
+        return Path("output") if self.data_dir is None else self.data_dir / "output"
+
+    def output_path(self, name: str) -> Path:
+        """A file in ``output_dir``, e.g. ``output_path("tdf_points.json")``."""
+        return self.output_dir / name
+
+    @property
+    def tdf_points_file(self) -> Path:
+        """The athlete's TDF points tracker file."""
+        return self.output_path("tdf_points.json")
+
+    @property
+    def rider_profile_file(self) -> Path:
+        """The athlete's Fiction Mode rider profile."""
+        if self.data_dir is None:
+            return PROJECT_ROOT / "config" / "rider_profile.json"
+        return self.data_dir / "rider_profile.json"
+
+    @property
+    def narratives_dir(self) -> Path:
+        """Where Fiction Mode narratives are archived."""
+        if self.data_dir is None:
+            return Path("docs_src/tdf-simulation/tdf-2025-hallucinations")
+        return self.data_dir / "narratives"
+
+    @property
+    def summaries_dir(self) -> Path:
+        """Where stage completion summaries are written."""
+        if self.data_dir is None:
+            return Path("docs_src/tdf-simulation/stages/completion-summary")
+        return self.data_dir / "summaries"
+
+    @property
+    def token_file(self) -> Path:
+        """Where refreshed Strava tokens are cached."""
+        return Path("tokens.json") if self.data_dir is None else self.data_dir / "tokens.json"
+
+    def env(self, name: str, fallback: bool = False) -> Optional[str]:
+        """The athlete's value of a credential variable (optionally falling back to the shared one)."""
+        value = os.getenv(f"{self.env_prefix}{name}")
+        if value is None and fallback and self.env_prefix:
+            value = os.getenv(name)
+        return value
+
+    @property
+    def oura_token(self) -> Optional[str]:
+        """The athlete's Oura personal access token."""
+        return self.env("OURA_TOKEN")
+
+    def strava_client(self) -> "StravaClient":
+        """The athlete's Strava client, created on first use and kept for the process."""
+        from .strava_api import StravaClient, default_client
+
+        if self.is_default:
+            return default_client()
+        with self._lock:
+            if self._client is None:
+                client_id, client_secret, access_token, refresh_token = (
+                    self.env(name, fallback=name in STRAVA_ENV[:2]) for name in STRAVA_ENV)
+                self._client = StravaClient(client_id, client_secret, access_token, refresh_token,
+                                            token_file=self.token_file)
+            return self._client
+
+    def ensure_dirs(self) -> None:
+        """Create the athlete's data and output directories."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+
+
+_default_athlete = AthleteContext()
+_active: contextvars.ContextVar[Optional[AthleteContext]] = contextvars.ContextVar("athlete", default=None)
+
+
+def current_athlete() -> AthleteContext:
+    """The active athlete, or the single-athlete default."""
+    return _active.get() or _default_athlete
+
+
+@contextmanager
+def use_athlete(athlete: Optional[AthleteContext]) -> Iterator[AthleteContext]:
+    """Make ``athlete`` the active one inside the block (None keeps the current one)."""
+    if athlete is None:
+        yield current_athlete()
+        return
+    token = _active.set(athlete)
+    try:
+        yield athlete
+    finally:
+        _active.reset(token)
+
+
+def as_athlete(method: Callable) -> Callable:
+    """Run a method with its object's ``athlete`` active, so code it calls follows that athlete."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with use_athlete(self.athlete):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def in_context(func: Callable, *args: Any, **kwargs: Any) -> Callable[[], Any]:
+    """
+    ``func`` bound to a copy of the caller's context, for ``executor.submit``.
+
+    Worker threads start with an empty context; without this, tasks handed to
+    a pool would lose the active athlete.
+    """
+    context = contextvars.copy_context()
+    return functools.partial(context.run, func, *args, **kwargs)
+
+
+def load_roster(path: os.PathLike) -> List[AthleteContext]:
+    """
+    Read a club roster TOML::
+
+        [[athlete]]
+        id = "alice"
+        mission = "missions/alice.toml"
+        data_dir = "athletes/alice"     # default: athletes/<id>
+        env_prefix = "ALICE_"           # default: <ID>_
+
+    Raises:
+        ValueError: On a missing id or a duplicate athlete.
+    """
+    path = Path(path)
+    with open(path, "rb") as file_obj:
+        data = tomllib.load(file_obj)
+    athletes, seen = [], set()
+    for entry in data.get("athlete", []):
+        athlete_id = entry.get("id")
+        if not athlete_id:
+            raise ValueError(f"Athlete without an id in {path}")
+        if athlete_id in seen:
+            raise ValueError(f"Duplicate athlete '{athlete_id}' in {path}")
+        seen.add(athlete_id)
+        athletes.append(AthleteContext(
+            athlete_id=athlete_id,
+            mission_path=Path(entry.get("mission", "missions/tdf_sim_2025.toml")),
+            data_dir=Path(entry.get("data_dir", f"athletes/{athlete_id}")),
+            env_prefix=entry.get("env_prefix", f"{athlete_id.upper().replace('-', '_')}_"),
+        ))
+    return athletes
+
+
+@dataclass
+class AthleteResult:
+    """Outcome of one athlete's run."""
+    athlete_id: str
+    seconds: float
+    ok: bool
+    result: Any = None
+    error: Optional[str] = None
+
+
+def run_athletes(athletes: Iterable[AthleteContext], func: Callable[[AthleteContext], Any],
+                 max_workers: int = 4) -> List[AthleteResult]:
+    """
+    Run ``func(athlete)`` for every athlete, at most ``max_workers`` at a time.
+
+    Each call runs with its athlete active. One athlete's failure doesn't
+    affect the others: an exception, or a result whose ``ok`` attribute is
+    False (such as a ``WorkflowReport``), marks only that athlete failed.
+
+    Returns:
+        One ``AthleteResult`` per athlete, in input order.
+    """
+    athletes = list(athletes)
+
+    def run(athlete):
+        started = time.perf_counter()
+        athlete.ensure_dirs()
+        with use_athlete(athlete):
+            try:
+                result = func(athlete)
+                ok, error = getattr(result, "ok", True), None
+            except Exception as e:
+                result, ok, error = None, False, f"{type(e).__name__}: {e}"
+        return AthleteResult(athlete.athlete_id, round(time.perf_counter() - started, 2), ok, result, error)
+
+    results: Dict[str, AthleteResult] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="athlete") as executor:
+        futures = {executor.submit(in_context(run, athlete)): athlete for athlete in athletes}
+        for future in as_completed(futures):
+            outcome = future.result()
+            results[outcome.athlete_id] = outcome
+            mark = "✅" if outcome.ok else "❌"
+            print(f"{mark} {outcome.athlete_id} finished in {outcome.seconds:.1f}s"
+                  + (f": {outcome.error}" if outcome.error else ""))
+    return [results[athlete.athlete_id] for athlete in athletes]
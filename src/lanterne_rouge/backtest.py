@@ -0,0 +1,378 @@
+"""
+Season backtests for the reasoning policy.
+
+Replays stored activities and wellness exports (Strava or intervals.icu CSVs,
+like the samples in ``tests/``) day by day: rebuilds daily TSS and the same
+Bannister CTL / ATL / TSB model used by ``monitor.get_ctl_atl_tsb``, runs the
+reasoning policy for every morning, and reports decision distributions,
+fitness trajectories and run time.
+
+Rule-based policies are evaluated with the vectorized ``batch_decisions``
+engine, one worker per parameter set. LLM policies (against the local stub
+backend from ``llm_stub``) are evaluated one day at a time, spread across
+workers in chunks of days.
+"""
+from __future__ import annotations
+
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .batch_decisions import ACTIONS, batch_rule_based_decisions
+from .monitor import K_ATL, K_CTL
+from .reasoner import ReasoningAgent
+
+# Daily load, as a fraction of current CTL, for an athlete who follows each action
+ACTION_LOAD_FACTORS = {"recover": 0.4, "ease": 0.8, "maintain": 1.0, "push": 1.3}
+
+DEFAULT_FTP = 250
+DAYS_PER_CHUNK = 30  # Days per worker task for per-day (LLM) policies
+LLM_DECISION_COLUMNS = ["day", "action", "intensity_recommendation", "confidence", "flags"]
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of replaying one policy over the season."""
+    name: str
+    decision_rules: Dict[str, Any]
+    decisions: pd.DataFrame  # One row per day: metrics plus action/intensity/confidence
+    trajectory: pd.DataFrame  # Actual and projected CTL/ATL/TSB per day
+    elapsed_seconds: float
+
+    def action_counts(self) -> Dict[str, int]:
+        counts = self.decisions["action"].value_counts()
+        return {action: int(counts.get(action, 0)) for action in ACTIONS}
+
+
+@dataclass
+class BacktestReport:
+    """All policy results from one backtest run."""
+    results: List[BacktestResult]
+    days: int
+    elapsed_seconds: float
+    workers: int
+    mode: str = "rules"
+    notes: List[str] = field(default_factory=list)
+
+    def summary(self) -> pd.DataFrame:
+        """One row per policy: action distribution and end-of-season fitness."""
+        rows = []
+        for result in self.results:
+            final = result.trajectory.iloc[-1] if len(result.trajectory) else {}
+            row = {"policy": result.name}
+            row.update(result.action_counts())
+            row.update({
+                "final_ctl": round(float(final.get("ctl", np.nan)), 1),
+                "final_tsb": round(float(final.get("tsb", np.nan)), 1),
+                "projected_ctl": round(float(final.get("projected_ctl", np.nan)), 1),
+                "projected_tsb": round(float(final.get("projected_tsb", np.nan)), 1),
+                "seconds": round(result.elapsed_seconds, 4),
+            })
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def format(self) -> str:
+        """Plain-text report for the console."""
+        lines = [
+            f"📊 Backtest: {len(self.results)} policies × {self.days} days "
+            f"({self.mode}, {self.workers} workers) in {self.elapsed_seconds:.2f}s",
+        ]
+        lines.extend(f"⚠️ {note}" for note in self.notes)
+        if self.results:
+            lines.append(self.summary().to_string(index=False))
+        return "\n".join(lines)
+
+
+# --------------------------------------------------------------------------- #
+#  Loading
+# --------------------------------------------------------------------------- #
+
+def _numeric(frame: pd.DataFrame, column: str) -> pd.Series:
+    if column not in frame:
+        return pd.Series(np.nan, index=frame.index)
+    return pd.to_numeric(frame[column], errors="coerce")
+
+
+def load_activities(path: Union[str, Path, pd.DataFrame], ftp: Optional[float] = None) -> pd.DataFrame:
+    """
+    Load a Strava or intervals.icu activities export and derive TSS per activity.
+
+    TSS follows the same priority as ``monitor.get_ctl_atl_tsb``: power-based
+    TSS from normalized power and FTP, then Strava's relative effort / suffer
+    score, then intervals.icu training load.
+
+    Args:
+        path: CSV export path, or a frame with the same columns
+            (e.g. ``HistoryStore.activities_frame()``).
+        ftp: FTP for power-based TSS; rows with their own ``icu_ftp`` use that.
+
+    Returns:
+        DataFrame with ``day`` (local date) and ``tss`` columns.
+    """
+    frame = path if isinstance(path, pd.DataFrame) else pd.read_csv(path, encoding="utf-8-sig")
+    start = pd.to_datetime(frame["start_date_local"], errors="coerce", utc=False)
+    if getattr(start.dt, "tz", None) is not None:
+        start = start.dt.tz_localize(None)
+
+    duration = _numeric(frame, "moving_time").fillna(_numeric(frame, "elapsed_time"))
+    normalized_power = (_numeric(frame, "weighted_average_watts")
+                        .fillna(_numeric(frame, "icu_normalized_watts"))
+                        .fillna(_numeric(frame, "average_watts"))
+                        .fillna(_numeric(frame, "icu_average_watts")))
+    row_ftp = _numeric(frame, "icu_ftp").fillna(ftp or DEFAULT_FTP)
+
+    intensity = normalized_power / row_ftp
+    power_tss = (duration * normalized_power * intensity) / (row_ftp * 3600) * 100
+    tss = (power_tss.where(power_tss > 0)
+           .fillna(_numeric(frame, "relative_effort").where(lambda s: s > 0))
+           .fillna(_numeric(frame, "suffer_score").where(lambda s: s > 0))
+           .fillna(_numeric(frame, "icu_training_load"))
+           .fillna(0.0))
+
+    activities = pd.DataFrame({"day": start.dt.normalize(), "tss": tss})
+    return activities.dropna(subset=["day"]).reset_index(drop=True)
+
+
+def load_wellness(path: Union[str, Path, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Load an intervals.icu wellness export (path or frame).
+
+    Returns:
+        DataFrame indexed by day with ``readiness_score`` and, when present in
+        the export, reference ``icu_ctl`` / ``icu_atl`` columns.
+    """
+    frame = path if isinstance(path, pd.DataFrame) else pd.read_csv(path, encoding="utf-8-sig")
+    wellness = pd.DataFrame({
+        "day": pd.to_datetime(frame["date"], errors="coerce").dt.normalize(),
+        "readiness_score": _numeric(frame, "readiness"),
+        "icu_ctl": _numeric(frame, "ctl"),
+        "icu_atl": _numeric(frame, "atl"),
+    }).dropna(subset=["day"])
+    return wellness.drop_duplicates("day", keep="last").set_index("day").sort_index()
+
+
+def _bannister(loads: np.ndarray, ctl0: float, atl0: float) -> tuple[np.ndarray, np.ndarray]:
+    """Exponentially weighted CTL and ATL after each day's load."""
+    seeded = np.concatenate([[ctl0], loads])
+    ctl = pd.Series(seeded).ewm(alpha=K_CTL, adjust=False).mean().to_numpy()[1:]
+    seeded[0] = atl0
+    atl = pd.Series(seeded).ewm(alpha=K_ATL, adjust=False).mean().to_numpy()[1:]
+    return ctl, atl
+
+
+def build_daily_metrics(
+    activities: pd.DataFrame,
+    wellness: Optional[pd.DataFrame] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    warmup_days: int = 90,
+) -> pd.DataFrame:
+    """
+    Rebuild the morning metrics the coach would have seen on each day.
+
+    CTL and ATL are seeded like ``get_ctl_atl_tsb`` (mean TSS of the first 14
+    days) over a warm-up window of up to ``warmup_days`` before ``start``.
+    The warm-up never starts before the first activity: the export has no
+    loads before it, and seeding from those empty days would start the
+    season at zero fitness. Each morning sees the previous day's
+    CTL/ATL/TSB, since that day's ride has not happened yet.
+
+    Returns:
+        DataFrame indexed by day with ``tss``, ``ctl``, ``atl``, ``tsb`` and
+        ``readiness_score`` (NaN where wellness is missing).
+    """
+    daily_tss = activities.groupby("day")["tss"].sum()
+    first = daily_tss.index.min() if len(daily_tss) else pd.Timestamp(start or date.today())
+    last = daily_tss.index.max() if len(daily_tss) else first
+    if wellness is not None and len(wellness):
+        last = max(last, wellness.index.max())
+
+    start_ts = pd.Timestamp(start) if start else first
+    end_ts = pd.Timestamp(end) if end else last
+    warmup_start = min(start_ts, max(first, start_ts - pd.Timedelta(days=warmup_days)))
+    days = pd.date_range(warmup_start, end_ts, freq="D")
+
+    loads = daily_tss.reindex(days, fill_value=0.0).to_numpy(dtype=float)
+    # Seed from the first 14 days with data, even if the window starts earlier
+    seed_days = pd.date_range(max(first, warmup_start), periods=14, freq="D")
+    init = float(daily_tss.reindex(seed_days, fill_value=0.0).mean()) if len(loads) else 0.0
+    ctl, atl = _bannister(loads, init, init)
+
+    metrics = pd.DataFrame({"tss": loads}, index=days)
+    metrics.index.name = "day"
+    metrics["ctl"] = np.concatenate([[init], ctl[:-1]])
+    metrics["atl"] = np.concatenate([[init], atl[:-1]])
+    metrics["tsb"] = metrics["ctl"] - metrics["atl"]
+    if wellness is not None:
+        metrics = metrics.join(wellness[["readiness_score"]], how="left")
+    else:
+        metrics["readiness_score"] = np.nan
+
+    return metrics.loc[start_ts:end_ts]
+
+
+def project_trajectory(metrics: pd.DataFrame, actions: Sequence[str]) -> pd.DataFrame:
+    """
+    Actual CTL/ATL/TSB next to the trajectory of an athlete who followed ``actions``.
+
+    The projection starts from the first morning's CTL/ATL and rides
+    ``ACTION_LOAD_FACTORS[action] × CTL`` each day.
+    """
+    ctl = float(metrics["ctl"].iloc[0]) if len(metrics) else 0.0
+    atl = float(metrics["atl"].iloc[0]) if len(metrics) else 0.0
+    projected_ctl = np.empty(len(metrics))
+    projected_atl = np.empty(len(metrics))
+    for i, action in enumerate(actions):
+        load = ACTION_LOAD_FACTORS.get(action, 1.0) * ctl
+        ctl = ctl * (1 - K_CTL) + load * K_CTL
+        atl = atl * (1 - K_ATL) + load * K_ATL
+        projected_ctl[i] = ctl
+        projected_atl[i] = atl
+
+    trajectory = metrics[["ctl", "atl", "tsb"]].copy()
+    trajectory["projected_ctl"] = projected_ctl
+    trajectory["projected_atl"] = projected_atl
+    trajectory["projected_tsb"] = projected_ctl - projected_atl
+    return trajectory
+
+
+# --------------------------------------------------------------------------- #
+#  Workers (module-level so they can be pickled by the process pool)
+# --------------------------------------------------------------------------- #
+
+def _run_rules(task: tuple) -> BacktestResult:
+    name, rules, metrics = task
+    started = time.perf_counter()
+    decisions = batch_rule_based_decisions(metrics["readiness_score"], metrics["tsb"], rules)
+    frame = decisions.to_frame()
+    frame.index = metrics.index
+    for column in ("ctl", "atl"):
+        frame[column] = metrics[column]
+    trajectory = project_trajectory(metrics, frame["action"])
+    return BacktestResult(name, rules, frame, trajectory, time.perf_counter() - started)
+
+
+def _run_llm_days(task: tuple) -> List[Dict[str, Any]]:
+    rules, records, stub_options = task
+    from .ai_clients import set_llm_backend
+    from .llm_stub import StubLLMBackend
+
+    # The stub answers with the policy's rules, standing in for an LLM following them
+    set_llm_backend(StubLLMBackend(**{**stub_options, "decision_rules": rules}))
+    agent = ReasoningAgent(use_llm=True)
+    agent.decision_rules = rules
+
+    rows = []
+    for record in records:
+        metrics = {k: v for k, v in record.items() if k != "day" and not pd.isna(v)}
+        decision = agent.make_decision(metrics)
+        rows.append({
+            "day": record["day"],
+            "action": decision.action,
+            "intensity_recommendation": decision.intensity_recommendation,
+            "confidence": decision.confidence,
+            "flags": ",".join(decision.flags),
+        })
+    return rows
+
+
+# --------------------------------------------------------------------------- #
+#  Runner
+# --------------------------------------------------------------------------- #
+
+def _merge_rules(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    rules = copy.deepcopy(base)
+    for group, values in overrides.items():
+        if isinstance(values, dict):
+            rules.setdefault(group, {}).update(values)
+        else:
+            rules[group] = values
+    return rules
+
+
+def run_backtest(
+    metrics: pd.DataFrame,
+    parameter_sets: Optional[Dict[str, Dict[str, Any]]] = None,
+    workers: Optional[int] = None,
+    use_llm_stub: bool = False,
+    stub_options: Optional[Dict[str, Any]] = None,
+) -> BacktestReport:
+    """
+    Replay the season under one or more reasoning policies.
+
+    Args:
+        metrics: Output of ``build_daily_metrics``.
+        parameter_sets: Named ``decision_rules`` overrides, e.g.
+            ``{"strict": {"readiness_thresholds": {"low": 75}}}``. The default
+            rules are always included as ``"default"``.
+        workers: Process pool size (default: CPU count); 0 runs everything in-process.
+        use_llm_stub: Run the LLM decision path against ``StubLLMBackend``
+            instead of the vectorized rules.
+        stub_options: Keyword arguments for ``StubLLMBackend`` (latency, error_rate, ...).
+
+    Returns:
+        BacktestReport with per-policy decisions, trajectories and timings.
+    """
+    started = time.perf_counter()
+    pool_size = (os.cpu_count() or 1) if workers is None else workers
+    base_rules = ReasoningAgent(use_llm=False).decision_rules
+    policies = {"default": base_rules}
+    for name, overrides in (parameter_sets or {}).items():
+        policies[name] = _merge_rules(base_rules, overrides)
+
+    if use_llm_stub:
+        results = _run_llm_policies(metrics, policies, pool_size, stub_options or {})
+        mode = "llm-stub"
+    else:
+        tasks = [(name, rules, metrics) for name, rules in policies.items()]
+        if pool_size == 0 or len(tasks) == 1:
+            pool_size = 0  # Not worth a pool for a single vectorized pass
+            results = [_run_rules(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=pool_size) as pool:
+                results = list(pool.map(_run_rules, tasks))
+        mode = "rules"
+
+    return BacktestReport(
+        results=results,
+        days=len(metrics),
+        elapsed_seconds=time.perf_counter() - started,
+        workers=pool_size,
+        mode=mode,
+        notes=[] if metrics["readiness_score"].notna().any() else
+              ["No readiness data in range; the default readiness of 75 was used"],
+    )
+
+
+def _run_llm_policies(metrics, policies, workers, stub_options) -> List[BacktestResult]:
+    """Per-day LLM decisions, split into chunks of days across the pool."""
+    records = metrics.reset_index()[["day", "readiness_score", "tsb", "ctl", "atl"]]
+    records["day"] = records["day"].dt.strftime("%Y-%m-%d")
+    chunks = [records.iloc[i:i + DAYS_PER_CHUNK].to_dict("records")
+              for i in range(0, len(records), DAYS_PER_CHUNK)]
+
+    results = []
+    for name, rules in policies.items():
+        policy_started = time.perf_counter()
+        tasks = [(rules, chunk, stub_options) for chunk in chunks]
+        if workers == 0:
+            rows = [row for task in tasks for row in _run_llm_days(task)]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                rows = [row for chunk_rows in pool.map(_run_llm_days, tasks) for row in chunk_rows]
+
+        # An empty metrics window gives an empty (but well-formed) result
+        frame = pd.DataFrame(rows, columns=LLM_DECISION_COLUMNS)
+        frame.index = pd.DatetimeIndex(pd.to_datetime(frame["day"]), name="day")
+        frame = frame.drop(columns="day").join(metrics[["readiness_score", "tsb", "ctl", "atl"]])
+        trajectory = project_trajectory(metrics, frame["action"])
+        results.append(BacktestResult(name, rules, frame, trajectory, time.perf_counter() - policy_started))
+    return results
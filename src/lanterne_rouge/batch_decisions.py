@@ -0,0 +1,217 @@
+"""
+Vectorized rule-based training decisions.
+
+Evaluates the same ``decision_rules`` as ``ReasoningAgent._make_rule_based_decision``
+over whole arrays of metrics (many days, many athletes) in a single NumPy pass,
+and sweeps threshold combinations by broadcasting instead of looping. Use it for
+backtests and multi-athlete runs; the scalar path stays the source of the
+human-readable reason text.
+"""
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .reasoner import TrainingDecision
+
+# Decision codes, in the order the scalar rules are checked
+ACTIONS = np.array(["recover", "ease", "push", "maintain"])
+INTENSITIES = np.array(["low", "moderate", "high", "moderate"])
+CONFIDENCES = np.array([0.9, 0.8, 0.8, 0.7])
+FLAG_NAMES = ("low_readiness", "very_negative_tsb", "negative_tsb")
+
+# Defaults used by the scalar rules when a metric is missing
+DEFAULT_READINESS = 75.0
+DEFAULT_TSB = 0.0
+
+# Flat names for the thresholds a sweep can vary
+THRESHOLD_PATHS = {
+    "readiness_low": ("readiness_thresholds", "low"),
+    "tsb_very_negative": ("tsb_thresholds", "very_negative"),
+    "tsb_negative": ("tsb_thresholds", "negative"),
+    "tsb_positive": ("tsb_thresholds", "positive"),
+}
+
+
+@dataclass
+class BatchDecisions:
+    """Column-oriented rule-based decisions, one entry per input row."""
+    action: np.ndarray  # "recover", "ease", "push", "maintain"
+    intensity_recommendation: np.ndarray  # "low", "moderate", "high"
+    flags: Dict[str, np.ndarray]  # Boolean array per flag name
+    confidence: np.ndarray  # 0.0 to 1.0
+    readiness: np.ndarray
+    tsb: np.ndarray
+
+    def __len__(self) -> int:
+        return self.action.shape[-1]
+
+    def flag_lists(self) -> List[List[str]]:
+        """Per-row flag lists in the same format as ``TrainingDecision.flags``."""
+        stacked = np.stack([self.flags[name] for name in FLAG_NAMES], axis=-1).reshape(-1, len(FLAG_NAMES))
+        return [[FLAG_NAMES[i] for i in np.flatnonzero(row)] for row in stacked]
+
+    def action_counts(self) -> Dict[str, int]:
+        """Number of rows recommending each action."""
+        return {action: int(np.count_nonzero(self.action == action)) for action in ACTIONS}
+
+    def decision(self, index: int) -> TrainingDecision:
+        """Materialize one row as a ``TrainingDecision`` with the scalar reason text."""
+        action = str(self.action[index])
+        readiness = float(self.readiness[index])
+        tsb = float(self.tsb[index])
+        reasons = {
+            "recover": f"Readiness at {readiness:g} and TSB at {tsb:.1f} indicate need for recovery",
+            "ease": f"TSB at {tsb:.1f} suggests moderate fatigue",
+            "push": f"TSB at {tsb:.1f} indicates good recovery state",
+            "maintain": "Metrics indicate steady training state",
+        }
+        return TrainingDecision(
+            action=action,
+            reason=reasons[action],
+            intensity_recommendation=str(self.intensity_recommendation[index]),
+            flags=[name for name in FLAG_NAMES if self.flags[name][index]],
+            confidence=float(self.confidence[index]),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the decisions as a DataFrame (1-D batches only)."""
+        data = {
+            "readiness_score": self.readiness,
+            "tsb": self.tsb,
+            "action": self.action,
+            "intensity_recommendation": self.intensity_recommendation,
+            "confidence": self.confidence,
+        }
+        data.update({name: values for name, values in self.flags.items()})
+        return pd.DataFrame(data)
+
+
+def _as_float_array(values: Any, default: float) -> np.ndarray:
+    """Convert a column to float, filling missing values like the scalar rules."""
+    array = np.asarray(values, dtype=float)
+    return np.where(np.isnan(array), default, array)
+
+
+def _threshold(rules: Mapping[str, Any], name: str) -> np.ndarray:
+    group, key = THRESHOLD_PATHS[name]
+    return np.asarray(rules[group][key], dtype=float)
+
+
+def batch_rule_based_decisions(
+    readiness: Any,
+    tsb: Any,
+    decision_rules: Mapping[str, Any],
+) -> BatchDecisions:
+    """
+    Evaluate the rule-based decision logic over arrays of metrics.
+
+    Args:
+        readiness: Readiness scores (array-like or Series); NaN means missing.
+        tsb: Training Stress Balance values, same length as ``readiness``.
+        decision_rules: Rules in ``ReasoningAgent.decision_rules`` format.
+            Threshold values may themselves be arrays that broadcast against
+            the metrics, e.g. shape ``(P, 1)`` to evaluate P rule sets at once.
+
+    Returns:
+        BatchDecisions whose arrays have the broadcast shape of the inputs.
+    """
+    readiness = _as_float_array(readiness, DEFAULT_READINESS)
+    tsb = _as_float_array(tsb, DEFAULT_TSB)
+
+    low_readiness = readiness < _threshold(decision_rules, "readiness_low")
+    very_negative = tsb < _threshold(decision_rules, "tsb_very_negative")
+    negative = ~very_negative & (tsb < _threshold(decision_rules, "tsb_negative"))
+    positive = tsb > _threshold(decision_rules, "tsb_positive")
+
+    # Same precedence as the scalar rules: recover, ease, push, maintain
+    codes = np.select([low_readiness | very_negative, negative, positive], [0, 1, 2], default=3)
+
+    shape = codes.shape
+    return BatchDecisions(
+        action=ACTIONS[codes],
+        intensity_recommendation=INTENSITIES[codes],
+        flags={
+            "low_readiness": np.broadcast_to(low_readiness, shape),
+            "very_negative_tsb": np.broadcast_to(very_negative, shape),
+            "negative_tsb": np.broadcast_to(negative, shape),
+        },
+        confidence=CONFIDENCES[codes],
+        readiness=np.broadcast_to(readiness, shape),
+        tsb=np.broadcast_to(tsb, shape),
+    )
+
+
+def decisions_from_frame(
+    frame: pd.DataFrame,
+    decision_rules: Mapping[str, Any],
+    readiness_column: str = "readiness_score",
+    tsb_column: str = "tsb",
+) -> pd.DataFrame:
+    """
+    Add rule-based decision columns to a metrics DataFrame.
+
+    Missing metric columns are treated as all-missing and take the scalar defaults.
+    """
+    readiness = frame[readiness_column] if readiness_column in frame else np.full(len(frame), np.nan)
+    tsb = frame[tsb_column] if tsb_column in frame else np.full(len(frame), np.nan)
+    decisions = batch_rule_based_decisions(readiness, tsb, decision_rules)
+
+    result = frame.copy()
+    result["action"] = decisions.action
+    result["intensity_recommendation"] = decisions.intensity_recommendation
+    result["confidence"] = decisions.confidence
+    for name, values in decisions.flags.items():
+        result[name] = values
+    return result
+
+
+def sweep_decision_rules(
+    readiness: Any,
+    tsb: Any,
+    decision_rules: Mapping[str, Any],
+    grid: Mapping[str, Sequence[float]],
+    baseline: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Evaluate every combination of threshold values in one broadcast pass.
+
+    Args:
+        readiness: Readiness scores for each day (or athlete-day).
+        tsb: TSB values, same length as ``readiness``.
+        decision_rules: Base rules; thresholds not in ``grid`` keep these values.
+        grid: Threshold values to try, keyed by ``readiness_low``,
+            ``tsb_very_negative``, ``tsb_negative`` or ``tsb_positive``.
+        baseline: Optional reference actions (e.g. from the current rules);
+            adds an ``agreement`` column with the share of matching days.
+
+    Returns:
+        One row per combination with the threshold values and the count of
+        days recommending each action.
+    """
+    unknown = set(grid) - set(THRESHOLD_PATHS)
+    if unknown:
+        raise ValueError(f"Unknown thresholds in grid: {sorted(unknown)}")
+
+    names = list(grid)
+    combos = np.array(list(itertools.product(*(grid[name] for name in names))), dtype=float)
+    if combos.size == 0:
+        return pd.DataFrame(columns=names + list(ACTIONS))
+
+    rules = {group: dict(values) for group, values in decision_rules.items() if isinstance(values, Mapping)}
+    for column, name in enumerate(names):
+        group, key = THRESHOLD_PATHS[name]
+        rules[group][key] = combos[:, column:column + 1]  # Shape (P, 1) broadcasts over days
+
+    decisions = batch_rule_based_decisions(readiness, tsb, rules)
+
+    summary = pd.DataFrame(combos, columns=names)
+    for action in ACTIONS:
+        summary[action] = np.count_nonzero(decisions.action == action, axis=-1)
+    if baseline is not None:
+        summary["agreement"] = np.mean(decisions.action == np.asarray(baseline), axis=-1)
+    return summary
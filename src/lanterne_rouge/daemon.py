@@ -0,0 +1,386 @@
+"""
+Long-running daemon with an internal job scheduler and a health endpoint.
+
+Every cron or GitHub Actions run starts cold: interpreter, imports, mission
+config, HTTP and LLM clients, then the job itself. ``serve`` keeps one
+process alive instead. Jobs are scheduled on each athlete's local clock
+(``ScheduledJob.timezone``), run on a small worker pool, and reuse whatever
+they keep on their ``WorkflowContext`` between runs. ``GET /health`` reports
+the scheduler and the last run of every job as JSON. With a ``StravaWebhook``
+the same server also receives Strava's activity events on ``/webhook``; it
+is then reachable from the internet, so triggering jobs requires a token.
+"""
+from __future__ import annotations
+
+import datetime
+import hmac
+import json
+import signal
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+if TYPE_CHECKING:
+    from .strava_webhook import StravaWebhook
+
+# Longest the scheduler sleeps before re-checking the clock (covers suspend / clock jumps)
+MAX_SLEEP_SECONDS = 60.0
+
+LOOPBACK_HOSTS = ("127.0.0.1", "::1", "localhost")
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def parse_times(values: Iterable[str]) -> Tuple[datetime.time, ...]:
+    """Parse ``"HH:MM"`` strings (e.g. ``"06:00"``) into sorted times."""
+    times = []
+    for value in values:
+        try:
+            hour, minute = (int(part) for part in value.strip().split(":"))
+            times.append(datetime.time(hour, minute))
+        except ValueError as e:
+            raise ValueError(f"Invalid time '{value}', expected HH:MM") from e
+    return tuple(sorted(times))
+
+
+@dataclass
+class ScheduledJob:
+    """
+    A job run at fixed local times every day.
+
+    Attributes:
+        name: Unique job name, e.g. ``"tdf-sim-2025:morning"``.
+        func: Called with no arguments; an object with an ``ok`` attribute
+            (such as a ``WorkflowReport``) that is False marks the run failed.
+        times: Local wall-clock times to run at.
+        timezone: IANA timezone of ``times`` (the athlete's).
+    """
+    name: str
+    func: Callable[[], Any]
+    times: Tuple[datetime.time, ...]
+    timezone: str = "UTC"
+    next_run: Optional[datetime.datetime] = None
+    running: bool = False
+    runs: int = 0
+    last_started: Optional[datetime.datetime] = None
+    last_seconds: Optional[float] = None
+    last_ok: Optional[bool] = None
+    last_error: Optional[str] = None
+
+    def __post_init__(self):
+        if not self.times:
+            raise ValueError(f"Job '{self.name}' has no run times")
+        self.zone = ZoneInfo(self.timezone)
+
+    def next_after(self, moment: datetime.datetime) -> datetime.datetime:
+        """The first scheduled run strictly after ``moment`` (both timezone-aware, UTC out)."""
+        local = moment.astimezone(self.zone)
+        for offset in range(0, 3):  # today, tomorrow, or the day after a DST gap
+            day = local.date() + datetime.timedelta(days=offset)
+            for at in self.times:
+                candidate = datetime.datetime.combine(day, at, tzinfo=self.zone).astimezone(datetime.timezone.utc)
+                if candidate > moment:
+                    return candidate
+        raise RuntimeError(f"No next run found for job '{self.name}'")  # unreachable with valid times
+
+    def status(self) -> Dict[str, Any]:
+        """JSON-friendly state for the health endpoint."""
+        def iso(value):
+            return value.isoformat() if value else None
+        return {
+            "timezone": self.timezone,
+            "times": [at.strftime("%H:%M") for at in self.times],
+            "next_run": iso(self.next_run),
+            "running": self.running,
+            "runs": self.runs,
+            "last_started": iso(self.last_started),
+            "last_seconds": self.last_seconds,
+            "last_ok": self.last_ok,
+            "last_error": self.last_error,
+        }
+
+
+class JobScheduler:
+    """
+    Run ``ScheduledJob``s at their local times on a background thread.
+
+    A job whose previous run is still going when it comes due again is not
+    started twice; that slot is skipped and logged.
+    """
+
+    def __init__(self, jobs: Iterable[ScheduledJob], max_workers: int = 2,
+                 clock: Callable[[], datetime.datetime] = _utcnow):
+        self.jobs: Dict[str, ScheduledJob] = {}
+        for job in jobs:
+            if job.name in self.jobs:
+                raise ValueError(f"Duplicate job: {job.name}")
+            self.jobs[job.name] = job
+        self.clock = clock
+        self.started_at: Optional[datetime.datetime] = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def alive(self) -> bool:
+        """True while the scheduling thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Compute every job's next run and start the scheduling thread."""
+        now = self.clock()
+        self.started_at = now
+        with self._lock:
+            for job in self.jobs.values():
+                job.next_run = job.next_after(now)
+        self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop scheduling; with ``wait`` let running jobs finish first."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def trigger(self, name: str) -> bool:
+        """Run a job now, outside its schedule; False if it is already running."""
+        with self._lock:
+            job = self.jobs[name]
+            if job.running:
+                return False
+            job.running = True
+        self._executor.submit(self._run, job)
+        return True
+
+    def run_due(self) -> List[str]:
+        """Start every job that is due and schedule its next run; returns the started names."""
+        now = self.clock()
+        started = []
+        with self._lock:
+            for job in self.jobs.values():
+                if job.next_run is None or job.next_run > now:
+                    continue
+                job.next_run = job.next_after(now)
+                if job.running:
+                    print(f"⏭️  {job.name} still running, skipping this run")
+                    continue
+                job.running = True
+                started.append(job)
+        for job in started:
+            self._executor.submit(self._run, job)
+        return [job.name for job in started]
+
+    def _run(self, job: ScheduledJob) -> None:
+        started = time.perf_counter()
+        job.last_started = self.clock()
+        print(f"▶️  {job.name} started")
+        try:
+            result = job.func()
+            ok, error = getattr(result, "ok", True), None
+        except Exception as e:
+            ok, error = False, f"{type(e).__name__}: {e}"
+        seconds = round(time.perf_counter() - started, 2)
+        with self._lock:
+            job.runs += 1
+            job.last_seconds = seconds
+            job.last_ok = ok
+            job.last_error = error
+            job.running = False
+        print(f"{'✅' if ok else '❌'} {job.name} finished in {seconds:.1f}s" + (f": {error}" if error else ""))
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            self.run_due()
+            with self._lock:
+                upcoming = [job.next_run for job in self.jobs.values() if job.next_run is not None]
+            delay = MAX_SLEEP_SECONDS
+            if upcoming:
+                delay = min(max((min(upcoming) - self.clock()).total_seconds(), 0.0), MAX_SLEEP_SECONDS)
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def status(self) -> Dict[str, Any]:
+        """Scheduler health plus every job's state."""
+        with self._lock:
+            jobs = {name: job.status() for name, job in self.jobs.items()}
+        failing = [name for name, job in jobs.items() if job["last_ok"] is False]
+        if not self.alive:
+            state = "stopped"
+        elif failing:
+            state = "degraded"
+        else:
+            state = "ok"
+        return {
+            "status": state,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "uptime_seconds": round((self.clock() - self.started_at).total_seconds()) if self.started_at else 0,
+            "jobs": jobs,
+        }
+
+
+class HealthServer:
+    """
+    Minimal HTTP server for the daemon.
+
+    ``GET /health`` returns the scheduler status as JSON (503 once the
+    scheduler has stopped); ``POST /jobs/<name>/run`` triggers a job now.
+    With ``webhook``, ``GET /webhook`` answers Strava's subscription
+    handshake and ``POST /webhook`` receives its events.
+
+    Triggering a job sends notifications and spends LLM calls. With a
+    ``jobs_token`` it needs an ``Authorization: Bearer <token>`` header;
+    without one it is only allowed on a loopback-only server with no
+    webhook (anything else is reachable by others).
+    """
+
+    def __init__(self, scheduler: JobScheduler, host: str = "127.0.0.1", port: int = 8080,
+                 webhook: Optional["StravaWebhook"] = None, jobs_token: Optional[str] = None):
+        self.scheduler = scheduler
+        self.webhook = webhook
+        self.jobs_token = jobs_token
+        self.jobs_open = not jobs_token and webhook is None and host in LOOPBACK_HOSTS
+        handler = self._handler()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """The bound (host, port); useful with ``port=0``."""
+        return self.httpd.server_address[:2]
+
+    def _handler(self):
+        scheduler = self.scheduler
+        webhook = self.webhook
+        jobs_token = self.jobs_token
+        jobs_open = self.jobs_open
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, code: int, body: Dict[str, Any]) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):  # noqa: N802 (http.server naming)
+                url = urllib.parse.urlsplit(self.path)
+                if webhook is not None and url.path.rstrip("/") == "/webhook":
+                    self._reply(*webhook.handle_get(dict(urllib.parse.parse_qsl(url.query))))
+                    return
+                if url.path.rstrip("/") not in ("/health", "/healthz"):
+                    self._reply(404, {"error": "not found"})
+                    return
+                status = scheduler.status()
+                if webhook is not None:
+                    status["webhook"] = webhook.processor.status()
+                self._reply(503 if status["status"] == "stopped" else 200, status)
+
+            def _may_trigger(self) -> bool:
+                if jobs_token:
+                    supplied = self.headers.get("Authorization", "")
+                    if hmac.compare_digest(supplied.encode("utf-8"), f"Bearer {jobs_token}".encode("utf-8")):
+                        return True
+                    self._reply(401, {"error": "missing or wrong token"})
+                    return False
+                if not jobs_open:
+                    self._reply(403, {"error": "set LANTERNE_JOBS_TOKEN to trigger jobs on this server"})
+                return jobs_open
+
+            def do_POST(self):  # noqa: N802
+                path = urllib.parse.urlsplit(self.path).path
+                if webhook is not None and path.rstrip("/") == "/webhook":
+                    length = int(self.headers.get("Content-Length") or 0)
+                    self._reply(*webhook.handle_post(self.rfile.read(length)))
+                    return
+                parts = path.strip("/").split("/")
+                if len(parts) != 3 or parts[0] != "jobs" or parts[2] != "run":
+                    self._reply(404, {"error": "not found"})
+                    return
+                if not self._may_trigger():
+                    return
+                if parts[1] not in scheduler.jobs:
+                    self._reply(404, {"error": f"unknown job {parts[1]}"})
+                    return
+                started = scheduler.trigger(parts[1])
+                self._reply(202 if started else 409, {"job": parts[1], "started": started})
+
+            def log_message(self, format, *args):  # keep health probes out of the job log
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def serve(jobs: Iterable[ScheduledJob], host: str = "127.0.0.1", port: int = 8080,
+          max_workers: int = 2, on_stop: Optional[Callable[[], None]] = None,
+          webhook: Optional["StravaWebhook"] = None, jobs_token: Optional[str] = None) -> None:
+    """
+    Run the scheduler and health endpoint until SIGINT / SIGTERM.
+
+    Args:
+        jobs: The jobs to schedule.
+        host, port: Where ``/health`` listens.
+        max_workers: Jobs that may run at the same time.
+        on_stop: Called after running jobs have finished, e.g. to close
+            warm HTTP sessions.
+        webhook: Receive Strava events on ``/webhook`` and process them on
+            its ``ActivityProcessor``.
+        jobs_token: Shared secret required by ``POST /jobs/<name>/run``
+            (see ``HealthServer``).
+    """
+    scheduler = JobScheduler(jobs, max_workers=max_workers)
+    server = HealthServer(scheduler, host, port, webhook=webhook, jobs_token=jobs_token)
+    stopping = threading.Event()
+
+    def _signal(signum, frame):
+        print(f"🛑 Received signal {signum}, finishing running jobs...")
+        stopping.set()
+
+    signal.signal(signal.SIGINT, _signal)
+    signal.signal(signal.SIGTERM, _signal)
+
+    scheduler.start()
+    if webhook is not None:
+        webhook.processor.start()
+    server.start()
+    host, port = server.address
+    print(f"🚴 Lanterne Rouge daemon serving health on http://{host}:{port}/health")
+    if webhook is not None:
+        print(f"   Strava webhook on http://{host}:{port}/webhook")
+    if not server.jobs_open and not jobs_token:
+        print("   Triggering jobs over HTTP is disabled (no LANTERNE_JOBS_TOKEN)")
+    for job in scheduler.jobs.values():
+        local = job.next_run.astimezone(job.zone)
+        print(f"   {job.name:<28} next run {local:%Y-%m-%d %H:%M %Z}")
+    try:
+        while not stopping.wait(1.0):
+            pass
+    finally:
+        server.stop()
+        if webhook is not None:
+            webhook.processor.stop()
+        scheduler.stop(wait=True)
+        if on_stop is not None:
+            on_stop()
+        print("👋 Daemon stopped")
@@ -0,0 +1,287 @@
+"""
+Typed daily metrics table.
+
+One row per athlete and day in the local SQLite database
+(``memory/lanterne.db`` by default) with the morning readiness, HRV balance,
+training load and the coach's decision, so analytics read a date range with
+one indexed query instead of parsing JSON blobs in ``memory`` and the CSV logs
+in ``output/``.
+
+Writers record whatever they know (Oura readiness, the Bannister model's daily
+load, the coach's decision) and values merge per day: a ``None`` never blanks a
+stored value. ``backfill_daily_metrics`` migrates the legacy logs once, and
+``DailyMetricsStore.export`` writes a range to Parquet or Arrow (Feather) for
+notebooks and dashboards.
+"""
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from .streams.mmp import DEFAULT_ATHLETE
+
+# Column name -> SQLite type
+METRIC_COLUMNS = {
+    "readiness_score": "INTEGER",
+    "hrv_balance": "INTEGER",
+    "tss": "REAL",
+    "ctl": "REAL",
+    "atl": "REAL",
+    "tsb": "REAL",
+    "decision": "TEXT",
+    "confidence": "REAL",
+    "ride_mode": "TEXT",
+}
+
+# SQLite type -> pandas dtype (nullable integers keep missing days as <NA>)
+_DTYPES = {"INTEGER": "Int64", "REAL": "float64", "TEXT": "object"}
+
+DateLike = Union[str, datetime.date]
+
+
+def _day(value: DateLike) -> str:
+    return value.isoformat()[:10] if isinstance(value, datetime.date) else str(value)[:10]
+
+
+def _is_day(text: str) -> bool:
+    try:
+        datetime.date.fromisoformat(text.strip()[:10])
+        return True
+    except ValueError:
+        return False
+
+
+def _clean(column: str, value: Any) -> Any:
+    """Coerce a metric to its column type (``None`` for blanks, ``NA`` and junk)."""
+    if value is None or (isinstance(value, str) and value.strip().upper() in ("", "NA", "NAN", "NONE")):
+        return None
+    kind = METRIC_COLUMNS[column]
+    try:
+        if kind == "INTEGER":
+            return int(round(float(value)))
+        if kind == "REAL":
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+class DailyMetricsStore:
+    """SQLite table of daily metrics keyed by athlete and day."""
+
+    def __init__(self, db_path: Optional[os.PathLike] = None):
+        if db_path is None:
+            from .memory_bus import db_file
+            db_path = db_file()
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        columns = ",\n                ".join(f"{name} {kind}" for name, kind in METRIC_COLUMNS.items())
+        with self._connect() as conn:
+            conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS daily_metrics (
+                athlete_id TEXT NOT NULL,
+                day TEXT NOT NULL,
+                {columns},
+                updated_at TEXT,
+                PRIMARY KEY (athlete_id, day)
+            )
+            """)
+            conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_daily_metrics_day
+            ON daily_metrics(day)
+            """)
+            conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_daily_metrics_decision
+            ON daily_metrics(athlete_id, decision, day)
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def record_many(self, rows: Iterable[Dict[str, Any]], athlete_id: str = DEFAULT_ATHLETE) -> int:
+        """
+        Merge many days of metrics in one transaction.
+
+        Args:
+            rows: Dicts with ``day`` plus any ``METRIC_COLUMNS``; other keys are
+                ignored and ``None`` keeps the stored value.
+
+        Returns:
+            Number of days written.
+        """
+        names = list(METRIC_COLUMNS)
+        updated_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        placeholders = ", ".join("?" * (len(names) + 3))
+        updates = ", ".join(f"{name} = COALESCE(excluded.{name}, {name})" for name in names)
+        sql = (f"INSERT INTO daily_metrics (athlete_id, day, {', '.join(names)}, updated_at) "
+               f"VALUES ({placeholders}) ON CONFLICT(athlete_id, day) DO UPDATE SET "
+               f"{updates}, updated_at = excluded.updated_at")
+        values = [(athlete_id, _day(row["day"]), *(_clean(name, row.get(name)) for name in names), updated_at)
+                  for row in rows]
+        with self._connect() as conn:
+            conn.executemany(sql, values)
+        return len(values)
+
+    def record(self, day: DateLike, athlete_id: str = DEFAULT_ATHLETE, **metrics) -> None:
+        """Merge one day's metrics (see ``record_many``)."""
+        self.record_many([{"day": day, **metrics}], athlete_id)
+
+    def frame(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None,
+              athlete_id: str = DEFAULT_ATHLETE, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Days between ``start`` and ``end`` (inclusive), oldest first.
+
+        Returns:
+            DataFrame indexed by day (datetime) with the requested metric columns.
+        """
+        selected = columns or list(METRIC_COLUMNS)
+        unknown = set(selected) - set(METRIC_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown daily metrics: {', '.join(sorted(unknown))}")
+        sql = f"SELECT day, {', '.join(selected)} FROM daily_metrics WHERE athlete_id = ?"
+        params: List[Any] = [athlete_id]
+        if start is not None:
+            sql += " AND day >= ?"
+            params.append(_day(start))
+        if end is not None:
+            sql += " AND day <= ?"
+            params.append(_day(end))
+        with self._connect() as conn:
+            frame = pd.read_sql_query(sql + " ORDER BY day", conn, params=params)
+        frame["day"] = pd.to_datetime(frame["day"])
+        frame = frame.astype({name: _DTYPES[METRIC_COLUMNS[name]] for name in selected})
+        return frame.set_index("day")
+
+    def latest(self, athlete_id: str = DEFAULT_ATHLETE) -> Optional[Dict[str, Any]]:
+        """The most recent day's row, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM daily_metrics WHERE athlete_id = ? ORDER BY day DESC LIMIT 1",
+                (athlete_id,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def export(self, path: os.PathLike, start: Optional[DateLike] = None, end: Optional[DateLike] = None,
+               athlete_id: str = DEFAULT_ATHLETE) -> Path:
+        """
+        Write a date range to Parquet (``.parquet``) or Arrow IPC (``.arrow`` / ``.feather``).
+
+        Both formats need ``pyarrow``.
+        """
+        path = Path(path)
+        frame = self.frame(start, end, athlete_id).reset_index()
+        frame.insert(0, "athlete_id", athlete_id)
+        try:
+            if path.suffix == ".parquet":
+                frame.to_parquet(path, index=False)
+            elif path.suffix in (".arrow", ".feather"):
+                frame.to_feather(path)
+            else:
+                raise ValueError(f"Unsupported export format '{path.suffix}' (use .parquet, .arrow or .feather)")
+        except ImportError as e:
+            raise ImportError("Exporting daily metrics requires pyarrow: pip install pyarrow") from e
+        return path
+
+
+def log_daily_metrics(rows: List[Dict[str, Any]], athlete_id: str = DEFAULT_ATHLETE,
+                      store: Optional[DailyMetricsStore] = None) -> bool:
+    """
+    Best-effort ``record_many`` for the daily pipeline: a database error is
+    reported, not raised, so it never blocks a recommendation.
+    """
+    try:
+        (store or DailyMetricsStore()).record_many(rows, athlete_id)
+        return True
+    except sqlite3.Error as e:
+        print(f"⚠️  Could not record daily metrics: {e}")
+        return False
+
+
+# --------------------------------------------------------------------------- #
+#  Legacy logs
+# --------------------------------------------------------------------------- #
+
+def _readiness_log_rows(path: Path) -> List[Dict[str, Any]]:
+    """
+    Rows of ``readiness_score_log.csv``.
+
+    The header is written once and contributors have changed since, so columns
+    past the score are only trusted when a row has as many cells as the header.
+    """
+    rows = []
+    with path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if not header:
+            return rows
+        for cells in reader:
+            if len(cells) < 2 or not _is_day(cells[0]):
+                continue  # repeated headers and wrapped explanation text
+            row = {"day": cells[0], "readiness_score": cells[1]}
+            if len(cells) == len(header) and "hrv_balance" in header:
+                row["hrv_balance"] = cells[header.index("hrv_balance")]
+            rows.append(row)
+    return rows
+
+
+def _memory_rows(db_path: Path) -> List[Dict[str, Any]]:
+    """Daily metrics and decisions from the JSON ``memory`` table, oldest first."""
+    rows = []
+    with sqlite3.connect(db_path) as conn:
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memory'").fetchone()
+        if not exists:
+            return rows
+        entries = conn.execute(
+            "SELECT timestamp, type, data FROM memory WHERE type IN ('observation', 'decision') ORDER BY timestamp"
+        ).fetchall()
+    for timestamp, kind, data in entries:
+        try:
+            payload = json.loads(data)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(payload, dict):
+            continue
+        if kind == "observation":
+            rows.append({"day": timestamp, **{key: payload.get(key) for key in
+                                              ("readiness_score", "hrv_balance", "ctl", "atl", "tsb")}})
+        else:
+            rows.append({"day": timestamp, "decision": payload.get("action"),
+                         "confidence": payload.get("confidence"), "ride_mode": payload.get("tdf_mode")})
+    return rows
+
+
+def backfill_daily_metrics(store: Optional[DailyMetricsStore] = None, output_dir: Optional[os.PathLike] = None,
+                           memory_db: Optional[os.PathLike] = None, athlete_id: str = DEFAULT_ATHLETE) -> int:
+    """
+    Migrate the legacy logs into the daily metrics table.
+
+    Reads ``readiness_score_log.csv`` and ``reasoning_log.csv`` from
+    ``output_dir`` and the observations and decisions in the ``memory`` table;
+    later entries for the same day win.
+
+    Returns:
+        Number of rows merged.
+    """
+    store = store or DailyMetricsStore()
+    output_dir = Path(output_dir) if output_dir else Path(__file__).resolve().parents[2] / "output"
+    rows: List[Dict[str, Any]] = []
+    for name in ("reasoning_log.csv", "readiness_score_log.csv"):
+        if (output_dir / name).exists():
+            rows.extend(_readiness_log_rows(output_dir / name))
+    rows.extend(_memory_rows(Path(memory_db) if memory_db else store.db_path))
+    return store.record_many(rows, athlete_id) if rows else 0
@@ -0,0 +1,70 @@
+"""
+Incremental regeneration of the generated docs pages.
+
+The docs updaters (``scripts/integrate_tdf_docs.py`` and
+``scripts/manage_stage_tabs.py``) rewrote all 21 stage pages, the simulation
+index and ``mkdocs.yml`` on every run, even when only one stage had changed,
+which churned git diffs and triggered full mkdocs rebuilds. ``RenderCache``
+remembers a content hash of what each page was rendered from, together with
+the page as it was left, so a page is only re-rendered when its inputs
+changed or it was edited since. ``write_if_changed`` skips writes whose
+output is byte-identical to the file on disk.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+from .pipeline import PipelineCache, file_fingerprint
+
+
+def content_hash(value: Any) -> str:
+    """SHA-256 of text or bytes, or of the JSON form of anything else."""
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    elif not isinstance(value, bytes):
+        value = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(value).hexdigest()
+
+
+def write_if_changed(path: os.PathLike, content: str) -> bool:
+    """Write ``content`` to ``path`` unless the file already holds exactly it; True if written."""
+    path = Path(path)
+    data = content.encode("utf-8")
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+
+class RenderCache:
+    """
+    Per-page record of the inputs a generated file was last rendered from.
+
+    Stored in the pipeline cache table (``memory/lanterne.db``), one row per
+    page. The key covers the page's current bytes as well as its inputs, so
+    a page edited by hand or by another script is rendered again.
+
+    Args:
+        namespace: Separates the records of different generators.
+        cache: Where records are stored (default: a ``PipelineCache`` in the
+            active athlete's database).
+    """
+
+    def __init__(self, namespace: str = "docs", cache: Optional[PipelineCache] = None):
+        self.namespace = namespace
+        self.cache = cache if cache is not None else PipelineCache()
+
+    def _key(self, path: os.PathLike, inputs: Any) -> str:
+        return content_hash({"inputs": inputs, "page": file_fingerprint(path)})
+
+    def is_fresh(self, path: os.PathLike, inputs: Any) -> bool:
+        """True if ``path`` was rendered from ``inputs`` and hasn't changed since."""
+        return self.cache.has(self.namespace, Path(path).as_posix(), self._key(path, inputs))
+
+    def record(self, path: os.PathLike, inputs: Any) -> None:
+        """Remember that ``path``, as it is now, was rendered from ``inputs``."""
+        self.cache.put(self.namespace, Path(path).as_posix(), self._key(path, inputs), True)
@@ -11,6 +11,9 @@ from .data_ingestion import RideData, StageRaceData, RaceEvent
 from ..ai_clients import call_llm
 from ..validation import calculate_power_metrics
 from ..monitor import get_current_ftp
+from ..streams import StreamCache, describe_peaks, mmp_curve
+from ..streams.wbal import DEFAULT_W_PRIME, w_prime_balance as compute_w_prime_balance
+from ..prompt_budget import MAPPING_BUDGET, PromptSection, fit_sections
 
 
 @dataclass
@@ -47,7 +50,8 @@ class AnalysisResult:
 class AnalysisMappingAgent:
     """Maps user ride data to race events and assigns narrative role"""
 
-    def __init__(self):
+    def __init__(self, w_prime: float = DEFAULT_W_PRIME):
+        self.w_prime = w_prime  # Anaerobic capacity (J) for W′ balance; CP is taken as FTP
         self.power_zones = {
             'recovery': (0.0, 0.55),
             'endurance': (0.56, 0.75),
@@ -78,6 +82,16 @@ class AnalysisMappingAgent:
         high_efforts = len([i for i in ride_data.high_effort_intervals
                            if i.get('avg_power', 0) > ftp * 0.9])
 
+        # Peak efforts and W′ balance from the streams cached at ingestion
+        peak_powers = {}
+        w_prime_balance = ride_data.metadata.get('w_prime_balance')
+        streams = StreamCache().load(ride_data.activity_id)
+        if streams and streams.get('watts') is not None:
+            peak_powers = mmp_curve(streams['watts'], streams.get('time')).peaks()
+            if w_prime_balance is None and ftp > 0:
+                w_prime_balance = compute_w_prime_balance(
+                    streams['watts'], ftp, self.w_prime, streams.get('time')).summary()
+
         return {
             'duration_minutes': activity_data['duration_minutes'],
             'ftp': ftp,
@@ -87,7 +101,9 @@ class AnalysisMappingAgent:
             'normalized_power': power_metrics['normalized_power'],
             'high_effort_count': high_efforts,
             'avg_power_pct_ftp': (ride_data.avg_power / ftp * 100) if ftp > 0 and ride_data.avg_power else 0,
-            'max_power_pct_ftp': (ride_data.max_power / ftp * 100) if ftp > 0 and ride_data.max_power else 0
+            'max_power_pct_ftp': (ride_data.max_power / ftp * 100) if ftp > 0 and ride_data.max_power else 0,
+            'peak_powers': peak_powers,
+            'w_prime_balance': w_prime_balance
         }
 
     def assign_rider_role(self, ride_analysis: Dict[str, Any], stage_data: StageRaceData) -> RiderRole:
@@ -132,7 +148,9 @@ Max Power: {ride_analysis.get('max_power', 'N/A')}W
 Heart Rate: {ride_analysis.get('avg_hr', 'N/A')} bpm (avg)
 Intensity Factor: {ride_analysis['intensity_factor']:.2f}
 High Effort Intervals: {ride_analysis['high_effort_count']}
-Power Profile: Avg {ride_analysis['avg_power_pct_ftp']:.0f}% FTP, Max {ride_analysis['max_power_pct_ftp']:.0f}% FTP"""
+Power Profile: Avg {ride_analysis['avg_power_pct_ftp']:.0f}% FTP, Max {ride_analysis['max_power_pct_ftp']:.0f}% FTP
+Peak Powers: {describe_peaks(ride_analysis.get('peak_powers') or {}, ride_analysis.get('ftp'))}
+W′ Balance: {self._describe_w_prime_balance(ride_analysis.get('w_prime_balance'))}"""
 
         # Format stage report summary
         stage_summary = f"""Stage: {stage_data.stage_name}
@@ -176,6 +194,17 @@ Respond with JSON format:
         
         return prompt
     
+    def _describe_w_prime_balance(self, w_prime_balance: Optional[Dict[str, Any]]) -> str:
+        """One-line summary of within-ride fatigue for prompts"""
+        if not w_prime_balance:
+            return "N/A"
+        events = w_prime_balance.get('depletion_events', [])
+        text = f"lowest {w_prime_balance['min_balance_pct']:.0f}% of W′"
+        if events:
+            lows = ", ".join(f"{e['severity']} at {e['low_minute']:.0f}min" for e in events[:5])
+            text += f"; {len(events)} depletion episode(s): {lows}"
+        return text
+
     def _format_stage_events(self, events: List[RaceEvent]) -> str:
         """Format stage events for prompt"""
         if not events:
@@ -313,23 +342,33 @@ Respond with JSON format:
         return mapped_events
 
     def _build_mapping_prompt(self, ride_data: RideData, stage_data: StageRaceData) -> str:
-        """Build prompt for LLM effort-to-event mapping"""
+        """Build prompt for LLM effort-to-event mapping within the prompt token budget"""
         
         # Format user efforts
         effort_summary = []
         for i, interval in enumerate(ride_data.high_effort_intervals):
+            start_minute = interval.get('start_minute', 0)
+            end_minute = interval.get('end_minute', start_minute + (interval.get('duration_minutes') or 0))
             effort_summary.append(
-                f"Effort {i+1}: {interval.get('start_minute', 0)}-{interval.get('end_minute', 0)}min, "
+                f"Effort {i+1}: {start_minute}-{end_minute:g}min, "
                 f"{interval.get('avg_power', 0):.0f}W avg, {interval.get('max_power', 0):.0f}W max"
             )
         
+        # Within-ride fatigue: where the rider's W′ ran low
+        w_prime_balance = ride_data.metadata.get('w_prime_balance') or {}
+        fatigue_summary = [
+            f"Depletion {i+1}: {event['start_minute']:.0f}-{event['start_minute'] + event['duration_minutes']:.0f}min, "
+            f"W′ down to {event['min_balance_pct']:.0f}% ({event['severity']})"
+            for i, event in enumerate(w_prime_balance.get('depletion_events', []))
+        ]
+        
         # Format race events
         event_summary = []
         for i, event in enumerate(stage_data.events[:10]):  # Limit to key events
             time_info = f"{event.time_km}km" if event.time_km else f"{event.time_minutes}min"
             event_summary.append(f"Event {i+1}: {time_info} - {event.description}")
         
-        prompt = f"""You are the Analysis & Mapping Agent for Fiction Mode cycling narratives.
+        header = f"""You are the Analysis & Mapping Agent for Fiction Mode cycling narratives.
 
 TASK: Map the user's effort intervals to plausible race events for narrative purposes.
 
@@ -337,35 +376,44 @@ STAGE CONTEXT:
 - Stage: {stage_data.stage_name}
 - Type: {stage_data.stage_type}
 - Distance: {stage_data.distance_km}km
-- Winner: {stage_data.winner}
-
-USER EFFORT INTERVALS:
-{chr(10).join(effort_summary)}
+- Winner: {stage_data.winner}"""
 
-RACE EVENTS:
-{chr(10).join(event_summary)}
-
-INSTRUCTIONS:
+        instructions = """INSTRUCTIONS:
 1. Analyze the timing and intensity of user efforts vs race events
 2. Create plausible narrative connections (doesn't need to be exact timing)
 3. Consider that users might respond to race action, not initiate it
 4. Match high-intensity efforts to exciting race moments
-5. Provide confidence scores (0.0-1.0) for each mapping
+5. W′ depletions mark where the rider was on the limit: attacks, chases, or cracking on a climb
+6. Provide confidence scores (0.0-1.0) for each mapping
 
 Respond with JSON array format:
 [
-  {{
+  {
     "user_effort_index": 0,
     "race_event_index": 1,
     "confidence": 0.8,
     "narrative_description": "responded to the early breakaway formation with a surge to 320W"
-  }},
+  },
   ...
 ]
 
 Focus on creating compelling narrative connections rather than precise timing matches."""
+
+        # Trailing efforts are dropped before trailing events; indices stay valid
+        # because whole lines are kept from the top
+        fitted = fit_sections([
+            PromptSection('header', header, priority=2),
+            PromptSection('efforts', "\n".join(effort_summary), priority=0, strategy='lines'),
+            PromptSection('events', "\n".join(event_summary), priority=1, strategy='lines'),
+            PromptSection('fatigue', "\n".join(fatigue_summary), priority=0, strategy='lines'),
+            PromptSection('instructions', instructions, priority=2),
+        ], MAPPING_BUDGET)
         
-        return prompt
+        prompt = (f"{fitted['header']}\n\nUSER EFFORT INTERVALS:\n{fitted['efforts']}"
+                  f"\n\nRACE EVENTS:\n{fitted['events']}")
+        if fitted['fatigue']:
+            prompt += f"\n\nFATIGUE (W′ BALANCE):\n{fitted['fatigue']}"
+        return f"{prompt}\n\n{fitted['instructions']}"
 
     def _parse_mapping_response(self, response: str, user_intervals: List[Dict], race_events: List[RaceEvent]) -> List[MappedEvent]:
         """Parse LLM mapping response into MappedEvent objects"""
@@ -10,10 +10,18 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+import numpy as np
+
 from ..strava_api import strava_get, get_athlete_id
 from ..validation import validate_activity_data
-from ..ai_clients import call_llm
+from ..ai_clients import call_llm, llm_available
+from ..streams import StreamCache, detect_intervals, segment_summaries, to_array
+from ..streams.wbal import DEFAULT_W_PRIME, w_prime_balance
 from ..mission_config import MissionConfig, bootstrap
+from ..prompt_budget import (
+    EFFORT_ANALYSIS_BUDGET, EVENTS_EXTRACTION_BUDGET, RESULTS_EXTRACTION_BUDGET,
+    PromptSection, budget_text, fit_sections, normalize_whitespace
+)
 
 
 @dataclass
@@ -66,8 +74,15 @@ class StageRaceData:
 class RideDataIngestionAgent:
     """Fetches and processes user's Strava ride data for Fiction Mode"""
 
-    def __init__(self):
+    def __init__(self, segment_minutes: int = 10, detector: str = 'rules',
+                 label_with_llm: bool = False, ftp: Optional[float] = None,
+                 w_prime: float = DEFAULT_W_PRIME):
         self.athlete_id = None
+        self.segment_minutes = segment_minutes  # Window size for stream summaries
+        self.detector = detector  # 'rules' (hysteresis detector) or 'llm' (segment prompt)
+        self.label_with_llm = label_with_llm  # Let the LLM relabel detected intervals
+        self.ftp = ftp
+        self.w_prime = w_prime  # Anaerobic capacity (J) for W′ balance; CP is taken as FTP
 
     def detect_tdf_activity(self, activity: Dict[str, Any]) -> Optional[int]:
         """
@@ -95,32 +110,38 @@ class RideDataIngestionAgent:
 
     def extract_effort_intervals(self, activity: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
-        Extract high-effort intervals from detailed activity streams using LLM analysis.
-        Uses actual power/HR data streams for intelligent pattern detection.
+        Extract high-effort intervals from detailed activity streams.
+
+        By default intervals are found by the deterministic FTP-relative
+        detector (``streams.intervals``); the LLM only relabels them when
+        ``label_with_llm`` is set. ``detector='llm'`` keeps the older
+        segment-summary prompt.
         """
         activity_id = activity.get('id')
         if not activity_id:
             return []
 
-        # Get detailed streams data
-        stream_types = ['time', 'watts', 'heartrate', 'cadence', 'velocity_smooth']
-        streams_param = ','.join(stream_types)
-        
         try:
-            streams = strava_get(f'activities/{activity_id}/streams?keys={streams_param}&key_by_type=true')
+            # Detailed streams, cached on disk for later analysis (peak powers)
+            streams = StreamCache().fetch(activity_id)
             if not streams or 'time' not in streams:
                 return self._fallback_effort_extraction(activity)
             
             # Extract stream data
-            time_data = streams['time']['data']
-            watts_data = streams.get('watts', {}).get('data', [])
-            hr_data = streams.get('heartrate', {}).get('data', [])
+            time_data = streams['time']
+            watts_data = streams.get('watts')
+            hr_data = streams.get('heartrate')
             
-            if not watts_data and not hr_data:
+            if watts_data is None and hr_data is None:
                 return self._fallback_effort_extraction(activity)
             
-            # Use LLM to analyze the effort patterns
-            intervals = self._analyze_efforts_with_llm(time_data, watts_data, hr_data, activity)
+            if self.detector == 'llm':
+                intervals = self._analyze_efforts_with_llm(time_data, watts_data, hr_data, activity)
+            else:
+                intervals = detect_intervals(time_data, watts_data, hr_data, ftp=self._get_ftp(),
+                                             velocity=streams.get('velocity_smooth'))
+                if intervals and self.label_with_llm and llm_available():
+                    intervals = self._label_intervals_with_llm(intervals, activity)
             
             if intervals:
                 return intervals
@@ -131,67 +152,97 @@ class RideDataIngestionAgent:
         # Fallback to basic analysis
         return self._fallback_effort_extraction(activity)
 
+    def _get_ftp(self) -> float:
+        """Athlete FTP for interval detection (mission config unless given)."""
+        if self.ftp is None:
+            from ..monitor import get_current_ftp
+            self.ftp = get_current_ftp()
+        return self.ftp
+
+    def _label_intervals_with_llm(self, intervals: List[Dict[str, Any]],
+                                  activity: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Ask the LLM for narrative labels of detected intervals; keep rule labels on failure."""
+        lines = []
+        for index, interval in enumerate(intervals, 1):
+            line = (f"Interval {index}: {interval['start_minute']}min for "
+                    f"{interval['duration_minutes']}min, type {interval['effort_type']}")
+            if interval.get('avg_power') is not None:
+                line += f", Power {interval['avg_power']:.0f}W (max {interval['max_power']:.0f}W)"
+            if interval.get('avg_hr') is not None:
+                line += f", HR {interval['avg_hr']:.0f}bpm"
+            lines.append(line)
+
+        prompt = f"""ACTIVITY: {activity.get('name', 'Unknown')}
+
+DETECTED EFFORT INTERVALS:
+{chr(10).join(lines)}
+
+For each interval, choose an effort type (surge, sustained, recovery, sprint, climb, tempo)
+and write a one-line description that could represent a race event.
+
+Respond with JSON array:
+[{{"index": 1, "effort_type": "surge", "description": "Mid-ride power surge - possible attack response"}}]"""
+
+        import json
+
+        try:
+            messages = [
+                {"role": "system", "content": "You are an expert cycling data analyst who labels detected effort intervals."},
+                {"role": "user", "content": prompt}
+            ]
+            response = call_llm(messages, model="gpt-4", force_json=True)
+            json_match = re.search(r'\[.*\]', response, re.DOTALL)
+            labels = json.loads(json_match.group()) if json_match else []
+        except Exception as e:
+            print(f"LLM interval labeling failed, keeping rule labels: {e}")
+            return intervals
+
+        labelled = [dict(interval) for interval in intervals]
+        for label in labels:
+            index = label.get('index') if isinstance(label, dict) else None
+            if isinstance(index, int) and 1 <= index <= len(labelled):
+                interval = labelled[index - 1]
+                interval['effort_type'] = label.get('effort_type') or interval['effort_type']
+                interval['description'] = label.get('description') or interval['description']
+        return labelled
+
     def _analyze_efforts_with_llm(self, time_data: List[int], watts_data: List[float], 
                                   hr_data: List[float], activity: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Use LLM to analyze effort patterns from streams data"""
         
-        if not time_data:
+        # Convert streams to arrays once; all statistics below are vectorized
+        time_array = to_array(time_data)
+        if time_array is None:
             return []
+        watts_array = to_array(watts_data)
+        hr_array = to_array(hr_data)
         
         # Prepare summary statistics for LLM
-        total_minutes = max(time_data) / 60 if time_data else 0
+        total_minutes = float(np.nanmax(time_array)) / 60
         
         # Calculate power statistics
         power_stats = {}
-        if watts_data:
+        if watts_array is not None:
             power_stats = {
-                'avg_power': sum(watts_data) / len(watts_data),
-                'max_power': max(watts_data),
-                'min_power': min(watts_data)
+                'avg_power': float(np.nanmean(watts_array)),
+                'max_power': float(np.nanmax(watts_array)),
+                'min_power': float(np.nanmin(watts_array))
             }
         
         # Calculate HR statistics  
         hr_stats = {}
-        if hr_data and any(hr > 0 for hr in hr_data):
-            valid_hr = [hr for hr in hr_data if hr > 0]
-            if valid_hr:
+        if hr_array is not None:
+            valid_hr = hr_array[hr_array > 0]
+            if valid_hr.size:
                 hr_stats = {
-                    'avg_hr': sum(valid_hr) / len(valid_hr),
-                    'max_hr': max(valid_hr),
-                    'min_hr': min(valid_hr)
+                    'avg_hr': float(valid_hr.mean()),
+                    'max_hr': float(valid_hr.max()),
+                    'min_hr': float(valid_hr.min())
                 }
         
-        # Create 10-minute segment summaries for LLM analysis
-        segment_minutes = 10
-        segments = []
-        
-        for segment_start in range(0, int(total_minutes), segment_minutes):
-            segment_end = min(segment_start + segment_minutes, total_minutes)
-            segment_indices = [i for i, t in enumerate(time_data) 
-                              if segment_start*60 <= t < segment_end*60]
-            
-            if segment_indices:
-                segment_data = {
-                    'start_min': segment_start,
-                    'end_min': segment_end,
-                }
-                
-                if watts_data:
-                    segment_powers = [watts_data[i] for i in segment_indices]
-                    segment_data.update({
-                        'avg_power': sum(segment_powers) / len(segment_powers),
-                        'max_power': max(segment_powers)
-                    })
-                
-                if hr_data:
-                    segment_hrs = [hr_data[i] for i in segment_indices if hr_data[i] > 0]
-                    if segment_hrs:
-                        segment_data.update({
-                            'avg_hr': sum(segment_hrs) / len(segment_hrs),
-                            'max_hr': max(segment_hrs)
-                        })
-                
-                segments.append(segment_data)
+        # Segment summaries for LLM analysis
+        segments = segment_summaries(time_array, watts_array, hr_array,
+                                     window_minutes=self.segment_minutes)
         
         # Build LLM prompt for effort analysis
         effort_prompt = self._build_effort_analysis_prompt(
@@ -213,11 +264,11 @@ class RideDataIngestionAgent:
 
     def _build_effort_analysis_prompt(self, activity: Dict[str, Any], power_stats: Dict, 
                                      hr_stats: Dict, segments: List[Dict], total_minutes: float) -> str:
-        """Build prompt for LLM effort interval analysis"""
+        """Build prompt for LLM effort interval analysis within the prompt token budget"""
         
         activity_name = activity.get('name', 'Unknown')
         
-        prompt = f"""You are the Ride Data Ingestion Agent for Fiction Mode cycling narratives.
+        header = f"""You are the Ride Data Ingestion Agent for Fiction Mode cycling narratives.
 
 TASK: Analyze this ride's effort patterns to identify key intervals for narrative purposes.
 
@@ -227,28 +278,23 @@ DURATION: {total_minutes:.1f} minutes
 OVERALL STATS:"""
         
         if power_stats:
-            prompt += f"""
+            header += f"""
 POWER: Avg {power_stats['avg_power']:.0f}W, Max {power_stats['max_power']:.0f}W"""
         
         if hr_stats:
-            prompt += f"""
+            header += f"""
 HEART RATE: Avg {hr_stats['avg_hr']:.0f}bpm, Max {hr_stats['max_hr']:.0f}bpm"""
         
-        prompt += f"""
-
-10-MINUTE SEGMENTS:"""
-        
+        segment_lines = []
         for segment in segments:
-            prompt += f"""
-{segment['start_min']}-{segment['end_min']}min:"""
+            line = f"{segment['start_min']}-{segment['end_min']}min:"
             if 'avg_power' in segment:
-                prompt += f" Power {segment['avg_power']:.0f}W (max {segment['max_power']:.0f}W)"
+                line += f" Power {segment['avg_power']:.0f}W (max {segment['max_power']:.0f}W)"
             if 'avg_hr' in segment:
-                prompt += f" HR {segment['avg_hr']:.0f}bpm (max {segment['max_hr']:.0f}bpm)"
+                line += f" HR {segment['avg_hr']:.0f}bpm (max {segment['max_hr']:.0f}bpm)"
+            segment_lines.append(line)
         
-        prompt += f"""
-
-INSTRUCTIONS:
+        instructions = """INSTRUCTIONS:
 1. Identify 2-5 significant effort intervals that could represent race events
 2. Look for power/HR surges, sustained efforts, or tactical moments
 3. Consider the activity name for context (TDF stage simulation, training, etc.)
@@ -256,7 +302,7 @@ INSTRUCTIONS:
 
 Respond with JSON array:
 [
-  {{
+  {
     "start_minute": 25.5,
     "duration_minutes": 2.3,
     "avg_power": 105,
@@ -264,13 +310,21 @@ Respond with JSON array:
     "avg_hr": 145,
     "effort_type": "surge",
     "description": "Mid-ride power surge - possible attack response"
-  }}
+  }
 ]
 
 Effort types: surge, sustained, recovery, sprint, climb, tempo
 Focus on intervals that tell a story about the rider's tactical choices."""
         
-        return prompt
+        # Segment summaries are the only part that grows with ride length
+        fitted = fit_sections([
+            PromptSection('header', header, priority=2),
+            PromptSection('segments', "\n".join(segment_lines), priority=0, strategy='lines'),
+            PromptSection('instructions', instructions, priority=2),
+        ], EFFORT_ANALYSIS_BUDGET)
+        
+        return (f"{fitted['header']}\n\n{self.segment_minutes}-MINUTE SEGMENTS:\n{fitted['segments']}"
+                f"\n\n{fitted['instructions']}")
 
     def _parse_effort_response(self, response: str) -> List[Dict[str, Any]]:
         """Parse LLM response into effort interval objects"""
@@ -352,6 +406,17 @@ Focus on intervals that tell a story about the rider's tactical choices."""
         # Extract effort intervals
         intervals = self.extract_effort_intervals(validated_activity)
 
+        metadata = {
+            'sport_type': activity.get('sport_type'),
+            'trainer': activity.get('trainer', False),
+            'commute': activity.get('commute', False),
+            'total_elevation_gain': validated_activity.get('total_elevation_gain', 0)
+        }
+        # Within-ride fatigue from the streams cached by interval extraction
+        wbal = self._w_prime_balance(activity['id'])
+        if wbal:
+            metadata['w_prime_balance'] = wbal
+
         return RideData(
             activity_id=activity['id'],
             start_time=start_time,
@@ -367,14 +432,21 @@ Focus on intervals that tell a story about the rider's tactical choices."""
             activity_name=activity.get('name', ''),
             description=activity.get('description'),
             high_effort_intervals=intervals,
-            metadata={
-                'sport_type': activity.get('sport_type'),
-                'trainer': activity.get('trainer', False),
-                'commute': activity.get('commute', False),
-                'total_elevation_gain': validated_activity.get('total_elevation_gain', 0)
-            }
+            metadata=metadata
         )
 
+    def _w_prime_balance(self, activity_id: int) -> Optional[Dict[str, Any]]:
+        """W′ balance summary (low point and depletion events) from cached streams."""
+        try:
+            streams = StreamCache().load(activity_id)
+            if not streams or streams.get('watts') is None:
+                return None
+            return w_prime_balance(streams['watts'], self._get_ftp(), self.w_prime,
+                                   streams.get('time')).summary()
+        except Exception as e:
+            print(f"W′ balance unavailable for activity {activity_id}: {e}")
+            return None
+
     def find_todays_tdf_ride(self) -> Optional[RideData]:
         """Find today's TDF simulation ride"""
 
@@ -537,14 +609,11 @@ class RaceDataIngestionAgent:
     def _build_events_extraction_prompt(self, stage_report: str, stage_number: int) -> str:
         """Build prompt for LLM race event extraction"""
         
-        prompt = f"""You are the Race Data Ingestion Agent for Fiction Mode cycling narratives.
+        header = """You are the Race Data Ingestion Agent for Fiction Mode cycling narratives.
 
-TASK: Extract key race events from this stage report for narrative purposes.
+TASK: Extract key race events from this stage report for narrative purposes."""
 
-STAGE REPORT:
-{stage_report[:2000]}  # Limit text length
-
-INSTRUCTIONS:
+        instructions = """INSTRUCTIONS:
 1. Identify key race events: breakaways, attacks, crashes, sprints, climbs, etc.
 2. Extract timing information (km markers or time) when available
 3. Note important riders involved
@@ -552,26 +621,35 @@ INSTRUCTIONS:
 
 Respond with JSON array format:
 [
-  {{
+  {
     "time_km": 45.5,
     "time_minutes": null,
     "event_type": "breakaway",
     "description": "Five riders escape: Pacher, Bouchard, Declercq break clear",
     "riders": ["Pacher", "Bouchard", "Declercq"]
-  }},
-  {{
+  },
+  {
     "time_km": null,
     "time_minutes": 180,
     "event_type": "attack",
     "description": "Pogačar attacks on the final climb",
     "riders": ["Pogačar"]
-  }}
+  }
 ]
 
 Event types: breakaway, attack, crash, sprint, climb, catch, finish
 Extract maximum 8 key events for narrative focus."""
-        
-        return prompt
+
+        # Scraped pages carry navigation and whitespace noise; normalize before
+        # summarizing the report into whatever the fixed sections leave over
+        fitted = fit_sections([
+            PromptSection('header', header, priority=2),
+            PromptSection('report', normalize_whitespace(stage_report), priority=0, strategy='summary'),
+            PromptSection('instructions', instructions, priority=2),
+        ], EVENTS_EXTRACTION_BUDGET)
+
+        return (f"{fitted['header']}\n\nSTAGE REPORT:\n{fitted['report']}"
+                f"\n\n{fitted['instructions']}")
 
     def _parse_events_response(self, response: str) -> List[RaceEvent]:
         """Parse LLM response into RaceEvent objects"""
@@ -709,11 +787,8 @@ Extract maximum 8 key events for narrative focus."""
     def _extract_results_with_llm(self, results_content: str, stage_number: int) -> List[Dict[str, str]]:
         """Extract structured results from webpage content using LLM"""
         
-        # Clean up the content and limit size
-        content_text = results_content
-        if len(content_text) > 2000:
-            # Look for likely results section
-            content_text = content_text[:2000]
+        # Clean up the content and keep the leading lines within budget
+        content_text = budget_text(results_content, RESULTS_EXTRACTION_BUDGET, strategy='lines')
         
         prompt = f"""Extract the top 10 stage results from this Tour de France 2025 stage {stage_number} webpage.
 
@@ -1083,9 +1158,9 @@ Return ONLY valid JSON."""
     def _get_stage_config(self, stage_number: int) -> Optional[Dict[str, Any]]:
         """Get stage configuration from mission config if available"""
         try:
-            # Bootstrap config from the standard mission config path
-            config_path = "missions/tdf_sim_2025.toml"
-            config = bootstrap(config_path)
+            # Bootstrap the active athlete's mission config
+            from ..athlete import current_athlete
+            config = bootstrap(current_athlete().mission_path)
             if not config or not config.tdf_simulation:
                 return None
             
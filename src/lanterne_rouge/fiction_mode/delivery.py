@@ -5,6 +5,7 @@ Formats and delivers completed narratives in various formats.
 """
 
 import json
+import os
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
@@ -31,6 +32,43 @@ class DeliveryOptions:
     save_to_archive: bool = True
 
 
+class StreamingArchiveWriter:
+    """Writes a narrative to the archive as it streams in from the LLM.
+
+    The Markdown header is written as soon as the writer is opened so the
+    draft file (and any console echo) shows output within the first second;
+    each streamed fragment is then appended and flushed. The draft lives
+    beside the published ``stage{N}.md``, never in it: only a successful
+    ``deliver_narrative`` replaces the published page, with the edited, fully
+    formatted version. If editing or delivery fails the page is untouched.
+    """
+
+    def __init__(self, file_path: Path, header: str, echo: bool = False):
+        self.file_path = file_path
+        self.echo = echo
+        self._handle = open(file_path, 'w', encoding='utf-8')
+        self._handle.write(header)
+        self._handle.flush()
+
+    def __call__(self, chunk: str) -> None:
+        """Append a streamed fragment; usable directly as an ``on_chunk`` callback."""
+        if self._handle.closed:
+            return
+        self._handle.write(chunk)
+        self._handle.flush()
+        if self.echo:
+            print(chunk, end="", flush=True)
+
+    def close(self) -> Path:
+        """Finish the draft file and return its path."""
+        if not self._handle.closed:
+            self._handle.write("\n")
+            self._handle.close()
+            if self.echo:
+                print()
+        return self.file_path
+
+
 @dataclass
 class DeliveredNarrative:
     """Complete delivered narrative package"""
@@ -88,6 +126,24 @@ class DeliveryAgent:
             format=options.format
         )
 
+    def open_stream(self, analysis: AnalysisResult, options: DeliveryOptions,
+                    echo: bool = False) -> StreamingArchiveWriter:
+        """Start a progressive Markdown draft for a narrative that is still being generated"""
+
+        title = self._generate_title(analysis, options.title_format)
+        stage_date = analysis.stage_data.date.strftime('%B %d, %Y')
+        header = f"# {title}\n\n*{stage_date}*\n\n⸻\n\n"
+
+        file_path = self.draft_path(analysis.stage_data.stage_number)
+        if echo:
+            print(header, end="", flush=True)
+        return StreamingArchiveWriter(file_path, header, echo=echo)
+
+    def draft_path(self, stage_number: int) -> Path:
+        """Where a stage's narrative is drafted while streaming (a dotfile, so mkdocs skips it)"""
+
+        return self.archive_dir / f".stage{stage_number}.md.draft"
+
     def _generate_title(self, analysis: AnalysisResult, title_format: str) -> str:
         """Generate narrative title"""
 
@@ -311,9 +367,13 @@ Generated by Lanterne Rouge Fiction Mode
         
         file_path = self.archive_dir / filename
 
-        # Write file
-        with open(file_path, 'w', encoding='utf-8') as f:
+        # Write beside the file, then rename over it, so the published page is
+        # replaced only once the new version is complete (the streamed draft
+        # becomes the page)
+        temp_path = self.draft_path(stage_num) if format == 'markdown' else file_path.with_name(f".{filename}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
             f.write(content)
+        os.replace(temp_path, file_path)
 
         print(f"📄 Narrative saved to: {file_path}")
         return file_path
@@ -4,11 +4,11 @@ Editor Agent for Fiction Mode
 Reviews and polishes generated narratives for style, accuracy, and quality.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import re
 
-from ..ai_clients import call_llm
+from ..ai_clients import call_llm, call_llm_stream, collect_stream
 from .analysis import AnalysisResult
 
 
@@ -68,8 +68,12 @@ class EditorAgent:
             'missing cycling context or atmosphere'
         ]
 
-    def llm_edit_narrative(self, narrative: str, analysis: AnalysisResult) -> str:
-        """Edit narrative using LLM with the documented Editor Agent prompt"""
+    def llm_edit_narrative(self, narrative: str, analysis: AnalysisResult,
+                           on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Edit narrative using LLM with the documented Editor Agent prompt
+
+        When ``on_chunk`` is given the edit is streamed fragment by fragment.
+        """
         
         # Use the exact prompt from context/tdf_fiction_mode.md
         prompt = f"""You are the Editor Agent for the Fiction Mode cycling narrative generator.
@@ -107,12 +111,18 @@ Edit the narrative to improve style, flow, and accuracy while maintaining the Ti
                 }
             ]
 
-            edited_narrative = call_llm(
-                messages=messages,
-                model="gpt-4",
-                temperature=0.3,
-                max_tokens=2500
-            )
+            if on_chunk is not None:
+                edited_narrative = collect_stream(
+                    call_llm_stream(messages, model="gpt-4", temperature=0.3, max_tokens=2500),
+                    on_chunk
+                )
+            else:
+                edited_narrative = call_llm(
+                    messages=messages,
+                    model="gpt-4",
+                    temperature=0.3,
+                    max_tokens=2500
+                )
 
             return edited_narrative.strip()
 
@@ -138,8 +148,13 @@ Edit the narrative to improve style, flow, and accuracy while maintaining the Ti
                       user_feedback: Optional[str] = None,
                       use_llm: bool = True,
                       quality_threshold: float = 0.9,
-                      max_iterations: int = 2) -> EditingReport:
-        """Complete editing pass on the narrative with quality standards"""
+                      max_iterations: int = 2,
+                      on_chunk: Optional[Callable[[str], None]] = None) -> EditingReport:
+        """Complete editing pass on the narrative with quality standards
+
+        ``on_chunk`` is forwarded to the LLM edit passes so callers can stream
+        each revision as it is produced.
+        """
 
         original_narrative = narrative
         current_narrative = narrative
@@ -151,7 +166,7 @@ Edit the narrative to improve style, flow, and accuracy while maintaining the Ti
             
             # Use LLM editing if requested (default for high-quality output)
             if use_llm:
-                current_narrative = self.llm_edit_narrative(current_narrative, analysis)
+                current_narrative = self.llm_edit_narrative(current_narrative, analysis, on_chunk)
             
             # Run all editing checks on the current version
             style_score = self._check_style_consistency(current_narrative, style_name)
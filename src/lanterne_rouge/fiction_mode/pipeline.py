@@ -16,6 +16,8 @@ from .writer import WriterAgent
 from .editor import EditorAgent, EditingReport
 from .delivery import DeliveryAgent, DeliveryOptions, DeliveredNarrative
 from .rider_profile import RiderProfileManager
+from ..ai_clients import print_chunk
+from ..athlete import AthleteContext, as_athlete, current_athlete
 from ..tdf_tracker import TDFTracker
 
 
@@ -29,6 +31,7 @@ class FictionModeConfig:
     auto_detect_stage: bool = True
     require_min_duration: int = 30  # minutes
     user_bio: Optional[str] = None
+    stream_output: bool = False  # stream the draft to console/archive as it is written
 
 
 @dataclass
@@ -46,14 +49,17 @@ class PipelineResult:
 class FictionModeOrchestrator:
     """Orchestrates the complete Fiction Mode pipeline"""
 
-    def __init__(self, config: Optional[FictionModeConfig] = None):
+    def __init__(self, config: Optional[FictionModeConfig] = None,
+                 athlete: Optional[AthleteContext] = None):
         self.config = config or FictionModeConfig()
+        # Whose rides, profile, points and narrative archive to use
+        self.athlete = athlete or current_athlete()
 
         # Initialize rider profile manager
-        self.profile_manager = RiderProfileManager()
+        self.profile_manager = RiderProfileManager(self.athlete.rider_profile_file)
         
         # Initialize TDF tracker
-        self.tdf_tracker = TDFTracker()
+        self.tdf_tracker = TDFTracker(athlete=self.athlete)
 
         # Initialize agents
         self.ride_agent = RideDataIngestionAgent()
@@ -61,8 +67,9 @@ class FictionModeOrchestrator:
         self.analysis_agent = AnalysisMappingAgent()
         self.writer_agent = WriterAgent()
         self.editor_agent = EditorAgent()
-        self.delivery_agent = DeliveryAgent()
+        self.delivery_agent = DeliveryAgent(archive_dir=str(self.athlete.narratives_dir))
 
+    @as_athlete
     def process_todays_ride(self, user_feedback: Optional[str] = None) -> PipelineResult:
         """Process today's ride through the complete Fiction Mode pipeline"""
 
@@ -163,11 +170,7 @@ class FictionModeOrchestrator:
 
             # Step 5: Generate narrative
             print(f"✍️ Generating narrative in {self.config.narrative_style} style...")
-            narrative = self.writer_agent.generate_narrative(
-                analysis,
-                self.config.narrative_style,
-                self.config.user_bio
-            )
+            narrative = self._generate_narrative(analysis)
 
             print(f"✅ Narrative generated ({len(narrative.split())} words)")
 
@@ -231,6 +234,7 @@ class FictionModeOrchestrator:
                 processing_time_seconds=processing_time
             )
 
+    @as_athlete
     def process_specific_activity(self, activity_id: int, stage_number: int,
                                 user_feedback: Optional[str] = None) -> PipelineResult:
         """Process a specific Strava activity as a TDF stage"""
@@ -270,11 +274,7 @@ class FictionModeOrchestrator:
             # (Same as process_todays_ride from Step 4 onwards)
             analysis = self.analysis_agent.analyze_and_map(ride_data, race_data)
 
-            narrative = self.writer_agent.generate_narrative(
-                analysis,
-                self.config.narrative_style,
-                self.config.user_bio
-            )
+            narrative = self._generate_narrative(analysis)
 
             editing_report = self.editor_agent.edit_narrative(
                 narrative,
@@ -320,6 +320,43 @@ class FictionModeOrchestrator:
                 processing_time_seconds=processing_time
             )
 
+    def _generate_narrative(self, analysis: AnalysisResult) -> str:
+        """Run the writer, streaming the draft when ``stream_output`` is enabled"""
+
+        if not self.config.stream_output:
+            return self.writer_agent.generate_narrative(
+                analysis,
+                self.config.narrative_style,
+                self.config.user_bio
+            )
+
+        # Markdown archives get a progressive draft file; other formats just echo
+        if self.config.save_to_archive and self.config.delivery_format == 'markdown':
+            sink = self.delivery_agent.open_stream(
+                analysis,
+                DeliveryOptions(format='markdown'),
+                echo=True
+            )
+            try:
+                return self.writer_agent.generate_narrative(
+                    analysis,
+                    self.config.narrative_style,
+                    self.config.user_bio,
+                    on_chunk=sink
+                )
+            finally:
+                sink.close()
+
+        narrative = self.writer_agent.generate_narrative(
+            analysis,
+            self.config.narrative_style,
+            self.config.user_bio,
+            on_chunk=print_chunk
+        )
+        print()
+        return narrative
+
+    @as_athlete
     def preview_analysis(self, activity_id: Optional[int] = None) -> Optional[AnalysisResult]:
         """Preview the analysis without generating narrative"""
 
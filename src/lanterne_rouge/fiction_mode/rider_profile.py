@@ -53,7 +53,7 @@ class RiderProfileManager:
             self.profile_path = Path(profile_path)
         
         # Ensure config directory exists
-        self.profile_path.parent.mkdir(exist_ok=True)
+        self.profile_path.parent.mkdir(parents=True, exist_ok=True)
     
     def is_profile_customized(self, profile: RiderProfile) -> bool:
         """Check if profile has been customized from template"""
@@ -4,11 +4,11 @@ Writer Agent for Fiction Mode
 Generates literary cycling narratives in various styles from analyzed ride data.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from dataclasses import dataclass
 import re
 
-from ..ai_clients import call_llm
+from ..ai_clients import call_llm, call_llm_stream, collect_stream
 from .analysis import AnalysisResult, MappedEvent
 from .rider_profile import get_rider_prompt_context, get_rider_context
 
@@ -88,8 +88,14 @@ class WriterAgent:
 
     def generate_narrative(self, analysis: AnalysisResult,
                          style_name: str = 'krabbe',
-                         stage_number: Optional[int] = None) -> str:
-        """Generate complete narrative from analysis with rider profile context"""
+                         stage_number: Optional[int] = None,
+                         on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Generate complete narrative from analysis with rider profile context
+
+        When ``on_chunk`` is given the completion is streamed and every fragment
+        is passed to it as it arrives (e.g. to echo to the console or append to
+        the archive file); the full narrative is still returned at the end.
+        """
 
         style = self.styles.get(style_name, self.styles['krabbe'])
 
@@ -113,12 +119,18 @@ class WriterAgent:
                 }
             ]
 
-            narrative = call_llm(
-                messages=messages,
-                model="gpt-4",
-                temperature=0.8,
-                max_tokens=2000
-            )
+            if on_chunk is not None:
+                narrative = collect_stream(
+                    call_llm_stream(messages, model="gpt-4", temperature=0.8, max_tokens=2000),
+                    on_chunk
+                )
+            else:
+                narrative = call_llm(
+                    messages=messages,
+                    model="gpt-4",
+                    temperature=0.8,
+                    max_tokens=2000
+                )
 
             # Post-process to replace any remaining template variables
             narrative = self._replace_template_variables(narrative, analysis, rider_context)
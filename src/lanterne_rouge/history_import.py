@@ -0,0 +1,566 @@
+"""
+Offline import of activity and wellness history.
+
+Streams bulk exports into the local SQLite database (``memory/lanterne.db``
+by default) without touching any API:
+
+- Activity CSVs from Strava (API-shaped exports like
+  ``tests/strava_export_*.csv`` or the account "bulk export" ``activities.csv``)
+  and intervals.icu (``i<athlete>_activities.csv``).
+- Wellness CSVs from intervals.icu (``athlete_<id>_wellness.csv``).
+- TCX files (plain or ``.tcx.gz``, e.g. the ``activities/`` folder of a Strava
+  bulk export or FIT files converted to TCX): a summary row goes into the
+  activity table and the per-second streams into the ``StreamCache``.
+
+Rows are read one at a time, coerced to typed values and written in chunked
+transactions. Activities are deduplicated by activity id (the first import
+wins); wellness days are upserted so a newer export refreshes older values.
+"""
+from __future__ import annotations
+
+import csv
+import datetime
+import gzip
+import io
+import itertools
+import os
+import sqlite3
+import time
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .streams.mmp import DEFAULT_ATHLETE
+
+CHUNK_ROWS = 2000  # Rows per transaction
+
+
+# --------------------------------------------------------------------------- #
+#  Type coercion
+# --------------------------------------------------------------------------- #
+
+def to_float(value: Any) -> Optional[float]:
+    """Parse a CSV cell as float (``None`` for blanks and junk)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace(",", "")
+    if not text:
+        return None
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return None if np.isnan(number) else number
+
+
+def to_bool(value: Any) -> Optional[int]:
+    """Parse ``true``/``false``/``1``/``0`` cells; stored as SQLite integers."""
+    text = str(value).strip().lower() if value is not None else ""
+    if text in ("true", "1", "yes", "y", "t"):
+        return 1
+    if text in ("false", "0", "no", "n", "f"):
+        return 0
+    return None
+
+
+def to_text(value: Any) -> Optional[str]:
+    text = str(value).strip() if value is not None else ""
+    return text or None
+
+
+def to_id(value: Any) -> Optional[str]:
+    """Activity ids as text; ``14907017808.0`` and ``i14907017808`` become ``14907017808``."""
+    text = to_text(value)
+    if text is None:
+        return None
+    if text.endswith(".0") and text[:-2].isdigit():
+        text = text[:-2]
+    if text[:1] == "i" and text[1:].isdigit():
+        text = text[1:]
+    return text
+
+
+_DATE_FORMATS = ("%b %d, %Y, %I:%M:%S %p", "%d %b %Y, %H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d")
+
+
+def to_timestamp(value: Any) -> Optional[str]:
+    """Normalise export timestamps to ``YYYY-MM-DDTHH:MM:SS`` (no timezone)."""
+    text = to_text(value)
+    if text is None:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        for fmt in _DATE_FORMATS:
+            try:
+                parsed = datetime.datetime.strptime(text, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+    return parsed.replace(tzinfo=None).isoformat(timespec="seconds")
+
+
+def to_date(value: Any) -> Optional[str]:
+    stamp = to_timestamp(value)
+    return stamp[:10] if stamp else None
+
+
+# --------------------------------------------------------------------------- #
+#  Column mapping
+# --------------------------------------------------------------------------- #
+
+# (column, coercer, export headers in priority order)
+ACTIVITY_FIELDS: Sequence[Tuple[str, Callable[[Any], Any], Tuple[str, ...]]] = (
+    ("activity_id", to_id, ("id", "Activity ID")),
+    ("start_date_local", to_timestamp, ("start_date_local", "Activity Date", "start_date")),
+    ("name", to_text, ("name", "Activity Name")),
+    ("sport_type", to_text, ("sport_type", "type", "Activity Type")),
+    ("moving_time", to_float, ("moving_time", "Moving Time")),
+    ("elapsed_time", to_float, ("elapsed_time", "Elapsed Time")),
+    ("distance", to_float, ("distance", "Distance")),
+    ("total_elevation_gain", to_float, ("total_elevation_gain", "Elevation Gain")),
+    ("average_watts", to_float, ("average_watts", "icu_average_watts", "Average Watts")),
+    ("weighted_average_watts", to_float,
+     ("weighted_average_watts", "icu_normalized_watts", "Weighted Average Power")),
+    ("max_watts", to_float, ("max_watts", "Max Watts")),
+    ("kilojoules", to_float, ("kilojoules",)),
+    ("average_heartrate", to_float, ("average_heartrate", "Average Heart Rate")),
+    ("max_heartrate", to_float, ("max_heartrate", "Max Heart Rate")),
+    ("average_cadence", to_float, ("average_cadence", "Average Cadence")),
+    ("suffer_score", to_float, ("suffer_score", "relative_effort", "Relative Effort")),
+    ("training_load", to_float, ("icu_training_load", "Training Load")),
+    ("ftp", to_float, ("icu_ftp",)),
+    ("trainer", to_bool, ("trainer",)),
+    ("commute", to_bool, ("commute", "Commute")),
+    ("external_id", to_text, ("external_id", "Filename")),
+)
+
+WELLNESS_FIELDS: Sequence[Tuple[str, Callable[[Any], Any], Tuple[str, ...]]] = (
+    ("date", to_date, ("date", "id")),
+    ("resting_hr", to_float, ("restingHR", "resting_hr")),
+    ("hrv", to_float, ("hrv",)),
+    ("readiness", to_float, ("readiness",)),
+    ("sleep_secs", to_float, ("sleepSecs", "sleep_secs")),
+    ("sleep_score", to_float, ("sleepScore", "sleep_score")),
+    ("weight", to_float, ("weight",)),
+    ("ctl", to_float, ("ctl",)),
+    ("atl", to_float, ("atl",)),
+)
+
+ACTIVITY_COLUMNS = [name for name, _, _ in ACTIVITY_FIELDS]
+WELLNESS_COLUMNS = [name for name, _, _ in WELLNESS_FIELDS]
+
+_SQL_TYPES = {
+    "start_date_local": "TEXT", "name": "TEXT", "sport_type": "TEXT", "external_id": "TEXT",
+    "trainer": "INTEGER", "commute": "INTEGER",
+}
+
+
+def _column_plan(header: Sequence[str], fields) -> List[Tuple[Callable[[Any], Any], List[str]]]:
+    """For each field, the coercer and the export headers present in this file."""
+    present = set(header)
+    return [(coerce, [alias for alias in aliases if alias in present]) for _, coerce, aliases in fields]
+
+
+def _coerce_row(row: Dict[str, Any], plan) -> List[Any]:
+    values = []
+    for coerce, headers in plan:
+        value = None
+        for header in headers:
+            value = coerce(row.get(header))
+            if value is not None:
+                break
+        values.append(value)
+    return values
+
+
+def _open_text(path: Path) -> io.TextIOBase:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8-sig", newline="")
+    return open(path, encoding="utf-8-sig", newline="")
+
+
+def _chunks(rows: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@dataclass
+class ImportResult:
+    """Counts for one imported file."""
+    source: str
+    kind: str
+    read: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    elapsed_seconds: float = 0.0
+
+    def format(self) -> str:
+        return (f"✅ {self.source}: {self.inserted} {self.kind} imported, "
+                f"{self.duplicates} duplicates, {self.invalid} invalid "
+                f"({self.read} rows in {self.elapsed_seconds:.2f}s)")
+
+
+# --------------------------------------------------------------------------- #
+#  Store
+# --------------------------------------------------------------------------- #
+
+class HistoryStore:
+    """SQLite tables of imported activities and daily wellness values."""
+
+    def __init__(self, db_path: Optional[os.PathLike] = None):
+        if db_path is None:
+            from .memory_bus import db_file
+            db_path = db_file()
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        activity_columns = ",\n                ".join(
+            f"{name} {_SQL_TYPES.get(name, 'REAL')}" for name in ACTIVITY_COLUMNS[1:])
+        wellness_columns = ",\n                ".join(f"{name} REAL" for name in WELLNESS_COLUMNS[1:])
+        with self._connect() as conn:
+            conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS activities (
+                athlete_id TEXT NOT NULL,
+                activity_id TEXT NOT NULL,
+                {activity_columns},
+                source TEXT,
+                PRIMARY KEY (athlete_id, activity_id)
+            )
+            """)
+            conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_activities_date
+            ON activities(athlete_id, start_date_local)
+            """)
+            conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS wellness (
+                athlete_id TEXT NOT NULL,
+                date TEXT NOT NULL,
+                {wellness_columns},
+                source TEXT,
+                PRIMARY KEY (athlete_id, date)
+            )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def write_activities(self, rows: Iterable[Sequence[Any]], source: str = "",
+                         athlete_id: str = DEFAULT_ATHLETE, chunk_size: int = CHUNK_ROWS) -> int:
+        """
+        Insert activity rows (values in ``ACTIVITY_COLUMNS`` order), skipping known ids.
+
+        Each chunk of ``chunk_size`` rows is one transaction.
+
+        Returns:
+            Number of new activities.
+        """
+        placeholders = ", ".join("?" * (len(ACTIVITY_COLUMNS) + 2))
+        sql = (f"INSERT INTO activities (athlete_id, {', '.join(ACTIVITY_COLUMNS)}, source) "
+               f"VALUES ({placeholders}) ON CONFLICT(athlete_id, activity_id) DO NOTHING")
+        inserted = 0
+        for chunk in _chunks(rows, chunk_size):
+            with self._connect() as conn:
+                before = conn.total_changes
+                conn.executemany(sql, [(athlete_id, *row, source) for row in chunk])
+                inserted += conn.total_changes - before
+        return inserted
+
+    def write_wellness(self, rows: Iterable[Sequence[Any]], source: str = "",
+                       athlete_id: str = DEFAULT_ATHLETE, chunk_size: int = CHUNK_ROWS) -> int:
+        """
+        Upsert wellness rows (values in ``WELLNESS_COLUMNS`` order).
+
+        Blank values in a newer export keep the stored value for that day.
+
+        Returns:
+            Number of rows written.
+        """
+        columns = ", ".join(WELLNESS_COLUMNS)
+        placeholders = ", ".join("?" * (len(WELLNESS_COLUMNS) + 2))
+        updates = ", ".join(f"{name} = COALESCE(excluded.{name}, {name})" for name in WELLNESS_COLUMNS[1:])
+        sql = (f"INSERT INTO wellness (athlete_id, {columns}, source) VALUES ({placeholders}) "
+               f"ON CONFLICT(athlete_id, date) DO UPDATE SET {updates}, source = excluded.source")
+        written = 0
+        for chunk in _chunks(rows, chunk_size):
+            with self._connect() as conn:
+                conn.executemany(sql, [(athlete_id, *row, source) for row in chunk])
+                written += len(chunk)
+        return written
+
+    def activity_ids_by_external_id(self, athlete_id: str = DEFAULT_ATHLETE) -> Dict[str, str]:
+        """Map upload file stems (``external_id`` without extension) to activity ids."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT activity_id, external_id FROM activities "
+                "WHERE athlete_id = ? AND external_id IS NOT NULL",
+                (athlete_id,),
+            ).fetchall()
+        return {_file_stem(row['external_id']): row['activity_id'] for row in rows}
+
+    def count(self, table: str, athlete_id: str = DEFAULT_ATHLETE) -> int:
+        if table not in ("activities", "wellness"):
+            raise ValueError(f"Unknown table: {table}")
+        with self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE athlete_id = ?",
+                                (athlete_id,)).fetchone()[0]
+
+    def activities_frame(self, athlete_id: str = DEFAULT_ATHLETE) -> pd.DataFrame:
+        """
+        Stored activities, oldest first, with the intervals.icu column names
+        ``backtest.load_activities`` understands.
+        """
+        with self._connect() as conn:
+            frame = pd.read_sql_query(
+                "SELECT * FROM activities WHERE athlete_id = ? ORDER BY start_date_local",
+                conn, params=(athlete_id,),
+            )
+        return frame.rename(columns={"training_load": "icu_training_load", "ftp": "icu_ftp"})
+
+    def wellness_frame(self, athlete_id: str = DEFAULT_ATHLETE) -> pd.DataFrame:
+        """Stored wellness days, oldest first, in the shape of an intervals.icu export."""
+        with self._connect() as conn:
+            frame = pd.read_sql_query(
+                "SELECT * FROM wellness WHERE athlete_id = ? ORDER BY date",
+                conn, params=(athlete_id,),
+            )
+        return frame.rename(columns={"resting_hr": "restingHR", "sleep_secs": "sleepSecs",
+                                     "sleep_score": "sleepScore"})
+
+
+def _file_stem(name: str) -> str:
+    stem = Path(name).name
+    for suffix in (".gz", ".tcx", ".fit", ".gpx"):
+        if stem.lower().endswith(suffix):
+            stem = stem[:-len(suffix)]
+    return stem
+
+
+# --------------------------------------------------------------------------- #
+#  CSV import
+# --------------------------------------------------------------------------- #
+
+def _import_csv(path: Path, fields, key_index: int, required: Sequence[int], write, kind: str) -> ImportResult:
+    started = time.perf_counter()
+    result = ImportResult(source=path.name, kind=kind)
+    seen = set()
+
+    with _open_text(path) as handle:
+        reader = csv.DictReader(handle)
+        plan = _column_plan(reader.fieldnames or [], fields)
+        if not plan[key_index][1]:
+            raise ValueError(f"{path.name}: no {fields[key_index][0]} column in {kind} export")
+
+        def rows():
+            for raw in reader:
+                result.read += 1
+                values = _coerce_row(raw, plan)
+                if any(values[i] is None for i in required):
+                    result.invalid += 1
+                    continue
+                if values[key_index] in seen:
+                    result.duplicates += 1
+                    continue
+                seen.add(values[key_index])
+                yield values
+
+        written = write(rows(), source=path.name)
+
+    result.inserted = written
+    result.duplicates = result.read - result.invalid - written
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def import_activities_csv(path: os.PathLike, store: Optional[HistoryStore] = None,
+                          athlete_id: str = DEFAULT_ATHLETE, chunk_size: int = CHUNK_ROWS) -> ImportResult:
+    """
+    Stream a Strava or intervals.icu activities CSV into the activity table.
+
+    Rows without an id or start date are counted as invalid; ids already
+    stored (or repeated in the file) are counted as duplicates.
+    """
+    store = store or HistoryStore()
+    return _import_csv(
+        Path(path), ACTIVITY_FIELDS, key_index=0, required=(0, 1), kind="activities",
+        write=lambda rows, source: store.write_activities(rows, source, athlete_id, chunk_size),
+    )
+
+
+def import_wellness_csv(path: os.PathLike, store: Optional[HistoryStore] = None,
+                        athlete_id: str = DEFAULT_ATHLETE, chunk_size: int = CHUNK_ROWS) -> ImportResult:
+    """Stream an intervals.icu wellness CSV into the wellness table (upsert by day)."""
+    store = store or HistoryStore()
+    return _import_csv(
+        Path(path), WELLNESS_FIELDS, key_index=0, required=(0,), kind="wellness days",
+        write=lambda rows, source: store.write_wellness(rows, source, athlete_id, chunk_size),
+    )
+
+
+# --------------------------------------------------------------------------- #
+#  TCX import
+# --------------------------------------------------------------------------- #
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_tcx(path: os.PathLike) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Parse a TCX file incrementally.
+
+    Returns:
+        ``(info, streams)``: ``info`` has ``sport`` and ``start`` (ISO
+        timestamp of the first lap); ``streams`` maps ``time`` (seconds from
+        the first trackpoint) and any of ``watts``, ``heartrate``, ``cadence``,
+        ``distance``, ``altitude``, ``velocity_smooth`` to arrays. Missing
+        samples are 0 (NaN for altitude).
+    """
+    path = Path(path)
+    info: Dict[str, Any] = {"sport": None, "start": None}
+    samples: Dict[str, List[float]] = {key: [] for key in
+                                       ("time", "watts", "heartrate", "cadence", "distance", "altitude",
+                                        "velocity_smooth")}
+    start = None
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as handle:
+        for event, elem in ET.iterparse(handle, events=("start", "end")):
+            tag = _local(elem.tag)
+            if event == "start":
+                if tag == "Activity" and info["sport"] is None:
+                    info["sport"] = elem.get("Sport")
+                continue
+            if tag == "Lap" and info["start"] is None:
+                info["start"] = to_timestamp(elem.get("StartTime"))
+            if tag != "Trackpoint":
+                if tag in ("Lap", "Activity"):
+                    elem.clear()
+                continue
+
+            point = {_local(child.tag): child for child in elem.iter()}
+            stamp = point.get("Time")
+            if stamp is None or not stamp.text:
+                elem.clear()
+                continue
+            moment = datetime.datetime.fromisoformat(stamp.text.strip().replace("Z", "+00:00"))
+            start = start or moment
+            samples["time"].append((moment - start).total_seconds())
+            hr = point.get("HeartRateBpm")
+            hr_value = point.get("Value") if hr is not None else None
+            samples["heartrate"].append(to_float(hr_value.text if hr_value is not None else None) or 0.0)
+            for key, tcx_tag in (("watts", "Watts"), ("cadence", "Cadence"), ("distance", "DistanceMeters"),
+                                 ("velocity_smooth", "Speed")):
+                child = point.get(tcx_tag)
+                samples[key].append(to_float(child.text if child is not None else None) or 0.0)
+            altitude = point.get("AltitudeMeters")
+            samples["altitude"].append(to_float(altitude.text if altitude is not None else None) or np.nan)
+            elem.clear()
+
+    if info["start"] is None and start is not None:
+        info["start"] = start.replace(tzinfo=None).isoformat(timespec="seconds")
+    streams = {key: np.asarray(values, dtype=float) for key, values in samples.items()}
+    streams = {key: values for key, values in streams.items()
+               if key == "time" or (values.size and np.nanmax(np.abs(values), initial=0) > 0)}
+    return info, streams
+
+
+def _tcx_summary(activity_id: str, info: Dict[str, Any], streams: Dict[str, np.ndarray],
+                 external_id: str) -> List[Any]:
+    from .streams.power import normalized_power
+
+    summary: Dict[str, Any] = {
+        "activity_id": activity_id,
+        "start_date_local": info["start"],
+        "sport_type": "Ride" if (info["sport"] or "").lower() == "biking" else info["sport"],
+        "external_id": external_id,
+    }
+    time_s = streams["time"]
+    if time_s.size:
+        summary["elapsed_time"] = float(time_s[-1] - time_s[0])
+        summary["moving_time"] = summary["elapsed_time"]
+    if "watts" in streams:
+        watts = streams["watts"]
+        summary["average_watts"] = round(float(watts.mean()), 1)
+        summary["max_watts"] = float(watts.max())
+        summary["weighted_average_watts"] = round(normalized_power(watts, time_s), 1)
+        summary["kilojoules"] = round(float(np.sum(watts * np.gradient(time_s))) / 1000, 1) if time_s.size > 1 else None
+    if "heartrate" in streams:
+        hr = streams["heartrate"][streams["heartrate"] > 0]
+        summary["average_heartrate"] = round(float(hr.mean()), 1)
+        summary["max_heartrate"] = float(hr.max())
+    if "cadence" in streams:
+        cadence = streams["cadence"][streams["cadence"] > 0]
+        summary["average_cadence"] = round(float(cadence.mean()), 1) if cadence.size else None
+    if "distance" in streams:
+        summary["distance"] = float(streams["distance"].max())
+    return [summary.get(name) for name in ACTIVITY_COLUMNS]
+
+
+def _tcx_files(paths: Iterable[os.PathLike]) -> Iterator[Path]:
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(p for p in path.iterdir() if p.name.lower().endswith((".tcx", ".tcx.gz")))
+        else:
+            yield path
+
+
+def import_tcx(paths: Iterable[os.PathLike], store: Optional[HistoryStore] = None, cache=None,
+               athlete_id: str = DEFAULT_ATHLETE, chunk_size: int = CHUNK_ROWS) -> ImportResult:
+    """
+    Import TCX files (or directories of them) as activities with cached streams.
+
+    The activity id is the file stem, or the id of an already-imported CSV
+    activity whose ``external_id`` names the same upload file, so a CSV and
+    the matching TCX files of one export describe each ride once. Streams are
+    written to the ``StreamCache`` under that id.
+    """
+    from .streams.cache import StreamCache
+
+    started = time.perf_counter()
+    store = store or HistoryStore()
+    cache = cache or StreamCache()
+    by_external_id = store.activity_ids_by_external_id(athlete_id)
+    result = ImportResult(source="tcx", kind="activities")
+
+    def rows():
+        for path in _tcx_files(paths):
+            result.read += 1
+            try:
+                info, streams = parse_tcx(path)
+            except (ET.ParseError, OSError, ValueError) as e:
+                print(f"⚠️ Could not parse {path.name}: {e}")
+                result.invalid += 1
+                continue
+            if info["start"] is None or streams["time"].size == 0:
+                result.invalid += 1
+                continue
+            stem = _file_stem(path.name)
+            activity_id = by_external_id.get(stem, stem)
+            if cache.load(activity_id) is None:
+                cache.save(activity_id, streams)
+            yield _tcx_summary(activity_id, info, streams, path.name)
+
+    result.inserted = store.write_activities(rows(), "tcx", athlete_id, chunk_size)
+    result.duplicates = result.read - result.invalid - result.inserted
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,566 @@
+"""
+Local stand-in LLM for offline runs, CI and load testing.
+
+``StubLLMBackend`` plugs into ``ai_clients`` and answers every call site in the
+project (training and TDF decisions, Fiction Mode ingestion, mapping, writing
+and editing, evening stage checks) with schema-valid JSON or text. Responses
+are generated from the prompt itself with the same rules the code falls back
+to, so runs are deterministic. Latency and failures can be injected to exercise
+timeouts and fallback paths.
+
+The same backend can be served over HTTP as an OpenAI-compatible
+``/v1/chat/completions`` endpoint:
+
+    python -m lanterne_rouge.llm_stub --port 8765 --latency 0.2 --error-rate 0.05
+
+and used from any process with ``OPENAI_BASE_URL=http://127.0.0.1:8765/v1``.
+In-process, set ``LLM_BACKEND=stub`` or call ``ai_clients.set_llm_backend``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from .ai_clients import LLMBackend
+
+# Call sites are recognised by markers in their prompts, checked in order
+CALL_SITE_MARKERS = [
+    ("tdf_decision", '"recommended_ride_mode"'),
+    ("training_decision", "structured training decision"),
+    ("effort_intervals", "effort pattern recognition"),
+    ("interval_labels", "labels detected effort intervals"),
+    ("race_events", "extracts key events from race reports"),
+    ("stage_results", "cycling results extractor"),
+    ("stage_details", "extracting cycling race data from letour.fr"),
+    ("rider_role", "assigns tactical roles"),
+    ("effort_mapping", "maps rider efforts to race events"),
+    ("activity_analysis", "effort with intelligent analysis"),
+    ("stage_summary", "stage completion summary"),
+    ("narrative_edit", "Tim Krabbé's distinctive literary style"),
+    ("narrative_edit", "expert literary editor"),
+    ("narrative_edit", "expert editor for cycling narratives"),
+    ("narrative", "Writer Agent"),
+    ("narrative", "cycling journalist"),
+    ("narrative", "epic cycling narrative"),
+    ("workout_adjustment", "smart cycling coach AI"),
+]
+
+StubResponse = Union[str, Callable[[List[dict]], str]]
+
+
+class StubLLMError(RuntimeError):
+    """Injected failure raised by the stub backend."""
+
+
+class StubLLMBackend(LLMBackend):
+    """Deterministic in-process LLM backend."""
+
+    name = "stub"
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = 0,
+        responses: Optional[Dict[str, StubResponse]] = None,
+        chunk_words: int = 8,
+        decision_rules: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            latency: Seconds to wait before answering each request.
+            jitter: Extra random delay of up to this many seconds per request.
+            error_rate: Probability (0-1) that a request raises ``StubLLMError``.
+            seed: Seed for jitter and error injection, so failures are reproducible.
+            responses: Optional overrides keyed by call site name; values are
+                fixed strings or callables taking the messages.
+            chunk_words: Words per fragment when streaming.
+            decision_rules: ``ReasoningAgent.decision_rules`` the training and
+                TDF decisions are made with (default: the agent's defaults),
+                so a backtest policy's parameters reach the stubbed LLM.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.responses = responses or {}
+        self.chunk_words = max(1, chunk_words)
+        self.decision_rules = decision_rules
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls) -> "StubLLMBackend":
+        """Build a stub configured by ``LLM_STUB_LATENCY``, ``LLM_STUB_JITTER``,
+        ``LLM_STUB_ERROR_RATE`` and ``LLM_STUB_SEED``."""
+        return cls(
+            latency=float(os.getenv("LLM_STUB_LATENCY", "0")),
+            jitter=float(os.getenv("LLM_STUB_JITTER", "0")),
+            error_rate=float(os.getenv("LLM_STUB_ERROR_RATE", "0")),
+            seed=int(os.getenv("LLM_STUB_SEED", "0")),
+        )
+
+    def complete(self, messages, model, *, temperature=0.7, max_tokens=512, force_json=False):
+        self._simulate_request()
+        return self.respond(messages)
+
+    def stream(self, messages, model, *, temperature=0.7, max_tokens=512):
+        self._simulate_request()
+        words = self.respond(messages).split(" ")
+        for start in range(0, len(words), self.chunk_words):
+            piece = " ".join(words[start:start + self.chunk_words])
+            yield piece if start + self.chunk_words >= len(words) else piece + " "
+
+    def respond(self, messages: List[dict]) -> str:
+        """Generate the reply for ``messages`` without latency or errors."""
+        site = detect_call_site(messages)
+        with self._lock:
+            self.calls[site] = self.calls.get(site, 0) + 1
+
+        override = self.responses.get(site)
+        if override is not None:
+            return override(messages) if callable(override) else override
+        if site in _DECISION_GENERATORS:
+            return _DECISION_GENERATORS[site](messages, self.decision_rules)
+        return _GENERATORS.get(site, _generic_reply)(messages)
+
+    def _simulate_request(self) -> None:
+        """Apply configured latency and error injection for one request."""
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise StubLLMError("Injected stub LLM failure")
+
+
+def detect_call_site(messages: List[dict]) -> str:
+    """Name the call site that produced ``messages`` ('generic' if unknown)."""
+    text = "\n".join(str(m.get("content", "")) for m in messages)
+    for site, marker in CALL_SITE_MARKERS:
+        if marker in text:
+            return site
+    return "generic"
+
+
+# ---------------------------------------------------------------------------
+# Response generators, one per call site
+# ---------------------------------------------------------------------------
+
+def _user_text(messages: List[dict]) -> str:
+    return "\n".join(str(m.get("content", "")) for m in messages if m.get("role") == "user")
+
+
+def _system_text(messages: List[dict]) -> str:
+    return "\n".join(str(m.get("content", "")) for m in messages if m.get("role") == "system")
+
+
+def _find_number(pattern: str, text: str, default: Optional[float] = None) -> Optional[float]:
+    match = re.search(pattern, text)
+    return float(match.group(1)) if match else default
+
+
+def _prompt_metrics(text: str) -> Dict[str, Any]:
+    """Decode the metrics JSON that follows 'My current metrics:' in a prompt."""
+    marker = text.find("My current metrics:")
+    start = text.find("{", marker) if marker >= 0 else -1
+    if start < 0:
+        return {}
+    try:
+        metrics, _ = json.JSONDecoder().raw_decode(text[start:])
+        return metrics if isinstance(metrics, dict) else {}
+    except json.JSONDecodeError:
+        return {}
+
+
+def _rule_agent(decision_rules: Optional[Dict[str, Any]] = None):
+    from .reasoner import ReasoningAgent
+
+    agent = ReasoningAgent(use_llm=False)
+    if decision_rules is not None:
+        agent.decision_rules = decision_rules
+    return agent
+
+
+def _training_decision(messages: List[dict], decision_rules: Optional[Dict[str, Any]] = None) -> str:
+    metrics = _prompt_metrics(_user_text(messages))
+    decision = _rule_agent(decision_rules)._make_rule_based_decision(metrics)
+    return json.dumps(asdict(decision))
+
+
+def _tdf_decision(messages: List[dict], decision_rules: Optional[Dict[str, Any]] = None) -> str:
+    user_text = _user_text(messages)
+    metrics = _prompt_metrics(user_text)
+    stage_type = re.search(r'"stage_type": "([^"]*)"', _system_text(messages))
+    stage_number = _find_number(r"TDF SIMULATION STAGE (\d+)", user_text, 1)
+    tdf_data = {
+        "stage_info": {"number": int(stage_number), "type": stage_type.group(1) if stage_type else "flat"},
+        "is_rest_day": "TODAY IS REST DAY" in user_text,
+    }
+    decision = _rule_agent(decision_rules)._make_rule_based_tdf_decision(metrics, tdf_data=tdf_data)
+    return json.dumps(asdict(decision))
+
+
+def _effort_intervals(messages: List[dict]) -> str:
+    segments = re.findall(
+        r"(\d+)-([\d.]+)min: Power (\d+)W \(max (\d+)W\)(?: HR (\d+)bpm)?", _user_text(messages)
+    )
+    # Strongest three segments, reported in ride order
+    strongest = sorted(segments, key=lambda s: float(s[2]), reverse=True)[:3]
+    intervals = []
+    for start, end, avg_power, max_power, avg_hr in sorted(strongest, key=lambda s: int(s[0])):
+        intervals.append({
+            "start_minute": float(start),
+            "duration_minutes": round(float(end) - float(start), 1),
+            "avg_power": float(avg_power),
+            "max_power": float(max_power),
+            "avg_hr": float(avg_hr) if avg_hr else None,
+            "effort_type": "surge" if float(max_power) > 1.5 * float(avg_power) else "sustained",
+            "description": f"{avg_power}W block from minute {start}",
+        })
+    return json.dumps(intervals)
+
+
+def _interval_labels(messages: List[dict]) -> str:
+    labels = []
+    for index, start, effort_type in re.findall(
+            r"Interval (\d+): ([\d.]+)min for [\d.]+min, type (\w+)", _user_text(messages)):
+        labels.append({
+            "index": int(index),
+            "effort_type": effort_type,
+            "description": f"{effort_type.capitalize()} effort from minute {start}",
+        })
+    return json.dumps(labels)
+
+
+def _race_events(messages: List[dict]) -> str:
+    return json.dumps([
+        {"time_km": 10.0, "time_minutes": None, "event_type": "breakaway",
+         "description": "An early breakaway forms", "riders": []},
+        {"time_km": 120.0, "time_minutes": None, "event_type": "catch",
+         "description": "The peloton reels in the breakaway", "riders": []},
+        {"time_km": None, "time_minutes": 240, "event_type": "sprint",
+         "description": "The bunch sprints for the line", "riders": []},
+    ])
+
+
+def _stage_results(messages: List[dict]) -> str:
+    results = [{"position": "1", "rider": "Stub Rider 1", "team": "Stub Team", "time": "0:00"}]
+    for position in range(2, 11):
+        results.append({
+            "position": str(position),
+            "rider": f"Stub Rider {position}",
+            "team": "Stub Team",
+            "time": f"+0:{position:02d}",
+        })
+    return json.dumps(results)
+
+
+def _stage_details(messages: List[dict]) -> str:
+    stage_number = int(_find_number(r"stage (\d+) details", _user_text(messages), 1))
+    return json.dumps({
+        "stage_name": f"Stage {stage_number}",
+        "distance_km": 175.0,
+        "stage_type": "flat",
+        "winner": "Stub Rider 1",
+        "winning_team": "Stub Team",
+        "weather": None,
+    })
+
+
+def _rider_role(messages: List[dict]) -> str:
+    intensity = _find_number(r"Intensity Factor: ([\d.]+)", _user_text(messages), 0.0)
+    if intensity >= 0.85:
+        role = ("breakaway", "breakaway", "went clear early and drove the move")
+    elif intensity >= 0.75:
+        role = ("chase_group", "chase_group", "rode hard in the chase behind the leaders")
+    else:
+        role = ("peloton", "main_bunch", "rode conservatively in the bunch")
+    return json.dumps({
+        "role_type": role[0],
+        "position": role[1],
+        "tactical": role[2],
+        "reasoning": f"Intensity factor {intensity:.2f}",
+    })
+
+
+def _effort_mapping(messages: List[dict]) -> str:
+    text = _user_text(messages)
+    efforts = len(re.findall(r"^Effort \d+:", text, re.MULTILINE))
+    events = len(re.findall(r"^Event \d+:", text, re.MULTILINE))
+    if not events:
+        return "[]"
+    return json.dumps([
+        {
+            "user_effort_index": index,
+            "race_event_index": min(index, events - 1),
+            "confidence": 0.6,
+            "narrative_description": "answered the move with a steady surge",
+        }
+        for index in range(efforts)
+    ])
+
+
+def _activity_analysis(messages: List[dict]) -> str:
+    system_text = _system_text(messages)
+    user_text = _user_text(messages)
+    intensity = _find_number(r"Intensity Factor: ([\d.]+)", user_text, 0.0)
+    tss = _find_number(r"Training Load: ([\d.]+) TSS", user_text, 0.0)
+    breakaway_if = _find_number(r"BREAKAWAY if IF≥([\d.]+)", system_text, 0.85)
+    breakaway_tss = _find_number(r"AND TSS≥([\d.]+)", system_text, 60)
+    gc_if = _find_number(r"GC if IF≥([\d.]+)", system_text, 0.70)
+
+    # Same thresholds the prompt states; time trials are always GC
+    if "TIME TRIAL" in system_text:
+        mode = "gc"
+    elif intensity >= breakaway_if and tss >= breakaway_tss:
+        mode = "breakaway"
+    elif intensity >= gc_if:
+        mode = "gc"
+    else:
+        mode = "rest"
+
+    return json.dumps({
+        "ride_mode": mode,
+        "confidence": 0.8,
+        "rationale": f"Your IF of {intensity:.2f} and {tss:.0f} TSS put this ride in {mode.upper()} mode.",
+        "performance_indicators": ["IF", "TSS", "duration"],
+        "effort_assessment": "aggressive" if mode == "breakaway" else "moderate",
+    })
+
+
+def _stage_summary(messages: List[dict]) -> str:
+    text = _user_text(messages)
+
+    def field(label: str) -> str:
+        match = re.search(rf"• {label}: (.*)", text)
+        return match.group(1).strip() if match else "N/A"
+
+    completed_on = field("Today's Date")
+    return (
+        f"🎉 TDF Stage {field('Stage Number')} Complete!\n\n"
+        f"🏔️ Stage Type: {field('Stage Type')}\n"
+        f"🚴 Mode Completed: {field('Mode Completed')}\n"
+        f"⭐ Points Earned: +{field('Points Earned')}\n"
+        f"📊 Total Points: {field('Total Points')}\n\n"
+        f"🏆 STAGE ANALYSIS:\nSteady, controlled work today. {field('Analysis Context')}\n\n"
+        f"---\nStage completed on: {completed_on}\n"
+        f"Activity ID: {field('Activity ID')}"
+    )
+
+
+def _narrative(messages: List[dict]) -> str:
+    text = _user_text(messages)
+    role = re.search(r"Role: (.*)", text)
+    stage = re.search(r"Stage: (.*)", text)
+    role_text = role.group(1).strip() if role else "peloton - rode in the bunch"
+    stage_text = stage.group(1).strip() if stage else "the stage"
+    return (
+        f"The road out of the start of {stage_text} is wide and calm. The rider counts the wheels "
+        "ahead and decides, for now, to count nothing else.\n\n"
+        f"Her day has a shape already: {role_text}. The legs agree with it, mostly. "
+        "When the pace lifts the rider lifts with it, not out of ambition, but because "
+        "the alternative is arithmetic best left undone.\n\n"
+        "At the line there is no ceremony. There is the bike, the number on her back, and the "
+        "quiet satisfaction of having done exactly what was possible."
+    )
+
+
+_NARRATIVE_SECTION = re.compile(
+    r"(?:DRAFT|CURRENT|ORIGINAL) NARRATIVE:\n(.*?)(?:\n\n[A-Z][A-Za-z' ]+:|\Z)", re.DOTALL
+)
+
+
+def _narrative_edit(messages: List[dict]) -> str:
+    # Editing is a no-op: hand the draft back unchanged
+    match = _NARRATIVE_SECTION.search(_user_text(messages))
+    return match.group(1).strip() if match else _narrative(messages)
+
+
+def _workout_adjustment(messages: List[dict]) -> str:
+    return "- Plan looks good. Continue with scheduled workout.\n- Keep hydration and fueling on point."
+
+
+def _generic_reply(messages: List[dict]) -> str:
+    return "- Stub response."
+
+
+# Decisions also take the backend's decision_rules
+_DECISION_GENERATORS: Dict[str, Callable[[List[dict], Optional[Dict[str, Any]]], str]] = {
+    "tdf_decision": _tdf_decision,
+    "training_decision": _training_decision,
+}
+
+_GENERATORS: Dict[str, Callable[[List[dict]], str]] = {
+    "effort_intervals": _effort_intervals,
+    "interval_labels": _interval_labels,
+    "race_events": _race_events,
+    "stage_results": _stage_results,
+    "stage_details": _stage_details,
+    "rider_role": _rider_role,
+    "effort_mapping": _effort_mapping,
+    "activity_analysis": _activity_analysis,
+    "stage_summary": _stage_summary,
+    "narrative": _narrative,
+    "narrative_edit": _narrative_edit,
+    "workout_adjustment": _workout_adjustment,
+}
+
+
+# ---------------------------------------------------------------------------
+# OpenAI-compatible HTTP server
+# ---------------------------------------------------------------------------
+
+def _completion_payload(content: str, model: str) -> Dict[str, Any]:
+    return {
+        "id": f"chatcmpl-stub-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def _chunk_payload(chunk_id: str, model: str, delta: Dict[str, Any], finish: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "id": chunk_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+    }
+
+
+def _make_handler(backend: StubLLMBackend):
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):  # noqa: A002 - keep load tests quiet
+            pass
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/") in ("/health", "/v1/models"):
+                self._send_json(200, {"object": "list", "data": [{"id": "stub", "object": "model"}]})
+            else:
+                self._send_json(404, {"error": {"message": "Not found"}})
+
+        def do_POST(self):
+            if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+                self._send_json(404, {"error": {"message": "Not found"}})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                messages = request.get("messages", [])
+                model = request.get("model", "stub")
+            except (ValueError, json.JSONDecodeError):
+                self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+                return
+
+            try:
+                if request.get("stream"):
+                    self._stream(backend.stream(messages, model), model)
+                else:
+                    content = backend.complete(messages, model)
+                    self._send_json(200, _completion_payload(content, model))
+            except StubLLMError as e:
+                self._send_json(500, {"error": {"message": str(e), "type": "server_error"}})
+
+        def _stream(self, chunks: Iterator[str], model: str) -> None:
+            # Pull the first fragment before committing to a 200 response so
+            # injected errors still surface as HTTP 500
+            first = next(chunks, None)
+            chunk_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+
+            def send(payload: Dict[str, Any]) -> None:
+                self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            send(_chunk_payload(chunk_id, model, {"role": "assistant"}))
+            if first is not None:
+                send(_chunk_payload(chunk_id, model, {"content": first}))
+            for chunk in chunks:
+                send(_chunk_payload(chunk_id, model, {"content": chunk}))
+            send(_chunk_payload(chunk_id, model, {}, finish="stop"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+    return StubHandler
+
+
+def make_stub_server(
+    backend: Optional[StubLLMBackend] = None,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+) -> ThreadingHTTPServer:
+    """
+    Create an OpenAI-compatible HTTP server backed by ``backend``.
+
+    Args:
+        backend: Stub backend to serve; defaults to ``StubLLMBackend.from_env()``.
+        host: Interface to bind.
+        port: Port to bind; 0 picks a free port (see ``server.server_address``).
+
+    Returns:
+        The server, not yet started. Call ``serve_forever()`` (optionally in a
+        thread) and ``shutdown()`` when done.
+    """
+    backend = backend or StubLLMBackend.from_env()
+    return ThreadingHTTPServer((host, port), _make_handler(backend))
+
+
+def main() -> None:
+    """Run the stub server from the command line."""
+    parser = argparse.ArgumentParser(description="Run the local stand-in LLM server")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of latency per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency (max seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for jitter and error injection")
+    args = parser.parse_args()
+
+    backend = StubLLMBackend(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed
+    )
+    server = make_stub_server(backend, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"✅ Stub LLM listening on http://{host}:{port}/v1")
+    print(f"   export OPENAI_BASE_URL=http://{host}:{port}/v1 OPENAI_API_KEY=stub")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ Stub LLM stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,9 @@ Memory module for Lanterne Rouge.
 
 This module provides functionality for storing, retrieving, and managing
 observations and memories for the AI reasoning system.
+
+Every function takes an optional ``db_path``; by default it uses the active
+athlete's database (``memory/lanterne.db`` for the single-athlete setup).
 """
 import datetime
 from pathlib import Path
@@ -10,26 +13,45 @@ import sqlite3
 import json
 from contextlib import contextmanager
 
+from .athlete import current_athlete
+
 DB_FILE = Path(__file__).resolve().parents[2] / "memory" / "lanterne.db"
-DB_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-_conn = sqlite3.connect(DB_FILE)
-_conn.execute("""
-CREATE TABLE IF NOT EXISTS memory (
-    timestamp TEXT PRIMARY KEY,
-    type TEXT,
-    data TEXT
-)
-""")
-_conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_type ON memory(type)")
-_conn.commit()
-_conn.close()
+
+def db_file() -> Path:
+    """The active athlete's database; the default for every SQLite store."""
+    return current_athlete().db_file
+
+_initialized_dbs = set()
+
+
+def _ensure_db(db_file: Path) -> None:
+    """Create the database and memory table on first use (not at import time)."""
+    if db_file in _initialized_dbs:
+        return
+    db_file.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_file)
+    try:
+        with conn:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS memory (
+                timestamp TEXT PRIMARY KEY,
+                type TEXT,
+                data TEXT
+            )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_type ON memory(type)")
+    finally:
+        conn.close()
+    _initialized_dbs.add(db_file)
 
 
 @contextmanager
-def _get_db_connection():
+def _get_db_connection(db_path=None):
     """Context manager for database connections to ensure proper cleanup."""
-    conn = sqlite3.connect(DB_FILE)
+    db_path = Path(db_path) if db_path is not None else db_file()
+    _ensure_db(db_path)
+    conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     try:
         yield conn
@@ -42,20 +64,22 @@ def _get_db_connection():
         conn.close()
 
 
-def _get_conn():
+def _get_conn(db_path=None):
     """Get a connection to the SQLite database with row factory set.
 
     Note: This is kept for backward compatibility but should be avoided.
     Use _get_db_connection() context manager instead.
     """
-    conn = sqlite3.connect(DB_FILE)
+    db_path = Path(db_path) if db_path is not None else db_file()
+    _ensure_db(db_path)
+    conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     return conn
 
 
-def load_memory():
+def load_memory(db_path=None):
     """Load all memories from the database in chronological order."""
-    with _get_db_connection() as conn:
+    with _get_db_connection(db_path) as conn:
         cursor = conn.execute("SELECT timestamp, type, data FROM memory ORDER BY timestamp")
         mem = {"observations": [], "decisions": [], "reflections": []}
         for row in cursor:
@@ -76,15 +100,16 @@ def load_memory():
     return mem
 
 
-def log_observation(data):
+def log_observation(data, db_path=None):
     """Log an observation to the memory database.
 
     Args:
         data: The observation data to log (will be JSON serialized)
+        db_path: Database to write to (default: the active athlete's)
     """
     ts = datetime.datetime.now(datetime.timezone.utc).isoformat()
     try:
-        with _get_db_connection() as conn:
+        with _get_db_connection(db_path) as conn:
             conn.execute(
                 "INSERT OR IGNORE INTO memory (timestamp, type, data) VALUES (?, ?, ?)",
                 (ts, "observation", json.dumps(data))
@@ -95,16 +120,17 @@ def log_observation(data):
         raise
 
 
-def log_decision(data):
+def log_decision(data, db_path=None):
     """Log a decision to the memory database.
 
     Args:
         data: The decision data to log (will be JSON serialized)
+        db_path: Database to write to (default: the active athlete's)
     """
     # Fixed: Use UTC timezone consistently with other logging functions
     ts = datetime.datetime.now(datetime.timezone.utc).isoformat()
     try:
-        with _get_db_connection() as conn:
+        with _get_db_connection(db_path) as conn:
             conn.execute(
                 "INSERT OR IGNORE INTO memory (timestamp, type, data) VALUES (?, ?, ?)",
                 (ts, "decision", json.dumps(data))
@@ -115,16 +141,17 @@ def log_decision(data):
         raise
 
 
-def log_reflection(data):
+def log_reflection(data, db_path=None):
     """Log a reflection to the memory database.
 
     Args:
         data: The reflection data to log (will be JSON serialized)
+        db_path: Database to write to (default: the active athlete's)
     """
     # Fixed: Use UTC timezone consistently with other logging functions
     ts = datetime.datetime.now(datetime.timezone.utc).isoformat()
     try:
-        with _get_db_connection() as conn:
+        with _get_db_connection(db_path) as conn:
             conn.execute(
                 "INSERT OR IGNORE INTO memory (timestamp, type, data) VALUES (?, ?, ?)",
                 (ts, "reflection", json.dumps(data))
@@ -135,14 +162,14 @@ def log_reflection(data):
         raise
 
 
-def fetch_recent_memories(limit: int):
+def fetch_recent_memories(limit: int, db_path=None):
     """
     Retrieve the most recent memory entries, across observations, decisions, and reflections,
     limited to the specified number of entries. Returns a list of dicts with keys:
     'timestamp', 'type', and 'data'.
     """
     try:
-        with _get_db_connection() as conn:
+        with _get_db_connection(db_path) as conn:
             cursor = conn.execute(
                 "SELECT timestamp, type, data FROM memory ORDER BY timestamp DESC LIMIT ?",
                 (limit,)
@@ -18,6 +18,9 @@ class AthleteConfig(BaseModel):
     """Athlete configuration."""
     ftp: int = Field(description="Functional Threshold Power in watts")
     weight_kg: Optional[float] = None
+    lthr: Optional[int] = Field(default=None, description="Lactate threshold heart rate in bpm")
+    timezone: str = Field(default="UTC", description="IANA timezone the athlete's daily jobs run in")
+    strava_id: Optional[int] = Field(default=None, description="Strava athlete id, to route webhook events")
 
 
 class ConstraintsConfig(BaseModel):
@@ -81,9 +84,18 @@ def load_config(path: Path | str) -> MissionConfig:
         raise ValueError(f"Invalid MissionConfig in {path}: {e}") from e
 
 
-def cache_to_sqlite(cfg: MissionConfig, db_path: str | Path = "memory/lanterne.db") -> None:
-    """Upsert the JSON blob so other modules can query cheaply."""
-    db_path = Path(db_path)
+def _db_path(db_path: str | Path | None) -> Path:
+    """``db_path``, or the active athlete's database."""
+    if db_path is None:
+        from .memory_bus import db_file
+        return Path(db_file())
+    return Path(db_path)
+
+
+def cache_to_sqlite(cfg: MissionConfig, db_path: str | Path | None = None) -> None:
+    """Upsert the JSON blob so other modules can query cheaply (active athlete's database by default)."""
+    db_path = _db_path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
     con = sqlite3.connect(db_path)
     con.execute(
         """
@@ -100,18 +112,19 @@ def cache_to_sqlite(cfg: MissionConfig, db_path: str | Path = "memory/lanterne.d
     con.close()
 
 
-def get_cached_mission_config(db_path: str | Path = "memory/lanterne.db") -> MissionConfig | None:
+def get_cached_mission_config(db_path: str | Path | None = None) -> MissionConfig | None:
     """
     Retrieve the most recent mission configuration from the SQLite cache.
 
     Args:
-        db_path: Path to the SQLite database file
+        db_path: Path to the SQLite database file (default: the active
+            athlete's database)
 
     Returns:
         MissionConfig object if found, None otherwise
     """
     try:
-        con = sqlite3.connect(db_path)
+        con = sqlite3.connect(_db_path(db_path))
         con.row_factory = sqlite3.Row
         row = con.execute("SELECT json FROM mission_config ORDER BY id DESC LIMIT 1").fetchone()
         con.close()
@@ -125,10 +138,10 @@ def get_cached_mission_config(db_path: str | Path = "memory/lanterne.db") -> Mis
         return None
 
 
-def get_athlete_ftp(db_path: str | Path = "memory/lanterne.db", default_ftp: int = 250) -> int:
-    """Retrieve the athlete's FTP from the mission config or return default value."""
+def get_athlete_ftp(db_path: str | Path | None = None, default_ftp: int = 250) -> int:
+    """Retrieve the active athlete's FTP from the cached mission config or return default value."""
     try:
-        db_path = Path(db_path)
+        db_path = _db_path(db_path)
         if not db_path.exists():
             return default_ftp
 
@@ -151,8 +164,8 @@ def get_athlete_ftp(db_path: str | Path = "memory/lanterne.db", default_ftp: int
         return default_ftp
 
 
-def bootstrap(path: Path | str, db_path: str | Path = "memory/lanterne.db") -> MissionConfig:
-    """Convenience – load + cache in one call."""
+def bootstrap(path: Path | str, db_path: str | Path | None = None) -> MissionConfig:
+    """Convenience – load + cache in one call (in the active athlete's database by default)."""
     cfg = load_config(path)
     cache_to_sqlite(cfg, db_path)
     return cfg
@@ -7,37 +7,43 @@ Observation‑layer utilities for Lanterne Rouge.
 * All metrics are returned as floats rounded to one decimal
 """
 
-import csv
 import os
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
 
-import requests
 from dotenv import load_dotenv
 
 from .strava_api import strava_get
-from .mission_config import get_athlete_ftp
 
 # --------------------------------------------------------------------------- #
 #  Environment
 # --------------------------------------------------------------------------- #
+# Importing this module has no side effects: .env is read, and output/ is
+# created, on first use. HTTP and config dependencies are imported lazily.
 
-load_dotenv()
-OURA_TOKEN = os.getenv("OURA_TOKEN")
+_env_loaded = False
 
-# Function to get the current FTP from mission config
+
+def _load_env() -> None:
+    """Load .env into the process environment once."""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
 
 
 def get_current_ftp():
     """Get the current athlete FTP value from mission config."""
+    from .mission_config import get_athlete_ftp
+
+    _load_env()
     user_ftp = os.getenv("USER_FTP")
     default_ftp = int(user_ftp) if user_ftp is not None else 250
     return get_athlete_ftp(default_ftp=default_ftp)
 
 # Output folder
 OUTPUT_DIR = Path(__file__).resolve().parents[2] / "output"
-OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
 
 
 # --------------------------------------------------------------------------- #
@@ -45,73 +51,66 @@ OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
 # --------------------------------------------------------------------------- #
 
 
-def record_readiness_contributors(day_entry: dict) -> None:
+def record_readiness_contributors(day_entry: dict, store=None) -> None:
     """
-    Persist a full contributor snapshot to CSV (`output/readiness_score_log.csv`).
+    Persist a full contributor snapshot for one Oura ``daily_readiness`` day.
 
-    Keeps a wide schema but sparsely populated if Oura adds new fields.
+    The snapshot goes into the ``ReadinessStore`` (JSON contributors, so new
+    Oura fields never misalign older days) and the score and HRV balance
+    into the daily metrics table.
     """
-    filename = OUTPUT_DIR / "readiness_score_log.csv"
-    contributors = day_entry.get("contributors", {})
-
-    # Base row
-    row = {
-        "day": day_entry.get("day"),
-        "readiness_score": day_entry.get("score"),
-        **contributors,
-    }
+    from .daily_metrics import log_daily_metrics
+    from .readiness_store import ReadinessStore, readiness_row
 
-    fieldnames = ["day", "readiness_score"] + sorted(contributors.keys())
-    file_exists = filename.exists()
-
-    with filename.open("a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(row)
+    row = readiness_row(day_entry)
+    (store or ReadinessStore()).upsert([row])
+    log_daily_metrics([{"day": row["day"], "readiness_score": row["readiness_score"],
+                        "hrv_balance": row["hrv_balance"]}])
 
     print("✅  Saved detailed readiness contributors.")
 
 
-def get_oura_readiness():
+def get_oura_readiness(store=None):
     """
     Return a tuple of (readiness_score:int | None, hrv_balance:int | None, readiness_day:str | None)
 
-    Note: This function returns scalar values, not dictionaries. The full readiness data
-    is processed by record_readiness_contributors() and saved to readiness_score_log.csv.
+    Oura data is synced incrementally into the local ``ReadinessStore`` (only
+    days since the last stored one are requested) and the most recent scored
+    day of the past week is read from it, so repeated runs neither re-request
+    the week nor log a day twice. If the API is unreachable, the stored days
+    are used.
+
+    Note: This function returns scalar values, not dictionaries. The full contributor
+    snapshot is kept in the store; record_readiness_contributors() runs once per new day.
     """
+    import requests
+
+    from .athlete import current_athlete
+    from .readiness_store import ReadinessStore, sync_oura
+
+    _load_env()
     # Use naive datetime objects consistently
     today = datetime.now().replace(tzinfo=None).date()
-    start_date = today - timedelta(days=6)
-
-    url = "https://api.ouraring.com/v2/usercollection/daily_readiness"
-    headers = {"Authorization": f"Bearer {OURA_TOKEN}"}
-    params = {"start_date": start_date.isoformat(), "end_date": today.isoformat()}
+    store = store or ReadinessStore()
+    athlete = current_athlete()
+    # The legacy CSV lives in each athlete's own output folder
+    legacy_log = (OUTPUT_DIR if athlete.is_default else athlete.output_dir) / "readiness_score_log.csv"
+    if store.last_day() is None and legacy_log.exists():
+        print(f"📊 Imported {store.import_csv_log(legacy_log)} days from {legacy_log.name}")
 
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=10)
-        r.raise_for_status()
+        sync_oura(store, today=today,
+                  on_new_readiness=lambda entry: record_readiness_contributors(entry, store))
     except requests.RequestException as exc:
         print(f"❌  Oura API request error: {exc}")
-        return None, None, None
     except ValueError as exc:
         print(f"❌  Oura API value error: {exc}")
-        return None, None, None
 
-    data = r.json().get("data", [])
-    if not data:
+    latest = store.latest(since=today - timedelta(days=6))
+    if latest is None:
         print("⚠️  No Oura readiness data in the past 7 days.")
         return None, None, None
-
-    # Most‑recent day first
-    for entry in sorted(data, key=lambda x: x["day"], reverse=True):
-        score = entry.get("score")
-        hrv_balance = entry.get("contributors", {}).get("hrv_balance")
-        if score is not None:
-            record_readiness_contributors(entry)
-            return score, hrv_balance, entry["day"]
-
-    return None, None, None
+    return latest["readiness_score"], latest["hrv_balance"], latest["day"]
 
 
 # --------------------------------------------------------------------------- #
@@ -135,12 +134,29 @@ def _calculate_power_tss(activity: dict) -> float:
 
     Formula: TSS = (duration_seconds × NP × IF) / (FTP × 3600) × 100, where IF = NP/FTP
 
+    NP is computed from the activity's watts stream when it is in the local
+    stream cache; otherwise Strava's weighted_average_watts is used.
+
     Returns calculated TSS value or 0 if power data is insufficient.
     """
     # Get current FTP value - force reload from mission config each time
-    user_ftp = os.getenv("USER_FTP")
-    default_ftp = int(user_ftp) if user_ftp is not None else 250
-    ftp = get_athlete_ftp(default_ftp=default_ftp)
+    ftp = get_current_ftp()
+
+    # Prefer true NP from cached streams (never downloads here)
+    if activity.get("id") and ftp:
+        from .streams.cache import StreamCache
+        from .streams.power import compute_power_metrics
+
+        streams = StreamCache().load(activity["id"])
+        if streams and "watts" in streams:
+            stream_metrics = compute_power_metrics(ftp, streams["watts"], streams.get("time"))
+            if stream_metrics is not None:
+                print(
+                    f"DEBUG: Stream-based TSS: {stream_metrics.tss:.1f} "
+                    f"(NP={stream_metrics.normalized_power:.0f}, IF={stream_metrics.intensity_factor:.2f}, "
+                    f"Duration={stream_metrics.duration_seconds:.0f}s, FTP={ftp})"
+                )
+                return stream_metrics.tss
 
     # Extract power metrics from activity
     weighted_avg_watts = activity.get("weighted_average_watts")  # This is NP (Normalized Power)
@@ -290,6 +306,11 @@ def get_ctl_atl_tsb(days: int = 90):
         ctl = new_ctl
         atl = new_atl
 
+    from .daily_metrics import log_daily_metrics
+    log_daily_metrics([{"day": day, "tss": load, "ctl": round(day_ctl, 1), "atl": round(day_atl, 1),
+                        "tsb": round(day_ctl - day_atl, 1)}
+                       for (day, day_ctl, day_atl), load in zip(daily_values, tss_series)])
+
     # Calculate TSB using today's CTL and ATL values
     # TSB = Today's Fitness (CTL) - Today's Fatigue (ATL)
     tsb = ctl - atl
@@ -301,60 +322,72 @@ def get_ctl_atl_tsb(days: int = 90):
     return round(ctl, 1), round(atl, 1), round(tsb, 1)
 
 
-def get_recent_workout_analysis(days_back=7):
+COMPLETION_SUMMARY_DIR = Path("docs_src/tdf-simulation/stages/completion-summary")
+RIDE_EFFICIENCY_FIELDS = ('efficiency_factor', 'decoupling_pct', 'hr_drift_pct', 'avg_cadence', 'coasting_pct')
+
+
+def get_recent_workout_analysis(days_back=7, store=None):
     """Get analysis of recent completed workouts/activities for training recommendations.
     
     This function analyzes recent workout completions to provide context for daily training decisions.
-    It can pull data from multiple sources:
-    1. TDF completion summaries (during simulation)
-    2. Direct Strava activity analysis (for regular training)
-    3. Stored workout analysis files
+    Everything is read from the structured ride store (one indexed query per source):
+    1. TDF stage completion results, written by the evening check
+    2. Stream-based efficiency metrics of recent Strava rides
+    
+    Both are merged by date, newest first. A ride that was also a stage is
+    listed once, as the stage, with its efficiency metrics added.
+    
+    Completion summaries saved as markdown before the store existed are
+    imported once, the first time the store has no completions.
     
     Args:
         days_back: Number of recent workouts to analyze
+        store: Optional RideAnalysisStore (defaults to the local database)
         
     Returns:
         List of recent workout analysis data with power metrics, effort levels, etc.
     """
     try:
+        from .ride_store import RideAnalysisStore
+
+        store = store or RideAnalysisStore()
         recent_analyses = []
         
-        # First, check for TDF completion summaries (if in TDF simulation period)
-        completion_dir = Path("docs_src/tdf-simulation/stages/completion-summary")
-        if completion_dir.exists():
-            for stage_file in completion_dir.glob("stage*.md"):
-                try:
-                    content = stage_file.read_text(encoding='utf-8')
-                    
-                    # Extract key performance data if stage completed
-                    if "Stage completed on:" in content:
-                        stage_data = _extract_completion_summary_data(content)
-                        if stage_data:
-                            recent_analyses.append({
-                                'source': 'tdf_completion',
-                                'stage': stage_file.stem,
-                                'data': stage_data
-                            })
-                except Exception as e:
-                    print(f"Could not parse TDF completion {stage_file}: {e}")
-                    continue
+        # TDF completion results, most recent first
+        completions = store.recent_completions(days_back)
+        if not completions and COMPLETION_SUMMARY_DIR.exists():
+            if import_completion_summaries(store, COMPLETION_SUMMARY_DIR):
+                completions = store.recent_completions(days_back)
+        by_activity = {}
+        for completion in completions:
+            analysis = {
+                'source': 'tdf_completion',
+                'stage': f"stage{completion['stage_number']}",
+                'data': _completion_analysis_data(completion)
+            }
+            recent_analyses.append(analysis)
+            if completion.get('activity_id'):
+                by_activity[str(completion['activity_id'])] = analysis
         
-        # TODO: Add direct Strava activity analysis for regular training
-        # This would pull recent activities and calculate IF, TSS, effort levels
-        # strava_activities = _get_recent_strava_activities(days_back)
-        # for activity in strava_activities:
-        #     analysis = _analyze_strava_activity(activity)
-        #     recent_analyses.append({
-        #         'source': 'strava_activity',
-        #         'activity_id': activity['id'],
-        #         'data': analysis
-        #     })
-        
-        # Sort by completion date/activity date (most recent first)
-        if recent_analyses:
-            # For TDF completions, sort by stage number
-            recent_analyses.sort(key=lambda x: int(x.get('stage', 'stage0').replace('stage', '') or 0), reverse=True)
+        # Precomputed stream analyses of recent rides (ride_store.sync_recent_rides);
+        # a ride that was also a stage adds its efficiency fields to the stage entry
+        for ride in store.recent_efficiency(days_back):
+            stage = by_activity.get(str(ride['activity_id']))
+            if stage is not None:
+                for key in RIDE_EFFICIENCY_FIELDS:
+                    if ride.get(key) is not None:
+                        stage['data'].setdefault(key, ride[key])
+                continue
+            recent_analyses.append({
+                'source': 'strava_activity',
+                'activity_id': ride['activity_id'],
+                'data': ride
+            })
         
+        # Both sources by date, newest first
+        recent_analyses.sort(key=lambda analysis: str(analysis['data'].get('date')
+                                                      or analysis['data'].get('start_date') or '')[:10],
+                             reverse=True)
         return recent_analyses[:days_back]
         
     except Exception as e:
@@ -362,6 +395,122 @@ def get_recent_workout_analysis(days_back=7):
         return []
 
 
+def get_zone_adherence(rides_back=20, store=None, cache=None):
+    """Time in zones of recent rides and how well they followed the planned zones.
+
+    Rides are those in the ride store (analysed by ``ride_store.sync_recent_rides``),
+    binned from their cached streams. Each ride is compared with the zones
+    planned for its day, as logged with that morning's decision.
+    
+    Args:
+        rides_back: Number of recent rides to include
+        store: Optional RideAnalysisStore (defaults to the local database)
+        cache: Optional StreamCache (defaults to the local stream cache)
+        
+    Returns:
+        Dict with ``time_in_zones`` (minutes per power zone across the rides)
+        and, once rides with a plan exist, the ``summarize_adherence`` fields
+        (``rides``, ``mean_score``, ``recent_score``, ``trend``); empty when
+        there is nothing to report.
+    """
+    try:
+        from .memory_bus import load_memory
+        from .ride_store import RideAnalysisStore
+        from .streams.cache import StreamCache
+        from .streams.zones import adherence_trend, season_time_in_zones, summarize_adherence
+
+        store = store or RideAnalysisStore()
+        cache = cache or StreamCache()
+        # Oldest first, the order the adherence trend is read in
+        rides = list(reversed(store.recent_efficiency(rides_back)))
+        actual = season_time_in_zones(cache.iter_streams([ride['activity_id'] for ride in rides]),
+                                      ftp=get_current_ftp())
+        if actual.empty:
+            return {}
+
+        # The zones planned each day (a later decision that day wins)
+        planned_by_day = {}
+        for decision in load_memory()["decisions"]:
+            if decision["data"].get("planned_zones"):
+                planned_by_day[decision["timestamp"][:10]] = decision["data"]["planned_zones"]
+        plans = {}
+        for ride in rides:
+            plan = planned_by_day.get(str(ride.get('start_date') or '')[:10])
+            if plan:
+                plans[ride['activity_id']] = plan
+
+        return {
+            **summarize_adherence(adherence_trend(actual, plans)),
+            'time_in_zones': {zone: round(float(minutes), 1) for zone, minutes in actual.sum().items()},
+        }
+
+    except Exception as e:
+        print(f"Warning: Could not get zone adherence: {e}")
+        return {}
+
+
+def _completion_analysis_data(completion):
+    """Workout analysis fields of a stored completion, named as the reasoner expects."""
+    data = {
+        'mode': (completion.get('ride_mode') or '').upper(),
+        'points': completion.get('points_earned'),
+        'total_points': completion.get('total_points'),
+        'duration_minutes': completion.get('duration_minutes'),
+        'tss': completion.get('tss'),
+        'intensity_factor': completion.get('intensity_factor'),
+        'effort_level': completion.get('effort_level'),
+        'avg_power': completion.get('avg_power'),
+        'weighted_power': completion.get('weighted_power'),
+        'date': completion.get('completed_on'),
+        'stage_type': completion.get('stage_type'),
+        'activity_id': completion.get('activity_id'),
+    }
+    return {key: value for key, value in data.items() if value not in (None, '')}
+
+
+def import_completion_summaries(store, directory=COMPLETION_SUMMARY_DIR):
+    """Import completion summaries saved as markdown into the ride store.
+
+    Returns:
+        Number of completions imported.
+    """
+    completions = []
+    for stage_file in Path(directory).glob("stage*.md"):
+        try:
+            content = stage_file.read_text(encoding='utf-8')
+            stage_data = _extract_completion_summary_data(content) if "Stage completed on:" in content else None
+            stage_number = stage_file.stem.replace('stage', '')
+            if not stage_data or not stage_data.get('date') or not stage_number.isdigit():
+                continue
+            completions.append({
+                'stage_number': int(stage_number),
+                'completed_on': stage_data['date'],
+                'activity_id': stage_data.get('activity_id'),
+                'stage_type': stage_data.get('stage_type'),
+                'ride_mode': stage_data.get('mode', '').lower() or None,
+                'points_earned': _to_number(stage_data.get('points'), int),
+                'total_points': _to_number(stage_data.get('total_points'), int),
+                'duration_minutes': _to_number(stage_data.get('duration')),
+                'tss': _to_number(stage_data.get('tss')),
+                'intensity_factor': _to_number(stage_data.get('intensity_factor')),
+                'effort_level': stage_data.get('effort_level'),
+                'avg_power': _to_number(stage_data.get('avg_power')),
+                'weighted_power': _to_number(stage_data.get('weighted_power')),
+            })
+        except Exception as e:
+            print(f"Could not parse TDF completion {stage_file}: {e}")
+    if completions:
+        store.save_completions(completions)
+        print(f"✅ Imported {len(completions)} completion summaries into the ride store")
+    return len(completions)
+
+
+def _to_number(text, cast=float):
+    """First number in a summary value like '+15' or '75.0 minutes', or None."""
+    match = re.search(r'-?\d+(?:\.\d+)?', str(text)) if text is not None else None
+    return cast(float(match.group())) if match else None
+
+
 def _extract_completion_summary_data(content):
     """Extract performance data from TDF completion summary content."""
     stage_data = {}
@@ -372,6 +521,12 @@ def _extract_completion_summary_data(content):
             stage_data['mode'] = line.split(': ')[1].strip()
         elif "Points Earned:" in line:
             stage_data['points'] = line.split(': ')[1].strip()
+        elif "Total Points:" in line:
+            stage_data['total_points'] = line.split(': ')[1].strip()
+        elif "Stage Type:" in line:
+            stage_data['stage_type'] = line.split(': ')[1].strip().lower()
+        elif "Activity ID:" in line:
+            stage_data['activity_id'] = line.split(': ')[1].strip()
         elif "Duration:" in line and "minutes" in line:
             stage_data['duration'] = line.split(': ')[1].strip()
         elif "TSS:" in line:
@@ -449,6 +604,16 @@ def get_performance_trends(recent_analyses):
     else:
         trends.append("Mixed intensity approach")
     
+    # Aerobic durability from stream-based Pw:HR decoupling
+    decoupling = [workout.get('data', {}).get('decoupling_pct') for workout in recent_analyses]
+    decoupling = [value for value in decoupling if value is not None]
+    if decoupling:
+        avg_decoupling = sum(decoupling) / len(decoupling)
+        if avg_decoupling > 5:
+            trends.append(f"Elevated aerobic decoupling ({avg_decoupling:.1f}% Pw:HR) - endurance fatigue")
+        else:
+            trends.append(f"Good aerobic durability ({avg_decoupling:.1f}% Pw:HR decoupling)")
+
     # Add recovery/workload trends
     if total_workouts >= 4:
         trends.append(f"Consistent activity pattern ({total_workouts} recent completions)")
@@ -0,0 +1,141 @@
+"""
+Concurrent gathering of the morning's metrics.
+
+Oura readiness, Strava CTL / ATL / TSB and the recent workout analysis (with
+time in zones and plan adherence) come
+from independent sources, so they are fetched on a thread pool and the
+morning run waits for the slowest source instead of their sum. Every source
+has its own timeout; a source that fails or times out leaves its fields empty
+and is reported in ``MorningMetrics.errors``, and the coach works with the
+rest (as it already does when a single API is down).
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .athlete import in_context
+
+# Seconds each source may take, measured from the start of gathering
+SOURCE_TIMEOUTS = {"oura": 15.0, "strava": 45.0, "workouts": 90.0}
+ALL_SOURCES = tuple(SOURCE_TIMEOUTS)
+
+
+@dataclass
+class MorningMetrics:
+    """Everything the coach needs from the observation layer for one morning."""
+    readiness_score: Optional[int] = None
+    hrv_balance: Optional[int] = None
+    readiness_day: Optional[str] = None
+    ctl: Optional[float] = None
+    atl: Optional[float] = None
+    tsb: Optional[float] = None
+    recent_workout_analysis: List[Dict[str, Any]] = field(default_factory=list)
+    performance_trends: str = ""
+    zone_adherence: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+    def as_metrics(self) -> Dict[str, Any]:
+        """The metrics dict ``TourCoach`` and the reasoner expect."""
+        return {
+            "readiness_score": self.readiness_score,
+            "ctl": self.ctl,
+            "atl": self.atl,
+            "tsb": self.tsb,
+        }
+
+    def format(self) -> str:
+        """One-line timing report, e.g. for the cron log."""
+        parts = [f"{name} {seconds:.1f}s" for name, seconds in self.timings.items()]
+        parts += [f"{name} ❌ {error}" for name, error in self.errors.items()]
+        return f"📊 Metrics gathered in {self.elapsed_seconds:.1f}s ({', '.join(parts)})"
+
+
+def _fetch_oura() -> Dict[str, Any]:
+    from . import monitor
+
+    score, hrv_balance, day = monitor.get_oura_readiness()
+    return {"readiness_score": score, "hrv_balance": hrv_balance, "readiness_day": day}
+
+
+def _fetch_strava() -> Dict[str, Any]:
+    from . import monitor
+
+    ctl, atl, tsb = monitor.get_ctl_atl_tsb()
+    return {"ctl": ctl, "atl": atl, "tsb": tsb}
+
+
+def _fetch_workouts() -> Dict[str, Any]:
+    from . import monitor, ride_store
+
+    # Analyse any new rides' streams once; the reasoner reads the stored numbers
+    try:
+        ride_store.sync_recent_rides()
+    except Exception as e:  # the stored analysis is still useful without new rides
+        print(f"⚠️  Ride efficiency sync failed: {e}")
+    analysis = monitor.get_recent_workout_analysis()
+    return {"recent_workout_analysis": analysis,
+            "performance_trends": monitor.get_performance_trends(analysis),
+            "zone_adherence": monitor.get_zone_adherence()}
+
+
+_SOURCES: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "oura": _fetch_oura, "strava": _fetch_strava, "workouts": _fetch_workouts,
+}
+
+
+def _timed(fetch: Callable[[], Dict[str, Any]]):
+    started = time.perf_counter()
+    values = fetch()
+    return values, time.perf_counter() - started
+
+
+def gather_morning_metrics(sources: Iterable[str] = ALL_SOURCES,
+                           timeouts: Optional[Dict[str, float]] = None) -> MorningMetrics:
+    """
+    Fetch the morning's metrics from several sources concurrently.
+
+    Args:
+        sources: Any of ``"oura"``, ``"strava"`` and ``"workouts"``.
+        timeouts: Per-source overrides of ``SOURCE_TIMEOUTS`` (seconds).
+
+    Returns:
+        MorningMetrics with whatever arrived in time; failed or timed-out
+        sources are listed in ``errors``.
+    """
+    sources = list(sources)
+    unknown = set(sources) - set(_SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown metric sources: {', '.join(sorted(unknown))}")
+    limits = {**SOURCE_TIMEOUTS, **(timeouts or {})}
+    result = MorningMetrics()
+
+    started = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=max(len(sources), 1), thread_name_prefix="metrics")
+    try:
+        futures = {name: executor.submit(in_context(_timed, _SOURCES[name])) for name in sources}
+        for name, future in futures.items():
+            remaining = started + limits[name] - time.perf_counter()
+            try:
+                values, seconds = future.result(timeout=max(remaining, 0))
+            except FutureTimeoutError:
+                result.errors[name] = f"timed out after {limits[name]:g}s"
+                continue
+            except Exception as e:
+                result.errors[name] = f"{type(e).__name__}: {e}"
+                continue
+            # Applied here, not in the worker, so a late source can't overwrite anything
+            for key, value in values.items():
+                setattr(result, key, value)
+            result.timings[name] = round(seconds, 2)
+    finally:
+        # Don't wait for a source that timed out; its late result is ignored
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    result.elapsed_seconds = round(time.perf_counter() - started, 2)
+    return result
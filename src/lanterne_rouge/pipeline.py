@@ -0,0 +1,275 @@
+"""
+DAG scheduler for the daily jobs, with output caching.
+
+The morning and evening GitHub Actions jobs chained scripts that each
+re-derived the same data (points status, current stage, briefing stage). A
+``Pipeline`` declares the steps once instead: every ``Task`` names the tasks
+whose outputs it consumes, tasks whose dependencies are done run concurrently
+on a thread pool, and all tasks share one ``WorkflowContext``.
+
+Outputs are cached in SQLite by a hash of the task's inputs (its declared
+external inputs plus its dependencies' outputs). A re-run only re-executes
+tasks whose inputs changed, so retrying a job after a failed notification
+doesn't fetch, decide and summarize again, and an unchanged briefing isn't
+sent twice.
+"""
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .athlete import in_context, use_athlete
+from .workflow import StepResult, WorkflowContext, WorkflowReport
+
+_MISS = object()
+
+
+@dataclass
+class Task:
+    """
+    One node of a pipeline.
+
+    Attributes:
+        name: Unique task name; also the keyword its output is passed under.
+        func: Called as ``func(context, **outputs_of_deps)``.
+        deps: Names of the tasks whose outputs this task consumes.
+        inputs: Optional callable returning a JSON-serializable fingerprint
+            of what the task reads from outside the pipeline (a date, a
+            file's hash, ...). Part of the cache key.
+        cache: Reuse the stored output when the cache key is unchanged.
+            Outputs that aren't JSON-serializable are never cached.
+        required: A failed required task fails the run; either way its
+            dependents are skipped.
+    """
+    name: str
+    func: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+    inputs: Optional[Callable[[WorkflowContext], Any]] = None
+    cache: bool = True
+    required: bool = True
+
+
+def file_fingerprint(path: os.PathLike) -> Optional[str]:
+    """SHA-256 of a file's bytes (``None`` if it doesn't exist), for ``Task.inputs``."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class PipelineCache:
+    """SQLite table with the last output of every task, keyed by its input hash."""
+
+    def __init__(self, db_path: Optional[os.PathLike] = None):
+        if db_path is None:
+            from .memory_bus import db_file
+            db_path = db_file()
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS pipeline_cache (
+                pipeline TEXT NOT NULL,
+                task TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                output TEXT NOT NULL,
+                updated_at TEXT,
+                PRIMARY KEY (pipeline, task)
+            )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, pipeline: str, task: str, input_hash: str) -> Any:
+        """The stored output, or the module's miss sentinel when the hash differs."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT output FROM pipeline_cache WHERE pipeline = ? AND task = ? AND input_hash = ?",
+                (pipeline, task, input_hash),
+            ).fetchone()
+        return _MISS if row is None else json.loads(row["output"])
+
+    def has(self, pipeline: str, task: str, input_hash: str) -> bool:
+        """True if an output is stored for exactly this input hash."""
+        return self.get(pipeline, task, input_hash) is not _MISS
+
+    def put(self, pipeline: str, task: str, input_hash: str, output: Any) -> bool:
+        """Store a task's output; returns False if it isn't JSON-serializable."""
+        try:
+            payload = json.dumps(output, sort_keys=True)
+        except (TypeError, ValueError):
+            return False
+        with self._connect() as conn:
+            conn.execute("""
+            INSERT INTO pipeline_cache (pipeline, task, input_hash, output, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(pipeline, task) DO UPDATE SET
+                input_hash = excluded.input_hash,
+                output = excluded.output,
+                updated_at = excluded.updated_at
+            """, (pipeline, task, input_hash, payload,
+                  datetime.datetime.now(datetime.timezone.utc).isoformat()))
+        return True
+
+    def clear(self, pipeline: Optional[str] = None) -> int:
+        """Forget cached outputs (of one pipeline, or all); returns rows deleted."""
+        with self._connect() as conn:
+            if pipeline is None:
+                return conn.execute("DELETE FROM pipeline_cache").rowcount
+            return conn.execute("DELETE FROM pipeline_cache WHERE pipeline = ?", (pipeline,)).rowcount
+
+
+class Pipeline:
+    """
+    A DAG of tasks run with a shared context and cached outputs.
+
+    Example:
+        pipeline = Pipeline("morning")
+        pipeline.add(Task("metrics", fetch_metrics, inputs=lambda ctx: str(date.today())))
+        pipeline.add(Task("briefing", write_briefing, deps=("metrics",)))
+        report = pipeline.run()
+    """
+
+    def __init__(self, name: str, tasks: Iterable[Task] = (), cache: Optional[PipelineCache] = None,
+                 max_workers: int = 4):
+        self.name = name
+        self.cache = cache
+        self.max_workers = max_workers
+        self.tasks: Dict[str, Task] = {}
+        for task in tasks:
+            self.add(task)
+
+    def add(self, task: Task) -> "Pipeline":
+        """Add a task; its dependencies must already be in the pipeline, so the graph stays acyclic."""
+        if task.name in self.tasks:
+            raise ValueError(f"Duplicate pipeline task: {task.name}")
+        missing = [dep for dep in task.deps if dep not in self.tasks]
+        if missing:
+            raise ValueError(f"Task '{task.name}' depends on unknown tasks: {', '.join(missing)}")
+        self.tasks[task.name] = task
+        return self
+
+    def order(self) -> List[str]:
+        """Task names in a valid execution order (insertion order is topological)."""
+        return list(self.tasks)
+
+    def _select(self, targets: Optional[Iterable[str]]) -> List[str]:
+        if not targets:
+            return self.order()
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.tasks:
+                raise ValueError(f"Unknown pipeline task: {name}")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.tasks[name].deps)
+        return [name for name in self.order() if name in needed]
+
+    def _cache_key(self, task: Task, context: WorkflowContext, upstream: Dict[str, Any]) -> str:
+        external = task.inputs(context) if task.inputs else None
+        return _digest({"task": task.name, "inputs": external,
+                        "deps": {dep: _digest(value) for dep, value in upstream.items()}})
+
+    def _execute(self, task: Task, context: WorkflowContext, upstream: Dict[str, Any], force: bool):
+        """Run one task on a worker (or load it from the cache); returns (output, cached, seconds)."""
+        started = time.perf_counter()
+        key = None
+        if self.cache is not None and task.cache:
+            key = self._cache_key(task, context, upstream)
+            if not force:
+                stored = self.cache.get(self.name, task.name, key)
+                if stored is not _MISS:
+                    return stored, True, time.perf_counter() - started
+        with use_athlete(context.athlete):
+            output = task.func(context, **upstream)
+        if key is not None:
+            self.cache.put(self.name, task.name, key, output)
+        return output, False, time.perf_counter() - started
+
+    def run(self, context: Optional[WorkflowContext] = None, targets: Optional[Iterable[str]] = None,
+            force: bool = False) -> WorkflowReport:
+        """
+        Run the pipeline.
+
+        Args:
+            context: Shared resources, left open for the caller; a fresh
+                ``WorkflowContext`` (closed afterwards) when omitted.
+            targets: Only run these tasks (and what they depend on).
+            force: Ignore cached outputs (fresh outputs are still stored).
+
+        Returns:
+            WorkflowReport with one entry per selected task, in pipeline order.
+        """
+        owns_context = context is None
+        context = context or WorkflowContext()
+        selected = self._select(targets)
+        pending = list(selected)
+        outputs: Dict[str, Any] = {}
+        results: Dict[str, StepResult] = {}
+        running = {}
+        submitted: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"pipeline-{self.name}")
+        try:
+            while pending or running:
+                for name in list(pending):
+                    task = self.tasks[name]
+                    if any(dep in results and dep not in outputs for dep in task.deps):
+                        # An upstream task failed or was skipped
+                        results[name] = StepResult(name, 0.0, ok=False, required=task.required, skipped=True)
+                        pending.remove(name)
+                    elif all(dep in outputs for dep in task.deps):
+                        upstream = {dep: outputs[dep] for dep in task.deps}
+                        running[executor.submit(in_context(self._execute, task, context, upstream, force))] = name
+                        submitted[name] = time.perf_counter()
+                        pending.remove(name)
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    task = self.tasks[name]
+                    try:
+                        output, cached, seconds = future.result()
+                    except Exception as e:
+                        print(f"❌ Task '{name}' failed: {e}")
+                        seconds = time.perf_counter() - submitted[name]
+                        results[name] = StepResult(name, round(seconds, 3), ok=False, required=task.required,
+                                                   error=f"{type(e).__name__}: {e}")
+                        continue
+                    # Outputs are recorded here, on the scheduler thread, never by workers
+                    outputs[name] = output
+                    context.results[name] = output
+                    results[name] = StepResult(name, round(seconds, 3), required=task.required, cached=cached)
+        finally:
+            executor.shutdown(wait=True)
+            if owns_context:
+                context.close()
+
+        report = WorkflowReport(self.name, [results[name] for name in selected])
+        report.elapsed_seconds = round(time.perf_counter() - started, 2)
+        return report
@@ -0,0 +1,179 @@
+"""
+Prompt budgeting utilities for Lanterne Rouge.
+
+Estimates prompt size in tokens and trims prompt sections to fit a budget.
+Each section carries a priority; when a prompt is over budget the lowest
+priority sections are summarized or truncated first, always in the same
+order, so the same inputs produce the same prompt on every run.
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional; fall back to a character heuristic
+    _ENCODING = None
+
+# Rough characters-per-token ratio for English prose when tiktoken is absent
+CHARS_PER_TOKEN = 4
+
+# Default total prompt budgets (in tokens) for the Fiction Mode call sites
+EFFORT_ANALYSIS_BUDGET = 1500
+EVENTS_EXTRACTION_BUDGET = 1800
+MAPPING_BUDGET = 1500
+RESULTS_EXTRACTION_BUDGET = 600  # scraped results page, before instructions
+
+TRUNCATION_MARKER = "\n[...truncated]"
+
+
+@dataclass
+class PromptSection:
+    """A named piece of a prompt with its trimming policy."""
+    name: str
+    text: str
+    priority: int = 0  # Higher priority sections are trimmed last
+    min_tokens: int = 0  # Never trim below this size
+    strategy: str = "head"  # 'head', 'lines' or 'summary'
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens ``text`` will use in a chat prompt."""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces and blank lines, e.g. in scraped HTML text."""
+    lines = [re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in text.splitlines()]
+    collapsed = re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+    return collapsed.strip()
+
+
+def truncate_to_tokens(text: str, max_tokens: int, strategy: str = "head") -> str:
+    """Shrink ``text`` to at most ``max_tokens`` tokens.
+
+    Args:
+        text: Text to shrink.
+        max_tokens: Token budget for the result.
+        strategy: ``"head"`` keeps the beginning of the text, ``"lines"`` keeps
+            whole leading lines, ``"summary"`` keeps the lead sentence of each
+            paragraph before filling in the rest.
+
+    Returns:
+        The original text if it already fits, otherwise a shortened version
+        ending with a truncation marker.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= estimate_tokens(TRUNCATION_MARKER):
+        return ""
+
+    available = max_tokens - estimate_tokens(TRUNCATION_MARKER)
+    if strategy == "lines":
+        kept = _keep_leading_lines(text, available)
+    elif strategy == "summary":
+        kept = _extractive_summary(text, available)
+    else:
+        kept = _keep_prefix(text, available)
+    return kept + TRUNCATION_MARKER
+
+
+def fit_sections(sections: List[PromptSection], budget: int) -> Dict[str, str]:
+    """Trim sections until their combined size fits within ``budget`` tokens.
+
+    Sections are shrunk in ascending priority order (ties broken by position,
+    later sections first) and never below their ``min_tokens``.
+
+    Returns:
+        Mapping of section name to its (possibly trimmed) text.
+    """
+    sizes = {section.name: estimate_tokens(section.text) for section in sections}
+    fitted = {section.name: section.text for section in sections}
+    overflow = sum(sizes.values()) - budget
+
+    order = sorted(
+        enumerate(sections),
+        key=lambda item: (item[1].priority, -item[0])
+    )
+    for _, section in order:
+        if overflow <= 0:
+            break
+        current = sizes[section.name]
+        target = max(section.min_tokens, current - overflow)
+        if target >= current:
+            continue
+        trimmed = truncate_to_tokens(section.text, target, section.strategy)
+        new_size = estimate_tokens(trimmed)
+        fitted[section.name] = trimmed
+        overflow -= current - new_size
+        sizes[section.name] = new_size
+
+    return fitted
+
+
+def budget_text(text: str, budget: int, strategy: str = "head") -> str:
+    """Convenience wrapper to normalize and trim a single block of text."""
+    return truncate_to_tokens(normalize_whitespace(text), budget, strategy)
+
+
+def _keep_prefix(text: str, max_tokens: int) -> str:
+    """Longest prefix of ``text`` that fits, cut back to a word boundary."""
+    low, high = 0, min(len(text), max_tokens * CHARS_PER_TOKEN * 2)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    prefix = text[:low]
+    if low < len(text) and " " in prefix:
+        prefix = prefix.rsplit(" ", 1)[0]
+    return prefix.rstrip()
+
+
+def _keep_leading_lines(text: str, max_tokens: int) -> str:
+    """Keep whole lines from the top while they fit."""
+    kept = []
+    used = 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line + "\n")
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+def _extractive_summary(text: str, max_tokens: int) -> str:
+    """Keep the lead sentence of every paragraph, then later sentences in order."""
+    paragraphs = [p for p in re.split(r"\n\s*\n", text) if p.strip()]
+    sentences = [re.split(r"(?<=[.!?])\s+", p.strip()) for p in paragraphs]
+
+    # Rank (paragraph, sentence) positions: all lead sentences first, then
+    # second sentences, and so on - a fixed order, so the result is stable.
+    ranked = sorted(
+        ((s_idx, p_idx) for p_idx, group in enumerate(sentences) for s_idx in range(len(group)))
+    )
+    selected = set()
+    used = 0
+    for s_idx, p_idx in ranked:
+        cost = estimate_tokens(sentences[p_idx][s_idx] + " ")
+        if used + cost > max_tokens:
+            continue
+        selected.add((p_idx, s_idx))
+        used += cost
+
+    summary = []
+    for p_idx, group in enumerate(sentences):
+        kept = [group[s_idx] for s_idx in range(len(group)) if (p_idx, s_idx) in selected]
+        if kept:
+            summary.append(" ".join(kept))
+    return "\n\n".join(summary)
@@ -0,0 +1,356 @@
+"""
+Local store of Oura readiness, sleep and HRV data.
+
+Daily Oura summaries are synced incrementally into the local SQLite database
+(``memory/lanterne.db`` by default): each sync asks the API only for the days
+since the last stored one (that day included, since Oura revises the current
+day as the night's data arrives) and upserts one row per day. Syncs closer
+together than ``MIN_SYNC_INTERVAL`` are skipped entirely, so running the
+morning pipeline several times a day costs one API round trip. Backtests and
+trend features read any date range locally.
+
+The schema evolves without breaking old rows: the full contributor snapshot
+is kept as JSON (Oura can add contributors at any time), the most used ones
+also get typed columns, and columns added to ``READINESS_COLUMNS`` later are
+added to existing tables on open. ``ReadinessStore.frame`` expands the JSON
+into one typed column per contributor ever seen.
+"""
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .streams.mmp import DEFAULT_ATHLETE
+
+OURA_API_URL = "https://api.ouraring.com/v2/usercollection"
+INITIAL_SYNC_DAYS = 30  # History fetched on the first sync
+MIN_SYNC_INTERVAL = datetime.timedelta(hours=1)
+
+# Column name -> SQLite type
+READINESS_COLUMNS = {
+    "readiness_score": "INTEGER",
+    "temperature_deviation": "REAL",
+    "hrv_balance": "INTEGER",
+    "resting_heart_rate": "INTEGER",
+    "recovery_index": "INTEGER",
+    "sleep_balance": "INTEGER",
+    "sleep_score": "INTEGER",
+}
+
+# SQLite type -> pandas dtype (nullable integers keep missing days as <NA>)
+_DTYPES = {"INTEGER": "Int64", "REAL": "float64"}
+
+DateLike = Union[str, datetime.date]
+
+
+def _day(value: DateLike) -> str:
+    return value.isoformat()[:10] if isinstance(value, datetime.date) else str(value)[:10]
+
+
+class ReadinessStore:
+    """SQLite table of daily Oura summaries keyed by athlete and day."""
+
+    def __init__(self, db_path: Optional[os.PathLike] = None):
+        if db_path is None:
+            from .memory_bus import db_file
+            db_path = db_file()
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        columns = ",\n                ".join(f"{name} {kind}" for name, kind in READINESS_COLUMNS.items())
+        with self._connect() as conn:
+            conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS oura_daily (
+                athlete_id TEXT NOT NULL,
+                day TEXT NOT NULL,
+                {columns},
+                contributors TEXT,
+                fetched_at TEXT,
+                PRIMARY KEY (athlete_id, day)
+            )
+            """)
+            # Tables created by older versions lack newer columns
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(oura_daily)")}
+            for name, kind in {**READINESS_COLUMNS, "contributors": "TEXT"}.items():
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE oura_daily ADD COLUMN {name} {kind}")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def upsert(self, days: List[Dict[str, Any]], athlete_id: str = DEFAULT_ATHLETE) -> List[str]:
+        """
+        Insert or update daily summaries in one transaction.
+
+        Args:
+            days: Dicts with ``day`` plus any ``READINESS_COLUMNS`` and an
+                optional ``contributors`` dict; ``None`` keeps a stored value
+                (readiness and sleep arrive separately).
+
+        Returns:
+            Days that were not stored before, in input order.
+        """
+        if not days:
+            return []
+        names = [*READINESS_COLUMNS, "contributors"]
+        fetched_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        updates = ", ".join(f"{name} = COALESCE(excluded.{name}, {name})" for name in names)
+        sql = (f"INSERT INTO oura_daily (athlete_id, day, {', '.join(names)}, fetched_at) "
+               f"VALUES ({', '.join('?' * (len(names) + 3))}) ON CONFLICT(athlete_id, day) "
+               f"DO UPDATE SET {updates}, fetched_at = excluded.fetched_at")
+        with self._connect() as conn:
+            keys = [_day(entry["day"]) for entry in days]
+            known = {row["day"] for row in conn.execute(
+                f"SELECT day FROM oura_daily WHERE athlete_id = ? AND day IN ({', '.join('?' * len(keys))})",
+                (athlete_id, *keys),
+            )}
+            conn.executemany(sql, [
+                (athlete_id, key, *(entry.get(name) for name in READINESS_COLUMNS),
+                 json.dumps(entry["contributors"], sort_keys=True) if entry.get("contributors") else None,
+                 fetched_at)
+                for key, entry in zip(keys, days)
+            ])
+        return [key for key in dict.fromkeys(keys) if key not in known]
+
+    def scored_days(self, days: List[str], athlete_id: str = DEFAULT_ATHLETE) -> set:
+        """Which of ``days`` already have a readiness score stored."""
+        if not days:
+            return set()
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT day FROM oura_daily WHERE athlete_id = ? AND readiness_score IS NOT NULL "
+                f"AND day IN ({', '.join('?' * len(days))})",
+                (athlete_id, *days),
+            ).fetchall()
+        return {row["day"] for row in rows}
+
+    def last_day(self, athlete_id: str = DEFAULT_ATHLETE) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(day) FROM oura_daily WHERE athlete_id = ?", (athlete_id,)).fetchone()
+        return row[0]
+
+    def last_fetched_at(self, athlete_id: str = DEFAULT_ATHLETE) -> Optional[datetime.datetime]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(fetched_at) FROM oura_daily WHERE athlete_id = ?",
+                               (athlete_id,)).fetchone()
+        return datetime.datetime.fromisoformat(row[0]) if row[0] else None
+
+    def latest(self, since: Optional[DateLike] = None,
+               athlete_id: str = DEFAULT_ATHLETE) -> Optional[Dict[str, Any]]:
+        """Most recent day with a readiness score (on or after ``since``), or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM oura_daily WHERE athlete_id = ? AND readiness_score IS NOT NULL "
+                "AND day >= ? ORDER BY day DESC LIMIT 1",
+                (athlete_id, _day(since) if since else ""),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def frame(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None,
+              athlete_id: str = DEFAULT_ATHLETE, contributors: bool = True) -> pd.DataFrame:
+        """
+        Days between ``start`` and ``end`` (inclusive), oldest first.
+
+        Args:
+            contributors: Also expand the JSON snapshot into one
+                ``contributor_<name>`` column per contributor seen in the range.
+
+        Returns:
+            DataFrame indexed by day (datetime) with nullable integer columns
+            for scores and float columns for deviations.
+        """
+        columns = [*READINESS_COLUMNS, "contributors"] if contributors else list(READINESS_COLUMNS)
+        sql = f"SELECT day, {', '.join(columns)} FROM oura_daily WHERE athlete_id = ?"
+        params: List[Any] = [athlete_id]
+        if start is not None:
+            sql += " AND day >= ?"
+            params.append(_day(start))
+        if end is not None:
+            sql += " AND day <= ?"
+            params.append(_day(end))
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY day", params).fetchall()
+
+        data: Dict[str, Any] = {
+            name: pd.array([row[name] for row in rows], dtype=_DTYPES[kind])
+            for name, kind in READINESS_COLUMNS.items()
+        }
+        if contributors:
+            snapshots = [json.loads(row["contributors"]) if row["contributors"] else {} for row in rows]
+            for key in sorted({key for snapshot in snapshots for key in snapshot}):
+                values = pd.to_numeric(pd.Series([snapshot.get(key) for snapshot in snapshots], dtype=object),
+                                       errors="coerce")
+                whole = values.dropna().mod(1).eq(0).all()
+                values = values.round().astype("Int64") if whole else values.astype(float)
+                data[f"contributor_{key}"] = values.array  # positional, not aligned on a RangeIndex
+        index = pd.DatetimeIndex([row["day"] for row in rows], name="day")
+        return pd.DataFrame(data, index=index)
+
+    def arrays(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None,
+               athlete_id: str = DEFAULT_ATHLETE) -> Dict[str, np.ndarray]:
+        """
+        The same range as plain NumPy columns for vectorized trend code.
+
+        Returns:
+            ``day`` as ``datetime64[D]`` plus one float64 array per column
+            (NaN where a value is missing).
+        """
+        frame = self.frame(start, end, athlete_id)
+        arrays = {"day": frame.index.to_numpy().astype("datetime64[D]")}
+        for name in frame.columns:
+            arrays[name] = frame[name].astype("float64").to_numpy(na_value=np.nan)
+        return arrays
+
+    def import_csv_log(self, path: os.PathLike, athlete_id: str = DEFAULT_ATHLETE) -> int:
+        """
+        Migrate the legacy ``readiness_score_log.csv`` (stored days are kept).
+
+        Its header was written once and the contributors changed since, so
+        contributor cells are only trusted when a row has as many cells as
+        the header; scores are always imported.
+
+        Returns:
+            Number of days added.
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        with open(path, newline="", encoding="utf-8") as handle:
+            reader = csv.reader(handle)
+            header = next(reader, None) or []
+            for cells in reader:
+                if len(cells) < 2:
+                    continue
+                try:
+                    day = datetime.date.fromisoformat(cells[0].strip()).isoformat()
+                except ValueError:
+                    continue
+                snapshot = {}
+                if len(cells) == len(header):
+                    snapshot = {key: _legacy_number(value) for key, value in zip(header[2:], cells[2:])}
+                    snapshot = {key: value for key, value in snapshot.items() if value is not None}
+                rows[day] = {"day": day, "readiness_score": _legacy_number(cells[1]),
+                             "contributors": snapshot, **_contributor_columns(snapshot)}
+        stored = set(self.frame(athlete_id=athlete_id, contributors=False).index.strftime("%Y-%m-%d"))
+        new = [row for day, row in sorted(rows.items()) if day not in stored]
+        self.upsert(new, athlete_id)
+        return len(new)
+
+
+def _legacy_number(value: str) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None  # "NA", blanks
+    return int(number) if number.is_integer() else number
+
+
+def _contributor_columns(contributors: Dict[str, Any]) -> Dict[str, Any]:
+    """Typed columns that mirror contributors in the JSON snapshot."""
+    return {name: contributors.get(name) for name in
+            ("hrv_balance", "resting_heart_rate", "recovery_index", "sleep_balance")}
+
+
+# --------------------------------------------------------------------------- #
+#  Oura API
+# --------------------------------------------------------------------------- #
+
+def fetch_oura_collection(collection: str, start_date: str, end_date: str,
+                          token: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    All documents of an Oura v2 daily collection between two days, following
+    ``next_token`` pagination.
+
+    Raises:
+        requests.RequestException: On network or HTTP errors.
+    """
+    import requests
+
+    if token is None:
+        from .athlete import current_athlete
+        token = current_athlete().oura_token
+    params = {"start_date": start_date, "end_date": end_date}
+    documents: List[Dict[str, Any]] = []
+    while True:
+        response = requests.get(f"{OURA_API_URL}/{collection}", params=params,
+                                headers={"Authorization": f"Bearer {token}"}, timeout=10)
+        response.raise_for_status()
+        body = response.json()
+        documents.extend(body.get("data", []))
+        if not body.get("next_token"):
+            return documents
+        params = {**params, "next_token": body["next_token"]}
+
+
+def readiness_row(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Store row for one ``daily_readiness`` document."""
+    contributors = entry.get("contributors") or {}
+    return {
+        "day": entry["day"],
+        "readiness_score": entry.get("score"),
+        "temperature_deviation": entry.get("temperature_deviation"),
+        "contributors": contributors,
+        **_contributor_columns(contributors),
+    }
+
+
+def sync_oura(store: Optional[ReadinessStore] = None, today: Optional[datetime.date] = None,
+              athlete_id: str = DEFAULT_ATHLETE, force: bool = False,
+              fetch: Optional[Callable[..., List[Dict[str, Any]]]] = None,
+              on_new_readiness: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[str]:
+    """
+    Fetch the days since the last stored one from Oura and upsert them.
+
+    Args:
+        today: Last day to request (defaults to the local date).
+        force: Sync even if the last sync was within ``MIN_SYNC_INTERVAL``.
+        fetch: ``fetch(collection, start_date, end_date)``; defaults to
+            ``fetch_oura_collection``.
+        on_new_readiness: Called with each readiness document for a day that
+            had no readiness score stored before (e.g. to log it once).
+
+    Returns:
+        Days that were not stored before.
+    """
+    store = store or ReadinessStore()
+    fetch = fetch or fetch_oura_collection
+    today = today or datetime.date.today()
+    last_fetched = store.last_fetched_at(athlete_id)
+    if (not force and last_fetched is not None
+            and datetime.datetime.now(datetime.timezone.utc) - last_fetched < MIN_SYNC_INTERVAL):
+        return []
+
+    last_day = store.last_day(athlete_id)
+    start = (datetime.date.fromisoformat(last_day) if last_day
+             else today - datetime.timedelta(days=INITIAL_SYNC_DAYS))
+    # The end date is exclusive for some collections; one extra day is harmless
+    end = today + datetime.timedelta(days=1)
+
+    readiness = fetch("daily_readiness", start.isoformat(), end.isoformat())
+    sleep = fetch("daily_sleep", start.isoformat(), end.isoformat())
+    rows: Dict[str, Dict[str, Any]] = {}
+    for entry in readiness:
+        rows[entry["day"]] = readiness_row(entry)
+    for entry in sleep:
+        rows.setdefault(entry["day"], {"day": entry["day"]})["sleep_score"] = entry.get("score")
+
+    already_scored = store.scored_days(list(rows), athlete_id)
+    new_days = store.upsert(sorted(rows.values(), key=lambda row: row["day"]), athlete_id)
+    if on_new_readiness:
+        for entry in sorted(readiness, key=lambda e: e["day"]):
+            if entry["day"] not in already_scored and entry.get("score") is not None:
+                on_new_readiness(entry)
+    return new_days
@@ -8,13 +8,12 @@ rule-based and LLM-based reasoning modes.
 from __future__ import annotations
 
 import json
-import os
 from typing import Dict, List, Any
 from dataclasses import dataclass
 from datetime import date
 
 from .memory_bus import fetch_recent_memories
-from .ai_clients import call_llm
+from .ai_clients import call_llm, llm_available
 
 
 @dataclass
@@ -46,6 +45,25 @@ class TrainingDecision:
     confidence: float  # 0.0 to 1.0
 
 
+def _zone_adherence_text(zone_adherence: Dict[str, Any] = None) -> str:
+    """Prompt lines for ``monitor.get_zone_adherence`` output ('' when there is none)."""
+    if not zone_adherence:
+        return ""
+    text = ""
+    time_in_zones = zone_adherence.get('time_in_zones')
+    if time_in_zones:
+        text += "\nTime in power zones over recent rides: " + ", ".join(
+            f"{zone} {minutes:.0f} min" for zone, minutes in time_in_zones.items())
+    if 'recent_score' in zone_adherence:
+        text += (
+            f"\nPlan adherence: {zone_adherence['recent_score']:.0%} of planned zone time hit "
+            f"over the last rides ({zone_adherence['mean_score']:.0%} across {zone_adherence['rides']})"
+        )
+        if zone_adherence.get('trend'):
+            text += f", {zone_adherence['trend']}"
+    return text
+
+
 class ReasoningAgent:
     """Makes structured training decisions based on athlete metrics.
 
@@ -98,7 +116,7 @@ class ReasoningAgent:
         Returns:
             TrainingDecision with structured reasoning output
         """
-        if self.use_llm and os.getenv("OPENAI_API_KEY"):
+        if self.use_llm and llm_available():
             return self._make_llm_decision(metrics, mission_config, current_date)
         return self._make_rule_based_decision(metrics, mission_config, current_date)
 
@@ -154,6 +172,21 @@ class ReasoningAgent:
                 confidence=0.7
             )
 
+    def make_batch_decisions(self, readiness, tsb, decision_rules: Dict[str, Any] = None):
+        """Make rule-based decisions for many days or athletes at once.
+
+        Args:
+            readiness: Array-like of readiness scores (NaN for missing).
+            tsb: Array-like of TSB values, same length as ``readiness``.
+            decision_rules: Optional rules overriding ``self.decision_rules``.
+
+        Returns:
+            BatchDecisions with action, intensity, flag and confidence arrays
+        """
+        from .batch_decisions import batch_rule_based_decisions
+
+        return batch_rule_based_decisions(readiness, tsb, decision_rules or self.decision_rules)
+
     def _make_llm_decision(
         self,
         metrics: Dict[str, Any],
@@ -226,6 +259,12 @@ Consider:
                         workout_analysis_summary += f"IF {data['intensity_factor']}, "
                     if data.get('tss'):
                         workout_analysis_summary += f"TSS {data['tss']}, "
+                    if data.get('efficiency_factor'):
+                        workout_analysis_summary += f"EF {data['efficiency_factor']}, "
+                    if data.get('decoupling_pct') is not None:
+                        workout_analysis_summary += f"Pw:HR decoupling {data['decoupling_pct']}%, "
+                    if data.get('hr_drift_pct') is not None:
+                        workout_analysis_summary += f"HR drift {data['hr_drift_pct']}%, "
                     if data.get('effort_level'):
                         workout_analysis_summary += f"{data['effort_level']} effort"
                     workout_analysis_summary += "\n"
@@ -233,8 +272,12 @@ Consider:
             if performance_trends:
                 workout_analysis_summary += f"\nPerformance trends: {performance_trends}"
 
+            # Time in zones and plan adherence (monitor.get_zone_adherence)
+            workout_analysis_summary += _zone_adherence_text(metrics.get('zone_adherence'))
+
+            excluded = ['recent_workout_analysis', 'performance_trends', 'zone_adherence']
             user_prompt = f"""My current metrics:
-{json.dumps({k: v for k, v in metrics.items() if k not in ['recent_workout_analysis', 'performance_trends']}, indent=2)}
+{json.dumps({k: v for k, v in metrics.items() if k not in excluded}, indent=2)}
 
 {training_context}
 
@@ -291,7 +334,7 @@ Please provide a structured training decision based on my metrics, recent workou
         Returns:
             TDFDecision with both training and ride mode recommendations
         """
-        if self.use_llm and os.getenv("OPENAI_API_KEY"):
+        if self.use_llm and llm_available():
             return self._make_llm_tdf_decision(metrics, mission_config, current_date, tdf_data)
         return self._make_rule_based_tdf_decision(metrics, mission_config, current_date, tdf_data)
 
@@ -496,6 +539,7 @@ Recent workout analysis:
 {json.dumps(tdf_data.get('recent_workout_analysis', [])[:3], indent=2) if tdf_data else "No recent workout data available"}
 
 Performance trends: {tdf_data.get('performance_trends', 'No trend analysis available') if tdf_data else 'No trend data available'}
+{_zone_adherence_text(tdf_data.get('zone_adherence')) if tdf_data else ''}
 
 Please provide both a training decision AND a ride mode recommendation for today's TDF stage. Remember to speak to me directly and explain your reasoning for both the training approach and the strategic ride mode choice."""
 
@@ -0,0 +1,220 @@
+"""
+Structured store of per-ride analyses.
+
+Stream-derived ride metrics and TDF stage completion results are written
+once per activity (or stage) and kept in indexed tables of the local SQLite
+database (``memory/lanterne.db`` by default), so the morning run reads
+precomputed numbers with one query instead of re-analysing rides or parsing
+markdown.
+"""
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from .streams.efficiency import RideEfficiency, ride_efficiency
+from .streams.mmp import DEFAULT_ATHLETE
+
+RIDE_SPORT_TYPES = ('Ride', 'VirtualRide')
+
+
+class RideAnalysisStore:
+    """SQLite-backed store of per-ride efficiency metrics and stage completions."""
+
+    def __init__(self, db_path: Optional[os.PathLike] = None):
+        if db_path is None:
+            from .memory_bus import db_file
+            db_path = db_file()
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS ride_efficiency (
+                athlete_id TEXT NOT NULL,
+                activity_id TEXT NOT NULL,
+                start_date TEXT,
+                name TEXT,
+                duration_seconds REAL,
+                efficiency_factor REAL,
+                decoupling_pct REAL,
+                hr_drift_pct REAL,
+                avg_cadence REAL,
+                coasting_pct REAL,
+                cadence_distribution TEXT,
+                computed_at TEXT,
+                PRIMARY KEY (athlete_id, activity_id)
+            )
+            """)
+            conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ride_efficiency_date
+            ON ride_efficiency(athlete_id, start_date DESC)
+            """)
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS completion_results (
+                athlete_id TEXT NOT NULL,
+                stage_number INTEGER NOT NULL,
+                completed_on TEXT NOT NULL,
+                activity_id TEXT,
+                stage_type TEXT,
+                ride_mode TEXT,
+                points_earned INTEGER,
+                total_points INTEGER,
+                duration_minutes REAL,
+                tss REAL,
+                intensity_factor REAL,
+                effort_level TEXT,
+                avg_power REAL,
+                weighted_power REAL,
+                PRIMARY KEY (athlete_id, stage_number)
+            )
+            """)
+            conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_completion_results_date
+            ON completion_results(athlete_id, completed_on DESC)
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def known_activity_ids(self, athlete_id: str = DEFAULT_ATHLETE) -> Set[str]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT activity_id FROM ride_efficiency WHERE athlete_id = ?",
+                                (athlete_id,)).fetchall()
+        return {row['activity_id'] for row in rows}
+
+    def save_efficiency(self, rides: List[Dict[str, Any]], athlete_id: str = DEFAULT_ATHLETE) -> int:
+        """
+        Insert or replace efficiency metrics for many rides in one transaction.
+
+        Args:
+            rides: Dicts with ``activity_id``, ``start_date``, ``name`` and
+                ``metrics`` (a RideEfficiency).
+
+        Returns:
+            Number of rides written.
+        """
+        computed_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        rows = []
+        for ride in rides:
+            metrics: RideEfficiency = ride['metrics']
+            rows.append((
+                athlete_id, str(ride['activity_id']), ride.get('start_date'), ride.get('name', ''),
+                metrics.duration_seconds, metrics.efficiency_factor, metrics.decoupling_pct,
+                metrics.hr_drift_pct, metrics.avg_cadence, metrics.coasting_pct,
+                json.dumps(metrics.cadence_distribution), computed_at,
+            ))
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ride_efficiency VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def recent_efficiency(self, limit: int = 7, athlete_id: str = DEFAULT_ATHLETE) -> List[Dict[str, Any]]:
+        """The ``limit`` most recent rides' metrics, newest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM ride_efficiency WHERE athlete_id = ? "
+                "ORDER BY start_date DESC LIMIT ?",
+                (athlete_id, limit),
+            ).fetchall()
+        result = []
+        for row in rows:
+            entry = dict(row)
+            entry['cadence_distribution'] = json.loads(entry['cadence_distribution'] or '{}')
+            result.append(entry)
+        return result
+
+    def save_completions(self, completions: List[Dict[str, Any]], athlete_id: str = DEFAULT_ATHLETE) -> int:
+        """
+        Insert or replace TDF stage completion results in one transaction.
+
+        Args:
+            completions: Dicts keyed like the ``completion_results`` columns
+                (``stage_number`` and ``completed_on`` are required).
+
+        Returns:
+            Number of completions written.
+        """
+        rows = [(
+            athlete_id, int(c['stage_number']), str(c['completed_on']),
+            str(c['activity_id']) if c.get('activity_id') is not None else None,
+            c.get('stage_type'), c.get('ride_mode'), c.get('points_earned'), c.get('total_points'),
+            c.get('duration_minutes'), c.get('tss'), c.get('intensity_factor'), c.get('effort_level'),
+            c.get('avg_power'), c.get('weighted_power'),
+        ) for c in completions]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO completion_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def save_completion(self, athlete_id: str = DEFAULT_ATHLETE, **completion) -> None:
+        """Record one stage completion (see ``save_completions``)."""
+        self.save_completions([completion], athlete_id)
+
+    def recent_completions(self, limit: int = 7, athlete_id: str = DEFAULT_ATHLETE) -> List[Dict[str, Any]]:
+        """The ``limit`` most recent stage completions, newest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM completion_results WHERE athlete_id = ? "
+                "ORDER BY completed_on DESC, stage_number DESC LIMIT ?",
+                (athlete_id, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def sync_recent_rides(limit: int = 10, athlete_id: str = DEFAULT_ATHLETE,
+                      store: Optional[RideAnalysisStore] = None, cache=None) -> int:
+    """
+    Analyse the athlete's last ``limit`` Strava rides that are not stored yet.
+
+    Streams come from the local ``StreamCache`` (downloaded on a miss); every
+    new ride is written in a single transaction.
+
+    Returns:
+        Number of newly analysed rides.
+    """
+    from .strava_api import strava_get
+    from .streams.cache import StreamCache
+
+    store = store or RideAnalysisStore()
+    cache = cache or StreamCache()
+    activities = strava_get(f"athlete/activities?per_page={limit}") or []
+    known = store.known_activity_ids(athlete_id)
+
+    new_rides = []
+    for activity in activities:
+        activity_id = activity.get('id')
+        if activity.get('sport_type', activity.get('type')) not in RIDE_SPORT_TYPES:
+            continue
+        if activity_id is None or str(activity_id) in known:
+            continue
+        streams = cache.fetch(activity_id)
+        metrics = ride_efficiency(streams) if streams else None
+        if metrics is None:
+            continue
+        new_rides.append({
+            'activity_id': activity_id,
+            'start_date': activity.get('start_date_local') or activity.get('start_date'),
+            'name': activity.get('name', ''),
+            'metrics': metrics,
+        })
+
+    if new_rides:
+        store.save_efficiency(new_rides, athlete_id)
+        print(f"📊 Analysed {len(new_rides)} new ride(s) for efficiency metrics")
+    return len(new_rides)
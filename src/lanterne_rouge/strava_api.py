@@ -1,203 +1,237 @@
 # strava_api.py
+"""
+Strava API client.
+
+Each athlete has a ``StravaClient`` holding their tokens (see
+``AthleteContext.strava_client``); the module-level functions use the active
+athlete's client. The single-athlete client reads its credentials from the
+environment (and ``tokens.json`` when ``USE_TOKEN_CACHE`` is on) on the first
+request, not at import time, and ``requests`` is only imported when a
+request is made.
+"""
 
 import os
 import json
-import requests
 import threading
+from pathlib import Path
+from typing import Optional
+
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from .athlete import current_athlete
 
-USE_TOKEN_CACHE = os.getenv("USE_TOKEN_CACHE", "true").lower() == "true"
+STRAVA_BASE_URL = "https://www.strava.com/api/v3"
+STRAVA_TOKEN_URL = "https://www.strava.com/oauth/token"
 
-# Load Strava credentials
-STRAVA_CLIENT_ID = os.getenv("STRAVA_CLIENT_ID")
-STRAVA_CLIENT_SECRET = os.getenv("STRAVA_CLIENT_SECRET")
-STRAVA_ACCESS_TOKEN = os.getenv("STRAVA_ACCESS_TOKEN")
-STRAVA_REFRESH_TOKEN = os.getenv("STRAVA_REFRESH_TOKEN")
 
-STRAVA_BASE_URL = "https://www.strava.com/api/v3"
+class StravaClient:
+    """
+    Strava API access with one athlete's tokens.
+
+    Thread-safe: tokens are read under a lock, and refreshes are serialized
+    by a second lock held across the token request. A request rejected with
+    a token that has since been refreshed retries with the new token instead
+    of refreshing again, so concurrent 401s for the same athlete share one
+    refresh (Strava rotates the refresh token on every refresh).
+
+    Args:
+        client_id, client_secret: The Strava application.
+        access_token, refresh_token: The athlete's tokens.
+        token_file: Refreshed tokens are saved here and, when it exists,
+            read from here on creation (None disables the cache).
+    """
 
-# Thread safety: Add locks to protect global variable access
-_token_lock = threading.Lock()
-_athlete_id_lock = threading.Lock()
+    def __init__(self, client_id: Optional[str], client_secret: Optional[str],
+                 access_token: Optional[str], refresh_token: Optional[str],
+                 token_file: Optional[os.PathLike] = None):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.token_file = Path(token_file) if token_file is not None else None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._athlete_id: Optional[int] = None
+
+        if self.token_file is not None and self.token_file.exists():
+            with open(self.token_file, "r", encoding="utf-8") as f:
+                tokens = json.load(f)
+            self.access_token = tokens["access_token"]
+            self.refresh_token = tokens["refresh_token"]
+
+    def _token(self) -> Optional[str]:
+        with self._lock:
+            return self.access_token
+
+    def refresh(self, stale_token: Optional[str] = None):
+        """
+        Refresh the access token using the refresh token and save both to the
+        token file. Returns ``(access_token, refresh_token)``, or ``(None, None)``.
+
+        Args:
+            stale_token: The access token a request was rejected with. If
+                another thread has replaced it since, its tokens are returned
+                without refreshing again.
+        """
+        import requests
+
+        with self._refresh_lock:
+            with self._lock:
+                if stale_token is not None and self.access_token != stale_token:
+                    return self.access_token, self.refresh_token
+                payload = {
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "grant_type": "refresh_token",
+                    "refresh_token": self.refresh_token,
+                }
+            print("🔄 Refreshing Strava Access Token...")
+            response = requests.post(STRAVA_TOKEN_URL, data=payload, timeout=10)
+            if response.status_code != 200:
+                print(f"❌ Failed to refresh token: {response.text}")
+                return None, None
+
+            tokens = response.json()
+            with self._lock:
+                self.access_token = tokens['access_token']
+                self.refresh_token = tokens['refresh_token']
+
+            print(
+                f"✅ Refreshed! New Access Token Expires At: {tokens['expires_at']}"
+            )
+
+            if self.token_file is not None:
+                self.token_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.token_file, "w", encoding="utf-8") as f:
+                    json.dump(tokens, f, indent=2)
+
+            return tokens['access_token'], tokens['refresh_token']
+
+    def _request(self, method: str, endpoint: str, **kwargs):
+        import requests
+
+        url = f"{STRAVA_BASE_URL}/{endpoint}"
+        token = self._token()
+        headers = {"Authorization": f"Bearer {token}", **kwargs.pop("headers", {})}
+        response = requests.request(method, url, headers=headers, timeout=10, **kwargs)
+
+        # If token expired, refresh (unless another request already did) and retry once
+        if response.status_code == 401:
+            refreshed_access_token, _ = self.refresh(stale_token=token)
+            if refreshed_access_token:
+                headers["Authorization"] = f"Bearer {refreshed_access_token}"
+                response = requests.request(method, url, headers=headers, timeout=10, **kwargs)
+        return response
+
+    def get(self, endpoint):
+        """GET an API endpoint; returns the decoded JSON, or [] on errors."""
+        response = self._request("GET", endpoint)
+
+        if response.status_code != 200:
+            print(f"❌ Strava API error {response.status_code}: {response.text}")
+            return []
+
+        if not response.content:
+            print("⚠️ Strava API returned empty response.")
+            return []
+
+        try:
+            return response.json()
+        except json.JSONDecodeError:
+            print("❌ Failed to decode JSON from Strava response.")
+            return []
+
+    def post(self, endpoint, payload):
+        """POST a JSON payload to an API endpoint; returns the decoded JSON."""
+        response = self._request("POST", endpoint, json=payload,
+                                 headers={"Content-Type": "application/json"})
+        return response.json()
 
-# Try to load updated tokens from tokens.json if it exists and USE_TOKEN_CACHE is True
-if USE_TOKEN_CACHE and os.path.exists("tokens.json"):
-    with open("tokens.json", "r", encoding="utf-8") as f:
-        tokens = json.load(f)
-    with _token_lock:
-        STRAVA_ACCESS_TOKEN = tokens["access_token"]
-        STRAVA_REFRESH_TOKEN = tokens["refresh_token"]
+    def athlete_id(self) -> int:
+        """
+        The numeric athlete ID of this client's token, fetched once via
+        ``/athlete`` and cached (refreshing an expired token first).
+        """
+        with self._lock:
+            if self._athlete_id is not None:
+                return self._athlete_id
+
+        response = self._request("GET", "athlete")
+        if response.status_code == 401:
+            raise RuntimeError("Failed to refresh Strava access token.")
+        response.raise_for_status()
+        athlete_id = response.json()["id"]
 
+        with self._lock:
+            self._athlete_id = athlete_id
 
-# ---------------------------------------------------------------------------
-# Athlete‑ID helper
-# ---------------------------------------------------------------------------
-# We avoid storing the athlete ID in MissionConfig files; instead we fetch it
-# once per run and memoise it here.  Down‑stream modules can call
-# `get_athlete_id()` whenever they need the numeric Strava user identifier.
+        print(f"✅ Fetched athlete ID {athlete_id} (cached)")
+        return athlete_id
 
-_ATHLETE_ID_CACHE: int | None = None
 
+_default_client: Optional[StravaClient] = None
+_default_lock = threading.Lock()
 
-def get_athlete_id() -> int:
-    """
-    Return the numeric athlete ID associated with the current access token.
 
-    We fetch it once via `/athlete` and cache the result for the remainder of
-    the Python process.  If the access token is expired, we auto‑refresh first.
-    Thread-safe implementation with proper locking.
+def default_client() -> StravaClient:
     """
-    global _ATHLETE_ID_CACHE, STRAVA_ACCESS_TOKEN
+    The single-athlete client, created once per process.
 
-    # Check cache first with lock protection
-    with _athlete_id_lock:
-        if _ATHLETE_ID_CACHE is not None:
-            return _ATHLETE_ID_CACHE
-
-    # Get current access token safely
-    with _token_lock:
-        current_token = STRAVA_ACCESS_TOKEN
+    Environment variables (after loading .env) come first; updated tokens from
+    tokens.json win when it exists and USE_TOKEN_CACHE is true.
+    """
+    global _default_client
 
-    headers = {"Authorization": f"Bearer {current_token}"}
-    url = f"{STRAVA_BASE_URL}/athlete"
+    with _default_lock:
+        if _default_client is None:
+            load_dotenv()
+            use_token_cache = os.getenv("USE_TOKEN_CACHE", "true").lower() == "true"
+            _default_client = StravaClient(
+                os.getenv("STRAVA_CLIENT_ID"),
+                os.getenv("STRAVA_CLIENT_SECRET"),
+                os.getenv("STRAVA_ACCESS_TOKEN"),
+                os.getenv("STRAVA_REFRESH_TOKEN"),
+                token_file="tokens.json" if use_token_cache else None,
+            )
+        return _default_client
 
-    response = requests.get(url, headers=headers, timeout=10)
 
-    # Handle token expiry transparently
-    if response.status_code == 401:
-        refreshed_token, _ = refresh_strava_token()
-        if refreshed_token is None:
-            raise RuntimeError("Failed to refresh Strava access token.")
-        headers["Authorization"] = f"Bearer {refreshed_token}"
-        response = requests.get(url, headers=headers, timeout=10)
+def current_client() -> StravaClient:
+    """The active athlete's client."""
+    return current_athlete().strava_client()
 
-    response.raise_for_status()
-    athlete_id = response.json()["id"]
 
-    # Cache the result safely
-    with _athlete_id_lock:
-        _ATHLETE_ID_CACHE = athlete_id
+# ---------------------------------------------------------------------------
+# Athlete‑ID helper
+# ---------------------------------------------------------------------------
+# We avoid storing the athlete ID in MissionConfig files; instead we fetch it
+# once per run and memoise it on the client.  Down‑stream modules can call
+# `get_athlete_id()` whenever they need the numeric Strava user identifier.
 
-    print(f"✅ Fetched athlete ID {athlete_id} (cached)")
-    return athlete_id
+def get_athlete_id() -> int:
+    """Return the numeric athlete ID associated with the active athlete's access token."""
+    return current_client().athlete_id()
 
 
 def refresh_strava_token():
     """
-    Refresh the Strava Access Token using the Refresh Token and save to
-    tokens.json. Thread-safe implementation with proper locking.
+    Refresh the active athlete's Strava Access Token and save it to their
+    token file. Returns ``(access_token, refresh_token)``, or ``(None, None)``.
     """
-    global STRAVA_ACCESS_TOKEN
-    global STRAVA_REFRESH_TOKEN
-
-    print("🔄 Refreshing Strava Access Token...")
-
-    # Get current tokens safely
-    with _token_lock:
-        current_client_id = STRAVA_CLIENT_ID
-        current_client_secret = STRAVA_CLIENT_SECRET
-        current_refresh_token = STRAVA_REFRESH_TOKEN
-
-    token_url = "https://www.strava.com/oauth/token"
-    payload = {
-        "client_id": current_client_id,
-        "client_secret": current_client_secret,
-        "grant_type": "refresh_token",
-        "refresh_token": current_refresh_token,
-    }
-    response = requests.post(token_url, data=payload, timeout=10)
-    if response.status_code == 200:
-        tokens = response.json()
-        new_access_token = tokens['access_token']
-        new_refresh_token = tokens['refresh_token']
-        expires_at = tokens['expires_at']
-
-        # Update global tokens safely
-        with _token_lock:
-            STRAVA_ACCESS_TOKEN = new_access_token
-            STRAVA_REFRESH_TOKEN = new_refresh_token
-
-        print(
-            f"✅ Refreshed! New Access Token Expires At: {expires_at}"
-        )
-
-        # Save updated tokens to tokens.json if USE_TOKEN_CACHE is True
-        if USE_TOKEN_CACHE:
-            with open("tokens.json", "w", encoding="utf-8") as f:
-                json.dump(tokens, f, indent=2)
-
-        return new_access_token, new_refresh_token
-    print(f"❌ Failed to refresh token: {response.text}")
-    return None, None
+    return current_client().refresh()
 
 
 def strava_get(endpoint):
     """
-    Perform a GET request to Strava API with current Access Token.
+    Perform a GET request to Strava API with the active athlete's Access Token.
     Thread-safe implementation.
     """
-    global STRAVA_ACCESS_TOKEN
-
-    # Get current token safely
-    with _token_lock:
-        current_token = STRAVA_ACCESS_TOKEN
-
-    headers = {
-        "Authorization": f"Bearer {current_token}"
-    }
-    url = f"{STRAVA_BASE_URL}/{endpoint}"
-
-    response = requests.get(url, headers=headers, timeout=10)
-
-    # If token expired, refresh and retry once
-    if response.status_code == 401:
-        refreshed_access_token, refreshed_refresh_token = refresh_strava_token()
-        if refreshed_access_token:
-            headers["Authorization"] = f"Bearer {refreshed_access_token}"
-            response = requests.get(url, headers=headers, timeout=10)
-
-    if response.status_code != 200:
-        print(f"❌ Strava API error {response.status_code}: {response.text}")
-        return []
-
-    if not response.content:
-        print("⚠️ Strava API returned empty response.")
-        return []
-
-    try:
-        return response.json()
-    except json.JSONDecodeError:
-        print("❌ Failed to decode JSON from Strava response.")
-        return []
+    return current_client().get(endpoint)
 
 
 def strava_post(endpoint, payload):
     """
-    Perform a POST request to Strava API with current Access Token.
+    Perform a POST request to Strava API with the active athlete's Access Token.
     Thread-safe implementation.
     """
-    global STRAVA_ACCESS_TOKEN
-
-    # Get current token safely
-    with _token_lock:
-        current_token = STRAVA_ACCESS_TOKEN
-
-    headers = {
-        "Authorization": f"Bearer {current_token}",
-        "Content-Type": "application/json"
-    }
-    url = f"{STRAVA_BASE_URL}/{endpoint}"
-
-    response = requests.post(url, headers=headers, json=payload, timeout=10)
-
-    # If token expired, refresh and retry once
-    if response.status_code == 401:
-        refreshed_access_token, refreshed_refresh_token = refresh_strava_token()
-        if refreshed_access_token:
-            headers["Authorization"] = f"Bearer {refreshed_access_token}"
-            response = requests.post(url, headers=headers, json=payload, timeout=10)
-
-    return response.json()
+    return current_client().post(endpoint, payload)
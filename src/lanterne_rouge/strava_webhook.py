@@ -0,0 +1,336 @@
+"""
+Strava webhook receiver for event-driven stage processing.
+
+The evening check used to poll ``athlete/activities`` several times a day,
+so a finished stage was noticed hours late and every poll spent API quota.
+Strava can push an event instead the moment an activity is uploaded
+(https://developers.strava.com/docs/webhooks/). ``StravaWebhook`` answers
+the subscription handshake and accepts those events; new activities are
+recorded in ``memory/lanterne.db`` (so Strava's retries are de-duplicated
+and nothing is lost across restarts) and queued for ``ActivityProcessor``,
+whose worker fetches exactly that activity and runs the stage check and
+Fiction Mode for it. Strava expects a reply within two seconds, so the POST
+only enqueues.
+
+``post_test_event`` posts a Strava-format event to a local receiver, which
+stands in for Strava when testing.
+"""
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+# Attempts per activity before it is left as failed
+MAX_ATTEMPTS = 3
+# Wait before retrying a failed activity; doubled after every further failure
+RETRY_DELAY_SECONDS = 300.0
+
+
+@dataclass(frozen=True)
+class ActivityEvent:
+    """A new activity pushed by Strava."""
+    activity_id: int
+    owner_id: int
+    event_time: int = 0
+    subscription_id: Optional[int] = None
+
+
+def parse_event(payload: Mapping[str, Any]) -> Optional[ActivityEvent]:
+    """
+    The activity a Strava event announces.
+
+    Only ``create`` events for activities start a stage; updates, deletes and
+    athlete (deauthorization) events return None.
+
+    Raises:
+        ValueError: If the payload isn't a Strava event.
+    """
+    try:
+        object_type, aspect_type = payload["object_type"], payload["aspect_type"]
+        object_id, owner_id = int(payload["object_id"]), int(payload["owner_id"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Not a Strava webhook event: {e}") from e
+    if object_type != "activity" or aspect_type != "create":
+        return None
+    return ActivityEvent(object_id, owner_id, int(payload.get("event_time") or 0),
+                         payload.get("subscription_id"))
+
+
+def verify_subscription(query: Mapping[str, str], verify_token: Optional[str]) -> Optional[Dict[str, str]]:
+    """
+    The reply to Strava's subscription validation request, or None if it fails.
+
+    Strava sends ``hub.mode=subscribe``, the ``hub.verify_token`` given when
+    subscribing and a ``hub.challenge`` that must be echoed back.
+    """
+    if query.get("hub.mode") != "subscribe" or not verify_token:
+        return None
+    if query.get("hub.verify_token") != verify_token or "hub.challenge" not in query:
+        return None
+    return {"hub.challenge": query["hub.challenge"]}
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+class WebhookEventStore:
+    """SQLite table of received activity events and their processing state."""
+
+    def __init__(self, db_path: Optional[os.PathLike] = None):
+        if db_path is None:
+            from .memory_bus import db_file
+            db_path = db_file()
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS strava_webhook_events (
+                activity_id INTEGER PRIMARY KEY,
+                owner_id INTEGER NOT NULL,
+                event_time INTEGER,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                received_at TEXT,
+                processed_at TEXT,
+                error TEXT
+            )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, event: ActivityEvent) -> bool:
+        """Record a new event as pending; False if the activity was seen before."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO strava_webhook_events (activity_id, owner_id, event_time, status, received_at) "
+                "VALUES (?, ?, ?, 'pending', ?) ON CONFLICT(activity_id) DO NOTHING",
+                (event.activity_id, event.owner_id, event.event_time, _now()),
+            )
+        return cursor.rowcount == 1
+
+    def mark(self, activity_id: int, ok: bool, error: Optional[str] = None,
+             max_attempts: int = MAX_ATTEMPTS) -> str:
+        """
+        Record a processing attempt; returns the new status.
+
+        A failed attempt leaves the event pending (retried after a backoff,
+        or on the next start) until ``max_attempts`` is reached.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT attempts FROM strava_webhook_events WHERE activity_id = ?",
+                               (activity_id,)).fetchone()
+            attempts = (row["attempts"] if row else 0) + 1
+            status = "done" if ok else ("failed" if attempts >= max_attempts else "pending")
+            conn.execute(
+                "UPDATE strava_webhook_events SET status = ?, attempts = ?, processed_at = ?, error = ? "
+                "WHERE activity_id = ?",
+                (status, attempts, _now(), error, activity_id),
+            )
+        return status
+
+    def pending(self) -> List[ActivityEvent]:
+        """Events not processed yet, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT activity_id, owner_id, event_time FROM strava_webhook_events "
+                "WHERE status = 'pending' ORDER BY received_at, activity_id"
+            ).fetchall()
+        return [ActivityEvent(row["activity_id"], row["owner_id"], row["event_time"] or 0) for row in rows]
+
+    def status(self, activity_id: int) -> Optional[Dict[str, Any]]:
+        """The stored row for an activity, or None."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM strava_webhook_events WHERE activity_id = ?",
+                               (activity_id,)).fetchone()
+        return dict(row) if row else None
+
+
+class ActivityProcessor:
+    """
+    Process queued activity events one at a time on a worker thread.
+
+    Args:
+        handler: Called with each ``ActivityEvent``; an exception, or a result
+            whose ``ok`` attribute is False (such as a ``WorkflowReport``),
+            marks the attempt failed.
+        store: Where events are recorded (default: ``memory/lanterne.db``).
+        max_attempts: Attempts per activity before giving up.
+        retry_delay: Seconds before a failed activity is queued again; the
+            delay doubles with every further failed attempt.
+    """
+
+    def __init__(self, handler: Callable[[ActivityEvent], Any], store: Optional[WebhookEventStore] = None,
+                 max_attempts: int = MAX_ATTEMPTS, retry_delay: float = RETRY_DELAY_SECONDS):
+        self.handler = handler
+        self.store = store if store is not None else WebhookEventStore()
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.processed = 0
+        self.last_error: Optional[str] = None
+        self._queue: "queue.Queue[Optional[ActivityEvent]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._retries: Dict[int, threading.Timer] = {}
+        self._retries_lock = threading.Lock()
+
+    @property
+    def backlog(self) -> int:
+        """Events waiting to be processed."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Queue events left pending by an earlier run and start the worker."""
+        for event in self.store.pending():
+            self._queue.put(event)
+        self._thread = threading.Thread(target=self._work, name="strava-webhook", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Finish the queued events, then stop the worker (scheduled retries wait for the next start)."""
+        with self._retries_lock:
+            for timer in self._retries.values():
+                timer.cancel()
+            self._retries.clear()
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def submit(self, event: ActivityEvent) -> bool:
+        """Record and queue a new event; False for a duplicate (e.g. a Strava retry)."""
+        if not self.store.add(event):
+            return False
+        self._queue.put(event)
+        return True
+
+    def _work(self) -> None:
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            started = time.perf_counter()
+            print(f"📬 Processing Strava activity {event.activity_id}")
+            try:
+                result = self.handler(event)
+                ok, error = getattr(result, "ok", True), None
+            except Exception as e:
+                ok, error = False, f"{type(e).__name__}: {e}"
+            status = self.store.mark(event.activity_id, ok, error, self.max_attempts)
+            self.processed += 1
+            if not ok:
+                self.last_error = error or "processing failed"
+            seconds = time.perf_counter() - started
+            print(f"{'✅' if ok else '❌'} Activity {event.activity_id} {status} in {seconds:.1f}s"
+                  + (f": {error}" if error else ""))
+            if status == "pending":
+                self._schedule_retry(event)
+
+    def _schedule_retry(self, event: ActivityEvent) -> None:
+        attempts = (self.store.status(event.activity_id) or {}).get("attempts", 1)
+        delay = self.retry_delay * 2 ** (attempts - 1)
+
+        def requeue():
+            with self._retries_lock:
+                if self._retries.pop(event.activity_id, None) is None:
+                    return  # cancelled by stop()
+            self._queue.put(event)
+
+        timer = threading.Timer(delay, requeue)
+        timer.daemon = True
+        with self._retries_lock:
+            self._retries[event.activity_id] = timer
+        timer.start()
+        print(f"🔁 Retrying activity {event.activity_id} in {delay:.0f}s")
+
+    def status(self) -> Dict[str, Any]:
+        """JSON-friendly state for the health endpoint."""
+        with self._retries_lock:
+            retrying = sorted(self._retries)
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "backlog": self.backlog,
+            "retrying": retrying,
+            "processed": self.processed,
+            "last_error": self.last_error,
+        }
+
+
+class StravaWebhook:
+    """
+    HTTP-agnostic webhook endpoint: the daemon's server routes requests here.
+
+    Args:
+        processor: Receives new activity events.
+        verify_token: Token chosen when subscribing (default: the
+            ``STRAVA_WEBHOOK_VERIFY_TOKEN`` environment variable).
+        owner_ids: Strava athlete ids to accept; None accepts every owner.
+            Events aren't signed, so this is only a filter: whoever handles
+            an event must check who owns the activity it names.
+    """
+
+    def __init__(self, processor: ActivityProcessor, verify_token: Optional[str] = None,
+                 owner_ids: Optional[List[int]] = None):
+        self.processor = processor
+        self.verify_token = verify_token if verify_token is not None else os.getenv("STRAVA_WEBHOOK_VERIFY_TOKEN")
+        self.owner_ids = set(owner_ids) if owner_ids is not None else None
+
+    def handle_get(self, query: Mapping[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """Subscription validation: echo the challenge or refuse."""
+        reply = verify_subscription(query, self.verify_token)
+        if reply is None:
+            return 403, {"error": "verification failed"}
+        return 200, reply
+
+    def handle_post(self, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """Accept an event; anything not worth processing is still acknowledged."""
+        try:
+            event = parse_event(json.loads(body or b"{}"))
+        except (ValueError, AttributeError) as e:
+            return 400, {"error": str(e)}
+        if event is None:
+            return 200, {"queued": False, "reason": "ignored event"}
+        if self.owner_ids is not None and event.owner_id not in self.owner_ids:
+            return 200, {"queued": False, "reason": f"unknown athlete {event.owner_id}"}
+        queued = self.processor.submit(event)
+        return 200, {"queued": queued, "activity_id": event.activity_id,
+                     **({} if queued else {"reason": "duplicate"})}
+
+
+def post_test_event(url: str, activity_id: int, owner_id: int = 0, aspect_type: str = "create",
+                    object_type: str = "activity", timeout: float = 10.0) -> Dict[str, Any]:
+    """
+    Post a Strava-format event to a webhook receiver (a local stand-in for Strava).
+
+    Returns:
+        The receiver's JSON reply.
+    """
+    event = {
+        "aspect_type": aspect_type,
+        "event_time": int(time.time()),
+        "object_id": activity_id,
+        "object_type": object_type,
+        "owner_id": owner_id,
+        "subscription_id": 0,
+        "updates": {},
+    }
+    request = urllib.request.Request(url, data=json.dumps(event).encode("utf-8"), method="POST",
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)
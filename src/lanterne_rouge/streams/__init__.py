@@ -0,0 +1,71 @@
+"""
+Stream analytics for Lanterne Rouge.
+
+Vectorized (NumPy) computations over per-second activity streams from Strava:
+window segmentation, power metrics, mean-maximal power curves, effort interval
+detection, time in zones, W′ balance, aerobic efficiency, and a local cache
+so season-wide analyses read arrays from disk instead of the API.
+"""
+
+from .cache import StreamCache
+from .efficiency import RideEfficiency, batch_efficiency, ride_efficiency
+from .intervals import DetectorConfig, detect_intervals
+from .mmp import PowerCurve, SeasonBestIndex, describe_peaks, mmp_curve
+from .power import (
+    PowerMetrics,
+    compute_power_metrics,
+    normalized_power,
+    season_power_metrics,
+    training_stress_score,
+)
+from .segments import (
+    STREAM_KEYS,
+    StreamSegments,
+    segment_stream,
+    segment_summaries,
+    stream_arrays,
+    to_array,
+)
+from .wbal import WBalance, w_prime_balance
+from .zones import (
+    ZoneAdherence,
+    adherence_trend,
+    compare_to_plan,
+    ride_time_in_zones,
+    season_time_in_zones,
+    summarize_adherence,
+    time_in_zones,
+)
+
+__all__ = [
+    'DetectorConfig',
+    'STREAM_KEYS',
+    'PowerCurve',
+    'PowerMetrics',
+    'RideEfficiency',
+    'SeasonBestIndex',
+    'StreamCache',
+    'StreamSegments',
+    'WBalance',
+    'ZoneAdherence',
+    'adherence_trend',
+    'batch_efficiency',
+    'compare_to_plan',
+    'compute_power_metrics',
+    'describe_peaks',
+    'detect_intervals',
+    'mmp_curve',
+    'normalized_power',
+    'ride_efficiency',
+    'ride_time_in_zones',
+    'season_power_metrics',
+    'season_time_in_zones',
+    'segment_stream',
+    'segment_summaries',
+    'stream_arrays',
+    'summarize_adherence',
+    'time_in_zones',
+    'to_array',
+    'training_stress_score',
+    'w_prime_balance',
+]
@@ -0,0 +1,80 @@
+"""
+On-disk cache of Strava activity streams.
+
+Streams are immutable once a ride is uploaded, so each activity is fetched
+from Strava once and stored as a compressed ``.npz`` file
+(``output/streams/<activity_id>.npz`` by default, or ``STREAM_CACHE_DIR``).
+Season-wide analyses then read arrays straight from disk.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .segments import STREAM_KEYS, stream_arrays
+
+DEFAULT_STREAM_DIR = Path(__file__).resolve().parents[3] / "output" / "streams"
+
+
+class StreamCache:
+    """Read-through cache of per-activity stream arrays."""
+
+    def __init__(self, directory: Optional[os.PathLike] = None):
+        self.directory = Path(directory or os.getenv("STREAM_CACHE_DIR") or DEFAULT_STREAM_DIR)
+
+    def path(self, activity_id) -> Path:
+        return self.directory / f"{activity_id}.npz"
+
+    def load(self, activity_id) -> Optional[Dict[str, np.ndarray]]:
+        """Return cached streams for an activity, or None if not cached."""
+        path = self.path(activity_id)
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            return {key: data[key] for key in data.files}
+
+    def save(self, activity_id, streams: Dict[str, np.ndarray]) -> Path:
+        """Store stream arrays for an activity."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(activity_id)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez_compressed(tmp_path, **streams)
+        tmp_path.replace(path)
+        return path
+
+    def fetch(self, activity_id, keys: Iterable[str] = STREAM_KEYS) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Return streams for an activity, downloading and caching them on a miss.
+
+        Returns:
+            Mapping of stream key to array, or None if Strava has no streams.
+        """
+        cached = self.load(activity_id)
+        if cached is not None:
+            return cached
+
+        from ..strava_api import strava_get
+
+        response = strava_get(f"activities/{activity_id}/streams?keys={','.join(keys)}&key_by_type=true")
+        if not isinstance(response, dict) or 'time' not in response:
+            return None
+        streams = stream_arrays(response)
+        self.save(activity_id, streams)
+        return streams
+
+    def activity_ids(self) -> List[str]:
+        """Ids of all cached activities, oldest file first."""
+        if not self.directory.exists():
+            return []
+        files = sorted(self.directory.glob("*.npz"), key=lambda p: p.stat().st_mtime)
+        return [p.stem for p in files if not p.stem.endswith(".tmp")]
+
+    def iter_streams(self, activity_ids: Optional[Iterable] = None) -> Iterator[Tuple[str, Dict[str, np.ndarray]]]:
+        """Yield ``(activity_id, streams)`` for cached activities."""
+        for activity_id in (activity_ids if activity_ids is not None else self.activity_ids()):
+            streams = self.load(activity_id)
+            if streams is not None:
+                yield activity_id, streams
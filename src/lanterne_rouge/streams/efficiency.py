@@ -0,0 +1,122 @@
+"""
+Aerobic efficiency metrics from power, heart-rate and cadence streams.
+
+- Efficiency factor (EF): Normalized Power / average heart rate.
+- Pw:HR decoupling: how much EF fell from the first to the second half of
+  the ride, in percent (under ~5% indicates good aerobic endurance).
+- HR drift: rise of average heart rate from the first to the second half.
+- Cadence distribution: share of pedalling time in cadence bands, plus the
+  share of the ride spent coasting.
+
+Like the power metrics, everything is computed over moving time: stops
+(recording gaps longer than ``MAX_GAP_SECONDS``) are left out, so a coffee
+stop neither lowers EF nor shifts the halves, which split the moving time.
+Samples with no heart rate reading (0 or missing) are left out of
+heart-rate averages.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .power import moving_1hz, normalized_power
+from .segments import to_array
+
+# Upper edges of cadence bands (rpm); the last band is open-ended
+CADENCE_BANDS = (70, 85, 95, 105)
+MIN_DURATION_SECONDS = 20 * 60  # Halves shorter than 10 min say little about drift
+
+
+@dataclass
+class RideEfficiency:
+    """Aerobic efficiency metrics for one ride."""
+    duration_seconds: float  # Moving time
+    efficiency_factor: Optional[float] = None
+    decoupling_pct: Optional[float] = None
+    hr_drift_pct: Optional[float] = None
+    avg_cadence: Optional[float] = None
+    coasting_pct: Optional[float] = None
+    cadence_distribution: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def cadence_band_labels(bands: Tuple[int, ...] = CADENCE_BANDS) -> list:
+    edges = [0, *bands]
+    labels = [f"{lo}-{hi}" for lo, hi in zip(edges[:-1], edges[1:])]
+    return labels + [f"{bands[-1]}+"]
+
+
+def _mean_hr(hr: np.ndarray) -> Optional[float]:
+    valid = hr[hr > 0]
+    return float(valid.mean()) if valid.size else None
+
+
+def ride_efficiency(streams: Dict[str, Any],
+                    min_duration: float = MIN_DURATION_SECONDS) -> Optional[RideEfficiency]:
+    """
+    Efficiency metrics for one ride's streams.
+
+    Args:
+        streams: Mapping with ``time`` and any of ``watts``, ``heartrate``, ``cadence``.
+        min_duration: Rides shorter than this get no decoupling or drift.
+
+    Returns:
+        RideEfficiency (fields are None where the streams don't allow them),
+        or None without a time stream.
+    """
+    time = to_array(streams.get('time'))
+    if time is None:
+        return None
+    power = moving_1hz(time, to_array(streams['watts'])) if streams.get('watts') is not None else None
+    hr = moving_1hz(time, to_array(streams['heartrate'])) if streams.get('heartrate') is not None else None
+    cadence = moving_1hz(time, to_array(streams['cadence'])) if streams.get('cadence') is not None else None
+
+    duration = float(moving_1hz(time, np.ones_like(time)).size)
+    result = RideEfficiency(duration_seconds=duration)
+
+    if power is not None and hr is not None and power.max() > 0:
+        avg_hr = _mean_hr(hr)
+        if avg_hr:
+            result.efficiency_factor = round(normalized_power(power) / avg_hr, 3)
+
+        if duration >= min_duration:
+            half = len(power) // 2
+            first_hr, second_hr = _mean_hr(hr[:half]), _mean_hr(hr[half:])
+            if first_hr and second_hr:
+                first_ef = normalized_power(power[:half]) / first_hr
+                second_ef = normalized_power(power[half:]) / second_hr
+                if first_ef > 0:
+                    result.decoupling_pct = round((first_ef - second_ef) / first_ef * 100, 2)
+                result.hr_drift_pct = round((second_hr - first_hr) / first_hr * 100, 2)
+
+    if cadence is not None and cadence.max() > 0:
+        pedalling = cadence[cadence > 0]
+        result.avg_cadence = round(float(pedalling.mean()), 1)
+        result.coasting_pct = round(float((cadence <= 0).mean() * 100), 1)
+        shares = np.bincount(np.digitize(pedalling, CADENCE_BANDS), minlength=len(CADENCE_BANDS) + 1)
+        shares = shares / len(pedalling) * 100
+        result.cadence_distribution = dict(zip(cadence_band_labels(), shares.round(1).tolist()))
+
+    return result
+
+
+def batch_efficiency(rides: Iterable[Tuple[Any, Dict[str, Any]]]) -> pd.DataFrame:
+    """
+    Efficiency metrics for many rides, e.g. the last N rides in a ``StreamCache``.
+
+    Returns:
+        DataFrame indexed by activity id, one column per ``RideEfficiency`` field.
+    """
+    rows = {}
+    for activity_id, streams in rides:
+        metrics = ride_efficiency(streams)
+        if metrics is not None:
+            rows[activity_id] = metrics.to_dict()
+    frame = pd.DataFrame.from_dict(rows, orient='index')
+    frame.index.name = 'activity_id'
+    return frame
@@ -0,0 +1,205 @@
+"""
+Deterministic high-effort interval detection.
+
+Power (or heart rate, when a ride has no power meter) is put on a 1 Hz grid
+and smoothed, then a two-threshold hysteresis relative to FTP marks effort
+samples: an effort starts when smoothed power reaches ``enter`` × FTP and
+lasts until it drops below ``exit`` × FTP. Short dips are bridged, short
+blips dropped, and each interval is summarised and classified with rules.
+Everything is vectorized, so a multi-hour ride takes milliseconds and the
+same streams always give the same intervals.
+
+Intervals are returned in the dict shape Fiction Mode already uses:
+``start_minute``, ``duration_minutes``, ``avg_power``, ``max_power``,
+``avg_hr``, ``effort_type`` and ``description``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .power import resample_1hz, rolling_mean
+from .segments import to_array
+
+SMOOTHING_SECONDS = 5
+ENTER_FTP_FRACTION = 0.95
+EXIT_FTP_FRACTION = 0.80
+HR_ENTER_FRACTION = 0.90  # of the ride's max HR when there is no power
+HR_EXIT_FRACTION = 0.85
+MERGE_GAP_SECONDS = 30
+MIN_DURATION_SECONDS = 10
+MAX_INTERVALS = 8
+
+
+@dataclass
+class DetectorConfig:
+    """Thresholds for ``detect_intervals``; fractions are of FTP (or max HR)."""
+    enter: float = ENTER_FTP_FRACTION
+    exit: float = EXIT_FTP_FRACTION
+    smoothing_seconds: int = SMOOTHING_SECONDS
+    merge_gap_seconds: int = MERGE_GAP_SECONDS
+    min_duration_seconds: int = MIN_DURATION_SECONDS
+    max_intervals: int = MAX_INTERVALS
+
+
+def _centered_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean centered on each sample, same length as ``values``."""
+    if window <= 1 or len(values) < window:
+        return values
+    rolled = rolling_mean(values, window)
+    lead = (window - 1) // 2
+    return np.concatenate([np.full(lead, rolled[0]), rolled,
+                           np.full(len(values) - len(rolled) - lead, rolled[-1])])
+
+
+def hysteresis_mask(signal: np.ndarray, enter: float, exit: float) -> np.ndarray:
+    """
+    Boolean mask that turns on at ``signal >= enter`` and off at ``signal < exit``.
+
+    Samples between the thresholds keep the state of the last sample that
+    crossed one of them.
+    """
+    above = signal >= enter
+    below = signal < exit
+    decided = np.where(above | below, np.arange(len(signal)), 0)
+    last_decided = np.maximum.accumulate(decided) if len(signal) else decided
+    return above[last_decided]
+
+
+def mask_runs(mask: np.ndarray, merge_gap: int = 0, min_length: int = 1) -> List[Tuple[int, int]]:
+    """
+    ``(start, end)`` index pairs (end exclusive) of the True runs in ``mask``.
+
+    Runs separated by gaps of at most ``merge_gap`` samples are merged, then
+    runs shorter than ``min_length`` are dropped.
+    """
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) > 1 and merge_gap > 0:
+        keep = (starts[1:] - ends[:-1]) > merge_gap
+        starts = starts[np.concatenate([[True], keep])]
+        ends = ends[np.concatenate([keep, [True]])]
+    long_enough = (ends - starts) >= min_length
+    return list(zip(starts[long_enough].tolist(), ends[long_enough].tolist()))
+
+
+def classify_interval(duration_s: float, avg_power: Optional[float], max_power: Optional[float],
+                      ftp: Optional[float], climbing: bool = False) -> str:
+    """Rule-based effort type: sprint, surge, climb, sustained or tempo."""
+    if ftp and max_power and duration_s <= 30 and max_power >= 1.5 * ftp:
+        return 'sprint'
+    if duration_s < 180:
+        return 'surge'
+    if climbing:
+        return 'climb'
+    if ftp and avg_power is not None and avg_power < 0.9 * ftp:
+        return 'tempo'
+    return 'sustained'
+
+
+_TYPE_PHRASES = {
+    'sprint': 'sprint',
+    'surge': 'power surge',
+    'climb': 'sustained climbing effort',
+    'sustained': 'sustained hard effort',
+    'tempo': 'steady tempo block',
+}
+
+
+def _describe(effort_type: str, start_s: float, duration_s: float, total_s: float,
+              avg_power: Optional[float], ftp: Optional[float]) -> str:
+    position = start_s / total_s if total_s else 0
+    phase = 'Early' if position < 0.33 else 'Mid-ride' if position < 0.67 else 'Late'
+    text = f"{phase} {_TYPE_PHRASES[effort_type]}"
+    if duration_s >= 60:
+        text += f" of {duration_s / 60:.0f} min"
+    else:
+        text += f" of {duration_s:.0f} s"
+    if ftp and avg_power:
+        text += f" at {avg_power / ftp * 100:.0f}% FTP"
+    return text
+
+
+def detect_intervals(
+    time: Sequence[float],
+    watts: Optional[Sequence[float]] = None,
+    heartrate: Optional[Sequence[float]] = None,
+    ftp: Optional[float] = None,
+    velocity: Optional[Sequence[float]] = None,
+    config: Optional[DetectorConfig] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Find high-effort intervals in a ride's streams.
+
+    Args:
+        time: Time stream in seconds.
+        watts: Power stream; used with ``ftp`` when available.
+        heartrate: Heart-rate stream; drives detection only without power.
+        ftp: Athlete FTP in watts.
+        velocity: Optional speed stream; slow sustained efforts are labelled climbs.
+        config: Detection thresholds (defaults to ``DetectorConfig()``).
+
+    Returns:
+        Interval dicts in ride order, at most ``config.max_intervals`` (the
+        ones with the most work above the exit threshold are kept).
+    """
+    config = config or DetectorConfig()
+    time = to_array(time)
+    if time is None:
+        return []
+    power = resample_1hz(time, to_array(watts)) if watts is not None and len(watts) else None
+    hr = resample_1hz(time, to_array(heartrate)) if heartrate is not None and len(heartrate) else None
+    speed = resample_1hz(time, to_array(velocity)) if velocity is not None and len(velocity) else None
+
+    if power is not None and ftp and power.max() > 0:
+        signal, reference = power, float(ftp)
+    elif hr is not None and hr.max() > 0:
+        signal, reference = hr, float(hr.max())
+        config = replace(config, enter=HR_ENTER_FRACTION, exit=HR_EXIT_FRACTION,
+                         min_duration_seconds=max(config.min_duration_seconds, 60))
+    else:
+        return []
+
+    smoothed = _centered_mean(signal, config.smoothing_seconds)
+    mask = hysteresis_mask(smoothed, config.enter * reference, config.exit * reference)
+    runs = mask_runs(mask, config.merge_gap_seconds, config.min_duration_seconds)
+    if not runs:
+        return []
+
+    bounds = np.array(runs, dtype=np.intp)
+    starts, ends = bounds[:, 0], bounds[:, 1]
+    lengths = ends - starts
+    # Keep the intervals with the most work above the exit threshold
+    excess = np.maximum(smoothed - config.exit * reference, 0)
+    excess_sums = np.concatenate([[0.0], np.cumsum(excess)])
+    work = excess_sums[ends] - excess_sums[starts]
+    chosen = np.sort(np.argsort(-work, kind='stable')[:config.max_intervals])
+
+    total_s = float(len(signal))
+    ride_speed = float(np.median(speed[speed > 0])) if speed is not None and (speed > 0).any() else None
+    intervals = []
+    for i in chosen:
+        lo, hi, duration = int(starts[i]), int(ends[i]), float(lengths[i])
+        avg_power = max_power = avg_hr = None
+        if power is not None:
+            avg_power = round(float(power[lo:hi].mean()), 1)
+            max_power = round(float(power[lo:hi].max()), 1)
+        if hr is not None:
+            valid = hr[lo:hi][hr[lo:hi] > 0]
+            avg_hr = round(float(valid.mean()), 1) if valid.size else None
+        climbing = (ride_speed is not None and duration >= 300
+                    and float(speed[lo:hi].mean()) < 0.7 * ride_speed)
+        effort_type = classify_interval(duration, avg_power, max_power, ftp, climbing)
+        intervals.append({
+            'start_minute': round(lo / 60, 1),
+            'duration_minutes': round(duration / 60, 1),
+            'avg_power': avg_power,
+            'max_power': max_power,
+            'avg_hr': avg_hr,
+            'effort_type': effort_type,
+            'description': _describe(effort_type, lo, duration, total_s, avg_power, ftp),
+        })
+    return intervals
@@ -0,0 +1,249 @@
+"""
+Mean-maximal power (power-duration) curves.
+
+The best average power for a duration ``d`` is the largest ``d``-second
+window mean of the 1 Hz power stream. With one cumulative sum every window
+mean is a single subtraction, so each duration costs O(n). The default
+duration grid is every second up to a minute and then ~2% geometric steps up
+to the ride length (plus the standard 5 s/1/5/20/60 min points), i.e. O(log n)
+durations for an O(n log n) curve. Pass ``durations=np.arange(1, n + 1)`` for
+an exhaustive curve.
+
+``SeasonBestIndex`` keeps each athlete's best power per duration and season
+in the local SQLite database and updates it incrementally as rides arrive.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..athlete import DEFAULT_ATHLETE
+from .power import resample_1hz
+from .segments import to_array
+
+DENSE_UNTIL_SECONDS = 60
+GEOMETRIC_STEP = 0.02
+STANDARD_DURATIONS = (1, 5, 10, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200)
+PEAK_DURATIONS = {'5s': 5, '1min': 60, '5min': 300, '20min': 1200}
+
+
+@dataclass
+class PowerCurve:
+    """Best average power for each duration of one ride (or a season)."""
+    durations: np.ndarray  # seconds
+    watts: np.ndarray
+    start_seconds: np.ndarray  # where each best effort starts in the ride
+
+    def __len__(self) -> int:
+        return len(self.durations)
+
+    def at(self, duration: float) -> float:
+        """
+        Best power for ``duration`` seconds.
+
+        Durations between grid points are interpolated in log-duration;
+        durations longer than the ride return 0.
+        """
+        if not len(self) or duration > self.durations[-1]:
+            return 0.0
+        return float(np.interp(np.log(duration), np.log(self.durations), self.watts))
+
+    def peaks(self, durations: Optional[Dict[str, int]] = None) -> Dict[str, float]:
+        """Best power at named durations the ride covers, e.g. ``{'5min': 312.4}``."""
+        durations = durations or PEAK_DURATIONS
+        return {label: round(self.at(seconds), 1) for label, seconds in durations.items()
+                if len(self) and seconds <= self.durations[-1]}
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({'watts': self.watts, 'start_seconds': self.start_seconds},
+                            index=pd.Index(self.durations, name='duration_s'))
+
+
+def curve_durations(length: int, dense_until: int = DENSE_UNTIL_SECONDS,
+                    step: float = GEOMETRIC_STEP) -> np.ndarray:
+    """Default duration grid (seconds) for a ride of ``length`` seconds."""
+    if length < 1:
+        return np.empty(0, dtype=np.intp)
+    dense = np.arange(1, min(dense_until, length) + 1)
+    grid = [dense, [s for s in STANDARD_DURATIONS if s <= length], [length]]
+    if length > dense_until:
+        count = int(np.ceil(np.log(length / dense_until) / np.log1p(step))) + 1
+        grid.append(np.geomspace(dense_until, length, count).round())
+    return np.unique(np.concatenate(grid).astype(np.intp))
+
+
+def mmp_curve(watts: Sequence[float], time: Optional[Sequence[float]] = None,
+              durations: Optional[Sequence[int]] = None) -> PowerCurve:
+    """
+    Mean-maximal power curve of a ride.
+
+    Args:
+        watts: Power stream.
+        time: Time stream aligned with ``watts`` (assumed 1 Hz if omitted).
+        durations: Durations in seconds (default: ``curve_durations``).
+            Durations longer than the ride are dropped.
+
+    Returns:
+        PowerCurve, exact at every returned duration.
+    """
+    watts = to_array(watts)
+    power = resample_1hz(to_array(time), watts) if watts is not None else np.empty(0)
+    n = len(power)
+    if durations is None:
+        durations = curve_durations(n)
+    durations = np.asarray(durations, dtype=np.intp)
+    durations = durations[(durations >= 1) & (durations <= n)]
+
+    sums = np.concatenate([[0.0], np.cumsum(power)])
+    best = np.empty(len(durations))
+    start = np.empty(len(durations), dtype=np.intp)
+    for i, d in enumerate(durations):
+        window_sums = sums[d:] - sums[:-d]
+        start[i] = np.argmax(window_sums)
+        best[i] = window_sums[start[i]] / d
+    return PowerCurve(durations, best, start)
+
+
+def describe_peaks(peaks: Dict[str, float], ftp: Optional[float] = None) -> str:
+    """One-line summary of peak powers for prompts, e.g. ``5min 312W (125% FTP)``."""
+    parts = []
+    for label, watts in peaks.items():
+        text = f"{label} {watts:.0f}W"
+        if ftp and label in ('5min', '20min'):
+            text += f" ({watts / ftp * 100:.0f}% FTP)"
+        parts.append(text)
+    return ", ".join(parts) if parts else "N/A"
+
+
+class SeasonBestIndex:
+    """
+    Per-athlete, per-season best power for every duration.
+
+    Stored in the local SQLite database (``memory/lanterne.db`` by default).
+    Each ride is ingested once; only durations where it beats the stored best
+    are written.
+    """
+
+    def __init__(self, db_path: Optional[os.PathLike] = None):
+        if db_path is None:
+            from ..memory_bus import db_file
+            db_path = db_file()
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS power_bests (
+                athlete_id TEXT NOT NULL,
+                season INTEGER NOT NULL,
+                duration_s INTEGER NOT NULL,
+                watts REAL NOT NULL,
+                activity_id TEXT NOT NULL,
+                PRIMARY KEY (athlete_id, season, duration_s)
+            )
+            """)
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS power_curve_rides (
+                athlete_id TEXT NOT NULL,
+                activity_id TEXT NOT NULL,
+                season INTEGER NOT NULL,
+                PRIMARY KEY (athlete_id, activity_id)
+            )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def has_ride(self, activity_id, athlete_id: str = DEFAULT_ATHLETE) -> bool:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM power_curve_rides WHERE athlete_id = ? AND activity_id = ?",
+                (athlete_id, str(activity_id)),
+            ).fetchone()
+        return row is not None
+
+    def ingest(self, activity_id, curve: PowerCurve, season: int,
+               athlete_id: str = DEFAULT_ATHLETE) -> List[int]:
+        """
+        Merge one ride's curve into the season bests.
+
+        Returns:
+            Durations (seconds) where this ride set a new season best; empty
+            if the ride was already ingested.
+        """
+        activity_id = str(activity_id)
+        with self._connect() as conn:
+            seen = conn.execute(
+                "INSERT OR IGNORE INTO power_curve_rides (athlete_id, activity_id, season) VALUES (?, ?, ?)",
+                (athlete_id, activity_id, int(season)),
+            )
+            if seen.rowcount == 0 or not len(curve):
+                return []
+
+            stored = dict(conn.execute(
+                "SELECT duration_s, watts FROM power_bests WHERE athlete_id = ? AND season = ?",
+                (athlete_id, int(season)),
+            ).fetchall())
+            previous = np.array([stored.get(int(d), -np.inf) for d in curve.durations])
+            improved = curve.watts > previous
+            rows = [(athlete_id, int(season), int(d), float(w), activity_id)
+                    for d, w in zip(curve.durations[improved], curve.watts[improved])]
+            conn.executemany(
+                """
+                INSERT INTO power_bests (athlete_id, season, duration_s, watts, activity_id)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (athlete_id, season, duration_s) DO UPDATE
+                SET watts = excluded.watts, activity_id = excluded.activity_id
+                WHERE excluded.watts > power_bests.watts
+                """,
+                rows,
+            )
+        return [int(d) for d in curve.durations[improved]]
+
+    def ingest_streams(self, activity_id, streams: Dict[str, Any], season: int,
+                       athlete_id: str = DEFAULT_ATHLETE) -> List[int]:
+        """Compute a ride's curve from its streams and ingest it (skipped if already seen)."""
+        if streams.get('watts') is None or self.has_ride(activity_id, athlete_id):
+            return []
+        return self.ingest(activity_id, mmp_curve(streams['watts'], streams.get('time')),
+                           season, athlete_id)
+
+    def ingest_rides(self, rides: Iterable, season: int,
+                     athlete_id: str = DEFAULT_ATHLETE) -> int:
+        """
+        Ingest ``(activity_id, streams)`` pairs, e.g. ``StreamCache().iter_streams()``.
+
+        Returns:
+            Number of rides that improved at least one season best.
+        """
+        return sum(bool(self.ingest_streams(activity_id, streams, season, athlete_id))
+                   for activity_id, streams in rides)
+
+    def bests(self, season: int, athlete_id: str = DEFAULT_ATHLETE) -> pd.DataFrame:
+        """Season bests as a DataFrame indexed by duration with watts and activity_id."""
+        with self._connect() as conn:
+            frame = pd.read_sql_query(
+                "SELECT duration_s, watts, activity_id FROM power_bests "
+                "WHERE athlete_id = ? AND season = ? ORDER BY duration_s",
+                conn, params=(athlete_id, int(season)), index_col='duration_s',
+            )
+        return frame
+
+    def best_curve(self, season: int, athlete_id: str = DEFAULT_ATHLETE) -> PowerCurve:
+        """Season bests as a PowerCurve (``start_seconds`` is not tracked and is zero)."""
+        frame = self.bests(season, athlete_id)
+        durations = frame.index.to_numpy(dtype=np.intp)
+        return PowerCurve(durations, frame['watts'].to_numpy(dtype=float),
+                          np.zeros(len(durations), dtype=np.intp))
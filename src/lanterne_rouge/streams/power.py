@@ -0,0 +1,205 @@
+"""
+Power metrics computed from the watts stream.
+
+Normalized Power is the fourth-power mean of the 30-second rolling average of
+power, sampled at 1 Hz. Intensity Factor, TSS, variability index and work (kJ)
+follow from it. All rolling windows use cumulative sums, so a ride is a few
+array operations regardless of length. Stops (recording gaps longer than
+``MAX_GAP_SECONDS``) are left out, so duration is moving time. When an
+activity has no power stream the metrics fall back to Strava's summary fields.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .segments import to_array
+
+NP_WINDOW_SECONDS = 30
+MAX_GAP_SECONDS = 5  # Longer recording gaps are treated as stopped (0 W)
+
+
+@dataclass
+class PowerMetrics:
+    """Power-based load metrics for one ride."""
+    normalized_power: float
+    average_power: float
+    intensity_factor: float
+    tss: float
+    variability_index: float
+    kilojoules: float
+    duration_seconds: float
+    source: str  # 'stream' or 'summary'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _on_grid(time: Optional[Sequence[float]], values: Sequence[float],
+             max_gap: float) -> Tuple[np.ndarray, np.ndarray]:
+    """A stream forward-filled onto a 1-second grid, and which grid seconds fall in long gaps."""
+    values = np.nan_to_num(np.asarray(values, dtype=float), nan=0.0)
+    if time is None:
+        return values, np.zeros(len(values), dtype=bool)
+
+    time = np.asarray(time, dtype=float)[:len(values)]
+    values = values[:len(time)]
+    if time.size == 0:
+        return values, np.zeros(0, dtype=bool)
+
+    grid = np.arange(time[0], time[-1] + 1)
+    source = np.searchsorted(time, grid, side='right') - 1
+    return values[source], (grid - time[source]) > max_gap
+
+
+def resample_1hz(time: Optional[Sequence[float]], values: Sequence[float],
+                 max_gap: float = MAX_GAP_SECONDS) -> np.ndarray:
+    """
+    Put a stream on a regular 1-second grid.
+
+    Strava's smart recording drops samples when nothing changes, so short gaps
+    are forward-filled; gaps longer than ``max_gap`` seconds (auto-pause,
+    coasting stops) are filled with zeros. Missing samples count as zero.
+    """
+    resampled, stale = _on_grid(time, values, max_gap)
+    resampled[stale] = 0.0
+    return resampled
+
+
+def moving_1hz(time: Optional[Sequence[float]], values: Sequence[float],
+               max_gap: float = MAX_GAP_SECONDS) -> np.ndarray:
+    """
+    A stream on a 1-second grid over moving time only.
+
+    Like ``resample_1hz``, but the seconds of gaps longer than ``max_gap``
+    are dropped instead of zero-filled, so a stop doesn't count as riding
+    time (matching Strava's moving time).
+    """
+    resampled, stale = _on_grid(time, values, max_gap)
+    return resampled[~stale]
+
+
+def riding_power(time: Optional[Sequence[float]], watts: Sequence[float],
+                 max_gap: float = MAX_GAP_SECONDS) -> np.ndarray:
+    """Power over moving time only (``moving_1hz``), so stops don't drag down NP and average power."""
+    return moving_1hz(time, watts, max_gap)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling mean over full windows only (length ``n - window + 1``)."""
+    values = np.asarray(values, dtype=float)
+    if window <= 1:
+        return values
+    if len(values) < window:
+        # Shorter than one window: a single average over what there is
+        return values.mean(keepdims=True) if len(values) else values
+    sums = np.cumsum(np.concatenate([[0.0], values]))
+    return (sums[window:] - sums[:-window]) / window
+
+
+def normalized_power(watts: Sequence[float], time: Optional[Sequence[float]] = None) -> float:
+    """Normalized Power from a watts stream (optionally with its time stream, whose stops are skipped)."""
+    power = riding_power(time, watts)
+    if power.size == 0:
+        return 0.0
+    rolled = rolling_mean(power, NP_WINDOW_SECONDS)
+    return float(np.mean(rolled ** 4) ** 0.25)
+
+
+def training_stress_score(duration_seconds: float, normalized_power: float, ftp: float) -> float:
+    """TSS = (duration_s × NP × IF) / (FTP × 3600) × 100, with IF = NP / FTP."""
+    if not ftp or ftp <= 0 or not duration_seconds or not normalized_power:
+        return 0.0
+    intensity_factor = normalized_power / ftp
+    return (duration_seconds * normalized_power * intensity_factor) / (ftp * 3600) * 100
+
+
+def _from_summary(activity: Dict[str, Any], ftp: float) -> PowerMetrics:
+    """Metrics from Strava summary fields when no stream is available."""
+    average = float(activity.get('average_watts') or 0)
+    normalized = float(activity.get('weighted_average_watts') or average)
+    duration = float(activity.get('moving_time') or activity.get('elapsed_time')
+                     or (activity.get('duration_minutes') or 0) * 60)
+    kilojoules = activity.get('kilojoules')
+    if kilojoules is None:
+        kilojoules = average * duration / 1000
+    return PowerMetrics(
+        normalized_power=normalized,
+        average_power=average,
+        intensity_factor=normalized / ftp if ftp else 0.0,
+        tss=training_stress_score(duration, normalized, ftp),
+        variability_index=normalized / average if average else 0.0,
+        kilojoules=float(kilojoules),
+        duration_seconds=duration,
+        source='summary',
+    )
+
+
+def compute_power_metrics(
+    ftp: float,
+    watts: Optional[Sequence[float]] = None,
+    time: Optional[Sequence[float]] = None,
+    activity: Optional[Dict[str, Any]] = None,
+) -> Optional[PowerMetrics]:
+    """
+    Compute NP, IF, TSS, VI and kJ for a ride.
+
+    Args:
+        ftp: Athlete FTP in watts.
+        watts: Power stream; when absent or all zero, summary fields are used.
+        time: Time stream aligned with ``watts`` (assumed 1 Hz if omitted).
+        activity: Strava activity summary used for the fallback path.
+
+    Returns:
+        PowerMetrics, or None when neither a stream nor summary power exists.
+    """
+    watts = to_array(watts)
+    if watts is not None and np.nanmax(watts) > 0:
+        # Moving time only: stops count toward neither duration nor NP
+        power = riding_power(to_array(time), watts)
+        normalized = normalized_power(power)
+        average = float(power.mean())
+        duration = float(len(power))
+        return PowerMetrics(
+            normalized_power=normalized,
+            average_power=average,
+            intensity_factor=normalized / ftp if ftp else 0.0,
+            tss=training_stress_score(duration, normalized, ftp),
+            variability_index=normalized / average if average else 0.0,
+            kilojoules=float(power.sum()) / 1000,
+            duration_seconds=duration,
+            source='stream',
+        )
+
+    if activity and (activity.get('weighted_average_watts') or activity.get('average_watts')):
+        return _from_summary(activity, ftp)
+    return None
+
+
+def season_power_metrics(
+    rides: Iterable[Tuple[Any, Dict[str, np.ndarray]]],
+    ftp: float,
+) -> pd.DataFrame:
+    """
+    Power metrics for many rides, e.g. everything in a ``StreamCache``.
+
+    Args:
+        rides: ``(activity_id, streams)`` pairs where ``streams`` maps stream
+            keys to arrays (as returned by ``StreamCache.iter_streams``).
+        ftp: Athlete FTP in watts.
+
+    Returns:
+        DataFrame indexed by activity id with one column per metric; rides
+        without a power stream are skipped.
+    """
+    rows = {}
+    for activity_id, streams in rides:
+        metrics = compute_power_metrics(ftp, streams.get('watts'), streams.get('time'))
+        if metrics is not None:
+            rows[activity_id] = metrics.to_dict()
+    frame = pd.DataFrame.from_dict(rows, orient='index')
+    frame.index.name = 'activity_id'
+    return frame
@@ -0,0 +1,204 @@
+"""
+Window segmentation of activity streams.
+
+Streams (time, watts, heartrate, ...) are converted to NumPy arrays once, then
+every window's count, mean, max and percentiles come from a handful of array
+operations: ``searchsorted`` finds the window boundaries in the (monotonic)
+time stream and ``reduceat`` reduces every window in a single pass.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Strava stream keys fetched for ride analysis
+STREAM_KEYS = ('time', 'watts', 'heartrate', 'cadence', 'velocity_smooth')
+
+
+def to_array(values: Optional[Iterable[Any]]) -> Optional[np.ndarray]:
+    """Convert a stream to a float array, mapping None/missing samples to NaN."""
+    if values is None:
+        return None
+    try:
+        array = np.asarray(values, dtype=float)
+    except TypeError:  # Strava streams can contain nulls
+        array = np.array([np.nan if v is None else v for v in values], dtype=float)
+    return array if array.size else None
+
+
+def stream_arrays(streams: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Convert a Strava ``key_by_type`` streams response to arrays.
+
+    Args:
+        streams: Mapping of stream key to ``{"data": [...]}`` (or a bare list).
+
+    Returns:
+        Mapping of stream key to float array; empty or missing streams are omitted.
+    """
+    arrays = {}
+    for key, stream in (streams or {}).items():
+        data = stream.get('data') if isinstance(stream, dict) else stream
+        array = to_array(data)
+        if array is not None:
+            arrays[key] = array
+    return arrays
+
+
+@dataclass
+class StreamSegments:
+    """Per-window statistics of one stream."""
+    start_seconds: np.ndarray
+    end_seconds: np.ndarray
+    count: np.ndarray
+    mean: np.ndarray
+    max: np.ndarray
+    percentiles: Dict[float, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.start_seconds)
+
+
+def window_edges(end_seconds: float, window_seconds: float, start_seconds: float = 0) -> np.ndarray:
+    """Window start times from ``start_seconds`` up to (not including) ``end_seconds``."""
+    if window_seconds <= 0:
+        raise ValueError("window_seconds must be positive")
+    return np.arange(start_seconds, end_seconds, window_seconds, dtype=float)
+
+
+def segment_stream(
+    time: Sequence[float],
+    values: Sequence[float],
+    window_seconds: float = 600,
+    end_seconds: Optional[float] = None,
+    percentiles: Sequence[float] = (),
+    valid: Optional[np.ndarray] = None,
+) -> StreamSegments:
+    """
+    Compute per-window statistics for a stream in a single pass.
+
+    Windows are half-open ``[start, start + window_seconds)`` intervals starting
+    at 0 and clipped to ``end_seconds``.
+
+    Args:
+        time: Monotonic sample times in seconds.
+        values: Sample values aligned with ``time``.
+        window_seconds: Window length in seconds.
+        end_seconds: End of the last window (default: last sample time).
+        percentiles: Percentiles (0-100) to compute per window.
+        valid: Optional boolean mask of samples to include (e.g. ``hr > 0``).
+
+    Returns:
+        StreamSegments with one entry per window. Windows without samples
+        have count 0 and NaN statistics.
+    """
+    time = np.asarray(time, dtype=float)
+    values = np.asarray(values, dtype=float)
+    n = min(len(time), len(values))
+    time, values = time[:n], values[:n]
+
+    keep = ~np.isnan(values)
+    if valid is not None:
+        keep &= np.asarray(valid, dtype=bool)[:n]
+    time, values = time[keep], values[keep]
+
+    if end_seconds is None:
+        end_seconds = float(time[-1]) if time.size else 0.0
+    starts = window_edges(end_seconds, window_seconds)
+    ends = np.minimum(starts + window_seconds, end_seconds)
+
+    # Sample index range of each window
+    lo = np.searchsorted(time, starts, side='left')
+    hi = np.searchsorted(time, ends, side='left')
+    count = hi - lo
+    filled = count > 0
+
+    mean = np.full(len(starts), np.nan)
+    peak = np.full(len(starts), np.nan)
+    if filled.any():
+        # Interleave (lo, hi) pairs: reduceat's even slots then reduce exactly
+        # [lo, hi) of each non-empty window; the pad keeps hi == len(values) valid
+        bounds = np.empty(2 * filled.sum(), dtype=np.intp)
+        bounds[0::2] = lo[filled]
+        bounds[1::2] = hi[filled]
+        padded = np.append(values, 0.0)
+        mean[filled] = np.add.reduceat(padded, bounds)[0::2] / count[filled]
+        peak[filled] = np.maximum.reduceat(padded, bounds)[0::2]
+
+    result = StreamSegments(starts, ends, count, mean, peak)
+    if percentiles:
+        result.percentiles = _window_percentiles(values, lo, count, percentiles)
+    return result
+
+
+def _window_percentiles(values: np.ndarray, lo: np.ndarray, count: np.ndarray,
+                        percentiles: Sequence[float]) -> Dict[float, np.ndarray]:
+    """Linear-interpolated percentiles of every window from one sort."""
+    window_id = np.repeat(np.arange(len(lo)), count)
+    offsets = np.concatenate([[0], np.cumsum(count)[:-1]])
+    # Sample index of every covered position, window after window
+    covered = np.arange(count.sum()) + np.repeat(lo - offsets, count)
+    # Sort by value within window; windows stay in order and contiguous
+    order = np.lexsort((values[covered], window_id))
+    ordered = values[covered][order]
+
+    result = {}
+    for pct in percentiles:
+        out = np.full(len(lo), np.nan)
+        filled = count > 0
+        position = (count[filled] - 1) * (pct / 100.0)
+        below = np.floor(position).astype(np.intp)
+        above = np.minimum(below + 1, count[filled] - 1)
+        base = offsets[filled]
+        fraction = position - below
+        out[filled] = ordered[base + below] * (1 - fraction) + ordered[base + above] * fraction
+        result[pct] = out
+    return result
+
+
+def segment_summaries(
+    time: Sequence[float],
+    watts: Optional[Sequence[float]] = None,
+    heartrate: Optional[Sequence[float]] = None,
+    window_minutes: float = 10,
+) -> List[Dict[str, Any]]:
+    """
+    Window summaries in the shape used by the Fiction Mode effort prompt.
+
+    Returns one dict per window that has samples, with ``start_min``/``end_min``
+    and, where available, ``avg_power``/``max_power`` and ``avg_hr``/``max_hr``
+    (heart rate ignores zero readings).
+    """
+    time = to_array(time)
+    if time is None:
+        return []
+
+    end_seconds = float(np.nanmax(time))
+    window_seconds = window_minutes * 60
+    power = heartrate_segments = None
+    if watts is not None and len(watts):
+        power = segment_stream(time, watts, window_seconds, end_seconds)
+    if heartrate is not None and len(heartrate):
+        hr = to_array(heartrate)
+        heartrate_segments = segment_stream(time, hr, window_seconds, end_seconds, valid=hr > 0)
+
+    # A window is reported if it holds any samples at all, as before
+    all_samples = segment_stream(time, np.zeros_like(time), window_seconds, end_seconds)
+    total_minutes = end_seconds / 60
+    summaries = []
+    for i in np.flatnonzero(all_samples.count > 0):
+        start_min = int(all_samples.start_seconds[i] // 60)
+        segment = {
+            'start_min': start_min,
+            'end_min': min(start_min + window_minutes, total_minutes),
+        }
+        if power is not None:
+            segment['avg_power'] = float(power.mean[i]) if power.count[i] else 0.0
+            segment['max_power'] = float(power.max[i]) if power.count[i] else 0.0
+        if heartrate_segments is not None and heartrate_segments.count[i]:
+            segment['avg_hr'] = float(heartrate_segments.mean[i])
+            segment['max_hr'] = float(heartrate_segments.max[i])
+        summaries.append(segment)
+    return summaries
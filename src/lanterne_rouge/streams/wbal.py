@@ -0,0 +1,121 @@
+"""
+W′ balance (W′bal) over a ride, Skiba differential form.
+
+Above critical power (CP) the anaerobic work capacity W′ is spent at
+``P - CP`` joules per second; below CP it recovers towards W′ in proportion
+to what has been spent, ``(W′ - W′bal)(CP - P) / W′``. At 1 Hz both cases are
+the single linear recurrence::
+
+    W′bal[t] = a[t] · W′bal[t-1] + (CP - P[t]),   a[t] = 1 - max(CP - P[t], 0) / W′
+
+which is evaluated with cumulative products and sums, block by block so the
+products never underflow. Depletion episodes (where W′bal falls low and has
+not yet recovered) are what Fiction Mode narrates as attacks or cracking.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .intervals import hysteresis_mask, mask_runs
+from .power import resample_1hz
+from .segments import to_array
+
+DEFAULT_W_PRIME = 20000.0  # joules
+BLOCK_SECONDS = 1024
+DEPLETED_FRACTION = 0.5  # an episode starts below 50% of W′ ...
+RECOVERED_FRACTION = 0.7  # ... and ends once back above 70%
+
+
+def linear_recurrence(a: np.ndarray, b: np.ndarray, initial: float,
+                      block: int = BLOCK_SECONDS) -> np.ndarray:
+    """
+    Evaluate ``x[t] = a[t] * x[t-1] + b[t]`` for all ``t`` with ``x[-1] = initial``.
+
+    Within each block ``x[t] = A[t] * (x0 + cumsum(b / A)[t])`` with ``A`` the
+    running product of ``a``; blocks keep ``A`` well away from underflow
+    (``a`` must be positive).
+    """
+    out = np.empty(len(a))
+    previous = float(initial)
+    for start in range(0, len(a), block):
+        a_block, b_block = a[start:start + block], b[start:start + block]
+        products = np.cumprod(a_block)
+        values = products * (previous + np.cumsum(b_block / products))
+        out[start:start + block] = values
+        previous = values[-1]
+    return out
+
+
+@dataclass
+class WBalance:
+    """Per-second W′ balance of one ride."""
+    balance: np.ndarray  # joules, one value per second
+    cp: float
+    w_prime: float
+
+    @property
+    def min_fraction(self) -> float:
+        """Lowest balance as a fraction of W′ (1.0 = never dipped)."""
+        return float(self.balance.min() / self.w_prime) if len(self.balance) else 1.0
+
+    def depletion_events(self, depleted: float = DEPLETED_FRACTION,
+                         recovered: float = RECOVERED_FRACTION) -> List[Dict[str, Any]]:
+        """
+        Episodes where W′bal drops below ``depleted`` × W′, until it recovers
+        above ``recovered`` × W′.
+
+        Returns:
+            Dicts with ``start_minute``, ``duration_minutes``, ``low_minute``,
+            ``min_balance_pct`` and ``severity`` ('cracked' below 10%, 'deep'
+            below 30%, otherwise 'moderate'), in ride order.
+        """
+        fraction = self.balance / self.w_prime
+        # Hysteresis on the negated signal: on at <= depleted, off at > recovered
+        mask = hysteresis_mask(-fraction, -depleted, -recovered)
+        events = []
+        for lo, hi in mask_runs(mask):
+            low = lo + int(np.argmin(fraction[lo:hi]))
+            low_pct = float(fraction[low] * 100)
+            events.append({
+                'start_minute': round(lo / 60, 1),
+                'duration_minutes': round((hi - lo) / 60, 1),
+                'low_minute': round(low / 60, 1),
+                'min_balance_pct': round(low_pct, 1),
+                'severity': 'cracked' if low_pct < 10 else 'deep' if low_pct < 30 else 'moderate',
+            })
+        return events
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly summary for prompts and ride metadata."""
+        return {
+            'cp': self.cp,
+            'w_prime': self.w_prime,
+            'min_balance_pct': round(self.min_fraction * 100, 1),
+            'depletion_events': self.depletion_events(),
+        }
+
+
+def w_prime_balance(watts: Sequence[float], cp: float, w_prime: float = DEFAULT_W_PRIME,
+                    time: Optional[Sequence[float]] = None) -> WBalance:
+    """
+    W′ balance for every second of a ride.
+
+    Args:
+        watts: Power stream.
+        cp: Critical power in watts (FTP is a reasonable stand-in).
+        w_prime: Anaerobic work capacity W′ in joules.
+        time: Time stream aligned with ``watts`` (assumed 1 Hz if omitted).
+
+    Returns:
+        WBalance starting from a full W′.
+    """
+    if cp <= 0 or w_prime <= cp:
+        raise ValueError("cp must be positive and w_prime (J) larger than cp (W)")
+    power = resample_1hz(to_array(time), to_array(watts)) if watts is not None else np.empty(0)
+    below_cp = np.maximum(cp - power, 0.0)
+    decay = 1.0 - below_cp / w_prime
+    balance = linear_recurrence(decay, cp - power, w_prime)
+    return WBalance(balance, float(cp), float(w_prime))
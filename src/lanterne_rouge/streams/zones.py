@@ -0,0 +1,197 @@
+"""
+Time in training zones from activity streams.
+
+Power zones are fractions of FTP and heart-rate zones fractions of lactate
+threshold heart rate (LTHR), both named ``Zone 1`` … ``Zone 5`` like
+``WorkoutPlan.zones``. A ride is binned with one ``digitize`` and one
+``bincount``; a season of rides is concatenated and binned in a single call
+with the ride index folded into the bin number.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .power import resample_1hz
+from .segments import to_array
+
+# Upper bounds of Zones 1-4; Zone 5 is everything above
+POWER_ZONE_FRACTIONS = (0.55, 0.75, 0.90, 1.05)  # of FTP
+HR_ZONE_FRACTIONS = (0.81, 0.90, 0.94, 1.00)  # of LTHR
+
+
+def zone_names(count: int) -> List[str]:
+    return [f"Zone {i}" for i in range(1, count + 1)]
+
+
+def _zone_samples(values: Sequence[float], reference: float, fractions: Sequence[float],
+                  time: Optional[Sequence[float]] = None, ignore_zero: bool = False) -> np.ndarray:
+    """Zone index (0-based) of every second of the ride; -1 marks ignored samples."""
+    samples = resample_1hz(to_array(time), to_array(values))
+    zones = np.digitize(samples, np.asarray(fractions) * reference)
+    if ignore_zero:
+        zones[samples <= 0] = -1
+    return zones
+
+
+def time_in_zones(values: Sequence[float], reference: float,
+                  fractions: Sequence[float] = POWER_ZONE_FRACTIONS,
+                  time: Optional[Sequence[float]] = None,
+                  ignore_zero: bool = False) -> Dict[str, float]:
+    """
+    Minutes spent in each zone.
+
+    Args:
+        values: Power or heart-rate stream.
+        reference: FTP (power) or LTHR (heart rate).
+        fractions: Upper bounds of all but the top zone, as fractions of ``reference``.
+        time: Time stream aligned with ``values`` (assumed 1 Hz if omitted).
+        ignore_zero: Drop zero samples (dropouts) instead of counting them in Zone 1.
+
+    Returns:
+        Mapping of zone name to minutes.
+    """
+    zones = _zone_samples(values, reference, fractions, time, ignore_zero)
+    seconds = np.bincount(zones[zones >= 0], minlength=len(fractions) + 1)
+    return dict(zip(zone_names(len(fractions) + 1), (seconds / 60).round(1).tolist()))
+
+
+def ride_time_in_zones(streams: Mapping[str, Any], ftp: Optional[float] = None,
+                       lthr: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+    """Power and/or heart-rate time in zones for one ride's streams."""
+    result = {}
+    if ftp and streams.get('watts') is not None:
+        result['power'] = time_in_zones(streams['watts'], ftp, POWER_ZONE_FRACTIONS, streams.get('time'))
+    if lthr and streams.get('heartrate') is not None:
+        result['heartrate'] = time_in_zones(streams['heartrate'], lthr, HR_ZONE_FRACTIONS,
+                                            streams.get('time'), ignore_zero=True)
+    return result
+
+
+def season_time_in_zones(rides: Iterable[Tuple[Any, Mapping[str, Any]]],
+                         ftp: Optional[float] = None, lthr: Optional[float] = None,
+                         source: str = 'power') -> pd.DataFrame:
+    """
+    Time in zones for many rides, e.g. everything in a ``StreamCache``.
+
+    Args:
+        rides: ``(activity_id, streams)`` pairs.
+        ftp: Athlete FTP (required for ``source='power'``).
+        lthr: Lactate threshold heart rate (required for ``source='heartrate'``).
+        source: ``'power'`` or ``'heartrate'``.
+
+    Returns:
+        DataFrame indexed by activity id with minutes per zone; rides without
+        the requested stream are skipped.
+    """
+    if source == 'power':
+        key, reference, fractions, ignore_zero = 'watts', ftp, POWER_ZONE_FRACTIONS, False
+    elif source == 'heartrate':
+        key, reference, fractions, ignore_zero = 'heartrate', lthr, HR_ZONE_FRACTIONS, True
+    else:
+        raise ValueError(f"Unknown zone source: {source}")
+    names = zone_names(len(fractions) + 1)
+    if not reference:
+        raise ValueError(f"A {'FTP' if source == 'power' else 'LTHR'} is required for {source} zones")
+
+    ids, per_ride = [], []
+    for activity_id, streams in rides:
+        if streams.get(key) is None:
+            continue
+        ids.append(activity_id)
+        per_ride.append(_zone_samples(streams[key], reference, fractions, streams.get('time'), ignore_zero))
+
+    if not per_ride:
+        return pd.DataFrame(columns=names, index=pd.Index([], name='activity_id'))
+
+    # One bincount for the whole season: bin = ride * zones + zone
+    zones = np.concatenate(per_ride)
+    ride = np.repeat(np.arange(len(per_ride)), [len(z) for z in per_ride])
+    counted = zones >= 0
+    bins = ride[counted] * len(names) + zones[counted]
+    seconds = np.bincount(bins, minlength=len(per_ride) * len(names)).reshape(len(per_ride), len(names))
+    return pd.DataFrame((seconds / 60).round(1), columns=names,
+                        index=pd.Index(ids, name='activity_id'))
+
+
+@dataclass
+class ZoneAdherence:
+    """How a ride's time in zones compares with the planned workout."""
+    planned: Dict[str, float]
+    actual: Dict[str, float]
+    difference: Dict[str, float]  # actual - planned minutes per zone
+    score: float  # share of planned minutes ridden in the planned zone (0-1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'planned': self.planned,
+            'actual': self.actual,
+            'difference': self.difference,
+            'score': self.score,
+        }
+
+
+def compare_to_plan(plan: Any, actual: Mapping[str, float]) -> ZoneAdherence:
+    """
+    Compare actual minutes per zone with a ``WorkoutPlan`` (or a zones dict).
+
+    Planned minutes count as hit up to the minutes actually ridden in that
+    zone, so riding longer in a zone never compensates for missing another.
+    """
+    planned = {zone: float(minutes) for zone, minutes in getattr(plan, 'zones', plan).items()}
+    zones = sorted(set(planned) | set(actual))
+    difference = {zone: round(actual.get(zone, 0.0) - planned.get(zone, 0.0), 1) for zone in zones}
+    total_planned = sum(planned.values())
+    hit = sum(min(minutes, actual.get(zone, 0.0)) for zone, minutes in planned.items())
+    score = round(hit / total_planned, 3) if total_planned else 0.0
+    return ZoneAdherence(planned, dict(actual), difference, score)
+
+
+def adherence_trend(actual: pd.DataFrame, plans: Mapping[Any, Any]) -> pd.DataFrame:
+    """
+    Adherence scores for every ride that has a plan, vectorized across rides.
+
+    Args:
+        actual: Minutes per zone indexed by activity id (``season_time_in_zones``),
+            in ride order.
+        plans: Mapping of activity id to ``WorkoutPlan`` or zones dict.
+
+    Returns:
+        DataFrame indexed by activity id with ``planned_minutes``,
+        ``actual_minutes`` and ``score``, in the order of ``actual``.
+    """
+    rows = {activity_id: getattr(plan, 'zones', plan) for activity_id, plan in plans.items()
+            if activity_id in actual.index}
+    planned = pd.DataFrame.from_dict(rows, orient='index').reindex(
+        index=[i for i in actual.index if i in rows], columns=actual.columns).fillna(0.0)
+    ridden = actual.loc[planned.index]
+    hit = np.minimum(planned.to_numpy(dtype=float), ridden.to_numpy(dtype=float)).sum(axis=1)
+    total = planned.sum(axis=1).to_numpy(dtype=float)
+    result = pd.DataFrame({
+        'planned_minutes': total,
+        'actual_minutes': ridden.sum(axis=1).to_numpy(dtype=float),
+        'score': np.divide(hit, total, out=np.zeros_like(hit), where=total > 0).round(3),
+    }, index=planned.index)
+    result.index.name = 'activity_id'
+    return result
+
+
+def summarize_adherence(trend: pd.DataFrame, recent: int = 5) -> Dict[str, Any]:
+    """Compact adherence summary for the reasoner (JSON-serializable)."""
+    if trend.empty:
+        return {}
+    scores = trend['score']
+    latest = scores.tail(recent)
+    earlier = scores.iloc[:-recent] if len(scores) > recent else None
+    summary = {
+        'rides': int(len(scores)),
+        'mean_score': round(float(scores.mean()), 2),
+        'recent_score': round(float(latest.mean()), 2),
+    }
+    if earlier is not None and len(earlier):
+        change = float(latest.mean() - earlier.mean())
+        summary['trend'] = 'improving' if change > 0.05 else 'declining' if change < -0.05 else 'stable'
+    return summary
@@ -11,17 +11,25 @@ from datetime import date, datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from .athlete import AthleteContext, current_athlete
+
 
 class TDFTracker:
     """Manages TDF simulation points tracking and achievement data."""
 
-    def __init__(self, data_file: Optional[str] = None):
-        """Initialize TDF tracker with data file path."""
+    def __init__(self, data_file: Optional[str] = None, athlete: Optional[AthleteContext] = None):
+        """Initialize TDF tracker with data file path.
+
+        Args:
+            data_file: Points file; defaults to the athlete's ``tdf_points.json``.
+            athlete: Whose points to track (default: the active athlete).
+        """
+        self.athlete = athlete or current_athlete()
         if data_file is None:
-            data_file = "output/tdf_points.json"
+            data_file = self.athlete.tdf_points_file
 
         self.data_file = Path(data_file)
-        self.data_file.parent.mkdir(exist_ok=True)
+        self.data_file.parent.mkdir(parents=True, exist_ok=True)
         self._data = self._load_data()
 
     def _load_data(self) -> Dict[str, Any]:
@@ -7,36 +7,41 @@ to produce cohesive, high-quality daily training recommendations.
 
 import os
 from datetime import date
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from dotenv import load_dotenv
 
+from .athlete import AthleteContext, as_athlete, current_athlete, use_athlete
 from .mission_config import MissionConfig, bootstrap
-from .monitor import get_oura_readiness, get_ctl_atl_tsb
+from .morning_metrics import gather_morning_metrics
 from .reasoner import ReasoningAgent, TDFDecision
 from .plan_generator import WorkoutPlanner
 from .ai_clients import CommunicationAgent
 from .memory_bus import log_observation, log_decision, log_reflection
-
-load_dotenv()
+from .daily_metrics import log_daily_metrics
 
 
 class TourCoach:
     """Orchestrates specialized agents to generate cohesive training recommendations."""
 
-    def __init__(self, config: MissionConfig, use_llm_reasoning: bool = True, llm_model: str = None):
+    def __init__(self, config: MissionConfig, use_llm_reasoning: bool = True, llm_model: str = None,
+                 athlete: Optional[AthleteContext] = None):
         """Initialize the Tour Coach with configurable reasoning mode.
 
         Args:
             config: Mission configuration
             use_llm_reasoning: If True, use LLM-based reasoning. If False, use rule-based reasoning. Default: True.
             llm_model: Optional model name for LLM-based reasoning.
+            athlete: Whose memory and TDF points the coach uses (default: the active athlete).
         """
+        load_dotenv()
         self.config = config
+        self.athlete = athlete or current_athlete()
         self.reasoning_agent = ReasoningAgent(use_llm=use_llm_reasoning, model=llm_model)
         self.workout_planner = WorkoutPlanner(config)
         self.communication_agent = CommunicationAgent()
 
+    @as_athlete
     def generate_daily_recommendation(self, metrics: Dict[str, Any]) -> str:
         """Generate a complete daily training recommendation."""
         current_date = date.today()
@@ -58,12 +63,17 @@ class TourCoach:
         log_decision({
             "action": decision.action,
             "reason": decision.reason,
-            "confidence": decision.confidence
+            "confidence": decision.confidence,
+            "workout_type": workout.workout_type,
+            "planned_zones": workout.zones
         })
         log_reflection({"summary": summary})
+        log_daily_metrics([{**metrics, "day": current_date, "decision": decision.action,
+                            "confidence": decision.confidence}])
 
         return summary
 
+    @as_athlete
     def generate_tdf_recommendation(
         self,
         metrics: Dict[str, Any],
@@ -107,6 +117,9 @@ class TourCoach:
             "expected_points": tdf_decision.expected_points
         })
         log_reflection({"tdf_summary": summary})
+        log_daily_metrics([{**metrics, "day": current_date, "decision": tdf_decision.action,
+                            "confidence": tdf_decision.confidence,
+                            "ride_mode": tdf_decision.recommended_ride_mode}])
 
         return summary
 
@@ -164,7 +177,7 @@ class TourCoach:
 
             # Use TDFTracker to get the next expected stage number
             from lanterne_rouge.tdf_tracker import TDFTracker
-            tracker = TDFTracker()
+            tracker = TDFTracker(athlete=self.athlete)
             stage_number = tracker.get_next_stage_number()
 
             # Validate stage number
@@ -194,13 +207,22 @@ def get_version():
         return "Unknown"
 
 
-def run_tour_coach(use_llm_reasoning: bool = None, llm_model: str = None):
+def run_tour_coach(use_llm_reasoning: bool = None, llm_model: str = None,
+                   athlete: Optional[AthleteContext] = None):
     """Main function to run the tour coach and generate daily recommendations.
 
     Args:
         use_llm_reasoning: If True, use LLM-based reasoning. If None, check environment variable.
         llm_model: Optional model name for LLM-based reasoning.
+        athlete: Whose metrics, mission and output to use (default: the active athlete).
     """
+    with use_athlete(athlete) as athlete:
+        return _run_tour_coach(use_llm_reasoning, llm_model, athlete)
+
+
+def _run_tour_coach(use_llm_reasoning, llm_model, athlete):
+    load_dotenv()
+
     # Determine reasoning mode
     if use_llm_reasoning is None:
         use_llm_reasoning = os.getenv("USE_LLM_REASONING", "true").lower() == "true"
@@ -208,34 +230,29 @@ def run_tour_coach(use_llm_reasoning: bool = None, llm_model: str = None):
     if llm_model is None:
         llm_model = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
 
-    # Gather current metrics
-    readiness, *_ = get_oura_readiness()
-    ctl, atl, tsb = get_ctl_atl_tsb()
-
-    metrics = {
-        "readiness_score": readiness,
-        "ctl": ctl,
-        "atl": atl,
-        "tsb": tsb
-    }
+    # Gather current metrics (Oura and Strava concurrently)
+    gathered = gather_morning_metrics(sources=("oura", "strava"))
+    print(gathered.format())
+    metrics = gathered.as_metrics()
 
     # Load mission configuration
-    cfg = bootstrap("missions/tdf_sim_2025.toml")
+    cfg = bootstrap(athlete.mission_path)
 
     # Create tour coach with specified reasoning mode
-    coach = TourCoach(cfg, use_llm_reasoning=use_llm_reasoning, llm_model=llm_model)
+    coach = TourCoach(cfg, use_llm_reasoning=use_llm_reasoning, llm_model=llm_model, athlete=athlete)
     summary = coach.generate_daily_recommendation(metrics)
 
     # Ensure output directory exists
-    os.makedirs("output", exist_ok=True)
+    os.makedirs(athlete.output_dir, exist_ok=True)
 
     # Write to file
-    with open("output/tour_coach_update.txt", "w", encoding="utf-8") as f:
+    update_file = athlete.output_path("tour_coach_update.txt")
+    with open(update_file, "w", encoding="utf-8") as f:
         f.write(summary)
 
     version = get_version()
     reasoning_mode = "LLM" if use_llm_reasoning else "Rule-based"
-    print(f"✅ Tour Coach Agent v{version} daily update generated ({reasoning_mode}): output/tour_coach_update.txt")
+    print(f"✅ Tour Coach Agent v{version} daily update generated ({reasoning_mode}): {update_file}")
 
     return summary
 
@@ -7,7 +7,7 @@ and configuration data to prevent injection attacks and data corruption.
 
 import json
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 
 def validate_llm_json_response(response: str, required_fields: List[str] = None) -> Dict[str, Any]:
@@ -221,12 +221,16 @@ def validate_stage_info(stage_info: Dict[str, Any]) -> Dict[str, Any]:
     return validated
 
 
-def calculate_power_metrics(activity_data: Dict[str, Any], ftp: int) -> Dict[str, Any]:
+def calculate_power_metrics(activity_data: Dict[str, Any], ftp: int,
+                            streams: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Calculate power-based training metrics using athlete's FTP.
 
     Args:
         activity_data: Validated activity data
         ftp: Athlete's Functional Threshold Power in watts
+        streams: Optional activity streams (``time``/``watts``). When a watts
+            stream is present, Normalized Power is computed from it instead of
+            Strava's ``weighted_average_watts``.
 
     Returns:
         Dictionary with calculated power metrics
@@ -241,19 +245,28 @@ def calculate_power_metrics(activity_data: Dict[str, Any], ftp: int) -> Dict[str
     if not ftp or ftp <= 0:
         return metrics
 
+    from .streams.power import compute_power_metrics, training_stress_score
+
     # Get power data
     normalized_power = activity_data.get('weighted_average_watts', 0) or 0
     duration_hours = activity_data.get('duration_minutes', 0) / 60
 
+    if streams and streams.get('watts') is not None:
+        stream_metrics = compute_power_metrics(ftp, streams.get('watts'), streams.get('time'))
+        if stream_metrics is not None:
+            normalized_power = round(stream_metrics.normalized_power)
+            metrics['variability_index'] = round(stream_metrics.variability_index, 2)
+            metrics['kilojoules'] = round(stream_metrics.kilojoules, 1)
+            metrics['power_source'] = stream_metrics.source
+
     if normalized_power > 0 and duration_hours > 0:
         # Calculate Intensity Factor (IF)
         intensity_factor = normalized_power / ftp
         metrics['intensity_factor'] = round(intensity_factor, 3)
         metrics['normalized_power'] = normalized_power
 
-        # Calculate Training Stress Score (TSS)
-        # TSS = (duration_hours × IF^2 × 100)
-        tss = duration_hours * (intensity_factor ** 2) * 100
+        # Calculate Training Stress Score (TSS), same formula as monitor
+        tss = training_stress_score(duration_hours * 3600, normalized_power, ftp)
         metrics['tss'] = round(tss, 1)
 
         # Determine effort level based on IF
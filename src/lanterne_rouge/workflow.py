@@ -0,0 +1,210 @@
+"""
+In-process workflow runner for the daily jobs.
+
+The morning run used to shell out to ``update_github_secret.py`` and
+``integrate_tdf_docs.py`` (which shelled out again to
+``populate_stage_data.py``), paying interpreter start-up, imports and a
+mission-config reload for every hop. A ``Workflow`` runs those steps as plain
+functions in one process instead. Steps share a ``WorkflowContext`` that loads
+the mission config, the TDF tracker and an HTTP session once, on first use,
+and every step is timed.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .athlete import AthleteContext, use_athlete
+
+DEFAULT_MISSION = Path("missions/tdf_sim_2025.toml")
+
+
+class WorkflowContext:
+    """
+    Resources shared by the steps of one workflow run.
+
+    Everything is loaded lazily, so a step that never touches the tracker or
+    the network doesn't pay for them. Loading is locked, so steps running on
+    several threads still share one instance. A context can outlive one run
+    (the daemon keeps one per athlete): the mission config and the tracker
+    are reloaded when their file changes on disk. Step return values are
+    kept in ``results`` for later steps. With an ``athlete``, steps run with
+    that athlete active and the mission defaults to theirs.
+    """
+
+    def __init__(self, mission_path: Optional[Path] = None, mission_cfg=None, tracker=None,
+                 athlete: Optional[AthleteContext] = None):
+        if mission_path is None:
+            mission_path = athlete.mission_path if athlete is not None else DEFAULT_MISSION
+        self.mission_path = Path(mission_path)
+        self.athlete = athlete
+        self.results: Dict[str, Any] = {}
+        self._mission_cfg = mission_cfg
+        self._tracker = tracker
+        self._session = None
+        self._loaded_mtimes: Dict[str, Optional[float]] = {}
+        self._lock = threading.RLock()
+
+    def _changed(self, name: str, path: Path) -> bool:
+        """True if ``path`` changed since ``name`` was loaded from it (records the new mtime)."""
+        mtime = path.stat().st_mtime if path.exists() else None
+        changed = name in self._loaded_mtimes and self._loaded_mtimes[name] != mtime
+        self._loaded_mtimes[name] = mtime
+        return changed
+
+    @property
+    def mission_cfg(self):
+        """The mission config, bootstrapped once and again only if the file changed."""
+        with self._lock:
+            if self._changed("mission_cfg", self.mission_path) or self._mission_cfg is None:
+                from .mission_config import bootstrap
+
+                # Cached in the context's athlete database, whichever athlete is active
+                db_path = self.athlete.db_file if self.athlete is not None else None
+                self._mission_cfg = bootstrap(self.mission_path, db_path=db_path)
+            return self._mission_cfg
+
+    @property
+    def tracker(self):
+        """The TDF points tracker, loaded once and again only if its file changed."""
+        with self._lock:
+            if self._tracker is None:
+                from .tdf_tracker import TDFTracker
+
+                self._tracker = TDFTracker(athlete=self.athlete)
+                self._changed("tracker", self._tracker.data_file)
+            elif self._changed("tracker", self._tracker.data_file):
+                self._tracker = type(self._tracker)(str(self._tracker.data_file), athlete=self._tracker.athlete)
+            return self._tracker
+
+    @property
+    def session(self):
+        """A ``requests.Session`` so repeated calls to one host reuse the connection."""
+        with self._lock:
+            if self._session is None:
+                import requests
+
+                self._session = requests.Session()
+            return self._session
+
+    def close(self) -> None:
+        """Release the HTTP session, if one was opened."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+@dataclass
+class StepResult:
+    """Outcome of one workflow step."""
+    name: str
+    seconds: float
+    ok: bool = True
+    required: bool = True
+    error: Optional[str] = None
+    skipped: bool = False
+    cached: bool = False
+
+
+@dataclass
+class WorkflowReport:
+    """Outcome and timing of a whole workflow run."""
+    name: str
+    steps: List[StepResult] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """False if a required step failed (best-effort failures don't count)."""
+        return all(step.ok for step in self.steps if step.required)
+
+    def format(self) -> str:
+        """Per-step timing table for the job log."""
+        lines = [f"⏱️  Workflow '{self.name}' finished in {self.elapsed_seconds:.1f}s"]
+        for step in self.steps:
+            if step.skipped:
+                status = "⏭️  skipped"
+            elif step.cached:
+                status = "💾 cached"
+            elif step.ok:
+                status = "✅"
+            else:
+                status = f"❌ {step.error}"
+            lines.append(f"   {step.name:<16} {step.seconds:6.2f}s  {status}")
+        return "\n".join(lines)
+
+
+@dataclass
+class _Step:
+    name: str
+    func: Callable[[WorkflowContext], Any]
+    required: bool
+
+
+class Workflow:
+    """
+    An ordered list of steps run in-process with a shared context.
+
+    A step is a function taking the ``WorkflowContext``; its return value is
+    stored under its name in ``context.results``. When a required step fails
+    the remaining steps are skipped; a failing optional step is only reported.
+    A context passed in by the caller is left open after the run.
+
+    Example:
+        workflow = Workflow("morning")
+        workflow.add_step("coach", run_coach)
+        workflow.add_step("docs", update_docs, required=False)
+        report = workflow.run()
+    """
+
+    def __init__(self, name: str, context: Optional[WorkflowContext] = None):
+        self.name = name
+        self._owns_context = context is None
+        self.context = context or WorkflowContext()
+        self._steps: List[_Step] = []
+
+    def add_step(self, name: str, func: Callable[[WorkflowContext], Any],
+                 required: bool = True) -> "Workflow":
+        """Append a step; returns the workflow so calls can be chained."""
+        if any(step.name == name for step in self._steps):
+            raise ValueError(f"Duplicate workflow step: {name}")
+        self._steps.append(_Step(name, func, required))
+        return self
+
+    def run(self) -> WorkflowReport:
+        """Run every step in order and return the timing report."""
+        report = WorkflowReport(self.name)
+        started = time.perf_counter()
+        failed = False
+        try:
+            for step in self._steps:
+                if failed:
+                    report.steps.append(StepResult(step.name, 0.0, ok=False, required=step.required,
+                                                   skipped=True))
+                    continue
+                step_started = time.perf_counter()
+                try:
+                    with use_athlete(self.context.athlete):
+                        self.context.results[step.name] = step.func(self.context)
+                except Exception as e:
+                    seconds = time.perf_counter() - step_started
+                    report.steps.append(StepResult(step.name, round(seconds, 3), ok=False,
+                                                   required=step.required,
+                                                   error=f"{type(e).__name__}: {e}"))
+                    print(f"❌ Step '{step.name}' failed: {e}")
+                    if step.required:
+                        traceback.print_exc()
+                        failed = True
+                    continue
+                seconds = time.perf_counter() - step_started
+                report.steps.append(StepResult(step.name, round(seconds, 3), required=step.required))
+        finally:
+            if self._owns_context:  # a caller's context keeps its warm session
+                self.context.close()
+        report.elapsed_seconds = round(time.perf_counter() - started, 2)
+        return report
@@ -52,3 +52,35 @@ def test_generate_workout_adjustment_invalid_json(mock_call_llm):
             tsb=10,
             mission_cfg=mission_cfg,
         )
+
+
+def _stream_chunk(text):
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = text
+    return chunk
+
+
+@patch("src.lanterne_rouge.ai_clients.openai.OpenAI")
+def test_call_llm_stream_yields_fragments(mock_openai):
+    from src.lanterne_rouge.ai_clients import call_llm_stream, collect_stream
+
+    mock_openai.return_value.chat.completions.create.return_value = iter(
+        [_stream_chunk("The peloton "), _stream_chunk(None), _stream_chunk("rolls out.")]
+    )
+    seen = []
+    text = collect_stream(call_llm_stream([{"role": "user", "content": "hi"}]), seen.append)
+
+    assert seen == ["The peloton ", "rolls out."]
+    assert text == "The peloton rolls out."
+    assert mock_openai.return_value.chat.completions.create.call_args.kwargs["stream"] is True
+
+
+@patch("src.lanterne_rouge.ai_clients.openai.OpenAI")
+def test_call_llm_stream_error_fallback(mock_openai):
+    from src.lanterne_rouge.ai_clients import call_llm_stream
+
+    mock_openai.return_value.chat.completions.create.side_effect = RuntimeError("boom")
+    assert list(call_llm_stream([{"role": "user", "content": "hi"}])) == [
+        "- Error: Could not get a response from the LLM."
+    ]
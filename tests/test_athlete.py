@@ -0,0 +1,103 @@
+"""
+Tests for per-athlete isolation and the bounded multi-athlete runner.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge import memory_bus
+from src.lanterne_rouge.athlete import (
+    AthleteContext,
+    current_athlete,
+    in_context,
+    load_roster,
+    run_athletes,
+    use_athlete,
+)
+from src.lanterne_rouge.tdf_tracker import TDFTracker
+
+
+def test_roster_defaults_and_validation(tmp_path):
+    roster = tmp_path / "athletes.toml"
+    roster.write_text('[[athlete]]\nid = "alice"\n\n[[athlete]]\nid = "bob-2"\nenv_prefix = "B_"\n'
+                      'data_dir = "club/bob"\n', encoding="utf-8")
+    alice, bob = load_roster(roster)
+    assert (alice.data_dir.as_posix(), alice.env_prefix) == ("athletes/alice", "ALICE_")
+    assert alice.tdf_points_file.as_posix() == "athletes/alice/output/tdf_points.json"
+    assert (bob.env_prefix, bob.db_file.as_posix()) == ("B_", "club/bob/lanterne.db")
+
+    roster.write_text('[[athlete]]\nid = "alice"\n\n[[athlete]]\nid = "alice"\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="Duplicate"):
+        load_roster(roster)
+
+
+def test_athletes_run_concurrently_with_isolated_state(tmp_path, monkeypatch):
+    monkeypatch.setenv("STRAVA_CLIENT_ID", "club-app")
+    for name in ("ALICE", "BOB", "CARA"):
+        monkeypatch.setenv(f"{name}_STRAVA_ACCESS_TOKEN", f"{name.lower()}-token")
+    athletes = [AthleteContext(name.lower(), data_dir=tmp_path / name.lower(), env_prefix=f"{name}_")
+                for name in ("ALICE", "BOB", "CARA")]
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def morning(athlete):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            memory_bus.log_observation({"athlete": athlete.athlete_id})
+            TDFTracker()._save_data()
+            # Work handed to a nested pool still sees this athlete
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                seen = pool.submit(in_context(lambda: current_athlete().athlete_id)).result()
+            client = current_athlete().strava_client()
+            time.sleep(0.1)
+            if athlete.athlete_id == "cara":
+                raise ConnectionError("Strava is down")
+            return (seen, client.client_id, client.access_token)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    results = run_athletes(athletes, morning, max_workers=2)
+
+    assert peak[0] == 2  # bounded pool
+    assert [result.athlete_id for result in results] == ["alice", "bob", "cara"]
+    assert results[0].result == ("alice", "club-app", "alice-token")
+    assert results[1].result == ("bob", "club-app", "bob-token")
+    assert not results[2].ok and results[2].error == "ConnectionError: Strava is down"
+    for athlete in athletes:
+        memories = memory_bus.load_memory(athlete.db_file)["observations"]
+        assert [entry["data"]["athlete"] for entry in memories] == [athlete.athlete_id]
+        assert athlete.tdf_points_file.exists()
+    assert current_athlete().athlete_id == "default"  # nothing leaks out of the runner
+
+    with use_athlete(athletes[1]):
+        assert memory_bus.db_file() == tmp_path / "bob" / "lanterne.db"
+        assert TDFTracker().data_file == tmp_path / "bob" / "output" / "tdf_points.json"
+
+
+def test_each_athlete_reads_their_own_cached_mission(tmp_path):
+    from src.lanterne_rouge.mission_config import bootstrap, get_athlete_ftp, get_cached_mission_config
+
+    mission = Path(__file__).parents[1] / "missions" / "tdf_sim_2025.toml"
+    strong = tmp_path / "strong.toml"
+    strong.write_text(mission.read_text(encoding="utf-8").replace("ftp           = 128", "ftp = 300"),
+                      encoding="utf-8")
+    alice = AthleteContext("alice", mission, data_dir=tmp_path / "alice")
+    bob = AthleteContext("bob", strong, data_dir=tmp_path / "bob")
+    for athlete in (alice, bob):
+        with use_athlete(athlete):
+            bootstrap(athlete.mission_path)
+
+    with use_athlete(alice):
+        assert get_athlete_ftp() == 128
+    with use_athlete(bob):
+        assert get_athlete_ftp() == 300
+        assert get_cached_mission_config().athlete.ftp == 300
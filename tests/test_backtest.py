@@ -0,0 +1,85 @@
+"""
+Tests for the season backtest harness.
+"""
+from datetime import date
+from pathlib import Path
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.backtest import build_daily_metrics, load_activities, load_wellness, run_backtest
+
+DATA_DIR = Path(__file__).parent
+
+
+def _season_metrics():
+    activities = load_activities(DATA_DIR / "i296483_activities.csv")
+    wellness = load_wellness(DATA_DIR / "athlete_i296483_wellness.csv")
+    return build_daily_metrics(activities, wellness, start=date(2025, 3, 1), end=date(2025, 6, 24))
+
+
+def test_build_daily_metrics_from_exports():
+    metrics = _season_metrics()
+
+    assert len(metrics) == 116
+    assert metrics["readiness_score"].notna().mean() > 0.9
+    # Morning TSB is yesterday's CTL minus ATL
+    assert (metrics["tsb"] - (metrics["ctl"] - metrics["atl"])).abs().max() < 1e-9
+
+
+def test_run_backtest_rule_policies_in_process_pool():
+    metrics = _season_metrics()
+
+    report = run_backtest(
+        metrics,
+        parameter_sets={"strict": {"readiness_thresholds": {"low": 80}}},
+        workers=2,
+    )
+
+    summary = report.summary().set_index("policy")
+    assert list(summary.index) == ["default", "strict"]
+    assert (summary[["recover", "ease", "push", "maintain"]].sum(axis=1) == len(metrics)).all()
+    assert summary.loc["strict", "recover"] >= summary.loc["default", "recover"]
+    assert len(report.results[0].trajectory) == len(metrics)
+
+
+def test_run_backtest_llm_stub_matches_rules():
+    metrics = _season_metrics().iloc[:20]
+
+    rules = run_backtest(metrics, workers=0)
+    stub = run_backtest(metrics, workers=0, use_llm_stub=True)
+
+    assert stub.mode == "llm-stub"
+    assert list(stub.results[0].decisions["action"]) == list(rules.results[0].decisions["action"])
+
+
+def test_run_backtest_llm_stub_follows_parameter_sets():
+    metrics = _season_metrics()
+    strict = {"strict": {"readiness_thresholds": {"low": 80}}}
+
+    rules = run_backtest(metrics, parameter_sets=strict, workers=0).summary().set_index("policy")
+    stub = run_backtest(metrics, parameter_sets=strict, workers=0, use_llm_stub=True).summary().set_index("policy")
+
+    assert stub.loc["strict", "recover"] > stub.loc["default", "recover"]
+    assert stub.loc["strict", "recover"] == rules.loc["strict", "recover"]
+
+    empty = run_backtest(metrics.iloc[:0], parameter_sets=strict, workers=0, use_llm_stub=True)
+    assert [len(result.decisions) for result in empty.results] == [0, 0]
+
+
+def test_projection_starts_from_the_first_real_loads():
+    activities = load_activities(DATA_DIR / "i296483_activities.csv")
+    metrics = build_daily_metrics(activities)  # season starts at the first activity
+
+    assert metrics["ctl"].iloc[0] > 0
+    trajectory = run_backtest(metrics, workers=0).results[0].trajectory
+    assert (trajectory["projected_ctl"] > 0).all()
+    assert trajectory["projected_tsb"].abs().max() > 0
+
+
+def test_parse_grid_without_options_adds_no_policy():
+    from scripts.backtest_season import parse_grid
+
+    assert parse_grid(None) == {}
+    assert list(parse_grid(["readiness_low=60,70"])) == ["readiness_low=60", "readiness_low=70"]
@@ -0,0 +1,56 @@
+"""
+Tests for the vectorized rule-based decision engine.
+"""
+import numpy as np
+import pandas as pd
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.batch_decisions import decisions_from_frame, sweep_decision_rules
+from src.lanterne_rouge.reasoner import ReasoningAgent
+
+
+def test_batch_decisions_match_scalar_rules():
+    """Every row of the batch must equal the scalar rule-based decision."""
+    agent = ReasoningAgent(use_llm=False)
+    readiness = np.array([60, 69, 70, 75, 85, 95, 80, 80, 80, 90])
+    tsb = np.array([5, -25, -21, -20, -15, -10, 15, 16, 0, -9.5])
+
+    batch = agent.make_batch_decisions(readiness, tsb)
+
+    for i in range(len(batch)):
+        expected = agent.make_decision({"readiness_score": readiness[i], "tsb": tsb[i]})
+        assert batch.decision(i) == expected
+
+
+def test_batch_decisions_from_frame_fill_missing():
+    """Missing metrics fall back to the scalar defaults (readiness 75, TSB 0)."""
+    agent = ReasoningAgent(use_llm=False)
+    frame = pd.DataFrame({"readiness_score": [np.nan, 65], "tsb": [20, np.nan]})
+
+    result = decisions_from_frame(frame, agent.decision_rules)
+
+    assert list(result["action"]) == ["push", "recover"]
+    assert list(result["low_readiness"]) == [False, True]
+
+
+def test_sweep_decision_rules_counts_each_combination():
+    agent = ReasoningAgent(use_llm=False)
+    readiness = np.array([65, 75, 85, 85])
+    tsb = np.array([0, -12, 20, 5])
+
+    summary = sweep_decision_rules(
+        readiness, tsb, agent.decision_rules,
+        {"readiness_low": [60, 70], "tsb_positive": [10, 25]},
+        baseline=agent.make_batch_decisions(readiness, tsb).action,
+    )
+
+    assert len(summary) == 4
+    assert (summary[["recover", "ease", "push", "maintain"]].sum(axis=1) == 4).all()
+    row = summary[(summary["readiness_low"] == 70) & (summary["tsb_positive"] == 10)].iloc[0]
+    assert (row["recover"], row["ease"], row["push"], row["maintain"]) == (1, 1, 1, 1)
+    assert row["agreement"] == 1.0
+    lenient = summary[(summary["readiness_low"] == 60) & (summary["tsb_positive"] == 25)].iloc[0]
+    assert lenient["recover"] == 0 and lenient["push"] == 0
@@ -0,0 +1,86 @@
+"""
+Tests for structured TDF completion results and the recent workout analysis.
+"""
+from unittest.mock import patch
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.monitor import get_performance_trends, get_recent_workout_analysis
+from src.lanterne_rouge.ride_store import RideAnalysisStore
+from src.lanterne_rouge.streams import RideEfficiency
+
+SUMMARY = """🎉 TDF Stage {n} Complete!
+
+🏔️ Stage Type: Mountain
+🚴 Mode Completed: BREAKAWAY
+⭐ Points Earned: +15
+📊 Total Points: {total}
+
+📈 Performance Metrics:
+• Duration: 75.0 minutes
+• Average Power: 116.0W
+• Weighted Power: 118.0W
+• TSS: 102.7
+• Effort Level: threshold
+
+With an Intensity Factor (IF) of 0.906 you pushed hard.
+
+---
+Stage completed on: 2025-07-{day:02d}
+Activity ID: 1511{n}
+"""
+
+
+def test_recent_completions_single_query_order(tmp_path):
+    store = RideAnalysisStore(tmp_path / "rides.db")
+    for stage, day, mode in [(1, 5, "gc"), (2, 6, "breakaway"), (3, 7, "gc")]:
+        store.save_completion(stage_number=stage, completed_on=f"2025-07-{day:02d}", ride_mode=mode,
+                              points_earned=10, tss=60.0, intensity_factor=0.86, effort_level="threshold")
+
+    analyses = get_recent_workout_analysis(days_back=2, store=store)
+
+    assert [a['stage'] for a in analyses] == ['stage3', 'stage2']
+    assert analyses[0]['data']['mode'] == 'GC'
+    assert analyses[0]['data']['intensity_factor'] == 0.86
+    assert "High-intensity" in get_performance_trends(analyses)
+
+
+def test_markdown_summaries_imported_once(tmp_path):
+    summaries = tmp_path / "completion-summary"
+    summaries.mkdir()
+    for n, day in [(9, 14), (10, 15)]:
+        (summaries / f"stage{n}.md").write_text(SUMMARY.format(n=n, total=n * 6, day=day), encoding="utf-8")
+    store = RideAnalysisStore(tmp_path / "rides.db")
+
+    with patch("src.lanterne_rouge.monitor.COMPLETION_SUMMARY_DIR", summaries):
+        first = get_recent_workout_analysis(store=store)
+        (summaries / "stage10.md").unlink()  # no longer read once imported
+        second = get_recent_workout_analysis(store=store)
+
+    assert first == second
+    latest = first[0]['data']
+    assert first[0]['stage'] == 'stage10'
+    assert latest['mode'] == 'BREAKAWAY' and latest['points'] == 15 and latest['total_points'] == 60
+    assert latest['duration_minutes'] == 75.0 and latest['intensity_factor'] == 0.906
+    assert latest['stage_type'] == 'mountain' and latest['activity_id'] == '151110'
+
+
+def test_completions_and_rides_merged_by_date(tmp_path):
+    store = RideAnalysisStore(tmp_path / "rides.db")
+    for stage in range(1, 8):
+        store.save_completion(stage_number=stage, completed_on=f"2025-07-{stage:02d}", ride_mode="gc",
+                              activity_id=str(100 + stage), points_earned=5)
+    store.save_efficiency([
+        {"activity_id": 107, "start_date": "2025-07-07T06:00:00Z", "name": "Stage 7",
+         "metrics": RideEfficiency(3600, efficiency_factor=1.4)},
+        {"activity_id": 200, "start_date": "2025-07-09T06:00:00Z", "name": "Recovery spin",
+         "metrics": RideEfficiency(2400, efficiency_factor=1.2)},
+    ])
+
+    analyses = get_recent_workout_analysis(days_back=3, store=store)
+
+    # The newer ride isn't cut off, and stage 7's ride is listed once, as the stage
+    assert [a.get('stage', a.get('activity_id')) for a in analyses] == ['200', 'stage7', 'stage6']
+    assert analyses[1]['data']['efficiency_factor'] == 1.4
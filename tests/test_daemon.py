@@ -0,0 +1,113 @@
+"""
+Tests for the daemon's scheduler and health endpoint.
+"""
+import datetime
+import json
+import sqlite3
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.daemon import HealthServer, JobScheduler, ScheduledJob, parse_times
+
+UTC = datetime.timezone.utc
+
+
+def test_jobs_follow_the_athletes_local_clock():
+    job = ScheduledJob("morning", lambda: None, parse_times(["06:00"]), "America/Los_Angeles")
+
+    summer = datetime.datetime(2025, 7, 10, 12, 0, tzinfo=UTC)  # 05:00 PDT
+    assert job.next_after(summer) == datetime.datetime(2025, 7, 10, 13, 0, tzinfo=UTC)
+    assert job.next_after(job.next_after(summer)) == datetime.datetime(2025, 7, 11, 13, 0, tzinfo=UTC)
+    winter = datetime.datetime(2025, 11, 2, 12, 0, tzinfo=UTC)  # DST ended overnight
+    assert job.next_after(winter) == datetime.datetime(2025, 11, 2, 14, 0, tzinfo=UTC)
+
+    evening = ScheduledJob("evening", lambda: None, parse_times(["23:00", "15:00"]), "America/Los_Angeles")
+    assert evening.next_after(summer).hour == 22  # 15:00 PDT comes first
+
+
+def test_due_jobs_run_once_and_report_health():
+    now = [datetime.datetime(2025, 7, 10, 12, 59, tzinfo=UTC)]
+    release = threading.Event()
+    runs = []
+
+    class Report:
+        ok = False
+
+    def slow():
+        runs.append("morning")
+        release.wait(5)
+
+    jobs = [ScheduledJob("morning", slow, parse_times(["06:00"]), "America/Los_Angeles"),
+            ScheduledJob("evening", Report, parse_times(["15:00"]), "America/Los_Angeles")]
+    scheduler = JobScheduler(jobs, clock=lambda: now[0])
+    scheduler.start()
+    server = HealthServer(scheduler, port=0)
+    server.start()
+    host, port = server.address
+    try:
+        assert scheduler.run_due() == []
+        now[0] = datetime.datetime(2025, 7, 10, 13, 0, tzinfo=UTC)
+        assert scheduler.run_due() == ["morning"]
+        assert not scheduler.trigger("morning")  # still running: not started twice
+        assert scheduler.trigger("evening")
+
+        time.sleep(0.2)
+        with urllib.request.urlopen(f"http://{host}:{port}/health") as response:
+            health = json.load(response)
+        assert health["status"] == "degraded"  # the evening report wasn't ok
+        assert health["jobs"]["morning"]["running"] is True
+        assert health["jobs"]["morning"]["next_run"] == "2025-07-11T13:00:00+00:00"
+        assert health["jobs"]["evening"]["last_ok"] is False
+
+        request = urllib.request.Request(f"http://{host}:{port}/jobs/nope/run", method="POST")
+        try:
+            urllib.request.urlopen(request)
+            raise AssertionError("expected 404")
+        except urllib.error.HTTPError as e:
+            assert e.code == 404
+    finally:
+        release.set()
+        server.stop()
+        scheduler.stop()
+
+    assert runs == ["morning"]
+    assert scheduler.jobs["morning"].last_ok is True
+    assert scheduler.status()["status"] == "stopped"
+
+
+def test_serve_keeps_roster_athletes_apart(tmp_path, monkeypatch):
+    from scripts import serve
+
+    mission = Path(__file__).parents[1] / "missions" / "tdf_sim_2025.toml"
+    roster = tmp_path / "athletes.toml"
+    roster.write_text("".join(f'[[athlete]]\nid = "{name}"\nmission = "{mission.as_posix()}"\n'
+                              f'data_dir = "{(tmp_path / name).as_posix()}"\n\n' for name in ("alice", "bob")),
+                      encoding="utf-8")
+
+    with patch("lanterne_rouge.ai_clients.get_llm_backend"):
+        contexts = serve.build_contexts(roster=roster)
+        jobs = serve.build_jobs(contexts, parse_times(["06:00"]), parse_times(["23:00"]))
+
+    assert sorted(job.name for job in jobs) == ["alice:evening", "alice:morning", "bob:evening", "bob:morning"]
+    assert {context.tracker.data_file for context in contexts} == {
+        tmp_path / "alice" / "output" / "tdf_points.json", tmp_path / "bob" / "output" / "tdf_points.json"}
+    for name in ("alice", "bob"):  # each mission is cached in the athlete's own database
+        with sqlite3.connect(tmp_path / name / "lanterne.db") as conn:
+            assert conn.execute("SELECT COUNT(*) FROM mission_config").fetchone()[0] == 1
+    assert serve._targets(contexts[0], "activity") == ("check", "fiction")
+
+    # Several missions would share the single-athlete files
+    monkeypatch.setattr(sys, "argv", ["serve.py", "--mission", "a.toml", "--mission", "b.toml"])
+    with pytest.raises(SystemExit):
+        serve.main()
@@ -0,0 +1,66 @@
+"""
+Tests for the typed daily metrics table.
+"""
+import json
+import sqlite3
+
+import pandas as pd
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.daily_metrics import DailyMetricsStore, backfill_daily_metrics
+
+
+def test_record_merges_days_and_queries_range(tmp_path):
+    store = DailyMetricsStore(tmp_path / "metrics.db")
+    store.record("2025-07-01", readiness_score=82, hrv_balance="NA")
+    store.record_many([{"day": f"2025-07-0{d}", "tss": 50.0 + d, "ctl": 40.0, "atl": 45.0, "tsb": -5.0}
+                       for d in range(1, 4)])
+    store.record("2025-07-01", decision="maintain", confidence=0.8, readiness_score=None)
+    store.record("2025-07-02", athlete_id="other", decision="push")
+
+    frame = store.frame("2025-07-01", "2025-07-02")
+    assert list(frame.index) == list(pd.to_datetime(["2025-07-01", "2025-07-02"]))
+    first = frame.loc["2025-07-01"]
+    assert first["readiness_score"] == 82 and pd.isna(first["hrv_balance"])  # None never blanks
+    assert first["tss"] == 51.0 and first["decision"] == "maintain"
+    assert frame["readiness_score"].dtype == "Int64"
+    assert store.latest()["day"] == "2025-07-03"
+    assert list(store.frame(athlete_id="other")["decision"]) == ["push"]
+
+    exported = pd.read_parquet(store.export(tmp_path / "metrics.parquet"))
+    assert len(exported) == 3 and set(exported["athlete_id"]) == {"default"}
+    assert len(pd.read_feather(store.export(tmp_path / "metrics.arrow", start="2025-07-03"))) == 1
+
+
+def test_backfill_from_legacy_logs(tmp_path):
+    output = tmp_path / "output"
+    output.mkdir()
+    (output / "readiness_score_log.csv").write_text(
+        "day,readiness_score,activity_balance,hrv_balance\n"
+        "2025-06-01,80,70,65\n"
+        "2025-06-02,75,70,60,99\n",  # contributors drifted: extra cell, hrv not trusted
+        encoding="utf-8",
+    )
+    (output / "reasoning_log.csv").write_text(
+        'day,readiness_score,explanation\n2025-05-31,70,"Friday, June 1\nrest"\n', encoding="utf-8")
+
+    db = tmp_path / "metrics.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE TABLE memory (timestamp TEXT PRIMARY KEY, type TEXT, data TEXT)")
+        conn.executemany("INSERT INTO memory VALUES (?, ?, ?)", [
+            ("2025-06-02T14:00:00+00:00", "observation", json.dumps({"readiness_score": 77, "ctl": 30, "tsb": 2})),
+            ("2025-06-02T14:00:01+00:00", "decision", json.dumps({"action": "ease", "confidence": 0.7,
+                                                                   "tdf_mode": "gc"})),
+        ])
+    store = DailyMetricsStore(db)
+
+    assert backfill_daily_metrics(store, output_dir=output) == 5
+    frame = store.frame()
+    assert list(frame.index.strftime("%Y-%m-%d")) == ["2025-05-31", "2025-06-01", "2025-06-02"]
+    assert frame.loc["2025-06-01", "hrv_balance"] == 65
+    day = frame.loc["2025-06-02"]
+    assert day["readiness_score"] == 77 and pd.isna(day["hrv_balance"])
+    assert day["ctl"] == 30.0 and day["decision"] == "ease" and day["ride_mode"] == "gc"
@@ -140,6 +140,26 @@ class TestFictionModeIntegration:
             assert options.format == fmt
 
 
+def test_streamed_draft_never_clobbers_published_narrative(tmp_path):
+    agent = DeliveryAgent(archive_dir=str(tmp_path))
+    published = tmp_path / "stage3.md"
+    published.write_text("# Stage 3 — published\n", encoding="utf-8")
+    stage_data = Mock(stage_number=3, stage_name="Valenciennes > Dunkerque", winner="Stub Rider",
+                      distance_km=178.0, date=datetime(2025, 7, 7))
+    analysis = Mock(stage_data=stage_data)
+
+    sink = agent.open_stream(analysis, DeliveryOptions(format='markdown'))
+    sink("The unedited draft")
+    sink.close()
+    # Generation or editing may still fail: the published page is untouched
+    assert published.read_text(encoding="utf-8") == "# Stage 3 — published\n"
+    assert "unedited draft" in agent.draft_path(3).read_text(encoding="utf-8")
+
+    agent._save_to_archive("# Stage 3 — edited\n", "Stage 3", analysis, 'markdown')
+    assert published.read_text(encoding="utf-8") == "# Stage 3 — edited\n"
+    assert not agent.draft_path(3).exists()
+
+
 class TestFictionModeErrorHandling:
     """Test Fiction Mode error handling"""
 
@@ -180,5 +200,24 @@ class TestFictionModeErrorHandling:
         assert len(result.mapped_events) == 0
 
 
+def test_force_rewrites_an_existing_narrative(tmp_path):
+    from lanterne_rouge.athlete import AthleteContext, use_athlete
+    from scripts import run_fiction_mode as runner
+
+    alice = AthleteContext("alice", tmp_path / "alice.toml", data_dir=tmp_path / "alice")
+    alice.narratives_dir.mkdir(parents=True)
+    (alice.narratives_dir / "stage3.md").write_text("# Stage 3\n", encoding="utf-8")
+    result = Mock(success=True, processing_time_seconds=1.0, delivered_narrative=None,
+                  editing_report=None, narrative="")
+
+    with use_athlete(alice), patch.object(runner, "FictionModeOrchestrator") as orchestrator:
+        orchestrator.return_value.process_specific_activity.return_value = result
+        assert runner.run_fiction_mode(activity_id=7, stage_number=3, style='dramatic') == 0
+        orchestrator.assert_not_called()  # kept without --force
+
+        assert runner.run_fiction_mode(activity_id=7, stage_number=3, style='dramatic', force=True) == 0
+        orchestrator.return_value.process_specific_activity.assert_called_once_with(7, 3, None)
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -0,0 +1,101 @@
+"""
+Tests for the offline activity / wellness history importer.
+"""
+import gzip
+from pathlib import Path
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.backtest import load_activities, load_wellness
+from src.lanterne_rouge.history_import import (
+    HistoryStore,
+    import_activities_csv,
+    import_tcx,
+    import_wellness_csv,
+)
+from src.lanterne_rouge.streams.cache import StreamCache
+
+TESTS_DIR = Path(__file__).parent
+ICU_ACTIVITIES = TESTS_DIR / "i296483_activities.csv"
+STRAVA_ACTIVITIES = TESTS_DIR / "strava_export_2025-06-26.csv"
+WELLNESS = TESTS_DIR / "athlete_i296483_wellness.csv"
+
+TCX_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<TrainingCenterDatabase xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2"
+  xmlns:ns3="http://www.garmin.com/xmlschemas/ActivityExtension/v2">
+ <Activities><Activity Sport="Biking"><Id>2025-06-24T18:06:31Z</Id>
+  <Lap StartTime="2025-06-24T18:06:31Z"><Track>
+"""
+TCX_POINT = """   <Trackpoint><Time>2025-06-24T18:{m:02d}:{s:02d}Z</Time>
+    <DistanceMeters>{d}</DistanceMeters><HeartRateBpm><Value>140</Value></HeartRateBpm>
+    <Cadence>90</Cadence><Extensions><ns3:TPX><ns3:Watts>{w}</ns3:Watts></ns3:TPX></Extensions></Trackpoint>
+"""
+TCX_FOOTER = "  </Track></Lap></Activity></Activities></TrainingCenterDatabase>\n"
+
+
+def test_csv_import_types_and_dedup(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+
+    icu = import_activities_csv(ICU_ACTIVITIES, store)
+    strava = import_activities_csv(STRAVA_ACTIVITIES, store)
+    again = import_activities_csv(ICU_ACTIVITIES, store)
+
+    assert icu.inserted == 224 and icu.invalid == 0
+    assert strava.inserted + strava.duplicates == 95 and strava.duplicates > 0  # overlapping exports
+    assert again.inserted == 0 and again.duplicates == 224
+    assert store.count("activities") == 224 + strava.inserted
+
+    frame = store.activities_frame()
+    ride = frame.set_index("activity_id").loc["14907017808"]
+    assert ride["start_date_local"] == "2025-06-24T18:06:31"
+    assert ride["sport_type"] == "Ride" and ride["trainer"] == 1
+    assert ride["weighted_average_watts"] == 88.0 and ride["icu_training_load"] == 25.0
+
+    # The backtest reads the stored history like the CSV export
+    from_store = load_activities(frame[frame["source"] == ICU_ACTIVITIES.name])
+    from_csv = load_activities(ICU_ACTIVITIES)
+    assert from_store["tss"].sum() == from_csv["tss"].sum()
+
+
+def test_wellness_upsert(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+    first = import_wellness_csv(WELLNESS, store)
+    assert first.inserted == first.read - first.invalid - first.duplicates
+    assert store.count("wellness") == first.inserted
+
+    refresh = tmp_path / "wellness.csv"
+    refresh.write_text("date,restingHR,readiness\n2025-06-25,58,\n", encoding="utf-8")
+    import_wellness_csv(refresh, store)
+
+    wellness = load_wellness(store.wellness_frame())
+    day = store.wellness_frame().set_index("date").loc["2025-06-25"]
+    assert day["restingHR"] == 58 and day["readiness"] == 73.0  # blank cells keep stored values
+    assert wellness.loc["2025-06-25", "readiness_score"] == 73.0
+    assert store.count("wellness") == first.inserted
+
+
+def test_tcx_import_maps_to_csv_activity(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+    cache = StreamCache(tmp_path / "streams")
+    import_activities_csv(ICU_ACTIVITIES, store)
+
+    points = "".join(TCX_POINT.format(m=6 + (31 + i) // 60, s=(31 + i) % 60, d=i * 7.0, w=150 + i % 2 * 50)
+                     for i in range(120))
+    export = tmp_path / "activities"
+    export.mkdir()
+    matched = export / "48502705abc743a593833128f9b5a5a9.tcx.gz"  # external_id of 14907017808
+    with gzip.open(matched, "wt", encoding="utf-8") as handle:
+        handle.write(TCX_HEADER + points + TCX_FOOTER)
+    (export / "99.tcx").write_text(TCX_HEADER + points + TCX_FOOTER, encoding="utf-8")
+    (export / "broken.tcx").write_text("<TrainingCenterDatabase>", encoding="utf-8")
+
+    result = import_tcx([export], store, cache)
+
+    assert (result.read, result.inserted, result.duplicates, result.invalid) == (3, 1, 1, 1)
+    streams = cache.load("14907017808")
+    assert streams["time"][-1] == 119 and streams["watts"].max() == 200
+    new = store.activities_frame().set_index("activity_id").loc["99"]
+    assert new["sport_type"] == "Ride" and new["average_watts"] == 175.0
+    assert new["average_heartrate"] == 140.0 and new["distance"] == 833.0
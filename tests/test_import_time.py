@@ -0,0 +1,57 @@
+"""
+Import-time budget and side-effect checks for short-lived cron runs.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+IMPORT_BUDGET_SECONDS = 0.15  # Typically ~0.02s; was ~0.18s with eager imports
+
+PROBE = """
+import builtins, json, pathlib, sqlite3, sys, time
+import dotenv
+
+effects = []
+_connect, _mkdir, _open = sqlite3.connect, pathlib.Path.mkdir, builtins.open
+sqlite3.connect = lambda *a, **k: effects.append("sqlite3.connect") or _connect(*a, **k)
+pathlib.Path.mkdir = lambda self, *a, **k: effects.append(f"mkdir {self}") or _mkdir(self, *a, **k)
+builtins.open = lambda file, *a, **k: effects.append(f"open {file}") or _open(file, *a, **k)
+dotenv.load_dotenv = lambda *a, **k: effects.append("load_dotenv")
+
+started = time.perf_counter()
+import lanterne_rouge.monitor
+import lanterne_rouge.memory_bus
+import lanterne_rouge.strava_api
+elapsed = time.perf_counter() - started
+
+heavy = [name for name in ("openai", "pydantic", "requests", "pandas", "numpy") if name in sys.modules]
+print(json.dumps({"elapsed": elapsed, "effects": effects, "heavy": heavy}))
+"""
+
+
+def _probe(tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=tmp_path, capture_output=True, text=True, timeout=60,
+        env={"PYTHONPATH": str(SRC_DIR), "PATH": ""},
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_monitor_import_has_no_side_effects(tmp_path):
+    (tmp_path / "tokens.json").write_text('{"access_token": "a", "refresh_token": "r"}', encoding="utf-8")
+    probe = _probe(tmp_path)
+    assert probe["effects"] == []
+    assert probe["heavy"] == []
+
+
+def test_monitor_import_within_budget(tmp_path):
+    # Best of three, so one slow cold start on a busy machine doesn't fail the run
+    elapsed = min(_probe(tmp_path)["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"import lanterne_rouge.monitor took {elapsed:.3f}s"
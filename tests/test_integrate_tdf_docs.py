@@ -0,0 +1,70 @@
+"""
+Tests for incremental regeneration of the TDF stage pages.
+"""
+from types import SimpleNamespace
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from scripts import integrate_tdf_docs
+from src.lanterne_rouge.doc_cache import RenderCache, write_if_changed
+from src.lanterne_rouge.pipeline import PipelineCache
+
+STAGE_PAGE = """# Stage {n}
+
+## Stage Report
+
+=== "Planned"
+
+\t#### 🦺 GC Mode
+
+\t- Ride steady
+"""
+
+
+class StubTracker:
+    def __init__(self, completed):
+        self.completed = completed
+
+    def get_points_status(self):
+        return {"stages_completed": self.completed, "total_points": 3 * self.completed}
+
+
+def test_only_changed_stages_are_rewritten(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stages = tmp_path / "docs_src" / "tdf-simulation" / "stages"
+    stages.mkdir(parents=True)
+    for n in range(1, 22):
+        (stages / f"stage{n}.md").write_text(STAGE_PAGE.format(n=n), encoding="utf-8")
+    briefing = tmp_path / "output" / "morning_tdf_briefing.txt"
+    briefing.parent.mkdir()
+    briefing.write_text("# Stage 3 TDF Morning Briefing\n\nRide GC.", encoding="utf-8")
+    mission = SimpleNamespace(tdf_simulation={"stages": {}})
+    cache = RenderCache("tdf-docs", PipelineCache(tmp_path / "cache.db"))
+
+    def run(completed=2):
+        return integrate_tdf_docs.update_all_stages(StubTracker(completed), mission, render_cache=cache)
+
+    run()
+    assert "Stage 3 TDF Morning Briefing" in (stages / "stage3.md").read_text(encoding="utf-8")
+    assert run() == []  # nothing changed: nothing rendered, nothing written
+
+    # Stage 3 done, briefing for stage 4: only those two pages change
+    briefing.write_text("# Stage 4 TDF Morning Briefing\n\nRide GC.", encoding="utf-8")
+    assert run(completed=3) == [3, 4]
+
+    # A page edited by hand is rendered again
+    page = stages / "stage10.md"
+    page.write_text(page.read_text(encoding="utf-8").replace("## Stage Report\n", "## Stage Report\nstray\n"),
+                    encoding="utf-8")
+    assert run(completed=3) == [10]
+    assert run(completed=3) == []
+
+
+def test_write_if_changed(tmp_path):
+    path = tmp_path / "page.md"
+    assert write_if_changed(path, "hello\n")
+    mtime = path.stat().st_mtime_ns
+    assert not write_if_changed(path, "hello\n")
+    assert path.stat().st_mtime_ns == mtime
@@ -0,0 +1,68 @@
+import json
+import threading
+
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.ai_clients import (
+    OpenAIBackend,
+    call_llm,
+    call_llm_stream,
+    use_llm_backend,
+)
+from src.lanterne_rouge.llm_stub import StubLLMBackend, detect_call_site, make_stub_server
+from src.lanterne_rouge.reasoner import ReasoningAgent
+
+
+def test_stub_training_decision_matches_rules():
+    stub = StubLLMBackend()
+    metrics = {"readiness_score": 65, "tsb": -25, "ctl": 50, "atl": 75}
+
+    with use_llm_backend(stub):
+        decision = ReasoningAgent(use_llm=True).make_decision(metrics)
+
+    expected = ReasoningAgent(use_llm=False).make_decision(metrics)
+    assert stub.calls == {"training_decision": 1}
+    assert decision.action == expected.action == "recover"
+    assert decision.flags == expected.flags
+
+
+def test_stub_effort_intervals_from_segments():
+    messages = [
+        {"role": "system", "content": "You are an expert cycling data analyst specializing in effort pattern recognition."},
+        {"role": "user", "content": "0-10min: Power 150W (max 200W) HR 130bpm (max 140bpm)\n"
+                                    "10-20min: Power 260W (max 420W) HR 160bpm (max 172bpm)"},
+    ]
+    assert detect_call_site(messages) == "effort_intervals"
+
+    with use_llm_backend(StubLLMBackend()):
+        intervals = json.loads(call_llm(messages, force_json=True))
+
+    assert [i["start_minute"] for i in intervals] == [0.0, 10.0]
+    assert intervals[1]["effort_type"] == "surge"
+
+
+def test_stub_error_injection_uses_fallback():
+    with use_llm_backend(StubLLMBackend(error_rate=1.0)):
+        reply = call_llm([{"role": "user", "content": "hello"}])
+    assert reply == "- Error: Could not get a response from the LLM."
+
+
+def test_stub_http_server_is_openai_compatible():
+    server = make_stub_server(StubLLMBackend(), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        backend = OpenAIBackend(api_key="stub", base_url=f"http://{host}:{port}/v1")
+        messages = [{"role": "system", "content": "You are a smart cycling coach AI."}]
+
+        with use_llm_backend(backend):
+            reply = call_llm(messages)
+            streamed = "".join(call_llm_stream(messages))
+
+        assert reply.startswith("- Plan looks good")
+        assert streamed == reply
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,49 @@
+"""
+Tests for concurrent gathering of the morning's metrics.
+"""
+import time
+from unittest.mock import patch
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.morning_metrics import gather_morning_metrics
+
+
+def _slow(seconds, value):
+    def fetch(*args, **kwargs):
+        time.sleep(seconds)
+        return value
+    return fetch
+
+
+def test_sources_fetched_concurrently():
+    analysis = [{'source': 'tdf_completion', 'stage': 'stage3', 'data': {'intensity_factor': 0.9}}]
+    with patch("src.lanterne_rouge.monitor.get_oura_readiness", _slow(0.3, (81, 70, "2025-07-10"))), \
+         patch("src.lanterne_rouge.monitor.get_ctl_atl_tsb", _slow(0.3, (42.0, 50.0, -8.0))), \
+         patch("src.lanterne_rouge.ride_store.sync_recent_rides", _slow(0.1, 0)), \
+         patch("src.lanterne_rouge.monitor.get_recent_workout_analysis", _slow(0.2, analysis)):
+        gathered = gather_morning_metrics()
+
+    assert gathered.elapsed_seconds < 0.6  # slowest source, not the 0.9s sum
+    assert gathered.as_metrics() == {"readiness_score": 81, "ctl": 42.0, "atl": 50.0, "tsb": -8.0}
+    assert gathered.hrv_balance == 70 and gathered.recent_workout_analysis == analysis
+    assert gathered.performance_trends and not gathered.errors
+    assert set(gathered.timings) == {"oura", "strava", "workouts"}
+
+
+def test_partial_results_on_timeout_and_error():
+    def broken():
+        raise ConnectionError("Oura is down")
+
+    with patch("src.lanterne_rouge.monitor.get_oura_readiness", broken), \
+         patch("src.lanterne_rouge.monitor.get_ctl_atl_tsb", _slow(1.0, (1.0, 2.0, -1.0))):
+        started = time.perf_counter()
+        gathered = gather_morning_metrics(sources=("oura", "strava"), timeouts={"strava": 0.2})
+        waited = time.perf_counter() - started
+
+    assert waited < 0.6  # the slow source is abandoned at its timeout
+    assert gathered.as_metrics() == {"readiness_score": None, "ctl": None, "atl": None, "tsb": None}
+    assert gathered.errors == {"oura": "ConnectionError: Oura is down", "strava": "timed out after 0.2s"}
+    assert "strava ❌ timed out" in gathered.format()
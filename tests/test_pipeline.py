@@ -0,0 +1,129 @@
+"""
+Tests for the DAG pipeline scheduler and its output cache.
+"""
+import time
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.pipeline import Pipeline, PipelineCache, Task
+from src.lanterne_rouge.workflow import WorkflowContext
+
+
+def _pipeline(cache, calls, day):
+    def fetch(context):
+        calls.append("fetch")
+        return {"readiness_score": 80}
+
+    def points(context):
+        calls.append("points")
+        time.sleep(0.2)
+        return {"total_points": 30}
+
+    def stage(context):
+        calls.append("stage")
+        time.sleep(0.2)
+        return int(day[0][-2:]) - 4
+
+    def briefing(context, fetch, points, stage):
+        calls.append("briefing")
+        return f"Stage {stage}: readiness {fetch['readiness_score']}, {points['total_points']} points"
+
+    return Pipeline("morning", [
+        Task("fetch", fetch, cache=False),
+        Task("points", points),
+        Task("stage", stage, inputs=lambda context: day[0]),
+        Task("briefing", briefing, deps=("fetch", "points", "stage")),
+    ], cache=cache)
+
+
+def test_independent_tasks_run_concurrently_and_reruns_are_cached(tmp_path):
+    cache = PipelineCache(tmp_path / "cache.db")
+    calls, day = [], ["2025-07-08"]
+
+    started = time.perf_counter()
+    report = _pipeline(cache, calls, day).run(WorkflowContext(mission_cfg=object()))
+    assert time.perf_counter() - started < 0.35  # points and stage overlap
+    assert report.ok and sorted(calls) == ["briefing", "fetch", "points", "stage"]
+
+    calls.clear()
+    context = WorkflowContext(mission_cfg=object())
+    report = _pipeline(cache, calls, day).run(context)
+    assert calls == ["fetch"]  # everything else is unchanged
+    assert [step.cached for step in report.steps] == [False, True, True, True]
+    assert context.results["briefing"] == "Stage 4: readiness 80, 30 points"
+    assert "💾 cached" in report.format()
+
+    calls.clear()
+    day[0] = "2025-07-09"  # an input changed: stage and its dependents re-run
+    context = WorkflowContext(mission_cfg=object())
+    _pipeline(cache, calls, day).run(context)
+    assert sorted(calls) == ["briefing", "fetch", "stage"]
+    assert context.results["briefing"].startswith("Stage 5")
+
+    calls.clear()
+    _pipeline(cache, calls, day).run(WorkflowContext(mission_cfg=object()), targets=["points"], force=True)
+    assert calls == ["points"]
+
+
+def test_failure_skips_dependents_only(tmp_path):
+    ran = []
+
+    def broken(context, check):
+        raise ConnectionError("Strava is down")
+
+    pipeline = Pipeline("evening", [
+        Task("check", lambda context: ran.append("check") or 1),
+        Task("docs", broken, deps=("check",), required=False),
+        Task("publish", lambda context, docs: ran.append("publish"), deps=("docs",), required=False),
+        Task("fiction", lambda context, check: ran.append("fiction") or check, deps=("check",)),
+    ], cache=PipelineCache(tmp_path / "cache.db"))
+    report = pipeline.run(WorkflowContext(mission_cfg=object()))
+
+    assert sorted(ran) == ["check", "fiction"]
+    assert [(step.name, step.ok, step.skipped) for step in report.steps] == [
+        ("check", True, False), ("docs", False, False), ("publish", False, True), ("fiction", True, False)]
+    assert report.ok  # only optional tasks failed
+    assert report.steps[1].error == "ConnectionError: Strava is down"
+
+
+def test_new_narrative_is_announced_once(tmp_path, monkeypatch):
+    from unittest.mock import patch
+
+    from lanterne_rouge.athlete import AthleteContext
+    from lanterne_rouge.pipeline import Pipeline as ScriptPipeline
+    from lanterne_rouge.pipeline import PipelineCache as ScriptCache
+    from lanterne_rouge.pipeline import Task as ScriptTask
+    from lanterne_rouge.workflow import WorkflowContext as ScriptContext
+    from scripts import run_pipeline
+
+    monkeypatch.setenv("ALICE_TO_EMAIL", "alice@example.com")
+    alice = AthleteContext("alice", tmp_path / "alice.toml", data_dir=tmp_path / "alice", env_prefix="ALICE_")
+    stage = [3]
+
+    def write_narrative(**kwargs):
+        alice.narratives_dir.mkdir(parents=True, exist_ok=True)
+        (alice.narratives_dir / f"stage{stage[0]}.md").write_text("# The breakaway", encoding="utf-8")
+        return 0
+
+    def pipeline():
+        return ScriptPipeline("evening", [
+            ScriptTask("check", lambda context: {"stages_completed": stage[0]}, cache=False),
+            ScriptTask("fiction", run_pipeline.generate_fiction, deps=("check",)),
+            ScriptTask("notify_fiction", run_pipeline.notify_fiction, deps=("fiction",)),
+        ], cache=ScriptCache(tmp_path / "cache.db"))
+
+    with patch("scripts.run_fiction_mode.run_fiction_mode", side_effect=write_narrative), \
+            patch("scripts.notify.send_email") as send_email:
+        pipeline().run(ScriptContext(mission_cfg=object(), athlete=alice))
+        pipeline().run(ScriptContext(mission_cfg=object(), athlete=alice))  # cached: not sent again
+        assert send_email.call_count == 1
+        subject, body, recipient = send_email.call_args.args
+        assert "Stage 3" in subject and "The breakaway" in body and recipient == "alice@example.com"
+
+        # A narrative that was already there isn't announced
+        stage[0] = 4
+        write_narrative()
+        report = pipeline().run(ScriptContext(mission_cfg=object(), athlete=alice))
+        assert report.ok and send_email.call_count == 1
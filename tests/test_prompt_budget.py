@@ -0,0 +1,54 @@
+"""
+Tests for the prompt budgeting utilities.
+"""
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.prompt_budget import (
+    PromptSection, TRUNCATION_MARKER, estimate_tokens, fit_sections,
+    normalize_whitespace, truncate_to_tokens
+)
+
+
+def test_text_within_budget_is_untouched():
+    text = "Short stage report."
+    assert truncate_to_tokens(text, 100) == text
+
+
+def test_truncation_respects_budget_for_each_strategy():
+    text = "\n\n".join(
+        f"Paragraph {i} opens here. It then keeps going with detail {i}. And more filler text."
+        for i in range(40)
+    )
+    for strategy in ("head", "lines", "summary"):
+        trimmed = truncate_to_tokens(text, 120, strategy)
+        assert estimate_tokens(trimmed) <= 120
+        assert trimmed.endswith(TRUNCATION_MARKER)
+
+
+def test_summary_prefers_lead_sentences():
+    text = "Lead one. Detail one.\n\nLead two. Detail two.\n\nLead three. Detail three."
+    budget = estimate_tokens("Lead one. Lead two. Lead three.") + estimate_tokens(TRUNCATION_MARKER) + 3
+    trimmed = truncate_to_tokens(text, budget, "summary")
+    assert "Lead three." in trimmed
+    assert "Detail one." not in trimmed
+
+
+def test_fit_sections_trims_lowest_priority_first():
+    sections = [
+        PromptSection("header", "Header text that must survive.", priority=2),
+        PromptSection("report", "word " * 2000, priority=0),
+        PromptSection("instructions", "Respond with JSON.", priority=2),
+    ]
+    fitted = fit_sections(sections, 200)
+
+    assert fitted["header"] == sections[0].text
+    assert fitted["instructions"] == sections[2].text
+    assert sum(estimate_tokens(text) for text in fitted.values()) <= 200
+    # Deterministic: same inputs give the same prompt
+    assert fit_sections(sections, 200) == fitted
+
+
+def test_normalize_whitespace_collapses_scraped_noise():
+    assert normalize_whitespace("  Stage   5 \n\n\n\n  Winner\t\tPogačar  ") == "Stage 5\n\nWinner Pogačar"
@@ -0,0 +1,121 @@
+"""
+Tests for the local Oura readiness store and its incremental sync.
+"""
+import datetime
+import sqlite3
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.athlete import AthleteContext, use_athlete
+from src.lanterne_rouge.monitor import get_oura_readiness
+from src.lanterne_rouge.readiness_store import ReadinessStore, readiness_row, sync_oura
+
+TODAY = datetime.date(2025, 7, 10)
+
+
+def _readiness(day, score, hrv=70):
+    return {"day": day, "score": score, "temperature_deviation": -0.1,
+            "contributors": {"hrv_balance": hrv, "resting_heart_rate": 80, "recovery_index": 90}}
+
+
+class FakeOura:
+    """Oura API stand-in that records the requested ranges."""
+
+    def __init__(self):
+        self.requests = []
+        self.readiness = [_readiness(f"2025-07-{d:02d}", 70 + d) for d in range(1, 10)]
+        self.sleep = [{"day": f"2025-07-{d:02d}", "score": 80 + d} for d in range(1, 11)]
+
+    def __call__(self, collection, start_date, end_date):
+        self.requests.append((collection, start_date, end_date))
+        documents = self.readiness if collection == "daily_readiness" else self.sleep
+        return [doc for doc in documents if start_date <= doc["day"] < end_date]
+
+
+def test_incremental_sync_and_dedup(tmp_path):
+    store = ReadinessStore(tmp_path / "oura.db")
+    oura = FakeOura()
+    logged = []
+
+    first = sync_oura(store, today=TODAY, fetch=oura, on_new_readiness=lambda e: logged.append(e["day"]))
+    assert first == [f"2025-07-{d:02d}" for d in range(1, 11)]
+    assert oura.requests[0] == ("daily_readiness", "2025-06-10", "2025-07-11")
+    assert len(logged) == 9  # 2025-07-10 has sleep but no readiness yet
+
+    assert sync_oura(store, today=TODAY, fetch=oura) == []  # within MIN_SYNC_INTERVAL
+    assert len(oura.requests) == 2
+
+    oura.readiness.append(_readiness("2025-07-10", 88, hrv=95))
+    again = sync_oura(store, today=TODAY, fetch=oura, force=True,
+                      on_new_readiness=lambda e: logged.append(e["day"]))
+    assert again == []  # no new days, the last day was updated in place
+    assert oura.requests[2] == ("daily_readiness", "2025-07-10", "2025-07-11")
+    assert logged[-1] == "2025-07-10" and logged.count("2025-07-10") == 1
+
+    frame = store.frame("2025-07-08", "2025-07-10")
+    assert list(frame["readiness_score"]) == [78, 79, 88]
+    assert list(frame["sleep_score"]) == [88, 89, 90]
+    assert frame.loc["2025-07-10", "hrv_balance"] == 95
+
+
+def test_get_oura_readiness_reads_local_store(tmp_path):
+    store = ReadinessStore(tmp_path / "oura.db")
+    store.upsert([{"day": datetime.date.today().isoformat(), "readiness_score": 77, "hrv_balance": 64}])
+
+    with patch("src.lanterne_rouge.readiness_store.fetch_oura_collection") as fetch:
+        assert get_oura_readiness(store=store) == (77, 64, datetime.date.today().isoformat())
+    fetch.assert_not_called()  # synced moments ago
+
+
+def test_club_athlete_does_not_import_the_default_csv(tmp_path):
+    default_output = tmp_path / "output"
+    default_output.mkdir()
+    (default_output / "readiness_score_log.csv").write_text(
+        "day,readiness_score,activity_balance,hrv_balance\n2025-07-01,80,75,60\n", encoding="utf-8")
+    alice = AthleteContext("alice", tmp_path / "alice.toml", data_dir=tmp_path / "alice", env_prefix="ALICE_")
+
+    with use_athlete(alice), \
+            patch("src.lanterne_rouge.monitor.OUTPUT_DIR", default_output), \
+            patch("src.lanterne_rouge.readiness_store.fetch_oura_collection", return_value=[]):
+        store = ReadinessStore(tmp_path / "alice.db")
+        assert get_oura_readiness(store=store) == (None, None, None)
+    assert store.last_day() is None
+
+
+def test_schema_evolves_and_typed_reader(tmp_path):
+    db = tmp_path / "oura.db"
+    with sqlite3.connect(db) as conn:  # table as created before contributors were stored
+        conn.execute("CREATE TABLE oura_daily (athlete_id TEXT NOT NULL, day TEXT NOT NULL, "
+                     "readiness_score INTEGER, fetched_at TEXT, PRIMARY KEY (athlete_id, day))")
+        conn.execute("INSERT INTO oura_daily VALUES ('default', '2025-06-30', 66, NULL)")
+    legacy = tmp_path / "readiness_score_log.csv"
+    legacy.write_text("day,readiness_score,activity_balance,hrv_balance\n"
+                      "2025-06-30,99,1,1\n"  # already stored: kept
+                      "2025-07-01,80,75,NA\n"
+                      "2025-07-02,81,76,60,55\n", encoding="utf-8")  # drifted row: score only
+
+    store = ReadinessStore(db)
+    assert store.import_csv_log(legacy, athlete_id="alice") == 3  # the default's days don't count
+    assert store.import_csv_log(legacy) == 2
+    entry = _readiness("2025-07-03", 84, hrv=72)
+    entry["contributors"]["cardio_capacity"] = 41.5  # field Oura adds later
+    store.upsert([readiness_row(entry)])
+
+    frame = store.frame()
+    assert list(frame["readiness_score"]) == [66, 80, 81, 84]
+    assert frame["readiness_score"].dtype == "Int64"
+    assert frame.loc["2025-07-01", "contributor_activity_balance"] == 75
+    assert pd.isna(frame.loc["2025-07-02", "contributor_activity_balance"])
+    assert frame["contributor_cardio_capacity"].dtype == "float64"
+    assert frame.loc["2025-07-03", "contributor_cardio_capacity"] == 41.5
+    assert frame.loc["2025-07-03", "hrv_balance"] == 72
+
+    arrays = store.arrays("2025-07-01")
+    assert arrays["day"].dtype == np.dtype("datetime64[D]") and len(arrays["day"]) == 3
+    assert np.isnan(arrays["contributor_hrv_balance"]).tolist() == [True, True, False]
@@ -0,0 +1,76 @@
+"""
+Tests for stream-based efficiency metrics and the ride analysis store.
+"""
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.monitor import get_performance_trends
+from src.lanterne_rouge.ride_store import RideAnalysisStore, sync_recent_rides
+from src.lanterne_rouge.streams.cache import StreamCache
+from src.lanterne_rouge.streams.efficiency import ride_efficiency
+
+
+def _ride(seconds=3600, drift=0.0):
+    time = np.arange(seconds, dtype=float)
+    watts = np.full(seconds, 200.0)
+    heartrate = 140.0 * (1 + drift * time / seconds)
+    cadence = np.full(seconds, 90.0)
+    cadence[:360] = 0  # 6 minutes coasting
+    cadence[360:1260] = 75
+    return {'time': time, 'watts': watts, 'heartrate': heartrate, 'cadence': cadence}
+
+
+def test_ride_efficiency_metrics():
+    steady = ride_efficiency(_ride())
+    assert steady.efficiency_factor == round(200 / 140, 3)
+    assert steady.decoupling_pct == 0.0 and steady.hr_drift_pct == 0.0
+    assert steady.coasting_pct == 10.0
+    assert steady.cadence_distribution == {'0-70': 0.0, '70-85': 27.8, '85-95': 72.2, '95-105': 0.0, '105+': 0.0}
+
+    drifting = ride_efficiency(_ride(drift=0.1))
+    assert 4 < drifting.decoupling_pct < 6
+    assert 4 < drifting.hr_drift_pct < 6
+
+    short = ride_efficiency(_ride(seconds=600))
+    assert short.decoupling_pct is None and short.efficiency_factor is not None
+
+
+def test_stops_are_left_out_of_efficiency():
+    steady = _ride()
+    # A 20-minute coffee stop after 40 minutes: no samples while stopped
+    stopped = {key: np.concatenate([values[:2400], values[2400:]]) for key, values in steady.items()}
+    stopped['time'] = np.concatenate([steady['time'][:2400], steady['time'][2400:] + 1200])
+
+    with_stop = ride_efficiency(stopped)
+    assert with_stop.duration_seconds <= 3600 + 5  # moving time (short gaps are filled)
+    assert with_stop.efficiency_factor == round(200 / 140, 3)
+    assert with_stop.decoupling_pct == 0.0 and with_stop.hr_drift_pct == 0.0
+    assert with_stop.coasting_pct == 10.0
+
+
+def test_sync_stores_new_rides_once(tmp_path):
+    cache = StreamCache(tmp_path / "streams")
+    cache.save(1, _ride())
+    cache.save(2, _ride(drift=0.1))
+    store = RideAnalysisStore(tmp_path / "rides.db")
+    activities = [
+        {'id': 2, 'sport_type': 'Ride', 'start_date_local': '2025-07-02T08:00:00Z', 'name': 'Long'},
+        {'id': 1, 'sport_type': 'VirtualRide', 'start_date_local': '2025-07-01T08:00:00Z', 'name': 'Zwift'},
+        {'id': 3, 'sport_type': 'Run', 'start_date_local': '2025-07-01T18:00:00Z', 'name': 'Run'},
+    ]
+
+    with patch("src.lanterne_rouge.strava_api.strava_get", return_value=activities):
+        assert sync_recent_rides(store=store, cache=cache) == 2
+        assert sync_recent_rides(store=store, cache=cache) == 0
+
+    recent = store.recent_efficiency(limit=5)
+    assert [ride['activity_id'] for ride in recent] == ['2', '1']
+    assert recent[1]['cadence_distribution']['85-95'] == 72.2
+
+    trends = get_performance_trends([{'data': ride} for ride in recent])
+    assert "Pw:HR" in trends
@@ -0,0 +1,35 @@
+"""
+Tests for the Strava client's token refresh.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.strava_api import StravaClient
+
+
+def test_concurrent_401s_share_one_refresh():
+    client = StravaClient("id", "secret", "old-access", "refresh-1")
+    refreshes = []
+
+    def api(method, url, headers, **kwargs):
+        ok = headers["Authorization"] == "Bearer new-access"
+        return Mock(status_code=200 if ok else 401, content=b"{}", json=lambda: {"ok": True})
+
+    def token_post(url, data, **kwargs):
+        refreshes.append(data["refresh_token"])
+        time.sleep(0.1)  # the other requests get their 401 meanwhile
+        tokens = {"access_token": "new-access", "refresh_token": "refresh-2", "expires_at": 0}
+        return Mock(status_code=200, json=lambda: tokens)
+
+    with patch("requests.request", side_effect=api), patch("requests.post", side_effect=token_post):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: client.get("athlete/activities"), range(4)))
+
+    assert results == [{"ok": True}] * 4
+    assert refreshes == ["refresh-1"]
+    assert client.refresh_token == "refresh-2"
@@ -0,0 +1,205 @@
+"""
+Tests for the Strava webhook receiver and its activity queue.
+"""
+import datetime
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from unittest.mock import Mock, patch
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.daemon import HealthServer, JobScheduler, ScheduledJob, parse_times
+from src.lanterne_rouge.strava_webhook import (
+    ActivityProcessor,
+    StravaWebhook,
+    WebhookEventStore,
+    parse_event,
+    post_test_event,
+)
+
+
+def test_subscription_handshake_and_event_parsing(tmp_path):
+    webhook = StravaWebhook(ActivityProcessor(print, WebhookEventStore(tmp_path / "events.db")),
+                            verify_token="STRAVA")
+    query = {"hub.mode": "subscribe", "hub.verify_token": "STRAVA", "hub.challenge": "15f7d1a91c1f40f8"}
+    assert webhook.handle_get(query) == (200, {"hub.challenge": "15f7d1a91c1f40f8"})
+    assert webhook.handle_get({**query, "hub.verify_token": "guess"})[0] == 403
+
+    event = {"aspect_type": "create", "object_type": "activity", "object_id": 1360128428,
+             "owner_id": 134815, "event_time": 1516126040, "subscription_id": 120475}
+    assert parse_event(event).activity_id == 1360128428
+    assert parse_event({**event, "aspect_type": "update"}) is None
+    assert parse_event({**event, "object_type": "athlete"}) is None
+    assert webhook.handle_post(b'{"object_type": "activity"}')[0] == 400
+
+
+def test_events_are_queued_once_and_processed(tmp_path):
+    store = WebhookEventStore(tmp_path / "events.db")
+    processed, release = [], threading.Event()
+
+    class Report:
+        def __init__(self, ok):
+            self.ok = ok
+
+    def handle(event):
+        release.wait(5)
+        processed.append(event.activity_id)
+        return Report(event.activity_id != 2)
+
+    processor = ActivityProcessor(handle, store, max_attempts=2)
+    webhook = StravaWebhook(processor, verify_token="STRAVA", owner_ids=[134815])
+    processor.start()
+    scheduler = JobScheduler([])
+    server = HealthServer(scheduler, port=0, webhook=webhook)
+    server.start()
+    host, port = server.address
+    url = f"http://{host}:{port}/webhook"
+    try:
+        # The receiver replies before the activity is processed
+        assert post_test_event(url, 1, owner_id=134815) == {"queued": True, "activity_id": 1}
+        assert post_test_event(url, 1, owner_id=134815)["reason"] == "duplicate"  # Strava retry
+        assert post_test_event(url, 2, owner_id=134815)["queued"] is True
+        assert post_test_event(url, 3, owner_id=999)["queued"] is False  # another athlete
+        assert post_test_event(url, 4, owner_id=134815, aspect_type="delete")["queued"] is False
+        with urllib.request.urlopen(f"{url}?hub.mode=subscribe&hub.verify_token=STRAVA&hub.challenge=abc") as r:
+            assert json.load(r) == {"hub.challenge": "abc"}
+        try:
+            urllib.request.urlopen(f"{url}?hub.mode=subscribe&hub.verify_token=nope&hub.challenge=abc")
+            raise AssertionError("expected 403")
+        except urllib.error.HTTPError as e:
+            assert e.code == 403
+        release.set()
+    finally:
+        server.stop()
+        processor.stop(timeout=5)
+
+    assert processed == [1, 2]
+    assert store.status(1)["status"] == "done"
+    assert store.status(2)["status"] == "pending" and store.status(2)["attempts"] == 1
+    assert store.status(3) is None
+
+    # A failed activity is retried after a restart, up to max_attempts
+    retry = ActivityProcessor(handle, store, max_attempts=2)
+    retry.start()
+    retry.stop(timeout=5)
+    assert processed == [1, 2, 2]
+    assert store.status(2)["status"] == "failed"
+    assert store.pending() == []
+
+
+def test_failed_stage_check_is_retried(tmp_path):
+    from scripts import evening_tdf_check
+
+    store = WebhookEventStore(tmp_path / "events.db")
+    tracker = Mock()
+    tracker.is_stage_completed_today.side_effect = OSError("tdf_points.json is locked")
+    ride = {"id": 7, "type": "Ride", "sport_type": "Ride", "moving_time": 3600}
+
+    def handle(event):
+        return evening_tdf_check.main(mission_cfg=Mock(), tracker=tracker, update_docs=False, activity=ride)
+
+    with patch.object(evening_tdf_check.TourCoach, "_is_tdf_active", return_value=True), \
+            patch.object(evening_tdf_check.TourCoach, "_get_current_stage_info",
+                         return_value={"number": 3, "type": "flat"}):
+        # A polling run only reports the error
+        assert evening_tdf_check.main(mission_cfg=Mock(), tracker=tracker, update_docs=False) is None
+
+        processor = ActivityProcessor(handle, store, max_attempts=2)
+        processor.start()
+        processor.submit(parse_event({"aspect_type": "create", "object_type": "activity",
+                                      "object_id": 7, "owner_id": 1}))
+        processor.stop(timeout=5)
+
+    assert store.status(7)["status"] == "pending" and store.status(7)["attempts"] == 1
+    assert "tdf_points.json is locked" in store.status(7)["error"]
+
+
+def test_failed_events_are_retried_with_backoff(tmp_path):
+    store = WebhookEventStore(tmp_path / "events.db")
+    attempts, done = [], threading.Event()
+
+    def handle(event):
+        attempts.append(time.perf_counter())
+        if len(attempts) < 3:
+            raise OSError("Strava is down")
+        done.set()
+
+    processor = ActivityProcessor(handle, store, max_attempts=3, retry_delay=0.05)
+    processor.start()
+    processor.submit(parse_event({"aspect_type": "create", "object_type": "activity",
+                                  "object_id": 5, "owner_id": 1}))
+    assert done.wait(5)
+    processor.stop(timeout=5)
+
+    assert store.status(5)["status"] == "done" and store.status(5)["attempts"] == 3
+    assert attempts[2] - attempts[1] >= attempts[1] - attempts[0] >= 0.05  # the delay doubles
+    assert processor.status()["retrying"] == []
+
+
+def test_pushed_activities_must_be_the_athletes_own_and_recent():
+    from scripts import evening_tdf_check, run_pipeline
+
+    today = datetime.date.today()
+    ride = {"id": 9, "athlete": {"id": 134815}, "sport_type": "Ride", "moving_time": 3600,
+            "start_date_local": f"{today.isoformat()}T07:00:00Z"}
+
+    def fetch(activity, owner_id=134815):
+        with patch("lanterne_rouge.strava_api.strava_get", return_value=activity), \
+                patch("lanterne_rouge.strava_api.get_athlete_id", return_value=134815):
+            return run_pipeline.fetch_activity(None, 9, owner_id=owner_id)
+
+    assert fetch(ride) == ride
+    assert fetch({**ride, "athlete": {"id": 666}}, owner_id=666) is None  # someone else's public ride
+    assert fetch(ride, owner_id=666) is None  # event names another owner
+    assert run_pipeline.check_activity(None, None) is None
+
+    tracker = Mock()
+    tracker.is_stage_completed_today.return_value = False
+    tracker.is_activity_already_used.return_value = False
+    old_ride = {**ride, "start_date_local": f"{(today - datetime.timedelta(days=3)).isoformat()}T07:00:00Z"}
+    with patch.object(evening_tdf_check.TourCoach, "_is_tdf_active", return_value=True), \
+            patch.object(evening_tdf_check.TourCoach, "_get_current_stage_info",
+                         return_value={"number": 3, "type": "flat"}), \
+            patch.object(evening_tdf_check, "analyze_activity_with_llm") as analyze:
+        assert evening_tdf_check.main(mission_cfg=Mock(), tracker=tracker, update_docs=False,
+                                      activity=old_ride) is None
+    analyze.assert_not_called()
+
+
+def test_jobs_need_a_token_beside_the_webhook(tmp_path):
+    runs = []
+    scheduler = JobScheduler([ScheduledJob("evening", lambda: runs.append(1), parse_times(["23:00"]), "UTC")])
+    webhook = StravaWebhook(ActivityProcessor(lambda event: None, WebhookEventStore(tmp_path / "events.db")))
+
+    def trigger(server, token=None):
+        host, port = server.address
+        request = urllib.request.Request(f"http://{host}:{port}/jobs/evening/run", method="POST")
+        if token:
+            request.add_header("Authorization", f"Bearer {token}")
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    open_server = HealthServer(scheduler, port=0, webhook=webhook)
+    open_server.start()
+    try:
+        assert trigger(open_server) == 403  # public server, no token configured
+    finally:
+        open_server.stop()
+
+    guarded = HealthServer(scheduler, port=0, webhook=webhook, jobs_token="s3cret")
+    guarded.start()
+    try:
+        assert trigger(guarded) == 401
+        assert trigger(guarded, "wrong") == 401
+        assert runs == []
+        assert trigger(guarded, "s3cret") == 202
+    finally:
+        guarded.stop()
@@ -0,0 +1,75 @@
+"""
+Tests for deterministic effort interval detection.
+"""
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.ai_clients import use_llm_backend
+from src.lanterne_rouge.fiction_mode.data_ingestion import RideDataIngestionAgent
+from src.lanterne_rouge.llm_stub import StubLLMBackend
+from src.lanterne_rouge.streams.intervals import detect_intervals, hysteresis_mask, mask_runs
+
+FTP = 250
+
+
+def _streams(seconds=3600):
+    time = np.arange(seconds, dtype=float)
+    watts = np.full(seconds, 160.0)
+    watts[900:1500] = 270  # 10-minute sustained effort
+    watts[1200:1215] = 150  # short dip inside it, bridged
+    watts[2400:2412] = 600  # sprint
+    watts[3000:3090] = 320  # 90 s surge
+    heartrate = np.where(watts > 200, 165.0, 135.0)
+    return {'time': time, 'watts': watts, 'heartrate': heartrate}
+
+
+def test_hysteresis_and_runs():
+    signal = np.array([0, 10, 7, 5, 10, 3, 3, 10, 10, 0], dtype=float)
+    mask = hysteresis_mask(signal, enter=9, exit=4)
+    assert mask.tolist() == [False, True, True, True, True, False, False, True, True, False]
+    assert mask_runs(mask) == [(1, 5), (7, 9)]
+    assert mask_runs(mask, merge_gap=2) == [(1, 9)]
+    assert mask_runs(mask, min_length=3) == [(1, 5)]
+
+
+def test_detect_intervals_shape_and_types():
+    streams = _streams()
+    intervals = detect_intervals(streams['time'], streams['watts'], streams['heartrate'], ftp=FTP)
+
+    assert [i['effort_type'] for i in intervals] == ['sustained', 'sprint', 'surge']
+    sustained = intervals[0]
+    assert set(sustained) == {'start_minute', 'duration_minutes', 'avg_power', 'max_power',
+                              'avg_hr', 'effort_type', 'description'}
+    assert sustained['start_minute'] == 15.0 and sustained['duration_minutes'] == 10.0
+    assert sustained['max_power'] == 270.0
+    assert 'FTP' in sustained['description']
+    # Same streams, same answer
+    assert detect_intervals(streams['time'], streams['watts'], streams['heartrate'], ftp=FTP) == intervals
+
+
+def test_detect_intervals_heart_rate_only():
+    streams = _streams()
+    intervals = detect_intervals(streams['time'], heartrate=streams['heartrate'])
+
+    assert intervals and intervals[0]['avg_power'] is None
+    assert intervals[0]['start_minute'] == 15.0
+    assert 160 < intervals[0]['avg_hr'] <= 165
+
+
+def test_ingestion_uses_detector_and_llm_only_labels():
+    agent = RideDataIngestionAgent(ftp=FTP, label_with_llm=True)
+    backend = StubLLMBackend()
+
+    with patch("src.lanterne_rouge.fiction_mode.data_ingestion.StreamCache.fetch", return_value=_streams()), \
+            use_llm_backend(backend):
+        intervals = agent.extract_effort_intervals({'id': 1, 'name': 'Stage 5'})
+
+    assert len(intervals) == 3
+    assert intervals[1]['description'] == 'Sprint effort from minute 40.0'
+    assert backend.calls.get('interval_labels') == 1
+    assert 'effort_intervals' not in backend.calls
@@ -0,0 +1,58 @@
+"""
+Tests for mean-maximal power curves and the season-best index.
+"""
+import numpy as np
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.streams.mmp import SeasonBestIndex, curve_durations, mmp_curve
+
+
+def _ride(seconds=3600, seed=1):
+    rng = np.random.default_rng(seed)
+    watts = rng.normal(200, 30, seconds).clip(0)
+    watts[600:900] = 320  # 5-minute effort
+    watts[2000:2010] = 900  # sprint
+    return watts
+
+
+def test_mmp_curve_matches_brute_force():
+    watts = _ride(seconds=900)
+    curve = mmp_curve(watts, durations=np.arange(1, 901))
+
+    for d in (1, 7, 60, 299, 300, 900):
+        brute = max(watts[i:i + d].mean() for i in range(len(watts) - d + 1))
+        assert abs(curve.at(d) - brute) < 1e-9
+
+
+def test_default_grid_and_peaks():
+    watts = _ride()
+    durations = curve_durations(len(watts))
+    assert durations[0] == 1 and durations[-1] == 3600
+    assert {5, 60, 300, 1200} <= set(durations.tolist())
+    assert len(durations) < 300
+
+    curve = mmp_curve(watts, time=np.arange(len(watts)))
+    peaks = curve.peaks()
+    assert peaks['5s'] == 900.0
+    assert peaks['5min'] == 320.0
+    assert curve.start_seconds[list(curve.durations).index(300)] == 600
+
+
+def test_season_best_index_updates_incrementally(tmp_path):
+    index = SeasonBestIndex(tmp_path / "bests.db")
+    easy = mmp_curve(np.full(1200, 180.0))
+    hard = mmp_curve(np.concatenate([np.full(300, 350.0), np.full(300, 150.0)]))
+
+    assert len(index.ingest("a1", easy, 2025)) == len(easy)
+    improved = index.ingest("a2", hard, 2025)
+    assert 300 in improved and 1200 not in improved
+    assert index.ingest("a2", hard, 2025) == []  # already ingested
+
+    bests = index.bests(2025)
+    assert bests.loc[300, "activity_id"] == "a2"
+    assert bests.loc[1200, "activity_id"] == "a1"
+    assert index.best_curve(2025).at(300) == 350.0
+    assert index.bests(2025, athlete_id="other").empty
@@ -0,0 +1,80 @@
+"""
+Tests for stream-based power metrics.
+"""
+import numpy as np
+import pandas as pd
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.streams import (
+    StreamCache,
+    compute_power_metrics,
+    normalized_power,
+    season_power_metrics,
+)
+from src.lanterne_rouge.validation import calculate_power_metrics
+
+
+def test_normalized_power_matches_rolling_reference():
+    rng = np.random.default_rng(3)
+    watts = rng.integers(0, 600, size=3600).astype(float)
+
+    reference = (pd.Series(watts).rolling(30).mean().dropna() ** 4).mean() ** 0.25
+
+    assert np.isclose(normalized_power(watts), reference)
+    # Steady power has NP equal to average power
+    assert np.isclose(normalized_power(np.full(600, 200.0)), 200.0)
+
+
+def test_compute_power_metrics_from_stream_and_summary():
+    watts = np.concatenate([np.full(1800, 150.0), np.full(1800, 300.0)])
+    metrics = compute_power_metrics(250, watts=watts, time=np.arange(3600))
+
+    assert metrics.source == 'stream'
+    assert metrics.variability_index > 1.0
+    assert np.isclose(metrics.kilojoules, 810.0)
+    assert np.isclose(metrics.tss, (metrics.normalized_power / 250) ** 2 * 100)
+
+    summary = compute_power_metrics(250, activity={'weighted_average_watts': 250, 'average_watts': 200,
+                                                   'moving_time': 3600})
+    assert summary.source == 'summary'
+    assert np.isclose(summary.tss, 100.0)
+    assert compute_power_metrics(250, activity={'moving_time': 3600}) is None
+
+
+def test_calculate_power_metrics_prefers_stream_np():
+    activity = {'weighted_average_watts': 180, 'duration_minutes': 60}
+    watts = np.concatenate([np.full(1800, 100.0), np.full(1800, 300.0)])
+
+    summary_only = calculate_power_metrics(activity, 250)
+    with_stream = calculate_power_metrics(activity, 250, streams={'watts': watts, 'time': np.arange(3600)})
+
+    assert summary_only['normalized_power'] == 180
+    assert with_stream['normalized_power'] > 200
+    assert with_stream['power_source'] == 'stream'
+    assert with_stream['tss'] > summary_only['tss']
+
+
+def test_stream_cache_round_trip_and_season_metrics(tmp_path):
+    cache = StreamCache(tmp_path)
+    for activity_id, level in ((1, 150.0), (2, 250.0)):
+        cache.save(activity_id, {'time': np.arange(1200, dtype=float), 'watts': np.full(1200, level)})
+
+    assert sorted(cache.activity_ids()) == ['1', '2']
+    season = season_power_metrics(cache.iter_streams(), ftp=250)
+
+    assert list(season.sort_index()['normalized_power'].round()) == [150.0, 250.0]
+
+
+def test_stops_are_not_riding_time():
+    # Two hours at 200 W with a one-hour stop in the middle (no samples recorded)
+    time = np.concatenate([np.arange(3600), np.arange(7200, 10800)])
+    metrics = compute_power_metrics(250, watts=np.full(7200, 200.0), time=time)
+
+    assert np.isclose(metrics.normalized_power, 200.0)
+    assert np.isclose(metrics.variability_index, 1.0)
+    assert abs(metrics.duration_seconds - 7200) <= 5
+    assert np.isclose(metrics.tss, 2 * 0.8 ** 2 * 100, rtol=0.01)
+    assert np.isclose(normalized_power(np.full(7200, 200.0), time), 200.0)
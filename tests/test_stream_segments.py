@@ -0,0 +1,57 @@
+"""
+Tests for vectorized stream segmentation.
+"""
+import numpy as np
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.streams import segment_stream, segment_summaries
+
+
+def _loop_segments(time_data, watts_data, hr_data, segment_minutes=10):
+    """Reference implementation: the original per-window list comprehension."""
+    total_minutes = max(time_data) / 60
+    segments = []
+    for segment_start in range(0, int(total_minutes), segment_minutes):
+        segment_end = min(segment_start + segment_minutes, total_minutes)
+        indices = [i for i, t in enumerate(time_data) if segment_start * 60 <= t < segment_end * 60]
+        if indices:
+            segment = {'start_min': segment_start, 'end_min': segment_end}
+            powers = [watts_data[i] for i in indices]
+            segment.update({'avg_power': sum(powers) / len(powers), 'max_power': max(powers)})
+            hrs = [hr_data[i] for i in indices if hr_data[i] > 0]
+            if hrs:
+                segment.update({'avg_hr': sum(hrs) / len(hrs), 'max_hr': max(hrs)})
+            segments.append(segment)
+    return segments
+
+
+def test_segment_summaries_match_reference_loop():
+    rng = np.random.default_rng(7)
+    time_data = list(range(0, 3601))  # Exactly one hour at 1 Hz
+    watts_data = list(rng.integers(0, 400, size=len(time_data)).astype(float))
+    hr_data = list(rng.integers(0, 180, size=len(time_data)).astype(float))
+
+    expected = _loop_segments(time_data, watts_data, hr_data)
+    actual = segment_summaries(time_data, watts_data, hr_data)
+
+    assert len(actual) == len(expected) == 6
+    for got, want in zip(actual, expected):
+        assert got.keys() == want.keys()
+        for key in want:
+            assert np.isclose(got[key], want[key])
+
+
+def test_segment_stream_percentiles_and_gaps():
+    time = np.array([0, 1, 2, 3, 20, 21, 22, 23], dtype=float)
+    values = np.array([4, 1, 3, 2, 10, 40, 20, 30], dtype=float)
+
+    segments = segment_stream(time, values, window_seconds=10, end_seconds=30, percentiles=(50, 90))
+
+    assert list(segments.count) == [4, 0, 4]
+    assert segments.mean[0] == 2.5 and np.isnan(segments.mean[1])
+    assert segments.max[2] == 40
+    assert np.isclose(segments.percentiles[50][0], np.percentile([4, 1, 3, 2], 50))
+    assert np.isclose(segments.percentiles[90][2], np.percentile([10, 40, 20, 30], 90))
@@ -0,0 +1,56 @@
+"""
+Tests for the W′ balance model.
+"""
+import time as timer
+
+import numpy as np
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.streams.wbal import w_prime_balance
+
+CP = 250
+W_PRIME = 20000
+
+
+def _skiba_loop(watts, cp, w_prime):
+    balance, out = w_prime, []
+    for power in watts:
+        if power > cp:
+            balance -= power - cp
+        else:
+            balance += (w_prime - balance) * (cp - power) / w_prime
+        out.append(balance)
+    return np.array(out)
+
+
+def _attacking_ride():
+    watts = np.full(5400, 180.0)
+    watts[1200:1330] = 400  # attack: 19.5 kJ over CP
+    watts[3000:3300] = 300  # 5 min at 50 W over CP: 15 kJ
+    return watts
+
+
+def test_matches_reference_recurrence():
+    watts = np.random.default_rng(3).normal(230, 80, 8000).clip(0)
+    wbal = w_prime_balance(watts, CP, W_PRIME)
+    assert np.allclose(wbal.balance, _skiba_loop(watts, CP, W_PRIME), rtol=1e-9, atol=1e-6)
+
+
+def test_depletion_events():
+    wbal = w_prime_balance(_attacking_ride(), CP, W_PRIME, time=np.arange(5400))
+    events = wbal.depletion_events()
+
+    assert [e['severity'] for e in events] == ['cracked', 'deep']
+    assert events[0]['start_minute'] == 21.1 and events[0]['low_minute'] == 22.1
+    assert events[0]['min_balance_pct'] == 2.5
+    assert wbal.summary()['min_balance_pct'] == round(wbal.min_fraction * 100, 1)
+
+
+def test_fast_enough_for_ingestion():
+    watts = np.random.default_rng(5).normal(200, 90, 6 * 3600).clip(0)
+    started = timer.perf_counter()
+    w_prime_balance(watts, CP, W_PRIME)
+    assert timer.perf_counter() - started < 0.5
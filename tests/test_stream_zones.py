@@ -0,0 +1,101 @@
+"""
+Tests for time-in-zone accumulation and plan adherence.
+"""
+import datetime
+
+import numpy as np
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge import monitor
+from src.lanterne_rouge.ai_clients import use_llm_backend
+from src.lanterne_rouge.athlete import AthleteContext, use_athlete
+from src.lanterne_rouge.llm_stub import StubLLMBackend
+from src.lanterne_rouge.memory_bus import log_decision
+from src.lanterne_rouge.plan_generator import WorkoutPlan
+from src.lanterne_rouge.reasoner import ReasoningAgent
+from src.lanterne_rouge.ride_store import RideAnalysisStore
+from src.lanterne_rouge.streams import RideEfficiency, StreamCache
+from src.lanterne_rouge.streams.zones import (
+    adherence_trend, compare_to_plan, ride_time_in_zones, season_time_in_zones,
+    summarize_adherence, time_in_zones
+)
+
+FTP = 200
+
+
+def _ride(zone_minutes):
+    """Stream with the given minutes at 50/65/80/100/120% FTP (Zones 1-5)."""
+    levels = [0.50, 0.65, 0.80, 1.00, 1.20]
+    watts = np.concatenate([np.full(int(m * 60), level * FTP) for level, m in zip(levels, zone_minutes)])
+    return {'time': np.arange(len(watts), dtype=float), 'watts': watts,
+            'heartrate': np.where(watts > FTP, 170.0, 0.0)}
+
+
+def test_time_in_zones_single_ride():
+    streams = _ride([10, 60, 0, 20, 0])
+    zones = time_in_zones(streams['watts'], FTP, time=streams['time'])
+    assert zones == {'Zone 1': 10.0, 'Zone 2': 60.0, 'Zone 3': 0.0, 'Zone 4': 20.0, 'Zone 5': 0.0}
+
+    both = ride_time_in_zones(_ride([0, 0, 0, 0, 5]), ftp=FTP, lthr=165)
+    assert both['heartrate']['Zone 5'] == 5.0
+    assert sum(both['heartrate'].values()) == 5.0  # zero readings ignored
+
+
+def test_season_bulk_matches_per_ride():
+    rides = [("a", _ride([10, 60, 0, 20, 0])), ("b", _ride([0, 30, 15, 0, 15])), ("c", {'time': [0, 1]})]
+    frame = season_time_in_zones(rides, ftp=FTP)
+
+    assert list(frame.index) == ["a", "b"]
+    for activity_id, streams in rides[:2]:
+        assert frame.loc[activity_id].to_dict() == time_in_zones(streams['watts'], FTP)
+
+
+def test_compare_to_plan_and_trend():
+    plan = WorkoutPlan("Threshold Work", "", 75, {"Zone 2": 45, "Zone 4": 20, "Zone 1": 10}, 95, 0.85, "template")
+    actual = time_in_zones(_ride([10, 60, 0, 10, 0])['watts'], FTP)
+
+    adherence = compare_to_plan(plan, actual)
+    assert adherence.score == round(65 / 75, 3)
+    assert adherence.difference["Zone 4"] == -10.0
+
+    frame = season_time_in_zones([("a", _ride([10, 45, 0, 20, 0])), ("b", _ride([10, 60, 0, 10, 0]))], ftp=FTP)
+    trend = adherence_trend(frame, {"a": plan, "b": plan.zones, "missing": plan})
+    assert list(trend["score"]) == [1.0, round(65 / 75, 3)]
+    assert summarize_adherence(trend, recent=1) == {
+        'rides': 2, 'mean_score': 0.93, 'recent_score': 0.87, 'trend': 'declining'
+    }
+
+
+def test_reasoner_sees_zone_adherence_of_planned_rides(tmp_path, monkeypatch):
+    monkeypatch.setattr(monitor, "get_current_ftp", lambda: FTP)
+    athlete = AthleteContext("zones", data_dir=tmp_path)
+    store, cache = RideAnalysisStore(tmp_path / "rides.db"), StreamCache(tmp_path / "streams")
+    today = datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+    for activity_id, minutes, hour in (("1", [10, 45, 0, 20, 0], 6), ("2", [10, 60, 0, 10, 0], 18)):
+        cache.save(activity_id, _ride(minutes))
+        store.save_efficiency([{"activity_id": activity_id, "start_date": f"{today}T{hour:02d}:00:00",
+                                "metrics": RideEfficiency(3600)}])
+
+    with use_athlete(athlete):
+        log_decision({"action": "maintain", "planned_zones": {"Zone 2": 45, "Zone 4": 20, "Zone 1": 10}})
+        zone_adherence = monitor.get_zone_adherence(store=store, cache=cache)
+
+    assert zone_adherence["rides"] == 2 and zone_adherence["recent_score"] == 0.93
+    assert zone_adherence["time_in_zones"]["Zone 2"] == 105.0
+
+    prompts = []
+
+    def decide(messages):
+        prompts.append(messages[-1]["content"])
+        return '{"action": "ease", "reason": "", "intensity_recommendation": "low", "flags": [], "confidence": 0.7}'
+
+    with use_athlete(athlete), use_llm_backend(StubLLMBackend(responses={"training_decision": decide})):
+        decision = ReasoningAgent(use_llm=True).make_decision(
+            {"readiness_score": 80, "tsb": 0, "zone_adherence": zone_adherence})
+
+    assert decision.action == "ease"
+    assert "Plan adherence: 93% of planned zone time hit" in prompts[0]
+    assert "Zone 2 105 min" in prompts[0]
@@ -0,0 +1,53 @@
+"""
+Tests for the in-process workflow runner.
+"""
+from unittest.mock import patch
+
+# Add project to path
+from setup import setup_path
+setup_path()
+
+from src.lanterne_rouge.workflow import Workflow, WorkflowContext
+
+
+def test_steps_share_context_and_load_config_once():
+    calls = []
+
+    def coach(context):
+        calls.append(context.mission_cfg)
+        return "summary"
+
+    def docs(context):
+        calls.append(context.mission_cfg)
+        return context.results["coach"].upper()
+
+    with patch("src.lanterne_rouge.mission_config.bootstrap", return_value=object()) as bootstrap:
+        workflow = Workflow("morning").add_step("coach", coach).add_step("docs", docs)
+        report = workflow.run()
+
+    bootstrap.assert_called_once()
+    assert calls[0] is calls[1]
+    assert workflow.context.results == {"coach": "summary", "docs": "SUMMARY"}
+    assert report.ok and [step.name for step in report.steps] == ["coach", "docs"]
+    assert "coach" in report.format()
+
+
+def test_failures_optional_and_required():
+    ran = []
+
+    def broken(context):
+        raise RuntimeError("GitHub is down")
+
+    workflow = Workflow("morning", WorkflowContext(mission_cfg=object()))
+    workflow.add_step("docs", broken, required=False)
+    workflow.add_step("coach", lambda context: ran.append("coach"))
+    workflow.add_step("secret", broken)
+    workflow.add_step("notify", lambda context: ran.append("notify"))
+    report = workflow.run()
+
+    assert ran == ["coach"]  # an optional failure continues, a required one stops
+    assert not report.ok
+    assert [(step.name, step.ok, step.skipped) for step in report.steps] == [
+        ("docs", False, False), ("coach", True, False), ("secret", False, False), ("notify", False, True)]
+    assert report.steps[2].error == "RuntimeError: GitHub is down"
+    assert "skipped" in report.format()